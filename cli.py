@@ -6,4 +6,8 @@ import sys
 from cli.main import main
 
 if __name__ == "__main__":
+    # 打包后的 exe 中启用多进程支持（字幕批处理进程池）
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -6,6 +6,7 @@
 from pathlib import Path
 
 from core.logger import get_logger
+from core.profiler import profiling
 from cli.utils import get_archive_path, create_managers, print_summary
 
 
@@ -28,10 +29,12 @@ def channel_command(args):
     logger.info(t("log.url_type_identified", url_type="channel", url=args.url))
 
     if args.dry_run:
-        return run_dry_run(args.url, logger, force=args.force)
+        with profiling(args.profile):
+            return run_dry_run(args.url, logger, force=args.force)
 
     if args.run:
-        return run_full_pipeline(args.url, logger, force=args.force)
+        with profiling(args.profile):
+            return run_full_pipeline(args.url, logger, force=args.force)
 
     logger.warning(t("cli_select_mode_warning"))
     return 1
@@ -174,7 +177,7 @@ def run_full_pipeline(url: str, logger, force: bool = False) -> int:
     try:
         from core.fetcher import VideoFetcher
         from core.pipeline import process_video_list
-        from core.output import OutputWriter
+        from core.output import create_output_writer
         from core.failure_logger import FailureLogger
         from core.incremental import IncrementalManager
         from config.manager import ConfigManager
@@ -234,7 +237,9 @@ def run_full_pipeline(url: str, logger, force: bool = False) -> int:
 
         # 创建输出写入器和失败记录器
         output_dir = Path(config.output_dir)
-        output_writer = OutputWriter(output_dir)
+        output_writer = create_output_writer(
+            output_dir, backend=config.output_backend, commit_mode=config.output_commit_mode
+        )
         failure_logger = FailureLogger(output_dir)
 
         # 定义进度回调（用于 CLI 显示）
@@ -281,6 +286,8 @@ def run_full_pipeline(url: str, logger, force: bool = False) -> int:
             proxy_manager=proxy_manager,
             cookie_manager=cookie_manager,
             on_stats=on_stats_callback,
+            artifact_memory_mb=config.artifact_memory_mb,
+            worker_budget=config.worker_budget,
         )
 
         # 输出汇总
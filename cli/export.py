@@ -0,0 +1,41 @@
+"""
+打包输出导出命令
+把 outputs.db 中的视频按目录输出的布局导出（不访问网络）
+"""
+
+from pathlib import Path
+
+from config.manager import ConfigManager
+from core.logger import get_logger
+from core.i18n import t
+
+
+def export_command(args):
+    """处理打包输出导出命令
+
+    Args:
+        args: argparse 解析的参数
+
+    Returns:
+        退出码（0 表示成功）
+    """
+    logger = get_logger()
+    from core.output.packed import PACKED_DB_NAME, PackedOutputStore
+
+    config = ConfigManager().load()
+    output_dir = Path(args.dir or config.output_dir)
+    db_path = output_dir / PACKED_DB_NAME
+    if not db_path.exists():
+        logger.error(t("exception.file_not_found", path=str(db_path)))
+        return 1
+
+    target_dir = Path(args.to) if args.to else output_dir
+    store = PackedOutputStore(db_path)
+    try:
+        videos, files = store.export(target_dir, video_ids=args.video, overwrite=args.force)
+    finally:
+        store.close()
+    logger.info_i18n("log.packed_export_complete", videos=videos, files=files, path=str(target_dir))
+    if args.video and videos < len(args.video):
+        return 1
+    return 0
@@ -4,18 +4,35 @@ CLI 主入口
 """
 
 import argparse
+import importlib
 import sys
 
 from config.manager import ConfigManager
 from core.logger import get_logger
-
-from cli.channel import channel_command
-from cli.urls import urls_command
-from cli.cookie import test_cookie_command
-from cli.ai_smoke_test import ai_smoke_test_command
 from core.i18n import t
 
 
+def _lazy_command(module_name: str, func_name: str):
+    """延迟导入子命令实现
+
+    子命令模块会间接导入 AI 供应商、下载器等较重的依赖，
+    只在命令真正执行时才导入，`--help` 和其他子命令不为此付出启动时间
+
+    Args:
+        module_name: 子命令模块名（如 "cli.channel"）
+        func_name: 命令函数名
+
+    Returns:
+        可作为 argparse func 的包装函数
+    """
+
+    def command(args):
+        return getattr(importlib.import_module(module_name), func_name)(args)
+
+    command.__name__ = func_name
+    return command
+
+
 def create_parser() -> argparse.ArgumentParser:
     """创建命令行参数解析器
 
@@ -43,6 +60,12 @@ def create_parser() -> argparse.ArgumentParser:
     # ai-smoke-test 子命令
     _add_ai_smoke_test_parser(subparsers)
 
+    # rerender 子命令
+    _add_rerender_parser(subparsers)
+
+    # export 子命令
+    _add_export_parser(subparsers)
+
     return parser
 
 
@@ -67,7 +90,12 @@ def _add_channel_parser(subparsers):
     channel_parser.add_argument(
         "--force", action="store_true", help=t("cli_force_help")
     )
-    channel_parser.set_defaults(func=channel_command)
+    channel_parser.add_argument(
+        "--profile", action="store_true", help=t("cli_profile_help")
+    )
+    channel_parser.set_defaults(
+        func=_lazy_command("cli.channel", "channel_command")
+    )
 
 
 def _add_urls_parser(subparsers):
@@ -89,7 +117,12 @@ def _add_urls_parser(subparsers):
     urls_parser.add_argument(
         "--force", action="store_true", help=t("cli_force_help")
     )
-    urls_parser.set_defaults(func=urls_command)
+    urls_parser.add_argument(
+        "--profile", action="store_true", help=t("cli_profile_help")
+    )
+    urls_parser.set_defaults(
+        func=_lazy_command("cli.urls", "urls_command")
+    )
 
 
 def _add_test_cookie_parser(subparsers):
@@ -97,7 +130,9 @@ def _add_test_cookie_parser(subparsers):
     test_cookie_parser = subparsers.add_parser(
         "test-cookie", help=t("cli_test_cookie_help")
     )
-    test_cookie_parser.set_defaults(func=test_cookie_command)
+    test_cookie_parser.set_defaults(
+        func=_lazy_command("cli.cookie", "test_cookie_command")
+    )
 
 
 def _add_ai_smoke_test_parser(subparsers):
@@ -105,7 +140,58 @@ def _add_ai_smoke_test_parser(subparsers):
     ai_smoke_test_parser = subparsers.add_parser(
         "ai-smoke-test", help=t("cli_ai_smoke_test_help")
     )
-    ai_smoke_test_parser.set_defaults(func=ai_smoke_test_command)
+    ai_smoke_test_parser.set_defaults(
+        func=_lazy_command("cli.ai_smoke_test", "ai_smoke_test_command")
+    )
+
+
+def _add_rerender_parser(subparsers):
+    """添加 rerender 子命令解析器"""
+    rerender_parser = subparsers.add_parser(
+        "rerender", help=t("cli_rerender_help")
+    )
+    rerender_parser.add_argument(
+        "--dir", type=str, help=t("cli_rerender_dir_help")
+    )
+    rerender_parser.add_argument(
+        "--format",
+        choices=["srt", "txt", "both"],
+        help=t("cli_rerender_format_help"),
+    )
+    rerender_parser.add_argument(
+        "--bilingual",
+        choices=["none", "source+target"],
+        help=t("cli_rerender_bilingual_help"),
+    )
+    rerender_parser.add_argument(
+        "--workers", type=int, help=t("cli_rerender_workers_help")
+    )
+    rerender_parser.add_argument(
+        "--force", action="store_true", help=t("cli_rerender_force_help")
+    )
+    rerender_parser.set_defaults(
+        func=_lazy_command("cli.rerender", "rerender_command")
+    )
+
+
+def _add_export_parser(subparsers):
+    """添加 export 子命令解析器"""
+    export_parser = subparsers.add_parser("export", help=t("cli_export_help"))
+    export_parser.add_argument(
+        "--dir", type=str, help=t("cli_export_dir_help")
+    )
+    export_parser.add_argument(
+        "--to", type=str, help=t("cli_export_to_help")
+    )
+    export_parser.add_argument(
+        "--video", action="append", metavar="VIDEO_ID", help=t("cli_export_video_help")
+    )
+    export_parser.add_argument(
+        "--force", action="store_true", help=t("cli_export_force_help")
+    )
+    export_parser.set_defaults(
+        func=_lazy_command("cli.export", "export_command")
+    )
 
 
 def main() -> int:
@@ -118,14 +204,7 @@ def main() -> int:
     config_manager = ConfigManager()
     config_manager.load()
 
-    # 初始化日志系统
-    logger = get_logger(
-        level="INFO",
-        console_output=True,
-        file_output=True,
-    )
-
-    # 创建解析器并解析参数
+    # 创建解析器并解析参数（--help 在此退出，无需初始化日志文件）
     parser = create_parser()
     args = parser.parse_args()
 
@@ -134,6 +213,13 @@ def main() -> int:
         parser.print_help()
         return 1
 
+    # 初始化日志系统
+    logger = get_logger(
+        level="INFO",
+        console_output=True,
+        file_output=True,
+    )
+
     # 执行对应命令
     try:
         return args.func(args)
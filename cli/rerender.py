@@ -0,0 +1,41 @@
+"""
+离线重新渲染命令
+根据已有输出目录中的字幕重新生成 TXT / 双语 / 章节文件（不访问网络）
+"""
+
+from pathlib import Path
+
+from config.manager import ConfigManager
+from core.logger import get_logger
+from core.i18n import t
+
+
+def rerender_command(args):
+    """处理离线重新渲染命令
+
+    Args:
+        args: argparse 解析的参数
+
+    Returns:
+        退出码（0 表示成功）
+    """
+    logger = get_logger()
+    from core.output.rerender import OutputRerenderer
+
+    config = ConfigManager().load()
+    language_config = config.language
+
+    output_dir = Path(args.dir or config.output_dir)
+    if not output_dir.exists():
+        logger.error(t("exception.file_not_found", path=str(output_dir)))
+        return 1
+
+    rerenderer = OutputRerenderer(
+        output_dir,
+        subtitle_format=args.format or language_config.subtitle_format,
+        bilingual_mode=args.bilingual or language_config.bilingual_mode,
+        max_workers=args.workers,
+        force=args.force,
+    )
+    stats = rerenderer.run()
+    return 1 if stats.failed else 0
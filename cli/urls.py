@@ -6,6 +6,7 @@ URL 列表模式命令
 from pathlib import Path
 
 from core.logger import get_logger
+from core.profiler import profiling
 from cli.utils import create_managers, print_summary
 
 
@@ -61,10 +62,12 @@ def urls_command(args):
 
         # 执行对应流程
         if args.dry_run:
-            return run_dry_run_for_urls(file_path, logger, force=args.force)
+            with profiling(args.profile):
+                return run_dry_run_for_urls(file_path, logger, force=args.force)
 
         if args.run:
-            return run_full_pipeline_for_urls(file_path, logger, force=args.force)
+            with profiling(args.profile):
+                return run_full_pipeline_for_urls(file_path, logger, force=args.force)
 
         logger.warning(t("log.output_skipped"))
         return 1
@@ -211,7 +214,7 @@ def run_full_pipeline_for_urls(file_path: Path, logger, force: bool = False) ->
     try:
         from core.fetcher import VideoFetcher
         from core.pipeline import process_video_list
-        from core.output import OutputWriter
+        from core.output import create_output_writer
         from core.failure_logger import FailureLogger
         from core.incremental import IncrementalManager
         from config.manager import ConfigManager
@@ -271,7 +274,9 @@ def run_full_pipeline_for_urls(file_path: Path, logger, force: bool = False) ->
 
         # 创建输出写入器和失败记录器
         output_dir = Path(config.output_dir)
-        output_writer = OutputWriter(output_dir)
+        output_writer = create_output_writer(
+            output_dir, backend=config.output_backend, commit_mode=config.output_commit_mode
+        )
         failure_logger = FailureLogger(output_dir)
 
         # 定义进度回调（用于 CLI 显示）
@@ -318,6 +323,8 @@ def run_full_pipeline_for_urls(file_path: Path, logger, force: bool = False) ->
             proxy_manager=proxy_manager,
             cookie_manager=cookie_manager,
             on_stats=on_stats_callback,
+            artifact_memory_mb=config.artifact_memory_mb,
+            worker_budget=config.worker_budget,
         )
 
         # 输出汇总
@@ -70,7 +70,7 @@ def get_archive_path(
 
 
 def create_managers(config, logger):
-    """创建代理管理器和 Cookie 管理器
+    """创建代理管理器和 Cookie 管理器（同时按配置设置 YouTube 请求限速）
 
     Args:
         config: 配置对象
@@ -81,6 +81,9 @@ def create_managers(config, logger):
     """
     from core.proxy_manager import ProxyManager
     from core.cookie_manager import CookieManager
+    from core.rate_limiter import get_rate_limiter
+
+    get_rate_limiter().configure(rate=config.request_rate, burst=config.request_burst)
 
     proxy_manager = None
     if config.proxies:
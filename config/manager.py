@@ -51,6 +51,9 @@ class AIConfig:
     timeout_seconds: int = 30  # 超时时间（秒）
     max_retries: int = 2  # 最大重试次数
     max_concurrency: int = 5  # 最大并发数（用于内部限流）
+    stream: bool = False  # 供应商支持时使用流式输出（可中途取消、提前发现异常输出），默认关闭
+    local_batch_size: int = 1  # 本地模型：服务饱和时最多合并的短请求数（1 表示不合并，保留流式输出）
+    keep_alive_seconds: int = 1800  # 本地模型：请求后模型保持加载的时间（秒）
     api_keys: dict[str, str] = field(default_factory=lambda: {
         "openai": "env:YTSUB_API_KEY",
         "anthropic": "env:YTSUB_API_KEY"
@@ -65,6 +68,9 @@ class AIConfig:
             "timeout_seconds": self.timeout_seconds,
             "max_retries": self.max_retries,
             "max_concurrency": self.max_concurrency,
+            "stream": self.stream,
+            "local_batch_size": self.local_batch_size,
+            "keep_alive_seconds": self.keep_alive_seconds,
             "api_keys": self.api_keys,
         }
     
@@ -92,6 +98,9 @@ class AIConfig:
             timeout_seconds=data.get("timeout_seconds", 30),
             max_retries=data.get("max_retries", 2),
             max_concurrency=data.get("max_concurrency", 5),  # 默认 5
+            stream=data.get("stream", False),
+            local_batch_size=data.get("local_batch_size", 1),
+            keep_alive_seconds=data.get("keep_alive_seconds", 1800),
             api_keys=api_keys,
         )
 
@@ -106,10 +115,16 @@ class AppConfig:
     concurrency: int = 10  # 下载并发数，默认 10
     ai_concurrency: int = 3  # AI 并发数（翻译/摘要），默认 3
     retry_count: int = 2  # 重试次数，默认 2（用于网络错误、限流等可重试错误）
+    request_rate: float = 0.0  # 每个出口（代理 + Cookie）每秒访问 YouTube 的请求数，0 表示不限速（被限流后自动限速）
+    request_burst: int = 3  # 每个出口允许的突发请求数
     proxies: list[str] = field(default_factory=list)  # 代理列表
     cookie: str = ""  # Cookie 字符串
     network_region: Optional[str] = None  # 网络地区（从 Cookie 测试中检测，格式如 "US", "CN" 等）
     output_dir: str = "out"  # 输出目录（相对路径）
+    output_commit_mode: str = "link"  # 输出提交方式（link：硬链接临时文件并按视频组提交；copy：逐个原子写）
+    output_backend: str = "dir"  # 输出后端（dir：每个视频一个目录；packed：打包到输出目录下的 outputs.db，用 export 命令导出）
+    artifact_memory_mb: int = 256  # 阶段间产物（译文、摘要）的内存上限（MB），超出后落盘，0 表示经临时文件传递
+    worker_budget: int = 0  # 跨阶段共享 worker 池的总线程数（启用分阶段流水线），0 表示使用线程级流水线
     translation_ai: AIConfig = field(default_factory=AIConfig)  # 翻译 AI 配置
     summary_ai: AIConfig = field(default_factory=AIConfig)  # 摘要 AI 配置
     # 保留 ai 字段用于向后兼容（已废弃，将在未来版本移除）
@@ -117,6 +132,7 @@ class AppConfig:
     ui_language: str = "zh-CN"  # UI 语言（zh-CN / en-US）
     theme: str = "light"  # UI 主题（light / light_gray / dark_gray / claude_warm）
     force_rerun: bool = False  # 强制重跑选项（忽略历史记录）
+    profile_enabled: bool = False  # 任务运行时进行性能分析（采样调用栈 + 热路径跟踪，结果写入日志目录）
     
     def to_dict(self) -> dict:
         """转换为字典（用于 JSON 序列化）"""
@@ -125,15 +141,22 @@ class AppConfig:
             "concurrency": self.concurrency,
             "ai_concurrency": self.ai_concurrency,
             "retry_count": self.retry_count,
+            "request_rate": self.request_rate,
+            "request_burst": self.request_burst,
             "proxies": self.proxies,
             "cookie": self.cookie,
             "network_region": self.network_region,
             "output_dir": self.output_dir,
+            "output_commit_mode": self.output_commit_mode,
+            "output_backend": self.output_backend,
+            "artifact_memory_mb": self.artifact_memory_mb,
+            "worker_budget": self.worker_budget,
             "translation_ai": self.translation_ai.to_dict(),
             "summary_ai": self.summary_ai.to_dict(),
             "ui_language": self.ui_language,
             "theme": self.theme,
             "force_rerun": self.force_rerun,
+            "profile_enabled": self.profile_enabled,
         }
         # 向后兼容：如果 ai 字段存在，也保存（用于旧版本兼容）
         if self.ai is not None:
@@ -168,16 +191,23 @@ class AppConfig:
             concurrency=data.get("concurrency", 10),  # 默认下载并发数 10
             ai_concurrency=data.get("ai_concurrency", 5),  # 默认 AI 并发数 5
             retry_count=data.get("retry_count", 2),
+            request_rate=data.get("request_rate", 0.0),
+            request_burst=data.get("request_burst", 3),
             proxies=data.get("proxies", []),
             cookie=data.get("cookie", ""),
             network_region=data.get("network_region"),  # 可选字段，默认为 None
             output_dir=data.get("output_dir", "out"),
+            output_commit_mode=data.get("output_commit_mode", "link"),
+            output_backend=data.get("output_backend", "dir"),
+            artifact_memory_mb=data.get("artifact_memory_mb", 256),
+            worker_budget=data.get("worker_budget", 0),
             translation_ai=AIConfig.from_dict(translation_ai_data or {}),
             summary_ai=AIConfig.from_dict(summary_ai_data or {}),
             ai=AIConfig.from_dict(old_ai) if old_ai else None,  # 保留用于向后兼容
             ui_language=data.get("ui_language", "zh-CN"),
             theme=data.get("theme", "light"),
             force_rerun=data.get("force_rerun", False),  # 默认 False
+            profile_enabled=data.get("profile_enabled", False),
         )
     
     @classmethod
@@ -34,26 +34,28 @@ from .registry import (
     is_provider_registered,
 )
 
-# 导入客户端类（向后兼容）
-from .openai_compatible import OpenAICompatibleClient
-from .local_model import LocalModelClient
-from .gemini import GeminiClient
-from .anthropic import AnthropicClient
-
-
-# GoogleTranslateClient 需要延迟导入（因为文件很大，可能有循环依赖）
-def _lazy_import_google_translate():
-    """延迟导入 GoogleTranslateClient"""
-    from .google_translate import GoogleTranslateClient
-
-    return GoogleTranslateClient
+# 客户端类延迟导入（向后兼容）：
+# 各客户端模块会引入 requests 等较重的依赖，只在实际使用时才导入，
+# 避免 `cli.py --help`、test-cookie 等与 AI 无关的命令为此付出启动时间
+_LAZY_CLIENTS = {
+    "OpenAICompatibleClient": ".openai_compatible",
+    "LocalModelClient": ".local_model",
+    "GeminiClient": ".gemini",
+    "AnthropicClient": ".anthropic",
+    "GoogleTranslateClient": ".google_translate",
+}
 
 
 # 使用 __getattr__ 实现延迟导入
 def __getattr__(name):
-    if name == "GoogleTranslateClient":
-        return _lazy_import_google_translate()
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name = _LAZY_CLIENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    client_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = client_class
+    return client_class
 
 
 __all__ = [
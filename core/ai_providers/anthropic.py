@@ -7,13 +7,44 @@ import time
 from typing import Optional, Sequence
 
 from config.manager import AIConfig
-from core.llm_client import LLMResult, LLMUsage, LLMException, LLMErrorType
+from core.llm_client import LLMResult, LLMStream, LLMUsage, LLMException, LLMErrorType
 from core.logger import get_logger, translate_exception
+from core.profiler import traced
 from core.llm_client import load_api_key
+from .base import get_capabilities
+from .streaming import open_stream
 
 logger = get_logger()
 
 
+def _cached_system(system: str) -> list:
+    """system 提示词标记为可缓存（cache_control），同一指令的后续请求按缓存读取计费
+
+    低于模型最小可缓存长度时服务端忽略该标记，不会报错。
+    """
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+def _usage_from_response(usage, output_tokens: Optional[int] = None) -> LLMUsage:
+    """转换 Anthropic usage
+
+    input_tokens 不含缓存读写部分，这里把三者相加作为 prompt_tokens，
+    缓存读取计入 cached_tokens，缓存写入计入 cache_write_tokens。
+    """
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    prompt_tokens = (usage.input_tokens or 0) + cache_read + cache_write
+    if output_tokens is None:
+        output_tokens = usage.output_tokens or 0
+    return LLMUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=output_tokens,
+        total_tokens=prompt_tokens + output_tokens,
+        cached_tokens=cache_read,
+        cache_write_tokens=cache_write,
+    )
+
+
 class AnthropicClient:
     """Anthropic LLM 客户端实现"""
 
@@ -81,6 +112,10 @@ class AnthropicClient:
     def max_concurrency(self) -> int:
         return self._max_concurrency
 
+    @property
+    def supports_streaming(self) -> bool:
+        return self.ai_config.stream and get_capabilities(self.provider_name).supports_streaming
+
     def _check_dependencies(self) -> None:
         """检查依赖库是否已安装"""
         try:
@@ -91,6 +126,7 @@ class AnthropicClient:
                 LLMErrorType.UNKNOWN,
             )
 
+    @traced("llm.generate")
     def generate(
         self,
         prompt: str,
@@ -118,22 +154,25 @@ class AnthropicClient:
                 timeout=self.ai_config.timeout_seconds,
             )
 
+            request = dict(
+                model=self.ai_config.model,
+                max_tokens=min(
+                    max_tokens or self.max_output_tokens,
+                    self.max_output_tokens,
+                ),
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature or 0.3,
+            )
+            if system:
+                request["system"] = _cached_system(system)
+
             # 实现重试逻辑
             last_error = None
             for attempt in range(self.ai_config.max_retries + 1):
                 try:
                     # 使用 Semaphore 进行并发限流
                     with self._sem:
-                        response = client.messages.create(
-                            model=self.ai_config.model,
-                            max_tokens=min(
-                                max_tokens or self.max_output_tokens,
-                                self.max_output_tokens,
-                            ),
-                            system=system,
-                            messages=[{"role": "user", "content": prompt}],
-                            temperature=temperature or 0.3,
-                        )
+                        response = client.messages.create(**request)
 
                     # 提取结果
                     text = response.content[0].text if response.content else ""
@@ -141,12 +180,8 @@ class AnthropicClient:
                     # 提取使用统计
                     usage = None
                     if response.usage:
-                        usage = LLMUsage(
-                            prompt_tokens=response.usage.input_tokens,
-                            completion_tokens=response.usage.output_tokens,
-                            total_tokens=response.usage.input_tokens
-                            + response.usage.output_tokens,
-                        )
+                        usage = _usage_from_response(response.usage)
+                        self._log_cache_hit(usage)
 
                     elapsed = time.time() - start_time
                     logger.debug(
@@ -241,3 +276,126 @@ class AnthropicClient:
                 translate_exception("exception.ai_client_init_failed_prefix", provider="Anthropic", error=str(e)),
                 LLMErrorType.UNKNOWN,
             )
+
+    def _map_error(self, e: Exception) -> LLMException:
+        """将 anthropic SDK 异常映射为 LLMException（分类与 generate 一致）"""
+        from anthropic import (
+            APIConnectionError,
+            APIError,
+            AuthenticationError,
+            RateLimitError,
+        )
+
+        if isinstance(e, RateLimitError):
+            return LLMException(
+                translate_exception("exception.ai_rate_limit", provider="Anthropic", error=str(e)),
+                LLMErrorType.RATE_LIMIT,
+            )
+        if isinstance(e, AuthenticationError):
+            return LLMException(
+                translate_exception("exception.ai_auth_failed_prefix", provider="Anthropic", error=str(e)),
+                LLMErrorType.AUTH,
+            )
+        if isinstance(e, APIConnectionError):
+            return LLMException(
+                translate_exception("exception.ai_network_failed_prefix", provider="Anthropic", error=str(e)),
+                LLMErrorType.NETWORK,
+            )
+        if isinstance(e, APIError):
+            error_msg = str(e).lower()
+            if any(
+                keyword in error_msg
+                for keyword in ["content", "safety", "policy", "violation"]
+            ):
+                return LLMException(
+                    translate_exception("exception.ai_content_filter", provider="Anthropic", error=str(e)),
+                    LLMErrorType.CONTENT,
+                )
+            return LLMException(
+                translate_exception("exception.ai_error_prefix", provider="Anthropic", error=str(e)),
+                LLMErrorType.UNKNOWN,
+            )
+        return LLMException(
+            translate_exception("exception.ai_unknown_error_prefix", provider="Anthropic", error=str(e)),
+            LLMErrorType.UNKNOWN,
+        )
+
+    def _log_cache_hit(self, usage: LLMUsage) -> None:
+        if usage.cached_tokens:
+            logger.debug_i18n(
+                "log.ai_prompt_cache_hit",
+                provider="Anthropic",
+                cached=usage.cached_tokens,
+                prompt=usage.prompt_tokens,
+            )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop: Optional[Sequence[str]] = None,
+    ) -> LLMStream:
+        """流式调用 Anthropic API
+
+        连接建立阶段按 max_retries 重试；返回的 LLMStream 持有并发名额，
+        迭代结束或 close() 时释放，close() 会立即断开 HTTP 连接。
+        """
+        import anthropic
+
+        client = anthropic.Anthropic(
+            api_key=self.api_key,
+            base_url=self.ai_config.base_url,
+            timeout=self.ai_config.timeout_seconds,
+        )
+        request = dict(
+            model=self.ai_config.model,
+            max_tokens=min(max_tokens or self.max_output_tokens, self.max_output_tokens),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature or 0.3,
+            stream=True,
+        )
+        if system:
+            request["system"] = _cached_system(system)
+        if stop:
+            request["stop_sequences"] = list(stop)
+
+        response, release = open_stream(
+            lambda: client.messages.create(**request),
+            self._map_error,
+            self._sem,
+            self.ai_config.max_retries,
+        )
+        stream = LLMStream(provider=self.provider_name, model=self.ai_config.model)
+        start_usage = None
+        output_tokens = 0
+
+        def deltas():
+            nonlocal start_usage, output_tokens
+            try:
+                for event in response:
+                    if event.type == "message_start":
+                        start_usage = event.message.usage
+                    elif event.type == "content_block_delta":
+                        yield getattr(event.delta, "text", "") or ""
+                    elif event.type == "message_delta" and event.usage:
+                        output_tokens = event.usage.output_tokens or 0
+                if start_usage is not None:
+                    stream.usage = _usage_from_response(start_usage, output_tokens)
+                    self._log_cache_hit(stream.usage)
+            except Exception as e:
+                # close() 断开连接导致的异常属于正常中止
+                if not stream.closed:
+                    raise self._map_error(e)
+            finally:
+                release()
+
+        def close():
+            try:
+                response.close()
+            finally:
+                release()
+
+        return stream.attach(deltas(), close)
@@ -0,0 +1,192 @@
+"""
+本地模型的请求批处理
+
+本地推理服务（Ollama、LM Studio、llama.cpp）的并行槽位很少（CPU 机器上通常只有 1 个），
+逐个发送短请求时大部分时间花在每次请求的固定开销上。这里把等待槽位的短请求合并：
+
+- 调用方线程把请求放入队列后竞争槽位，拿到槽位的线程把队列中同类请求（system 指令和生成参数相同）
+  一起取走，合并为一条多段 Prompt 发送，再按 <response id="n"> 标签把结果分发回各调用方
+- 槽位空闲时请求立即单独发送，不做额外等待；只有服务饱和时才会合并（连续批处理）
+- 响应中缺失的部分在同一槽位内单独重发，调用方拿到的结果与单独请求一致
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Hashable, List, Optional
+
+from core.llm_client import LLMResult, LLMUsage
+from core.logger import get_logger
+from core.prompts import build_batched_prompt
+
+logger = get_logger()
+
+# 可以合并的单个请求最大字符数（长请求单独发送）
+MAX_PART_CHARS = 2000
+# 一次合并请求的最大总字符数（输出长度与输入相近，需要留在 max_output_tokens 以内）
+MAX_BATCH_CHARS = 6000
+# 等待槽位时检查请求是否已被其他线程取走的间隔（秒）
+SLOT_POLL_INTERVAL = 0.05
+
+_RESPONSE_BLOCK = re.compile(
+    r"<response\s+id\s*=\s*[\"']?(\d+)[\"']?\s*>(.*?)</response\s*>", re.IGNORECASE | re.DOTALL
+)
+
+
+def parse_batched_response(text: str, count: int) -> Dict[int, str]:
+    """拆分合并请求的响应
+
+    Args:
+        text: 模型返回的完整文本
+        count: 合并的请求数
+
+    Returns:
+        {请求编号(从 1 开始): 结果文本}，缺失或为空的请求不包含在内
+    """
+    result: Dict[int, str] = {}
+    for number, body in _RESPONSE_BLOCK.findall(text or ""):
+        number = int(number)
+        body = body.strip()
+        if 1 <= number <= count and number not in result and body:
+            result[number] = body
+    return result
+
+
+def _share_usage(usage: Optional[LLMUsage], share: float) -> Optional[LLMUsage]:
+    """按比例拆分合并请求的 token 用量"""
+    if usage is None:
+        return None
+
+    def part(value: Optional[int]) -> Optional[int]:
+        return None if value is None else round(value * share)
+
+    return LLMUsage(
+        prompt_tokens=part(usage.prompt_tokens),
+        completion_tokens=part(usage.completion_tokens),
+        total_tokens=part(usage.total_tokens),
+        estimated_cost_usd=None if usage.estimated_cost_usd is None else usage.estimated_cost_usd * share,
+        cached_tokens=part(usage.cached_tokens),
+        cache_write_tokens=part(usage.cache_write_tokens),
+    )
+
+
+@dataclass
+class _Part:
+    prompt: str
+    done: threading.Event = field(default_factory=threading.Event)
+    taken: bool = False
+    result: Optional[LLMResult] = None
+    error: Optional[BaseException] = None
+
+
+class PromptBatcher:
+    """按槽位限流并合并短请求（线程安全）"""
+
+    def __init__(
+        self,
+        send: Callable[..., LLMResult],
+        slots: int,
+        max_parts: int,
+        max_part_chars: int = MAX_PART_CHARS,
+        max_batch_chars: int = MAX_BATCH_CHARS,
+    ):
+        """初始化
+
+        Args:
+            send: 实际发送函数 send(prompt, system=..., **kwargs) -> LLMResult
+            slots: 服务端并行槽位数（同时在途的请求数上限）
+            max_parts: 一次最多合并的请求数（1 表示不合并，只限流）
+            max_part_chars: 可以合并的单个请求最大字符数
+            max_batch_chars: 一次合并请求的最大总字符数
+        """
+        self._send = send
+        self.slots = max(1, slots)
+        self.max_parts = max(1, max_parts)
+        self.max_part_chars = max_part_chars
+        self.max_batch_chars = max_batch_chars
+        self.batches = 0  # 发出的合并请求数
+        self._slots = threading.Semaphore(self.slots)
+        self._lock = threading.Lock()
+        self._queues: Dict[Hashable, Deque[_Part]] = {}
+
+    def generate(self, prompt: str, system: Optional[str] = None, **kwargs) -> LLMResult:
+        """发送一个请求（可能与其他线程的请求合并），阻塞直到拿到自己的结果"""
+        batchable = self.max_parts > 1 and len(prompt) <= self.max_part_chars
+        if not batchable:
+            with self._slots:
+                return self._send(prompt, system=system, **kwargs)
+
+        key = (system, repr(sorted(kwargs.items())))
+        part = _Part(prompt)
+        with self._lock:
+            self._queues.setdefault(key, deque()).append(part)
+
+        while True:
+            with self._lock:
+                if part.taken:
+                    break
+            if not self._slots.acquire(timeout=SLOT_POLL_INTERVAL):
+                continue
+            with self._lock:
+                batch = None if part.taken else self._take(key, part)
+            try:
+                if batch:
+                    self._run(batch, system, kwargs)
+            finally:
+                self._slots.release()
+            break
+
+        part.done.wait()
+        if part.error is not None:
+            raise part.error
+        return part.result
+
+    def _take(self, key: Hashable, own: _Part) -> List[_Part]:
+        """从队列取出本次要发送的请求（自己的请求总在其中，调用时持有 _lock）"""
+        queue = self._queues[key]
+        queue.remove(own)
+        batch = [own]
+        chars = len(own.prompt)
+        while queue and len(batch) < self.max_parts:
+            if chars + len(queue[0].prompt) > self.max_batch_chars:
+                break
+            chars += len(queue[0].prompt)
+            batch.append(queue.popleft())
+        if not queue:
+            del self._queues[key]
+        for part in batch:
+            part.taken = True
+        return batch
+
+    def _run(self, batch: List[_Part], system: Optional[str], kwargs: Dict) -> None:
+        """在已占用的槽位内发送请求并分发结果"""
+        try:
+            if len(batch) == 1:
+                batch[0].result = self._send(batch[0].prompt, system=system, **kwargs)
+                return
+
+            merged = build_batched_prompt(system, [part.prompt for part in batch])
+            response = self._send(merged.user, system=merged.system, **kwargs)
+            self.batches += 1
+            texts = parse_batched_response(response.text, len(batch))
+            share = 1 / len(batch)
+            logger.debug_i18n("log.local_batch_sent", parts=len(batch), returned=len(texts))
+            for number, part in enumerate(batch, start=1):
+                if number in texts:
+                    part.result = LLMResult(
+                        text=texts[number],
+                        usage=_share_usage(response.usage, share),
+                        provider=response.provider,
+                        model=response.model,
+                    )
+                else:
+                    # 模型漏掉了这一部分：单独重发
+                    part.result = self._send(part.prompt, system=system, **kwargs)
+        except BaseException as e:
+            for part in batch:
+                if part.result is None:
+                    part.error = e
+        finally:
+            for part in batch:
+                part.done.set()
@@ -7,9 +7,12 @@ import time
 from typing import Optional, Sequence
 
 from config.manager import AIConfig
-from core.llm_client import LLMResult, LLMException, LLMErrorType
+from core.llm_client import LLMResult, LLMStream, LLMException, LLMErrorType
 from core.logger import get_logger, translate_exception
+from core.profiler import traced
 from core.llm_client import load_api_key
+from .base import get_capabilities
+from .streaming import open_stream
 
 logger = get_logger()
 
@@ -75,6 +78,10 @@ class GeminiClient:
     def max_concurrency(self) -> int:
         return self._max_concurrency
 
+    @property
+    def supports_streaming(self) -> bool:
+        return self.ai_config.stream and get_capabilities(self.provider_name).supports_streaming
+
     def _check_dependencies(self) -> None:
         """检查依赖库是否已安装"""
         try:
@@ -85,6 +92,7 @@ class GeminiClient:
                 LLMErrorType.UNKNOWN,
             )
 
+    @traced("llm.generate")
     def generate(
         self,
         prompt: str,
@@ -214,3 +222,86 @@ class GeminiClient:
                 translate_exception("exception.ai_client_init_failed_prefix", provider="Gemini", error=str(e)),
                 LLMErrorType.UNKNOWN,
             )
+
+    def _map_error(self, e: Exception) -> LLMException:
+        """将 Gemini 异常映射为 LLMException（分类与 generate 一致）"""
+        error_msg = str(e).lower()
+        if "rate limit" in error_msg or "quota" in error_msg:
+            return LLMException(
+                translate_exception("exception.ai_rate_limit", provider="Gemini", error=str(e)),
+                LLMErrorType.RATE_LIMIT,
+            )
+        if "auth" in error_msg or "api key" in error_msg or "permission" in error_msg:
+            return LLMException(
+                translate_exception("exception.ai_auth_failed_prefix", provider="Gemini", error=str(e)),
+                LLMErrorType.AUTH,
+            )
+        if "network" in error_msg or "connection" in error_msg or "timeout" in error_msg:
+            return LLMException(
+                translate_exception("exception.ai_network_failed_prefix", provider="Gemini", error=str(e)),
+                LLMErrorType.NETWORK,
+            )
+        if "safety" in error_msg or "content" in error_msg or "blocked" in error_msg:
+            return LLMException(
+                translate_exception("exception.ai_content_filter", provider="Gemini", error=str(e)),
+                LLMErrorType.CONTENT,
+            )
+        return LLMException(
+            translate_exception("exception.ai_error_prefix", provider="Gemini", error=str(e)),
+            LLMErrorType.UNKNOWN,
+        )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop: Optional[Sequence[str]] = None,
+    ) -> LLMStream:
+        """流式调用 Gemini API
+
+        SDK 不提供中途断开连接的接口，close() 后不再读取剩余分片并立即释放并发名额。
+        """
+        import google.generativeai as genai
+
+        genai.configure(api_key=self.api_key)
+        model = genai.GenerativeModel(self.ai_config.model)
+
+        full_prompt = prompt
+        if system:
+            full_prompt = f"{system}\n\n{prompt}"
+
+        response, release = open_stream(
+            lambda: model.generate_content(
+                full_prompt,
+                generation_config={
+                    "max_output_tokens": min(
+                        max_tokens or self.max_output_tokens,
+                        self.max_output_tokens,
+                    ),
+                    "temperature": temperature or 0.3,
+                    "stop_sequences": stop if stop else None,
+                },
+                stream=True,
+            ),
+            self._map_error,
+            self._sem,
+            self.ai_config.max_retries,
+        )
+        stream = LLMStream(provider=self.provider_name, model=self.ai_config.model)
+
+        def deltas():
+            try:
+                for chunk in response:
+                    if stream.closed:
+                        return
+                    yield getattr(chunk, "text", "") or ""
+            except Exception as e:
+                if not stream.closed:
+                    raise self._map_error(e)
+            finally:
+                release()
+
+        return stream.attach(deltas(), release)
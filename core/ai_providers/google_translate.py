@@ -12,6 +12,8 @@ from config.manager import AIConfig
 from core.exceptions import TaskCancelledError
 from core.llm_client import LLMResult, LLMUsage, LLMException, LLMErrorType
 from core.logger import get_logger, translate_exception, translate_log
+from core.profiler import traced
+from core.translation_memory import get_translation_memory
 
 logger = get_logger()
 
@@ -57,6 +59,7 @@ class GoogleTranslateClient:
         # 取消令牌（用于支持取消操作，由 SubtitleTranslator 在调用前设置）
         self._cancel_token = None
 
+    @traced("llm.generate")
     def generate(
         self,
         prompt: str,
@@ -73,7 +76,7 @@ class GoogleTranslateClient:
 
         Args:
             prompt: 翻译提示词（包含字幕文本）
-            system: 系统提示词（忽略，Google 翻译不需要）
+            system: 系统提示词（只用于提取源语言和目标语言）
             max_tokens: 最大 token 数（忽略）
             temperature: 温度参数（忽略）
             stop: 停止序列（忽略）
@@ -85,6 +88,10 @@ class GoogleTranslateClient:
             LLMException: 当翻译失败时抛出
         """
         try:
+            # 静态指令（含语言对）可能通过 system 单独传入，拼回完整 prompt 再解析
+            if system:
+                prompt = f"{system}\n\n{prompt}"
+
             # 从 prompt 中提取字幕文本
             # prompt 格式：请将以下字幕从 X 翻译成 Y...\n\n字幕内容：\n{字幕文本}\n\n请直接返回...
             subtitle_text = self._extract_subtitle_from_prompt(prompt)
@@ -679,8 +686,21 @@ class GoogleTranslateClient:
             translator = GoogleTranslator(
                 source=actual_source_lang, target=actual_target_lang
             )
-            # 注意：translator.translate() 是阻塞调用，无法在调用期间中断
-            translated_text = translator.translate(text_to_translate)
+            def translate_once() -> Optional[str]:
+                # 注意：translator.translate() 是阻塞调用，无法在调用期间中断
+                result = translator.translate(text_to_translate)
+                # 返回原文视为翻译失败，不写入翻译记忆（否则后续视频都会复用未翻译的条目）
+                return None if result == text_to_translate else result
+
+            # 逐条翻译与上下文无关：相同文本复用翻译记忆，并发的相同请求只发一次
+            translated_text = get_translation_memory(self).translate(
+                actual_source_lang,
+                actual_target_lang,
+                text_to_translate,
+                translate_once,
+            )
+            if translated_text is None:
+                translated_text = text_to_translate
 
             # 检查翻译结果是否与原文相同
             if translated_text == text_to_translate:
@@ -2,12 +2,16 @@
 本地模型专用客户端（Ollama、LM Studio）
 - 继承 OpenAICompatibleClient
 - 增强：长超时、心跳检测、预热、友好报错
+- 本地推理模式：探测服务端并行槽位、keep-alive 保持模型常驻、服务饱和时合并短请求（见 batching.py）
 """
 
 from __future__ import annotations
 
-import requests
+import os
+import threading
+from typing import Optional
 
+from .batching import PromptBatcher
 from .openai_compatible import OpenAICompatibleClient
 from core.exceptions import LocalModelError
 from core.logger import get_logger
@@ -37,6 +41,89 @@ class LocalModelClient(OpenAICompatibleClient):
 
         self._warmed_up = False
         self._service_checked = False
+        self._batcher: Optional[PromptBatcher] = None
+        self._slots_lock = threading.Lock()
+        self._ready_lock = threading.Lock()
+
+    @property
+    def batch_size(self) -> int:
+        """服务饱和时最多合并的短请求数"""
+        return max(1, self.ai_config.local_batch_size)
+
+    @property
+    def parallel_slots(self) -> int:
+        """服务端并行槽位数（预热时探测；探测前或探测不到时使用配置的并发数，读取时不访问网络）"""
+        batcher = self._batcher
+        return batcher.slots if batcher is not None else self._max_concurrency
+
+    def _get_batcher(self) -> PromptBatcher:
+        """获取批处理器（首次调用时探测槽位数并创建）"""
+        with self._slots_lock:
+            if self._batcher is None:
+                discovered = self._discover_parallel_slots()
+                slots = min(discovered or self._max_concurrency, self._max_concurrency)
+                self._batcher = PromptBatcher(
+                    super().generate, slots=slots, max_parts=self.batch_size
+                )
+                logger.info_i18n(
+                    "log.local_model_slots",
+                    slots=slots,
+                    discovered=discovered or "-",
+                    batch_size=self.batch_size,
+                )
+            return self._batcher
+
+    @property
+    def max_concurrency(self) -> int:
+        """调度器并发数：槽位数 × 合并数（等待槽位的请求足够多时才能合并）"""
+        return self.parallel_slots * self.batch_size
+
+    @property
+    def supports_streaming(self) -> bool:
+        # 合并请求需要完整响应才能拆分，批处理模式下不使用流式输出
+        return self.batch_size <= 1 and super().supports_streaming
+
+    def _root_url(self) -> str:
+        """服务根地址（去掉 /v1）"""
+        return self._normalize_base_url()[: -len("/v1")]
+
+    def _discover_parallel_slots(self) -> Optional[int]:
+        """探测服务端并行槽位数
+
+        - Ollama：服务在本机时读取 OLLAMA_NUM_PARALLEL（API 不提供该信息）
+        - llama.cpp server：GET /props 返回 total_slots
+
+        Returns:
+            槽位数，探测不到时返回 None
+        """
+        if self.provider_name == "ollama":
+            value = os.environ.get("OLLAMA_NUM_PARALLEL", "").strip()
+            if value.isdigit() and int(value) > 0 and self._is_local_base_url(self._root_url()):
+                return int(value)
+            return None
+
+        from core.http_client import get_http_client
+
+        try:
+            response = get_http_client().get(
+                f"{self._root_url()}/props", timeout=self.HEALTH_CHECK_TIMEOUT, retries=0
+            )
+            if response.status_code == 200:
+                slots = response.json().get("total_slots")
+                if isinstance(slots, int) and slots > 0:
+                    return slots
+        except Exception as e:
+            logger.debug_i18n("log.local_model_service_check_error", error=str(e))
+        return None
+
+    def _extra_body(self) -> Optional[dict]:
+        """keep-alive：请求结束后模型保持加载，避免视频之间重新加载模型"""
+        seconds = self.ai_config.keep_alive_seconds
+        if self.provider_name == "ollama":
+            return {"keep_alive": seconds}
+        if self.provider_name == "lm_studio":
+            return {"ttl": seconds}
+        return None
 
     def _normalize_base_url(self) -> str:
         """
@@ -51,10 +138,17 @@ class LocalModelClient(OpenAICompatibleClient):
 
     def _check_service_available(self) -> bool:
         """检查本地模型服务是否可用（心跳）"""
+        import requests  # 延迟导入：只有本地模型才需要，避免拖慢 CLI 启动
+
+        from core.http_client import get_http_client
+
         check_url = f"{self._normalize_base_url()}/models"  # GET /v1/models
 
         try:
-            response = requests.get(check_url, timeout=self.HEALTH_CHECK_TIMEOUT)
+            # 心跳不做传输层重试：服务未启动时应尽快返回
+            response = get_http_client().get(
+                check_url, timeout=self.HEALTH_CHECK_TIMEOUT, retries=0
+            )
             return response.status_code == 200
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             logger.warning_i18n("log.local_model_not_running")
@@ -71,6 +165,7 @@ class LocalModelClient(OpenAICompatibleClient):
             original_timeout = self.ai_config.timeout_seconds
             self.ai_config.timeout_seconds = self.WARMUP_TIMEOUT
 
+            self._preload_model()
             super().generate("Hi", max_tokens=5)
 
             self.ai_config.timeout_seconds = original_timeout
@@ -83,14 +178,40 @@ class LocalModelClient(OpenAICompatibleClient):
 
         self._warmed_up = True
 
-    def generate(self, prompt: str, **kwargs):
-        """生成文本：首次调用时进行服务检查和预热"""
-        if not self._service_checked:
-            if not self._check_service_available():
-                raise LocalModelError()
-            self._service_checked = True
-
-        if not self._warmed_up:
-            self._warmup()
+    def _preload_model(self) -> None:
+        """Ollama：通过原生接口加载模型并设置 keep-alive（OpenAI 兼容接口不一定支持 keep_alive）"""
+        if self.provider_name != "ollama":
+            return
+        from core.http_client import get_http_client
+
+        get_http_client().session(retries=0).post(
+            f"{self._root_url()}/api/generate",
+            json={"model": self.ai_config.model, "keep_alive": self.ai_config.keep_alive_seconds},
+            timeout=self.WARMUP_TIMEOUT,
+        )
+
+    def _ensure_ready(self) -> None:
+        """首次调用时进行服务检查和预热（并发的首批请求只预热一次）"""
+        if self._service_checked and self._warmed_up:
+            return
+        with self._ready_lock:
+            if not self._service_checked:
+                if not self._check_service_available():
+                    raise LocalModelError()
+                self._service_checked = True
+
+            if not self._warmed_up:
+                self._warmup()
+
+            # 探测槽位数并创建批处理器（只在这里访问服务端，之后 parallel_slots 直接读缓存）
+            self._get_batcher()
 
-        return super().generate(prompt, **kwargs)
+    def generate(self, prompt: str, **kwargs):
+        """生成文本：首次调用时进行服务检查和预热，按槽位限流并在服务饱和时合并短请求"""
+        self._ensure_ready()
+        return self._get_batcher().generate(prompt, **kwargs)
+
+    def generate_stream(self, prompt: str, **kwargs):
+        """流式生成文本：首次调用时进行服务检查和预热"""
+        self._ensure_ready()
+        return super().generate_stream(prompt, **kwargs)
@@ -15,13 +15,34 @@ import time
 from typing import Optional, Sequence
 
 from config.manager import AIConfig
-from core.llm_client import LLMResult, LLMUsage, LLMException, LLMErrorType
+from core.llm_client import LLMResult, LLMStream, LLMUsage, LLMException, LLMErrorType
 from core.logger import get_logger, translate_exception
+from core.profiler import traced
 from core.llm_client import load_api_key
+from .base import get_capabilities
+from .streaming import open_stream
 
 logger = get_logger()
 
 
+def _usage_from_response(usage) -> LLMUsage:
+    """转换 OpenAI 兼容接口的 usage（含自动前缀缓存命中的 token 数）
+
+    OpenAI 在 prompt_tokens_details.cached_tokens 中返回，DeepSeek 在 prompt_cache_hit_tokens 中返回；
+    两种缓存都要求前缀逐字节相同，所以静态指令作为 system 消息放在最前面。
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached is None:
+        cached = getattr(usage, "prompt_cache_hit_tokens", None)
+    return LLMUsage(
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        total_tokens=usage.total_tokens,
+        cached_tokens=cached,
+    )
+
+
 class OpenAICompatibleClient:
     """OpenAI 兼容客户端实现"""
 
@@ -72,9 +93,10 @@ class OpenAICompatibleClient:
             or "gpt-4-vision" in model_lower
         )
 
-        # Token 限制（保守估计，可根据实际模型调整）
-        self._max_input_tokens = 128000  # 默认值，可通过配置覆盖
-        self._max_output_tokens = 4096  # 默认值，可通过配置覆盖
+        # Token 限制（按供应商能力配置，本地模型的上下文窗口远小于云端模型）
+        capabilities = get_capabilities(self.provider_name)
+        self._max_input_tokens = capabilities.context_window
+        self._max_output_tokens = capabilities.max_tokens
         self._max_concurrency = ai_config.max_concurrency
 
         # 创建 Semaphore 用于并发限流
@@ -96,6 +118,10 @@ class OpenAICompatibleClient:
     def max_concurrency(self) -> int:
         return self._max_concurrency
 
+    @property
+    def supports_streaming(self) -> bool:
+        return self.ai_config.stream and get_capabilities(self.provider_name).supports_streaming
+
     def _check_dependencies(self) -> None:
         """检查依赖库是否已安装"""
         try:
@@ -106,6 +132,10 @@ class OpenAICompatibleClient:
                 LLMErrorType.UNKNOWN,
             )
 
+    def _extra_body(self) -> Optional[dict]:
+        """附加到请求体的供应商扩展参数（子类覆盖，如本地模型的 keep-alive）"""
+        return None
+
     def _is_local_base_url(self, base_url: Optional[str]) -> bool:
         """检测是否为本地服务 URL
 
@@ -131,6 +161,7 @@ class OpenAICompatibleClient:
         base_url_lower = base_url.lower()
         return any(pattern in base_url_lower for pattern in local_patterns)
 
+    @traced("llm.generate")
     def generate(
         self,
         prompt: str,
@@ -181,6 +212,7 @@ class OpenAICompatibleClient:
                             ),
                             temperature=temperature or 0.3,
                             stop=stop,
+                            extra_body=self._extra_body(),
                         )
 
                     # 提取结果
@@ -189,11 +221,8 @@ class OpenAICompatibleClient:
                     # 提取使用统计
                     usage = None
                     if response.usage:
-                        usage = LLMUsage(
-                            prompt_tokens=response.usage.prompt_tokens,
-                            completion_tokens=response.usage.completion_tokens,
-                            total_tokens=response.usage.total_tokens,
-                        )
+                        usage = _usage_from_response(response.usage)
+                        self._log_cache_hit(usage)
 
                     elapsed = time.time() - start_time
                     logger.debug(
@@ -316,3 +345,128 @@ class OpenAICompatibleClient:
                 ),
                 LLMErrorType.UNKNOWN,
             )
+
+    def _log_cache_hit(self, usage: LLMUsage) -> None:
+        if usage.cached_tokens:
+            logger.debug_i18n(
+                "log.ai_prompt_cache_hit",
+                provider=self.provider_name.capitalize(),
+                cached=usage.cached_tokens,
+                prompt=usage.prompt_tokens,
+            )
+
+    def _map_error(self, e: Exception) -> LLMException:
+        """将 openai SDK 异常映射为 LLMException（分类与 generate 一致）"""
+        from openai import (
+            APIConnectionError,
+            APIError,
+            AuthenticationError,
+            RateLimitError,
+        )
+
+        provider = self.provider_name.capitalize()
+        if isinstance(e, RateLimitError):
+            return LLMException(
+                translate_exception("exception.ai_rate_limit", provider=provider, error=str(e)),
+                LLMErrorType.RATE_LIMIT,
+            )
+        if isinstance(e, AuthenticationError):
+            return LLMException(
+                translate_exception("exception.ai_auth_failed_prefix", provider=provider, error=str(e)),
+                LLMErrorType.AUTH,
+            )
+        if isinstance(e, APIConnectionError):
+            return LLMException(
+                translate_exception("exception.ai_network_failed_prefix", provider=provider, error=str(e)),
+                LLMErrorType.NETWORK,
+            )
+        if isinstance(e, APIError):
+            error_msg = str(e).lower()
+            if any(
+                keyword in error_msg
+                for keyword in ["content", "safety", "policy", "violation"]
+            ):
+                return LLMException(
+                    translate_exception("exception.ai_content_filter", provider=provider, error=str(e)),
+                    LLMErrorType.CONTENT,
+                )
+            return LLMException(
+                translate_exception("exception.ai_error_prefix", provider=provider, error=str(e)),
+                LLMErrorType.UNKNOWN,
+            )
+        return LLMException(
+            translate_exception("exception.ai_unknown_error_prefix", provider=provider, error=str(e)),
+            LLMErrorType.UNKNOWN,
+        )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop: Optional[Sequence[str]] = None,
+    ) -> LLMStream:
+        """流式调用 OpenAI 兼容 API
+
+        连接建立阶段按 max_retries 重试；返回的 LLMStream 持有并发名额，
+        迭代结束或 close() 时释放，close() 会立即断开 HTTP 连接。
+        """
+        import openai
+
+        base_url = self.ai_config.base_url or "https://api.openai.com/v1"
+        client = openai.OpenAI(
+            api_key=self.api_key,
+            base_url=base_url,
+            timeout=self.ai_config.timeout_seconds,
+        )
+
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        request = dict(
+            model=self.ai_config.model,
+            messages=messages,
+            max_tokens=min(max_tokens or self.max_output_tokens, self.max_output_tokens),
+            temperature=temperature or 0.3,
+            stop=stop,
+            stream=True,
+            extra_body=self._extra_body(),
+        )
+        # 只有 OpenAI 官方确定支持 stream_options，兼容服务可能拒绝未知参数
+        if "api.openai.com" in base_url:
+            request["stream_options"] = {"include_usage": True}
+
+        response, release = open_stream(
+            lambda: client.chat.completions.create(**request),
+            self._map_error,
+            self._sem,
+            self.ai_config.max_retries,
+        )
+        stream = LLMStream(provider=self.provider_name, model=self.ai_config.model)
+
+        def deltas():
+            try:
+                for chunk in response:
+                    if getattr(chunk, "usage", None):
+                        stream.usage = _usage_from_response(chunk.usage)
+                        self._log_cache_hit(stream.usage)
+                    if chunk.choices:
+                        yield chunk.choices[0].delta.content or ""
+            except Exception as e:
+                # close() 断开连接导致的异常属于正常中止
+                if not stream.closed:
+                    raise self._map_error(e)
+            finally:
+                release()
+
+        def close():
+            try:
+                response.close()
+            finally:
+                release()
+
+        return stream.attach(deltas(), close)
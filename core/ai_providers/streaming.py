@@ -0,0 +1,68 @@
+"""
+流式调用的公共逻辑
+
+各供应商的 generate_stream 共用：获取并发名额、建立连接（失败时指数退避重试）、只释放一次名额。
+"""
+
+import threading
+import time
+from typing import Any, Callable, Tuple
+
+from core.llm_client import LLMErrorType, LLMException
+from core.logger import get_logger
+
+logger = get_logger()
+
+# 建立连接阶段可重试的错误类型（开始输出后不再重试）
+RETRYABLE_STREAM_ERRORS = (LLMErrorType.RATE_LIMIT, LLMErrorType.NETWORK)
+
+
+def _release_once(semaphore: threading.Semaphore) -> Callable[[], None]:
+    """返回只会释放一次信号量的函数（迭代结束和 close() 都可能调用）"""
+    lock = threading.Lock()
+    released = [False]
+
+    def release() -> None:
+        with lock:
+            if released[0]:
+                return
+            released[0] = True
+        semaphore.release()
+
+    return release
+
+
+def open_stream(
+    open_fn: Callable[[], Any],
+    map_error: Callable[[Exception], LLMException],
+    semaphore: threading.Semaphore,
+    max_retries: int,
+) -> Tuple[Any, Callable[[], None]]:
+    """获取并发名额并建立流式连接
+
+    Args:
+        open_fn: 发起流式请求的函数，返回供应商的流对象
+        map_error: 将供应商异常映射为 LLMException
+        semaphore: 供应商的并发限流信号量
+        max_retries: 最大重试次数
+
+    Returns:
+        (供应商流对象, 释放并发名额的函数)
+
+    Raises:
+        LLMException: 连接失败且不可重试或重试耗尽
+    """
+    max_retries = max(0, max_retries)
+    for attempt in range(max_retries + 1):
+        semaphore.acquire()
+        try:
+            return open_fn(), _release_once(semaphore)
+        except Exception as e:
+            semaphore.release()
+            error = e if isinstance(e, LLMException) else map_error(e)
+            if attempt < max_retries and error.error_type in RETRYABLE_STREAM_ERRORS:
+                wait_time = 2**attempt
+                logger.warning_i18n("log.ai_retry_error", wait_time=wait_time)
+                time.sleep(wait_time)
+                continue
+            raise error
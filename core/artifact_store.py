@@ -0,0 +1,183 @@
+"""
+阶段间产物存储
+
+翻译、摘要等阶段产出的文本保存在内存中随 StageData 传递，下游阶段直接读取，
+不再经过“写临时文件 → fsync → 再读回解码”的往返：
+- 以文件路径为键（路径即该产物在临时目录中的位置），调用方仍然传递 Path
+- write_text 只写内存；读取时内存未命中才读磁盘，读到的内容同样缓存
+- 总内存超过上限时按 LRU 淘汰：尚未落盘的产物写到自己的临时路径（spill），已落盘的直接丢弃
+- 视频处理完成后按临时目录释放
+
+断点续传状态（ChunkTracker、manifest）仍由各自模块即时写盘，不经过这里。
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+# 默认内存上限（MB）
+DEFAULT_MAX_MEMORY_MB = 256
+
+
+@dataclass
+class _Artifact:
+    text: str
+    size: int
+    on_disk: bool  # 内容是否已在磁盘上（读入的缓存或已 spill）
+
+
+class ArtifactStore:
+    """带内存上限和 LRU 落盘的产物存储（线程安全）"""
+
+    def __init__(self, max_memory_mb: float = DEFAULT_MAX_MEMORY_MB):
+        """初始化
+
+        Args:
+            max_memory_mb: 内存上限（MB），超过后按 LRU 落盘/丢弃
+        """
+        self.max_bytes = int(max(0, max_memory_mb) * 1024 * 1024)
+        self._entries: "OrderedDict[str, _Artifact]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(Path(path))
+
+    @staticmethod
+    def _size(text: str) -> int:
+        # 按 UTF-8 编码后的大小估算（与落盘大小一致）
+        return len(text.encode("utf-8", errors="ignore"))
+
+    def write_text(self, path: Path, text: str) -> Path:
+        """保存产物（只写内存，内存不足时才落盘）
+
+        Args:
+            path: 产物路径（落盘时写到这里）
+            text: 文本内容
+
+        Returns:
+            产物路径
+        """
+        path = Path(path)
+        with self._lock:
+            self._store(self._key(path), _Artifact(text, self._size(text), on_disk=False))
+            self._evict()
+        return path
+
+    def read_text(self, path: Path) -> str:
+        """读取产物（内存未命中时读磁盘并缓存）
+
+        Raises:
+            OSError / UnicodeDecodeError: 内存中没有且读取磁盘失败（与 Path.read_text 一致）
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.text
+            self.misses += 1
+
+        text = Path(path).read_text(encoding="utf-8")
+        with self._lock:
+            if key not in self._entries:
+                self._store(key, _Artifact(text, self._size(text), on_disk=True))
+                self._evict()
+        return text
+
+    def exists(self, path: Optional[Path]) -> bool:
+        """产物是否存在（内存中或磁盘上）"""
+        if not path:
+            return False
+        with self._lock:
+            if self._key(path) in self._entries:
+                return True
+        return Path(path).exists()
+
+    def is_pending(self, path: Optional[Path]) -> bool:
+        """产物是否只在内存中（尚未落盘）"""
+        if not path:
+            return False
+        with self._lock:
+            entry = self._entries.get(self._key(path))
+            return entry is not None and not entry.on_disk
+
+    def spill(self, path: Path) -> Path:
+        """确保产物已落盘到自己的路径（供只接受文件路径的调用方使用）"""
+        with self._lock:
+            entry = self._entries.get(self._key(path))
+            if entry is not None and not entry.on_disk:
+                self._write(Path(path), entry)
+        return Path(path)
+
+    def discard(self, directory: Optional[Path], spill: bool = False) -> None:
+        """释放某个目录下的全部产物（视频处理完成、临时目录清理前调用）
+
+        Args:
+            directory: 视频的临时目录
+            spill: 是否先把尚未落盘的产物写到磁盘（保留中间结果供重跑续传）
+        """
+        if not directory:
+            return
+        directory = Path(directory)
+        with self._lock:
+            for key in [k for k in self._entries if directory in Path(k).parents]:
+                entry = self._entries.pop(key)
+                self._bytes -= entry.size
+                if spill and not entry.on_disk:
+                    try:
+                        self._write(Path(key), entry)
+                    except OSError as e:
+                        logger.warning_i18n("log.artifact_spill_failed", path=key, error=str(e))
+
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中/落盘次数及当前内存占用"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "spills": self.spills,
+            }
+
+    def _store(self, key: str, entry: _Artifact) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+    def _write(self, path: Path, entry: _Artifact) -> None:
+        """把内存中的产物写到磁盘（临时文件，不 fsync）"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(entry.text, encoding="utf-8")
+        entry.on_disk = True
+        self.spills += 1
+
+    def _evict(self) -> None:
+        """超出内存上限时按 LRU 淘汰（最近写入的产物保留在内存中）"""
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = next(iter(self._entries.items()))
+            if not entry.on_disk:
+                try:
+                    self._write(Path(key), entry)
+                    logger.debug(f"产物内存超出上限，落盘: {key}")
+                except OSError as e:
+                    # 落盘失败时保留在内存中，避免丢失产物
+                    logger.warning_i18n("log.artifact_spill_failed", path=key, error=str(e))
+                    self._entries.move_to_end(key)
+                    return
+            del self._entries[key]
+            self._bytes -= entry.size
@@ -4,7 +4,7 @@
 """
 
 import threading
-from typing import Optional
+from typing import Optional, Callable, List
 
 
 class CancelToken:
@@ -31,6 +31,8 @@ class CancelToken:
         self._cancelled = False
         self._lock = threading.Lock()
         self._reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
 
     def cancel(self, reason: Optional[str] = None) -> None:
         """取消操作
@@ -39,8 +41,18 @@ class CancelToken:
             reason: 取消原因（可选）
         """
         with self._lock:
+            already_cancelled = self._cancelled
             self._cancelled = True
             self._reason = reason
+            self._event.set()
+            callbacks = [] if already_cancelled else list(self._callbacks)
+
+        # 在锁外执行回调，避免回调中再次访问令牌时死锁
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
 
     def is_cancelled(self) -> bool:
         """检查是否已取消
@@ -60,8 +72,49 @@ class CancelToken:
         with self._lock:
             return self._reason
 
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """阻塞等待取消信号
+
+        可替代 ``time.sleep``：取消时立即唤醒，而不是等到睡眠结束。
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示无限等待
+
+        Returns:
+            如果已取消返回 True，超时返回 False
+        """
+        return self._event.wait(timeout)
+
+    def register_callback(self, callback: Callable[[], None]) -> None:
+        """注册取消回调
+
+        回调在 ``cancel()`` 调用时执行（只执行一次）；如果注册时已取消，立即执行。
+        用于唤醒阻塞在队列/条件变量上的线程。
+
+        Args:
+            callback: 无参回调函数
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def unregister_callback(self, callback: Callable[[], None]) -> None:
+        """注销取消回调
+
+        Args:
+            callback: 之前注册的回调函数
+        """
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
     def reset(self) -> None:
         """重置取消状态（谨慎使用，主要用于测试）"""
         with self._lock:
             self._cancelled = False
             self._reason = None
+            self._event.clear()
@@ -5,16 +5,117 @@
 
 import json
 import subprocess
-from typing import Optional
+import sys
+import time
+from typing import Any, Dict, List, Optional
 
 from core.models import DetectionResult, VideoInfo
+from core.language import LanguageConfig
+from core.language_utils import lang_matches, SOURCE_LANGUAGE_PRIORITY
 from core.logger import get_logger, translate_exception
 from core.exceptions import AppException, ErrorType
 from core.fetcher import _map_ytdlp_error_to_app_error
-from core.subprocess_utils import run_command
+from core.subprocess_utils import run_ytdlp_command
 
 logger = get_logger()
 
+# 预取的字幕信息有效期（秒）：字幕 URL 带签名会过期，超过该时间重新检测
+PREFETCH_MAX_AGE_SECONDS = 3 * 3600
+
+
+# 直接从 URL 下载字幕时优先使用的格式（与 SubtitleDownloader._find_subtitle_url 一致）
+PREFERRED_SUBTITLE_EXTS = ("srt", "vtt", "srv3", "json3")
+
+
+def compact_tracks(tracks: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """每种语言只保留下载时会使用的那一个格式，且只保留 ext / url 字段
+
+    yt-dlp 为每种语言返回约 6 种格式（带签名的长 URL 及 name / protocol 等字段），
+    而直接下载只会使用第一个偏好格式（没有时使用第一个）
+
+    Args:
+        tracks: yt-dlp 的 subtitles / automatic_captions 字典
+
+    Returns:
+        {语言代码（已 intern）: [{"ext": ..., "url": ...}]}
+    """
+    compact = {}
+    for lang_code, entries in tracks.items():
+        if not entries:
+            continue
+        chosen = next(
+            (e for e in entries if e.get("ext") in PREFERRED_SUBTITLE_EXTS and e.get("url")),
+            entries[0],
+        )
+        compact[sys.intern(lang_code)] = [
+            {"ext": sys.intern(chosen.get("ext") or "vtt"), "url": chosen.get("url")}
+        ]
+    return compact
+
+
+def relevant_languages(language_config: LanguageConfig) -> List[str]:
+    """与语言配置相关的语言（指定源语言、目标语言、自动选择源语言的优先级列表）"""
+    languages = list(language_config.subtitle_target_languages)
+    if language_config.source_language:
+        languages.append(language_config.source_language)
+    languages.extend(SOURCE_LANGUAGE_PRIORITY)
+    return languages
+
+
+def compact_detection_result(
+    result: DetectionResult,
+    language_config: LanguageConfig,
+    video_url: Optional[str] = None,
+) -> DetectionResult:
+    """只保留与语言配置相关的字幕轨道（原地修改）
+
+    保留的语言：目标语言、指定源语言、源语言优先级列表，以及第一条人工/自动字幕
+    （自动选择源语言时的兜底）。语言列表 manual_languages / auto_languages 保持完整，
+    源语言选择逻辑不受影响；下载需要其他语言的 URL 时通过 video_url 重新获取。
+
+    Args:
+        result: 检测结果
+        language_config: 语言配置
+        video_url: 视频 URL（用于按需重新获取完整列表）
+
+    Returns:
+        同一个 DetectionResult
+    """
+    wanted = relevant_languages(language_config)
+
+    def keep(tracks: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        first = next(iter(tracks), None)
+        return {
+            lang: entries
+            for lang, entries in tracks.items()
+            if lang == first or any(lang_matches(lang, w) for w in wanted)
+        }
+
+    result.subtitle_urls = keep(result.subtitle_urls)
+    result.auto_subtitle_urls = keep(result.auto_subtitle_urls)
+    result.compact = True
+    result.video_url = video_url
+    return result
+
+
+def project_subtitle_info(data: Dict[str, Any]) -> Dict[str, Any]:
+    """从 yt-dlp --dump-json 的 info_dict 中提取检测所需的字段
+
+    字幕轨道经 compact_tracks 精简（每种语言一个格式）
+
+    Args:
+        data: yt-dlp info_dict
+
+    Returns:
+        {"subtitles", "automatic_captions", "chapters", "fetched_at"}
+    """
+    return {
+        "subtitles": compact_tracks(data.get("subtitles") or {}),
+        "automatic_captions": compact_tracks(data.get("automatic_captions") or {}),
+        "chapters": data.get("chapters") or [],  # 添加章节信息
+        "fetched_at": time.time(),
+    }
+
 
 class SubtitleDetector:
     """字幕检测器
@@ -32,11 +133,14 @@ class SubtitleDetector:
         self.yt_dlp_path = yt_dlp_path or "yt-dlp"
         self.cookie_manager = cookie_manager
 
-    def detect(self, video_info: VideoInfo) -> DetectionResult:
+    def detect(
+        self, video_info: VideoInfo, language_config: Optional[LanguageConfig] = None
+    ) -> DetectionResult:
         """检测视频字幕情况
 
         Args:
             video_info: 视频信息对象
+            language_config: 语言配置（可选），提供时返回只保留相关字幕轨道的紧凑结果
 
         Returns:
             DetectionResult 对象，包含字幕检测结果
@@ -44,8 +148,10 @@ class SubtitleDetector:
         try:
             logger.info_i18n("detect_subtitle_start", video_id=video_info.video_id)
 
-            # 使用 yt-dlp 获取字幕信息
-            subtitle_info = self._get_subtitle_info_ytdlp(video_info.url)
+            # 优先使用获取视频信息时预取的字幕信息，否则调用 yt-dlp 获取
+            subtitle_info = self._take_prefetched(video_info)
+            if subtitle_info is None:
+                subtitle_info = self._get_subtitle_info_ytdlp(video_info.url)
 
             if subtitle_info is None:
                 logger.warning_i18n(
@@ -72,14 +178,15 @@ class SubtitleDetector:
             # 提取人工字幕语言（标准化语言代码）
             from core.language import normalize_language_code
 
+            # 语言代码 intern：批量处理时所有视频共享同一组字符串
             for lang_code in subtitles.keys():
-                normalized_lang = normalize_language_code(lang_code)
+                normalized_lang = sys.intern(normalize_language_code(lang_code))
                 if normalized_lang not in manual_languages:
                     manual_languages.append(normalized_lang)
 
             # 提取自动字幕语言（标准化语言代码）
             for lang_code in automatic_captions.keys():
-                normalized_lang = normalize_language_code(lang_code)
+                normalized_lang = sys.intern(normalize_language_code(lang_code))
                 if normalized_lang not in auto_languages:
                     auto_languages.append(normalized_lang)
 
@@ -97,6 +204,8 @@ class SubtitleDetector:
                 subtitle_urls=subtitles,  # 保存原始字幕 URL 信息
                 auto_subtitle_urls=automatic_captions,  # 保存原始自动字幕 URL 信息
             )
+            if language_config is not None:
+                compact_detection_result(result, language_config, video_info.url)
 
             if has_subtitles:
                 logger.info_i18n(
@@ -147,6 +256,23 @@ class SubtitleDetector:
             )
             raise app_error
 
+    @staticmethod
+    def _take_prefetched(video_info: VideoInfo) -> Optional[dict]:
+        """取出预取的字幕信息（取出后从 VideoInfo 上释放，过期则丢弃）"""
+        info = getattr(video_info, "prefetched_subtitle_info", None)
+        if info is None:
+            return None
+        video_info.prefetched_subtitle_info = None
+        age = time.time() - info.get("fetched_at", 0)
+        if age > PREFETCH_MAX_AGE_SECONDS:
+            logger.debug(
+                f"Prefetched subtitle info expired ({age:.0f}s), re-detecting",
+                video_id=video_info.video_id,
+            )
+            return None
+        logger.debug_i18n("log.detect_using_prefetched", video_id=video_info.video_id)
+        return info
+
     def _get_subtitle_info_ytdlp(self, url: str) -> Optional[dict]:
         """使用 yt-dlp 获取字幕信息
 
@@ -180,7 +306,7 @@ class SubtitleDetector:
 
             cmd.append(url)
 
-            result = run_command(cmd, timeout=60)
+            result = run_ytdlp_command(cmd, timeout=60)
 
             if result.returncode != 0:
                 # 将 yt-dlp 错误映射为 AppException
@@ -200,13 +326,7 @@ class SubtitleDetector:
             data = json.loads(result.stdout)
 
             # 提取字幕信息和章节
-            subtitle_info = {
-                "subtitles": data.get("subtitles", {}),
-                "automatic_captions": data.get("automatic_captions", {}),
-                "chapters": data.get("chapters", []),  # 添加章节信息
-            }
-
-            return subtitle_info
+            return project_subtitle_info(data)
 
         except subprocess.TimeoutExpired:
             app_error = AppException(
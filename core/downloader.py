@@ -6,7 +6,7 @@
 
 import subprocess
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 from core.models import VideoInfo, DetectionResult
 from core.language import LanguageConfig
@@ -14,9 +14,9 @@ from core.logger import get_logger, translate_log
 from core.exceptions import AppException, ErrorType
 from core.fetcher import _map_ytdlp_error_to_app_error
 from core.failure_logger import _atomic_write
-from core.language_utils import lang_matches
+from core.language_utils import lang_matches, SOURCE_LANGUAGE_PRIORITY
 from core.chinese_detector import is_chinese_lang, normalize_chinese_lang_code
-from core.subprocess_utils import run_command
+from core.subprocess_utils import run_ytdlp_command
 from core.subtitle_format import (
     convert_vtt_to_srt,
     convert_json3_to_srt,
@@ -374,22 +374,6 @@ class SubtitleDownloader:
         Returns:
             语言代码，如果没有字幕则返回 None
         """
-        # 定义优先级列表（按使用人数排序）
-        PRIORITY_LANGUAGES = [
-            "en",
-            "zh-CN",
-            "ja",
-            "de",
-            "fr",
-            "es",
-            "ru",
-            "pt",
-            "ko",
-            "it",
-            "ar",
-            "hi",
-        ]
-
         # 如果指定了源语言
         if language_config.source_language:
             specified_lang = language_config.source_language
@@ -427,7 +411,7 @@ class SubtitleDownloader:
 
         # 自动模式：按优先级匹配
         # 先检查人工字幕（使用 lang_matches 函数支持 zh vs zh-CN 匹配）
-        for priority_lang in PRIORITY_LANGUAGES:
+        for priority_lang in SOURCE_LANGUAGE_PRIORITY:
             for detected_lang in detection_result.manual_languages:
                 if lang_matches(detected_lang, priority_lang):
                     logger.debug_i18n(
@@ -440,7 +424,7 @@ class SubtitleDownloader:
                     return detected_lang  # 返回实际检测到的语言代码
 
         # 再检查自动字幕
-        for priority_lang in PRIORITY_LANGUAGES:
+        for priority_lang in SOURCE_LANGUAGE_PRIORITY:
             for detected_lang in detection_result.auto_languages:
                 if lang_matches(detected_lang, priority_lang):
                     logger.debug_i18n(
@@ -474,33 +458,17 @@ class SubtitleDownloader:
 
         return None
 
-    def _download_subtitle_from_url(
-        self,
-        detection_result: DetectionResult,
-        lang_code: str,
-        output_dir: Path,
-        output_filename: str,
-    ) -> Optional[Path]:
-        """直接从检测结果中的 URL 下载字幕（备用方案）
-        
-        当 yt-dlp 的 --write-subs 无法工作时，直接从字幕 URL 下载。
-        
-        Args:
-            detection_result: 检测结果（包含字幕 URL）
-            lang_code: 语言代码
-            output_dir: 输出目录
-            output_filename: 输出文件名
-            
+    def _find_subtitle_url(
+        self, detection_result: DetectionResult, lang_code: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """在检测结果中查找指定语言的字幕 URL（人工字幕优先）
+
         Returns:
-            下载的字幕文件路径，如果失败则返回 None
+            (字幕 URL, 字幕格式)，未找到时为 (None, None)
         """
-        import requests
-        from core.language_utils import lang_matches
-        
-        output_path = output_dir / output_filename
         subtitle_url = None
         subtitle_ext = None
-        
+
         # 先查找人工字幕 URL
         for sub_lang, sub_list in detection_result.subtitle_urls.items():
             if lang_matches(sub_lang, lang_code) and sub_list:
@@ -543,7 +511,76 @@ class SubtitleDownloader:
                             video_id=detection_result.video_id,
                         )
                         break
+
+        return subtitle_url, subtitle_ext
+
+    def _refetch_full_tracks(self, detection_result: DetectionResult) -> bool:
+        """重新获取完整字幕轨道列表（紧凑检测结果的回退路径）
+
+        Returns:
+            是否成功更新检测结果
+        """
+        if not detection_result.video_url:
+            return False
+        from core.detector import SubtitleDetector
+
+        logger.info_i18n(
+            "log.detection_refetch_full_tracks", video_id=detection_result.video_id
+        )
+        try:
+            detector = SubtitleDetector(
+                yt_dlp_path=self.yt_dlp_path, cookie_manager=self.cookie_manager
+            )
+            subtitle_info = detector._get_subtitle_info_ytdlp(detection_result.video_url)
+        except AppException as e:
+            logger.warning_i18n(
+                "log.download_from_url_failed",
+                error=str(e),
+                video_id=detection_result.video_id,
+            )
+            return False
+        if not subtitle_info:
+            return False
+        detection_result.subtitle_urls = subtitle_info.get("subtitles", {})
+        detection_result.auto_subtitle_urls = subtitle_info.get("automatic_captions", {})
+        detection_result.compact = False
+        return True
+
+    def _download_subtitle_from_url(
+        self,
+        detection_result: DetectionResult,
+        lang_code: str,
+        output_dir: Path,
+        output_filename: str,
+    ) -> Optional[Path]:
+        """直接从检测结果中的 URL 下载字幕（备用方案）
         
+        当 yt-dlp 的 --write-subs 无法工作时，直接从字幕 URL 下载。
+        
+        Args:
+            detection_result: 检测结果（包含字幕 URL）
+            lang_code: 语言代码
+            output_dir: 输出目录
+            output_filename: 输出文件名
+            
+        Returns:
+            下载的字幕文件路径，如果失败则返回 None
+        """
+        import requests
+
+        from core.http_client import get_http_client
+
+        output_path = output_dir / output_filename
+
+        subtitle_url, subtitle_ext = self._find_subtitle_url(detection_result, lang_code)
+
+        # 紧凑检测结果只保留了相关语言的字幕轨道，找不到时按需重新获取完整列表
+        if not subtitle_url and detection_result.compact:
+            if self._refetch_full_tracks(detection_result):
+                subtitle_url, subtitle_ext = self._find_subtitle_url(
+                    detection_result, lang_code
+                )
+
         if not subtitle_url:
             logger.warning_i18n(
                 "log.no_subtitle_url_found",
@@ -552,16 +589,17 @@ class SubtitleDownloader:
             )
             return None
         
-        # 重试逻辑：429 错误时切换代理并延迟重试
+        # 重试逻辑：429 错误时切换代理，并由限速器降低该出口的请求速率
         import time
-        import random
         
+        from core.rate_limiter import get_rate_limiter
+        
+        rate_limiter = get_rate_limiter()
         max_retries = 3
         tried_proxies = set()
         
         for attempt in range(max_retries):
             # 准备代理配置（每次重试获取新代理，排除已尝试的）
-            proxies = None
             current_proxy = None
             if self.proxy_manager:
                 current_proxy = self.proxy_manager.get_next_proxy(
@@ -569,22 +607,20 @@ class SubtitleDownloader:
                 )
                 if current_proxy:
                     tried_proxies.add(current_proxy)
-                    proxies = {"http": current_proxy, "https": current_proxy}
                     logger.debug(f"使用代理下载字幕: {current_proxy[:30]}...")
             
             try:
-                # 添加随机请求间隔，避免触发限流
+                # 按出口身份限速（替代固定的随机睡眠）
+                rate_limiter.acquire(current_proxy)
                 if attempt > 0:
-                    delay = random.uniform(5, 10)  # 重试时延迟更长（5-10秒）
-                    logger.info(f"等待 {delay:.1f}s 后重试 ({attempt + 1}/3)...")
-                    time.sleep(delay)
-                else:
-                    delay = random.uniform(0.5, 1.5)  # 首次请求添加小延迟
-                    time.sleep(delay)
+                    logger.info(f"重试下载字幕 ({attempt + 1}/{max_retries})...")
                 
-                # 下载字幕
-                response = requests.get(subtitle_url, timeout=30, proxies=proxies)
+                # 下载字幕（复用该代理的 keep-alive 连接）
+                request_started = time.perf_counter()
+                response = get_http_client().get(subtitle_url, proxy=current_proxy)
                 response.raise_for_status()
+                latency_ms = (time.perf_counter() - request_started) * 1000
+                rate_limiter.report(current_proxy, throttled=False)
                 
                 content = response.text
                 
@@ -601,9 +637,9 @@ class SubtitleDownloader:
                 with open(output_path, "w", encoding="utf-8") as f:
                     f.write(content)
                 
-                # 标记代理成功
+                # 标记代理成功（记录延迟用于加权选择）
                 if current_proxy and self.proxy_manager:
-                    self.proxy_manager.mark_success(current_proxy)
+                    self.proxy_manager.mark_success(current_proxy, latency_ms=latency_ms)
                 
                 logger.info_i18n(
                     "log.subtitle_downloaded_from_url",
@@ -621,6 +657,7 @@ class SubtitleDownloader:
                         error=str(e),
                         video_id=detection_result.video_id,
                     )
+                    rate_limiter.report(current_proxy, throttled=True)
                     # 标记当前代理失败
                     if current_proxy and self.proxy_manager:
                         self.proxy_manager.mark_failure(current_proxy, "429 Too Many Requests")
@@ -818,7 +855,7 @@ class SubtitleDownloader:
             if not is_auto:
                 cmd.extend(["--write-auto-subs"])  # 同时也尝试自动字幕
 
-            result = run_command(cmd, timeout=60)
+            result = run_ytdlp_command(cmd, timeout=60, cancel_token=cancel_token)
             
             # 调试日志：输出 yt-dlp 的执行结果（使用 DEBUG 级别避免刷屏）
             logger.debug(f"yt-dlp 命令: {' '.join(cmd)}")
@@ -1114,7 +1151,7 @@ class SubtitleDownloader:
             else:
                 cmd.extend(["--write-subs", "--sub-langs", lang_code])
 
-            result = run_command(cmd, timeout=60)
+            result = run_ytdlp_command(cmd, timeout=60)
 
             if result.returncode != 0:
                 logger.error_i18n(
@@ -13,6 +13,7 @@ import threading
 import json
 
 from core.logger import get_logger
+from core.profiler import traced
 from core.exceptions import ErrorType
 
 logger = get_logger()
@@ -59,6 +60,7 @@ def _append_line_safe(file_path: Path, line: str) -> bool:
         return False
 
 
+@traced("file.write")
 def _atomic_write(file_path: Path, content: str, mode: str = "a") -> bool:
     """原子写文件（先写.tmp，成功后rename）
 
@@ -18,7 +18,7 @@ from core.url_parser import (
     extract_video_id as _extract_video_id,
     YOUTUBE_PATTERNS,
 )
-from core.subprocess_utils import run_command, get_subprocess_kwargs
+from core.subprocess_utils import run_command, run_ytdlp_command, get_subprocess_kwargs
 
 # 初始化 logger
 logger = get_logger()
@@ -342,7 +342,7 @@ class VideoFetcher:
 
                 cmd.append(url)
 
-                result = run_command(cmd, timeout=60)
+                result = run_ytdlp_command(cmd, timeout=60)
 
                 if result.returncode != 0:
                     error_msg = result.stderr
@@ -396,6 +396,9 @@ class VideoFetcher:
                 # 解析 JSON
                 data = json.loads(result.stdout)
 
+                # 同一份 info_dict 已包含字幕列表和章节，保留投影供检测阶段直接使用
+                from core.detector import project_subtitle_info
+
                 return VideoInfo(
                     video_id=data.get("id", ""),
                     url=data.get("webpage_url", url),
@@ -405,6 +408,7 @@ class VideoFetcher:
                     duration=data.get("duration"),
                     upload_date=data.get("upload_date"),
                     description=data.get("description"),
+                    prefetched_subtitle_info=project_subtitle_info(data),
                 )
             except subprocess.TimeoutExpired:
                 # 超时错误：标记代理失败并重试
@@ -513,7 +517,7 @@ class VideoFetcher:
 
             cmd.append(channel_url)
 
-            result = run_command(cmd, timeout=120)
+            result = run_ytdlp_command(cmd, timeout=120)
 
             if result.returncode != 0:
                 error_msg = result.stderr
@@ -649,7 +653,7 @@ class VideoFetcher:
 
             cmd.append(playlist_url)
 
-            result = run_command(cmd, timeout=120)
+            result = run_ytdlp_command(cmd, timeout=120)
 
             if result.returncode != 0:
                 error_msg = result.stderr
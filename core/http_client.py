@@ -0,0 +1,184 @@
+"""
+HTTP 客户端层
+统一管理直连 HTTP 请求使用的 requests.Session：
+
+- 按代理 URL 复用 keep-alive 会话，跨视频复用 TCP/TLS 连接（字幕文件下载不再每次重新握手）
+- 连接池大小与阶段并发数对齐（ensure_pool_size），避免 urllib3 "Connection pool is full" 时丢弃连接
+- 共享的传输层重试策略与默认超时：只重试连接错误和 5xx，429 由调用方处理（切换代理 / 限速）
+
+requests 在首次创建会话时才导入，不影响 CLI 启动耗时。
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+# 默认超时（连接, 读取），单位秒
+DEFAULT_TIMEOUT: Tuple[float, float] = (10, 30)
+
+# 默认每个主机的连接池大小（会随阶段并发数增大）
+DEFAULT_POOL_SIZE = 10
+
+# 默认传输层重试次数
+DEFAULT_RETRIES = 2
+
+# 传输层重试的状态码（429 不在其中：需要调用方切换代理或降速）
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# 每个会话缓存的主机连接池数量
+_POOL_CONNECTIONS = 10
+
+_DIRECT = ""  # 直连会话的键
+
+
+class HttpClient:
+    """按代理复用连接的 HTTP 客户端（线程安全）"""
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
+        """初始化 HTTP 客户端
+
+        Args:
+            pool_size: 每个主机的最大连接数
+            retries: 传输层重试次数（连接错误、5xx）
+            timeout: 默认超时（连接, 读取）
+        """
+        self.pool_size = max(1, pool_size)
+        self.retries = max(0, retries)
+        self.timeout = timeout
+        self._sessions: Dict[Tuple[str, int], "requests.Session"] = {}
+        self._lock = threading.Lock()
+
+    def _new_adapter(self, retries: int):
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        return HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+        )
+
+    def session(self, proxy: Optional[str] = None, retries: Optional[int] = None):
+        """获取（必要时创建）指定代理的会话
+
+        Args:
+            proxy: 代理 URL，None 表示直连
+            retries: 传输层重试次数，None 使用默认值（探测类请求可传 0）
+
+        Returns:
+            requests.Session 实例
+        """
+        retries = self.retries if retries is None else max(0, retries)
+        key = (proxy or _DIRECT, retries)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        import requests
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = self._new_adapter(retries)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if proxy:
+                    session.proxies = {"http": proxy, "https": proxy}
+                self._sessions[key] = session
+        return session
+
+    def get(
+        self,
+        url: str,
+        proxy: Optional[str] = None,
+        timeout=None,
+        retries: Optional[int] = None,
+        **kwargs,
+    ):
+        """发送 GET 请求（复用代理对应的连接池）
+
+        Args:
+            url: 请求 URL
+            proxy: 代理 URL，None 表示直连
+            timeout: 超时，None 使用默认值
+            retries: 传输层重试次数，None 使用默认值
+            **kwargs: 传给 requests.Session.get 的其他参数
+
+        Returns:
+            requests.Response
+        """
+        return self.session(proxy, retries).get(
+            url, timeout=timeout or self.timeout, **kwargs
+        )
+
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """确保每个主机的连接池不小于指定大小（通常为网络阶段并发数）
+
+        已创建的会话会换用新的连接池，正在使用的旧连接在请求结束后自然释放
+        """
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = pool_size
+            for (_, retries), session in self._sessions.items():
+                adapter = self._new_adapter(retries)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+        logger.debug(f"HTTP 连接池大小调整为 {pool_size}")
+
+    def close_proxy(self, proxy: Optional[str]) -> None:
+        """关闭指定代理的会话（代理失效时丢弃其中的陈旧连接）"""
+        target = proxy or _DIRECT
+        with self._lock:
+            keys = [key for key in self._sessions if key[0] == target]
+            sessions = [self._sessions.pop(key) for key in keys]
+        for session in sessions:
+            session.close()
+
+    def close(self) -> None:
+        """关闭所有会话"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# 全局单例
+_global_http_client: Optional[HttpClient] = None
+_global_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """获取全局 HTTP 客户端实例（单例模式）
+
+    Returns:
+        HttpClient 实例
+    """
+    global _global_http_client
+
+    if _global_http_client is None:
+        with _global_lock:
+            if _global_http_client is None:
+                _global_http_client = HttpClient()
+    return _global_http_client
@@ -19,11 +19,16 @@ class JsonI18nProvider:
     从 core/i18n/locales/ 目录加载 JSON 翻译文件
     支持 fallback 到英文
 
+    语言文件按需加载：初始化时只加载当前语言，
+    英文 fallback 在第一次遇到缺失的键时才加载
+
     Attributes:
         translations: 当前语言的翻译字典
         language: 当前语言代码
     """
 
+    FALLBACK_LANGUAGE = "en-US"
+
     def __init__(self, locale_dir: Path, lang_code: str = "en-US"):
         """初始化 JSON Provider
 
@@ -34,6 +39,7 @@ class JsonI18nProvider:
         self.locale_dir = locale_dir
         self.language = lang_code
         self.translations: Dict[str, str] = {}
+        self._fallback: Optional[Dict[str, str]] = None
         self._load(lang_code)
 
     def _lang_to_filename(self, lang_code: str) -> str:
@@ -47,36 +53,42 @@ class JsonI18nProvider:
         """
         return lang_code.replace("-", "_") + ".json"
 
+    def _read_locale(self, lang_code: str) -> Dict[str, str]:
+        """读取单个语言文件，失败时返回空字典"""
+        path = self.locale_dir / self._lang_to_filename(lang_code)
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Failed to load translations from {path}: {e}")
+            return {}
+
     def _load(self, lang_code: str) -> None:
         """加载翻译文件
 
-        先加载英文作为 fallback，再用目标语言覆盖
+        只加载目标语言；英文 fallback 由 _get_fallback() 按需加载
 
         Args:
             lang_code: 目标语言代码
         """
-        self.translations.clear()
-
-        # 先加载英文作为 fallback
-        en_path = self.locale_dir / self._lang_to_filename("en-US")
-        if en_path.exists():
-            try:
-                self.translations = json.loads(en_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError) as e:
-                logger.warning(f"Failed to load fallback translations from {en_path}: {e}")
-
-        # 再加载目标语言覆盖
-        if lang_code != "en-US":
-            target_path = self.locale_dir / self._lang_to_filename(lang_code)
-            if target_path.exists():
-                try:
-                    target_trans = json.loads(target_path.read_text(encoding="utf-8"))
-                    self.translations.update(target_trans)
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.warning(f"Failed to load translations from {target_path}: {e}")
-
+        self.translations = self._read_locale(lang_code)
+        self._fallback = self.translations if lang_code == self.FALLBACK_LANGUAGE else None
         self.language = lang_code
 
+    def _get_fallback(self) -> Dict[str, str]:
+        """获取英文 fallback 字典（首次调用时加载）"""
+        if self._fallback is None:
+            self._fallback = self._read_locale(self.FALLBACK_LANGUAGE)
+        return self._fallback
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """查找翻译：当前语言优先，缺失时回退到英文"""
+        text = self.translations.get(key)
+        if text is None:
+            text = self._get_fallback().get(key)
+        return text
+
     def reload(self, lang_code: Optional[str] = None) -> None:
         """重新加载翻译文件
 
@@ -97,7 +109,10 @@ class JsonI18nProvider:
         Returns:
             翻译后的文本
         """
-        return self.translations.get(key, default if default is not None else key)
+        text = self._lookup(key)
+        if text is None:
+            return default if default is not None else key
+        return text
 
     def nget(self, singular: str, plural: str, n: int) -> str:
         """获取复数形式的翻译
@@ -114,7 +129,8 @@ class JsonI18nProvider:
             对应形式的翻译文本
         """
         key = singular if n == 1 else plural
-        return self.translations.get(key, key)
+        text = self._lookup(key)
+        return key if text is None else text
 
     def get_language(self) -> str:
         """获取当前语言代码
@@ -21,6 +21,7 @@ class LanguageConfig:
     - 双语字幕模式
     - 翻译策略
     - 字幕输出格式
+    - 多目标语言合并翻译
     """
 
     ui_language: str = "zh-CN"  # 界面语言，如 "zh-CN" / "en-US"
@@ -38,6 +39,7 @@ class LanguageConfig:
     subtitle_format: Literal["srt", "txt", "both"] = (
         "srt"  # 字幕输出格式：srt（带时间轴）、txt（纯文本）、both（两种都输出）
     )
+    multi_target_translation: bool = False  # 多目标语言时每个 chunk 一次请求翻译所有语言
 
     def to_dict(self) -> dict:
         """转换为字典（用于 JSON 序列化）"""
@@ -48,6 +50,7 @@ class LanguageConfig:
             "bilingual_mode": self.bilingual_mode,
             "translation_strategy": self.translation_strategy,
             "subtitle_format": self.subtitle_format,
+            "multi_target_translation": self.multi_target_translation,
         }
         # 只有当 source_language 不为 None 时才包含（避免保存 None 值）
         if self.source_language is not None:
@@ -94,6 +97,7 @@ class LanguageConfig:
                 "translation_strategy", "OFFICIAL_AUTO_THEN_AI"
             ),
             subtitle_format=data.get("subtitle_format", "srt"),
+            multi_target_translation=data.get("multi_target_translation", False),
         )
 
 
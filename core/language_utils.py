@@ -7,6 +7,22 @@
 
 from typing import List
 
+# 自动选择源语言时的优先级列表（按使用人数排序）
+SOURCE_LANGUAGE_PRIORITY: List[str] = [
+    "en",
+    "zh-CN",
+    "ja",
+    "de",
+    "fr",
+    "es",
+    "ru",
+    "pt",
+    "ko",
+    "it",
+    "ar",
+    "hi",
+]
+
 
 def lang_matches(lang1: str, lang2: str) -> bool:
     """检查两个语言代码是否匹配（考虑主语言代码）
@@ -4,7 +4,10 @@ LLM 客户端抽象接口
 """
 
 import os
-from typing import Protocol, Optional, Sequence
+import threading
+import time
+import weakref
+from typing import Any, Callable, Generic, Iterator, List, Protocol, Optional, Sequence, TypeVar
 from dataclasses import dataclass
 from enum import Enum
 
@@ -34,10 +37,12 @@ class LLMException(Exception):
 class LLMUsage:
     """LLM 使用统计信息"""
 
-    prompt_tokens: Optional[int] = None
+    prompt_tokens: Optional[int] = None  # 输入 token 总数（包含命中缓存的部分）
     completion_tokens: Optional[int] = None
     total_tokens: Optional[int] = None
     estimated_cost_usd: Optional[float] = None
+    cached_tokens: Optional[int] = None  # 输入中命中供应商前缀缓存的 token 数（按折扣计费）
+    cache_write_tokens: Optional[int] = None  # 本次写入前缀缓存的 token 数（Anthropic）
 
 
 @dataclass
@@ -50,6 +55,76 @@ class LLMResult:
     model: Optional[str] = None
 
 
+class LLMStream:
+    """流式生成结果（generate_stream 的返回值）
+
+    迭代得到文本增量；迭代结束后通过 text / usage / to_result() 获取完整结果。
+    close() 可以在其他线程调用（如取消回调），会立即断开底层连接并释放并发名额。
+    启用性能分析时，从创建到接收结束（或 close）记录为一个 llm.generate_stream span。
+    """
+
+    def __init__(self, provider: Optional[str] = None, model: Optional[str] = None):
+        from core.profiler import get_active_profiler
+
+        self.provider = provider
+        self.model = model
+        self.usage: Optional[LLMUsage] = None
+        self.closed = False
+        self._parts: List[str] = []
+        self._deltas: Iterator[str] = iter(())
+        self._close_fn: Optional[Callable[[], None]] = None
+        self._profiler = get_active_profiler()
+        self._started = time.perf_counter()
+
+    def _finish_span(self) -> None:
+        profiler, self._profiler = self._profiler, None
+        if profiler is not None:
+            profiler.record_span(
+                "llm.generate_stream",
+                self._started,
+                time.perf_counter(),
+                {"provider": self.provider, "model": self.model},
+            )
+
+    def attach(
+        self, deltas: Iterator[str], close: Optional[Callable[[], None]] = None
+    ) -> "LLMStream":
+        """绑定供应商的增量迭代器和关闭函数（由供应商实现调用）"""
+        self._deltas = deltas
+        self._close_fn = close
+        return self
+
+    def __iter__(self) -> Iterator[str]:
+        for delta in self._deltas:
+            if delta:
+                self._parts.append(delta)
+                yield delta
+        self._finish_span()
+
+    @property
+    def text(self) -> str:
+        """已接收的完整文本"""
+        return "".join(self._parts)
+
+    def close(self) -> None:
+        """停止接收：断开连接并释放资源（可重复调用）"""
+        if self.closed:
+            return
+        self.closed = True
+        self._finish_span()
+        if self._close_fn:
+            try:
+                self._close_fn()
+            except Exception:
+                pass
+
+    def to_result(self) -> LLMResult:
+        """转换为 LLMResult"""
+        return LLMResult(
+            text=self.text, usage=self.usage, provider=self.provider, model=self.model
+        )
+
+
 class LLMClient(Protocol):
     """LLM 客户端抽象接口
 
@@ -95,6 +170,85 @@ class LLMClient(Protocol):
         ...
 
 
+class StreamingLLMClient(LLMClient, Protocol):
+    """支持流式输出的 LLM 客户端（可选能力）
+
+    在 LLMClient 的基础上额外提供：
+    - supports_streaming: bool - 当前配置下是否启用流式输出
+    - generate_stream() - 返回 LLMStream，调用方可边接收边校验，随时 close() 中止
+    """
+
+    supports_streaming: bool
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop: Optional[Sequence[str]] = None,
+    ) -> LLMStream:
+        """流式生成文本
+
+        参数与 generate 相同。连接建立阶段按配置重试；开始输出后出错直接抛出。
+
+        Returns:
+            LLMStream 对象（持有并发名额，迭代结束或 close() 时释放）
+
+        Raises:
+            LLMException: 当调用失败时抛出，包含错误类型
+        """
+        ...
+
+
+_State = TypeVar("_State")
+
+
+class ClientRegistry(Generic[_State]):
+    """按 LLM 客户端共享的状态（调度器、分块大小、翻译记忆等）
+
+    以客户端为弱引用键：客户端被回收时状态随之释放，不会交给之后创建的新客户端。
+    不支持弱引用（或不可哈希）的客户端不缓存，每次返回新的状态。
+    """
+
+    def __init__(self, factory: Callable[[Any], _State]):
+        """初始化
+
+        Args:
+            factory: 为客户端创建状态的函数 factory(llm)
+        """
+        self._factory = factory
+        self._states: "weakref.WeakKeyDictionary[Any, _State]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, llm: Any) -> _State:
+        """获取（必要时创建）客户端对应的状态"""
+        with self._lock:
+            try:
+                state = self._states.get(llm)
+            except TypeError:
+                return self._factory(llm)
+            if state is None:
+                state = self._factory(llm)
+                self._states[llm] = state
+            return state
+
+
+def supports_streaming(llm) -> bool:
+    """判断 LLM 客户端是否可以使用流式输出
+
+    Args:
+        llm: LLM 客户端实例
+
+    Returns:
+        客户端实现了 generate_stream 且当前配置启用了流式输出时返回 True
+    """
+    return bool(getattr(llm, "supports_streaming", False)) and callable(
+        getattr(llm, "generate_stream", None)
+    )
+
+
 def load_api_key(config_value: str) -> Optional[str]:
     """从配置值加载 API Key
 
@@ -22,6 +22,11 @@ class VideoInfo:
     duration: Optional[int] = None  # 视频时长（秒）
     upload_date: Optional[str] = None  # 上传日期（YYYYMMDD 格式）
     description: Optional[str] = None  # 视频描述（可选）
+    # 获取视频信息时顺带保留的字幕信息投影（见 detector.project_subtitle_info），
+    # 检测阶段直接使用，避免对同一视频再次执行 yt-dlp --dump-json
+    prefetched_subtitle_info: Optional[Dict[str, Any]] = field(
+        default=None, repr=False, compare=False
+    )
 
     def __str__(self) -> str:
         """字符串表示"""
@@ -43,6 +48,10 @@ class DetectionResult:
     # 原始字幕 URL 信息，格式：{lang_code: [{"ext": "vtt", "url": "..."}, ...]}
     subtitle_urls: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
     auto_subtitle_urls: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    # 紧凑模式：只保留与语言配置相关的字幕轨道（见 detector.compact_detection_result），
+    # 需要其他语言时通过 video_url 重新获取完整列表
+    compact: bool = False
+    video_url: Optional[str] = None
 
     def __str__(self) -> str:
         """字符串表示"""
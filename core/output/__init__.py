@@ -5,8 +5,15 @@ core.output 包的 __init__.py
 
 # 导入并导出 OutputWriter
 from .writer import OutputWriter
+from .rerender import OutputRerenderer, RerenderStats
+from .packed import PackedOutputStore, PackedOutputWriter, create_output_writer
 
 # 定义 __all__ 以明确包的公共接口
 __all__ = [
     "OutputWriter",
+    "OutputRerenderer",
+    "RerenderStats",
+    "PackedOutputStore",
+    "PackedOutputWriter",
+    "create_output_writer",
 ]
@@ -0,0 +1,144 @@
+"""
+输出提交（零拷贝落盘）
+
+临时目录中已完成的字幕、摘要文件直接硬链接到视频输出目录，不再读出内容重新写入：
+- 先链接到 <目标>.tmp，再 os.replace 为目标文件，覆盖旧输出时同样是原子的
+- 临时文件保留原样（后续生成双语字幕、TXT 仍会读取），清理临时目录不影响输出
+- 只有跨设备（或文件系统不支持硬链接）时才复制
+- 每个视频只在最后做一次目录 fsync（组提交），代替每个文件一次的写入 + fsync
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import List
+
+from core.logger import get_logger
+from core.profiler import traced
+
+logger = get_logger()
+
+# 提交模式
+COMMIT_MODE_LINK = "link"  # 硬链接 / 跨设备时复制，每个视频一次目录 fsync
+COMMIT_MODE_COPY = "copy"  # 旧行为：读出内容后逐个原子写（每个文件一次 fsync）
+COMMIT_MODES = (COMMIT_MODE_LINK, COMMIT_MODE_COPY)
+
+
+def _fsync_path(path: Path) -> None:
+    """fsync 文件或目录（平台不支持时忽略，如 Windows 上的目录）"""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class OutputCommit:
+    """单个视频输出目录的一次组提交"""
+
+    def __init__(self, video_dir: Path, sync: bool = True):
+        """初始化
+
+        Args:
+            video_dir: 视频输出目录
+            sync: commit 时是否 fsync（目录只是中转时可关闭）
+        """
+        self.video_dir = Path(video_dir)
+        self.sync = sync
+        self.placed: List[Path] = []
+        self.copied = 0
+
+    def place(self, source_path: Path, target_path: Path) -> Path:
+        """把已完成的临时文件放到输出位置（硬链接，跨设备时复制）
+
+        Args:
+            source_path: 临时目录中的源文件
+            target_path: 输出文件路径（所在目录需已存在）
+
+        Returns:
+            输出文件路径
+
+        Raises:
+            OSError: 链接和复制都失败
+        """
+        tmp_path = target_path.with_suffix(target_path.suffix + ".tmp")
+        try:
+            try:
+                os.link(source_path, tmp_path)
+            except FileExistsError:
+                # 上次中断残留的 .tmp
+                tmp_path.unlink()
+                os.link(source_path, tmp_path)
+        except OSError:
+            # 跨设备（EXDEV）或文件系统不支持硬链接
+            self._copy(source_path, tmp_path)
+        try:
+            os.replace(tmp_path, target_path)
+        except OSError:
+            try:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        self.placed.append(target_path)
+        return target_path
+
+    def write_text(self, target_path: Path, content: str) -> Path:
+        """把内存中的内容写到输出位置（写 .tmp 后原子替换，落盘推迟到 commit）
+
+        Args:
+            target_path: 输出文件路径（所在目录需已存在）
+            content: 文件内容
+
+        Returns:
+            输出文件路径
+        """
+        tmp_path = target_path.with_suffix(target_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, target_path)
+        except OSError:
+            try:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        self.placed.append(target_path)
+        return target_path
+
+    def _copy(self, source_path: Path, tmp_path: Path) -> None:
+        try:
+            shutil.copyfile(source_path, tmp_path)
+        except OSError:
+            try:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        self.copied += 1
+
+    @traced("output.commit")
+    def commit(self) -> None:
+        """落盘：确保放入的文件内容已写到磁盘，然后对输出目录做一次 fsync
+
+        源文件通常已由写入方 fsync，此时对链接文件的 fsync 没有脏页，开销可以忽略。
+        """
+        if self.sync:
+            for path in self.placed:
+                _fsync_path(path)
+            if self.placed and os.name != "nt":
+                _fsync_path(self.video_dir)
+        logger.debug(
+            f"输出提交完成: {self.video_dir.name}，{len(self.placed)} 个文件（复制 {self.copied} 个）"
+        )
+        self.placed = []
+        self.copied = 0
@@ -0,0 +1,110 @@
+"""
+双语字幕时间轴对齐
+把时间戳解析为整数毫秒，在按开始时间排序的 cue 上做线性双指针区间重叠匹配
+
+- 官方翻译字幕、分块翻译结果与源字幕的时间轴常有几十到几百毫秒的偏差，
+  按 (start, end) 字符串精确匹配时大部分条目无法对齐
+- 每条目标 cue 分配给重叠时长最大的源 cue（允许 tolerance_ms 的间隙），
+  一条源 cue 可对应多条目标 cue（目标字幕切分更细时），目标文本不会重复出现
+- 整体复杂度 O(n + m)（输入已排序时；未排序时先排序），不构造字符串键字典
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 默认对齐容差（毫秒）：间隙不超过该值的相邻 cue 仍可匹配
+DEFAULT_ALIGN_TOLERANCE_MS = 500
+
+_TIMESTAMP_PATTERN = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[,.](\d{1,3}))?")
+
+
+def parse_timestamp_ms(timestamp: str) -> int:
+    """解析时间戳为毫秒
+
+    支持 SRT（00:00:01,500）、VTT（00:00:01.500 / 00:01.500）格式
+
+    Args:
+        timestamp: 时间戳字符串
+
+    Returns:
+        毫秒数
+
+    Raises:
+        ValueError: 无法解析的时间戳
+    """
+    match = _TIMESTAMP_PATTERN.match(timestamp.strip())
+    if not match:
+        raise ValueError(f"Invalid timestamp: {timestamp!r}")
+    hours, minutes, seconds, fraction = match.groups()
+    millis = int(fraction.ljust(3, "0")) if fraction else 0
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + millis
+
+
+def _intervals(entries: Sequence[Dict]) -> List[Tuple[int, int, int]]:
+    """转换为按开始时间排序的 (start_ms, end_ms, 原始下标) 列表"""
+    intervals = []
+    for i, entry in enumerate(entries):
+        try:
+            start = parse_timestamp_ms(entry["start"])
+            end = parse_timestamp_ms(entry["end"])
+        except (KeyError, ValueError):
+            continue
+        intervals.append((start, max(start, end), i))
+    intervals.sort()
+    return intervals
+
+
+def align_entries(
+    source_entries: Sequence[Dict],
+    target_entries: Sequence[Dict],
+    tolerance_ms: int = DEFAULT_ALIGN_TOLERANCE_MS,
+) -> List[List[Dict]]:
+    """按时间轴对齐源语言与目标语言字幕条目
+
+    Args:
+        source_entries: 源语言字幕条目（parse_srt 的输出）
+        target_entries: 目标语言字幕条目（parse_srt 的输出）
+        tolerance_ms: 对齐容差（毫秒），间隙不超过该值的 cue 也可匹配
+
+    Returns:
+        与 source_entries 一一对应的列表，每个元素为匹配到的目标条目（按时间排序，可能为空）
+    """
+    aligned: List[List[Dict]] = [[] for _ in source_entries]
+    sources = _intervals(source_entries)
+    targets = _intervals(target_entries)
+    if not sources or not targets:
+        return aligned
+
+    first = 0  # 第一个可能与当前目标 cue 重叠的源 cue
+    for t_start, t_end, t_index in targets:
+        # 源 cue 按开始时间排序，但结束时间不一定单调：只跳过已确定不可能匹配的前缀
+        while first < len(sources) and sources[first][1] + tolerance_ms < t_start:
+            first += 1
+
+        best: Optional[int] = None
+        best_score = 0
+        k = first
+        while k < len(sources) and sources[k][0] - tolerance_ms <= t_end:
+            s_start, s_end, s_index = sources[k]
+            score = min(s_end, t_end) - max(s_start, t_start)  # 重叠时长，负数为间隙
+            exact = s_start == t_start and s_end == t_end
+            if (score > -tolerance_ms or exact) and (best is None or score > best_score):
+                best, best_score = s_index, score
+            k += 1
+
+        if best is not None:
+            aligned[best].append(target_entries[t_index])
+
+    return aligned
+
+
+def alignment_texts(
+    source_entries: Sequence[Dict],
+    target_entries: Sequence[Dict],
+    tolerance_ms: int = DEFAULT_ALIGN_TOLERANCE_MS,
+) -> List[Optional[str]]:
+    """对齐并返回每个源条目对应的目标文本（未匹配为 None）"""
+    return [
+        "\n".join(entry["text"].strip() for entry in matched) if matched else None
+        for matched in align_entries(source_entries, target_entries, tolerance_ms)
+    ]
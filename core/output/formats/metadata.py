@@ -117,6 +117,8 @@ def write_metadata(
                 "manual_languages": detection_result.manual_languages,
                 "auto_languages": detection_result.auto_languages,
             },
+            # 章节信息（离线重新渲染时用于重新生成章节文件）
+            "chapters": detection_result.chapters,
             "language_config": {
                 "ui_language": language_config.ui_language,
                 "subtitle_target_languages": language_config.subtitle_target_languages,
@@ -9,6 +9,7 @@ from typing import Optional, Dict, List
 
 from core.logger import get_logger
 from core.failure_logger import _atomic_write
+from .alignment import DEFAULT_ALIGN_TOLERANCE_MS, alignment_texts
 
 logger = get_logger()
 
@@ -190,7 +191,11 @@ def parse_srt(srt_content: str) -> List[Dict]:
     return entries
 
 
-def merge_srt_entries(source_entries: List[Dict], target_entries: List[Dict]) -> str:
+def merge_srt_entries(
+    source_entries: List[Dict],
+    target_entries: List[Dict],
+    tolerance_ms: int = DEFAULT_ALIGN_TOLERANCE_MS,
+) -> str:
     """合并源语言和目标语言字幕条目
 
     根据时间轴对齐，生成双语字幕（格式：源语言 / 目标语言）
@@ -198,33 +203,23 @@ def merge_srt_entries(source_entries: List[Dict], target_entries: List[Dict]) ->
     Args:
         source_entries: 源语言字幕条目列表
         target_entries: 目标语言字幕条目列表
+        tolerance_ms: 时间轴对齐容差（毫秒），见 alignment.align_entries
 
     Returns:
         合并后的 SRT 格式字符串
     """
-    # 简单的对齐策略：按序号对齐（假设两个字幕文件的序号和时间轴一致）
-    # 如果序号不一致，则按时间轴对齐
     merged_lines = []
     matched_count = 0
     unmatched_count = 0
 
-    # 创建目标字幕的时间索引（用于时间对齐）
-    target_by_time = {}
-    for entry in target_entries:
-        key = (entry["start"], entry["end"])
-        target_by_time[key] = entry
+    # 按时间区间重叠对齐（时间戳解析为毫秒，容忍轻微偏差）
+    target_texts = alignment_texts(source_entries, target_entries, tolerance_ms)
 
-    # 遍历源字幕条目，尝试匹配目标字幕
-    for source_entry in source_entries:
+    for source_entry, target_text in zip(source_entries, target_texts):
         source_text = source_entry["text"]
-        time_key = (source_entry["start"], source_entry["end"])
 
-        # 尝试按时间轴匹配
-        target_entry = target_by_time.get(time_key)
-
-        if target_entry:
+        if target_text:
             # 找到匹配的目标字幕，合并（上下放置）
-            target_text = target_entry["text"]
             merged_text = f"{source_text}\n{target_text}"
             matched_count += 1
         else:
@@ -246,7 +241,11 @@ def merge_srt_entries(source_entries: List[Dict], target_entries: List[Dict]) ->
     return "\n".join(merged_lines)
 
 
-def merge_entries_to_txt(source_entries: List[Dict], target_entries: List[Dict]) -> str:
+def merge_entries_to_txt(
+    source_entries: List[Dict],
+    target_entries: List[Dict],
+    tolerance_ms: int = DEFAULT_ALIGN_TOLERANCE_MS,
+) -> str:
     """合并源语言和目标语言字幕条目为 TXT 格式（去掉时间轴）
 
     保持字幕条目的空行分隔，双语字幕保持上下放置格式
@@ -254,31 +253,23 @@ def merge_entries_to_txt(source_entries: List[Dict], target_entries: List[Dict])
     Args:
         source_entries: 源语言字幕条目列表
         target_entries: 目标语言字幕条目列表
+        tolerance_ms: 时间轴对齐容差（毫秒），见 alignment.align_entries
 
     Returns:
         合并后的 TXT 格式字符串（每个条目之间有空行分隔）
     """
-    # 创建目标字幕的时间索引（用于时间对齐）
-    target_by_time = {}
-    for entry in target_entries:
-        key = (entry["start"], entry["end"])
-        target_by_time[key] = entry
-
     lines = []
     matched_count = 0
     unmatched_count = 0
 
-    # 遍历源字幕条目，尝试匹配目标字幕
-    for source_entry in source_entries:
-        source_text = source_entry["text"].strip()
-        time_key = (source_entry["start"], source_entry["end"])
+    # 按时间区间重叠对齐（时间戳解析为毫秒，容忍轻微偏差）
+    target_texts = alignment_texts(source_entries, target_entries, tolerance_ms)
 
-        # 尝试按时间轴匹配
-        target_entry = target_by_time.get(time_key)
+    for source_entry, target_text in zip(source_entries, target_texts):
+        source_text = source_entry["text"].strip()
 
-        if target_entry:
+        if target_text:
             # 找到匹配的目标字幕，合并（上下放置）
-            target_text = target_entry["text"].strip()
             merged_text = f"{source_text}\n{target_text}"
             matched_count += 1
         else:
@@ -4,21 +4,29 @@
 """
 
 from pathlib import Path
+from typing import Optional
 
 from core.logger import get_logger
 from core.exceptions import AppException, ErrorType
 from core.failure_logger import _atomic_write
+from core.output.commit import OutputCommit
 
 logger = get_logger()
 
 
-def write_summary(video_dir: Path, summary_path: Path, summary_language: str) -> Path:
+def write_summary(
+    video_dir: Path,
+    summary_path: Path,
+    summary_language: str,
+    commit: Optional[OutputCommit] = None,
+) -> Path:
     """写入摘要文件
 
     Args:
         video_dir: 视频输出目录
         summary_path: 源摘要文件路径
         summary_language: 摘要语言代码
+        commit: 组提交（可选）；传入时硬链接源文件，由调用方统一落盘
 
     Returns:
         写入的文件路径
@@ -27,14 +35,18 @@ def write_summary(video_dir: Path, summary_path: Path, summary_language: str) ->
     target_path = video_dir / f"summary.{summary_language}.md"
 
     try:
-        # 使用原子写机制
-        content = summary_path.read_text(encoding="utf-8")
         from core.logger import translate_exception
-        if not _atomic_write(target_path, content, mode="w"):
-            raise AppException(
-                message=translate_exception("exception.atomic_write_summary_failed", path=str(target_path)),
-                error_type=ErrorType.FILE_IO,
-            )
+        if commit is not None:
+            # 硬链接源文件（跨设备时复制），不重写内容
+            commit.place(summary_path, target_path)
+        else:
+            # 使用原子写机制
+            content = summary_path.read_text(encoding="utf-8")
+            if not _atomic_write(target_path, content, mode="w"):
+                raise AppException(
+                    message=translate_exception("exception.atomic_write_summary_failed", path=str(target_path)),
+                    error_type=ErrorType.FILE_IO,
+                )
         from core.logger import translate_log
 
         logger.debug(translate_log("summary_written", file_name=target_path.name))
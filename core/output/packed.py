@@ -0,0 +1,239 @@
+"""
+打包输出存储（大频道用）
+
+目录输出为每个视频创建一个目录和 3～8 个小文件，上万个视频的频道会产生数万个 inode，
+目录扫描很慢。打包后端把每个视频的全部输出文件（原始/翻译/双语字幕、摘要、章节、元数据）
+存入输出目录下的一个 SQLite 数据库，按视频 ID 直接查找：
+- 各格式的生成逻辑与目录输出完全相同：先在暂存目录中生成，再在一个事务中整体入库并删除暂存目录
+- 同一视频重新处理时整体替换
+- 需要目录结构时用 export 命令按原有布局导出（见 cli/export.py）
+"""
+
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.logger import get_logger
+from core.models import VideoInfo
+from core.profiler import traced
+from .commit import COMMIT_MODE_LINK
+from .writer import OutputWriter
+
+logger = get_logger()
+
+# 输出后端
+OUTPUT_BACKEND_DIR = "dir"  # 每个视频一个目录（默认）
+OUTPUT_BACKEND_PACKED = "packed"  # 打包到 SQLite
+OUTPUT_BACKENDS = (OUTPUT_BACKEND_DIR, OUTPUT_BACKEND_PACKED)
+
+# 数据库文件名（位于输出目录下）
+PACKED_DB_NAME = "outputs.db"
+# 暂存目录名（位于输出目录下，入库后删除）
+STAGING_DIR_NAME = ".packing"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    rel_dir TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    video_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    content BLOB NOT NULL,
+    PRIMARY KEY (video_id, name)
+) WITHOUT ROWID;
+"""
+
+
+class PackedOutputStore:
+    """SQLite 打包输出存储（线程安全）"""
+
+    def __init__(self, db_path: Path):
+        """初始化（数据库不存在时创建）
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # WAL + NORMAL：每个视频一次事务提交，读不阻塞写
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def put_video(self, video_id: str, rel_dir: str, files: Dict[str, bytes]) -> None:
+        """写入（或整体替换）一个视频的全部输出文件
+
+        Args:
+            video_id: 视频 ID
+            rel_dir: 导出时的目录（相对输出目录，POSIX 形式）
+            files: {文件名: 内容}
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE video_id = ?", (video_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos (video_id, rel_dir, updated_at) VALUES (?, ?, ?)",
+                (video_id, rel_dir, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO files (video_id, name, content) VALUES (?, ?, ?)",
+                [(video_id, name, content) for name, content in files.items()],
+            )
+
+    def get_dir(self, video_id: str) -> Optional[str]:
+        """视频的导出目录（相对输出目录），不存在时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rel_dir FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_files(self, video_id: str) -> List[str]:
+        """视频的全部输出文件名"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM files WHERE video_id = ? ORDER BY name", (video_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def read_file(self, video_id: str, name: str) -> Optional[bytes]:
+        """读取单个输出文件，不存在时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM files WHERE video_id = ? AND name = ?", (video_id, name)
+            ).fetchone()
+        return row[0] if row else None
+
+    def video_ids(self) -> List[str]:
+        """已入库的全部视频 ID"""
+        with self._lock:
+            rows = self._conn.execute("SELECT video_id FROM videos ORDER BY rel_dir").fetchall()
+        return [row[0] for row in rows]
+
+    def export(
+        self,
+        target_dir: Path,
+        video_ids: Optional[Iterable[str]] = None,
+        overwrite: bool = False,
+    ) -> Tuple[int, int]:
+        """按目录输出的布局导出
+
+        Args:
+            target_dir: 导出根目录（通常就是输出目录）
+            video_ids: 只导出这些视频（默认全部）
+            overwrite: 是否覆盖已存在的文件
+
+        Returns:
+            (导出的视频数, 写入的文件数)
+        """
+        target_dir = Path(target_dir)
+        ids = list(video_ids) if video_ids is not None else self.video_ids()
+        videos = written = 0
+        for video_id in ids:
+            rel_dir = self.get_dir(video_id)
+            if rel_dir is None:
+                logger.warning_i18n("log.packed_video_not_found", video_id=video_id)
+                continue
+            video_dir = target_dir.joinpath(*PurePosixPath(rel_dir).parts)
+            video_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT name, content FROM files WHERE video_id = ?", (video_id,)
+                ).fetchall()
+            for name, content in rows:
+                path = video_dir / name
+                if path.exists() and not overwrite:
+                    continue
+                path.write_bytes(content)
+                written += 1
+            videos += 1
+        return videos, written
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class PackedOutputWriter(OutputWriter):
+    """打包输出写入器
+
+    write_all 等方法照常在暂存目录中生成文件，finalize_video 时整体入库并删除暂存目录。
+    """
+
+    # 暂存文件入库后即删除，持久性由 SQLite 事务保证，不需要对暂存目录 fsync
+    sync_outputs = False
+
+    def __init__(self, base_output_dir: Path, db_path: Optional[Path] = None):
+        """初始化
+
+        Args:
+            base_output_dir: 基础输出目录（数据库默认位于其中）
+            db_path: 数据库文件路径（默认 <输出目录>/outputs.db）
+        """
+        super().__init__(base_output_dir, commit_mode=COMMIT_MODE_LINK)
+        self.staging_dir = self.base_output_dir / STAGING_DIR_NAME
+        self.store = PackedOutputStore(db_path or self.base_output_dir / PACKED_DB_NAME)
+
+    def get_video_output_dir(
+        self,
+        video_info: VideoInfo,
+        channel_name: Optional[str] = None,
+        channel_id: Optional[str] = None,
+    ) -> Path:
+        """视频的暂存目录（与目录输出的相对布局一致，导出时还原）"""
+        video_dir = super().get_video_output_dir(video_info, channel_name, channel_id)
+        return self.staging_dir / video_dir.relative_to(self.base_output_dir)
+
+    @traced("output.pack")
+    def finalize_video(self, video_info: VideoInfo, video_dir: Path) -> Path:
+        """把暂存目录中的输出文件整体入库，然后删除暂存目录
+
+        Args:
+            video_info: 视频信息
+            video_dir: get_video_output_dir 返回的暂存目录
+
+        Returns:
+            暂存目录路径（已删除）
+        """
+        video_dir = Path(video_dir)
+        if not video_dir.is_dir():
+            return video_dir
+        files = {
+            path.name: path.read_bytes()
+            for path in sorted(video_dir.iterdir())
+            if path.is_file() and not path.name.endswith(".tmp")
+        }
+        rel_dir = video_dir.relative_to(self.staging_dir).as_posix()
+        self.store.put_video(video_info.video_id, rel_dir, files)
+        shutil.rmtree(video_dir, ignore_errors=True)
+        logger.debug(f"输出已入库: {video_info.video_id}，{len(files)} 个文件")
+        return video_dir
+
+
+def create_output_writer(
+    base_output_dir: Path,
+    backend: str = OUTPUT_BACKEND_DIR,
+    commit_mode: str = COMMIT_MODE_LINK,
+) -> OutputWriter:
+    """按配置创建输出写入器
+
+    Args:
+        base_output_dir: 基础输出目录
+        backend: 输出后端（"dir" 目录，"packed" SQLite 打包）
+        commit_mode: 目录输出的提交方式
+
+    Returns:
+        OutputWriter 实例
+    """
+    if backend == OUTPUT_BACKEND_PACKED:
+        return PackedOutputWriter(base_output_dir)
+    return OutputWriter(base_output_dir, commit_mode=commit_mode)
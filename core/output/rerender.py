@@ -0,0 +1,467 @@
+"""
+离线重新渲染
+基于已有输出目录（OutputWriter 生成的 original.*.srt / translated.*.srt / metadata.json）
+重新生成 TXT、双语字幕和章节文件，全程只读写本地文件，不访问网络
+
+- 修改 subtitle_format / bilingual_mode 后无需重新检测、下载、翻译
+- 输入文件与渲染设置都未变化的视频直接跳过：先比较 mtime + size，
+  不一致时再比较 sha256（仅 touch 过的文件不会触发重新渲染）
+- 字幕转换 / 双语合并通过 SubtitleProcessPool 多进程批量执行，文件读写使用线程池
+- SRT 输入文件永远不会被修改或删除；只有派生文件（TXT / 双语）会被覆盖或清理
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.cancel_token import CancelToken
+from core.failure_logger import _atomic_write
+from core.logger import get_logger
+from core.subtitle.process_pool import SubtitleProcessPool
+from .packed import STAGING_DIR_NAME
+
+logger = get_logger()
+
+
+# 重新渲染状态文件（位于输出根目录，记录每个视频的输入指纹）
+RERENDER_STATE_FILE = ".rerender_state.json"
+RERENDER_STATE_VERSION = 1
+
+# 重新渲染负责维护的派生文件，不在本次渲染结果中的会被清理
+DERIVED_PATTERNS = (
+    "original.*.txt",
+    "translated.*.txt",
+    "bilingual.*.srt",
+    "bilingual.*.txt",
+)
+
+
+@dataclass
+class RerenderStats:
+    """重新渲染统计"""
+
+    total: int = 0
+    rendered: int = 0
+    skipped: int = 0
+    no_source: int = 0
+    failed: int = 0
+    files_written: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class _VideoJob:
+    """单个视频的渲染任务"""
+
+    video_dir: Path
+    key: str  # 相对于输出根目录的路径（状态文件中的键）
+    fingerprint: Dict[str, Dict[str, Any]]
+    contents: Dict[str, str]
+    metadata: Dict[str, Any]
+    outputs: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def _lang_from_name(file_name: str, prefix: str) -> str:
+    """从 <prefix>.<lang>.srt 中提取语言代码（支持 zh-Hans 等任意形式）"""
+    return file_name[len(prefix) + 1 : -len(".srt")]
+
+
+def _file_fingerprint(path: Path, data: bytes) -> Dict[str, Any]:
+    stat = path.stat()
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+class OutputRerenderer:
+    """输出目录离线重新渲染器
+
+    Example:
+        rerenderer = OutputRerenderer(Path("out"), subtitle_format="both",
+                                      bilingual_mode="source+target")
+        stats = rerenderer.run()
+    """
+
+    def __init__(
+        self,
+        base_output_dir: Path,
+        subtitle_format: str = "srt",
+        bilingual_mode: str = "none",
+        target_languages: Optional[List[str]] = None,
+        source_language: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        io_workers: int = 8,
+        batch_size: int = 256,
+        force: bool = False,
+        cancel_token: Optional[CancelToken] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """初始化重新渲染器
+
+        Args:
+            base_output_dir: 输出根目录（OutputWriter 的 base_output_dir）
+            subtitle_format: 字幕输出格式（srt / txt / both）
+            bilingual_mode: 双语字幕模式（none / source+target）
+            target_languages: 生成双语字幕的目标语言，None 表示目录中所有已翻译语言
+            source_language: 源语言代码（用于双语文件命名），None 表示按 metadata / 文件名推断
+            max_workers: 字幕处理进程数，None 表示 CPU 核数，<= 1 表示不使用子进程
+            io_workers: 文件读写线程数
+            batch_size: 每批处理的视频数（限制内存占用，批次之间保存状态）
+            force: 忽略状态文件，重新渲染所有视频
+            cancel_token: 取消令牌（批次之间检查）
+            on_progress: 进度回调 (已处理视频数, 视频总数)
+        """
+        self.base_output_dir = Path(base_output_dir)
+        self.subtitle_format = subtitle_format
+        self.bilingual_mode = bilingual_mode
+        self.target_languages = list(target_languages) if target_languages else None
+        self.source_language = source_language
+        self.max_workers = max_workers
+        self.io_workers = max(1, io_workers)
+        self.batch_size = max(1, batch_size)
+        self.force = force
+        self.cancel_token = cancel_token
+        self.on_progress = on_progress
+        self.state_path = self.base_output_dir / RERENDER_STATE_FILE
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """渲染设置（变化时所有视频都需要重新渲染）"""
+        return {
+            "version": RERENDER_STATE_VERSION,
+            "subtitle_format": self.subtitle_format,
+            "bilingual_mode": self.bilingual_mode,
+            "target_languages": self.target_languages,
+            "source_language": self.source_language,
+        }
+
+    # ============ 状态文件 ============
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if self.force or not self.state_path.exists():
+            return {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return data.get("videos", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Rerender state unreadable, starting fresh: {e}")
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        content = json.dumps({"videos": state}, ensure_ascii=False)
+        if not _atomic_write(self.state_path, content, mode="w"):
+            logger.warning_i18n("log.rerender_state_save_failed", path=str(self.state_path))
+
+    # ============ 扫描 / 读取 ============
+
+    def find_video_dirs(self) -> List[Path]:
+        """查找输出树中所有视频目录（包含 metadata.json 的目录）"""
+        if not self.base_output_dir.exists():
+            return []
+        return sorted(
+            p.parent
+            for p in self.base_output_dir.rglob("metadata.json")
+            # 跳过打包输出中断后残留的暂存目录
+            if STAGING_DIR_NAME not in p.relative_to(self.base_output_dir).parts
+        )
+
+    @staticmethod
+    def _input_files(video_dir: Path) -> List[Path]:
+        files = sorted(video_dir.glob("original.*.srt")) + sorted(
+            video_dir.glob("translated.*.srt")
+        )
+        metadata_path = video_dir / "metadata.json"
+        if metadata_path.exists():
+            files.append(metadata_path)
+        return files
+
+    def _is_unchanged(
+        self, video_dir: Path, inputs: List[Path], cached: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """检查视频输入是否未变化
+
+        Returns:
+            未变化时返回（可能刷新了 mtime 的）指纹，否则返回 None
+        """
+        if not cached or cached.get("settings") != self.settings:
+            return None
+        cached_inputs = cached.get("inputs", {})
+        if sorted(cached_inputs) != sorted(p.name for p in inputs):
+            return None
+        if not all((video_dir / name).exists() for name in cached.get("outputs", [])):
+            return None
+
+        fingerprint = {}
+        for path in inputs:
+            old = cached_inputs[path.name]
+            stat = path.stat()
+            if stat.st_mtime_ns == old["mtime_ns"] and stat.st_size == old["size"]:
+                fingerprint[path.name] = old
+                continue
+            # mtime 变化：比较内容哈希，内容相同仍视为未变化
+            new = _file_fingerprint(path, path.read_bytes())
+            if new["sha256"] != old["sha256"]:
+                return None
+            fingerprint[path.name] = new
+        return fingerprint
+
+    def _load_video(
+        self, video_dir: Path, cached: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Any]:
+        """读取单个视频的输入（线程池中执行）
+
+        Returns:
+            ("skipped", 指纹) / ("no_source", None) / ("job", _VideoJob) / ("failed", 错误)
+        """
+        key = video_dir.relative_to(self.base_output_dir).as_posix()
+        try:
+            inputs = self._input_files(video_dir)
+            if not any(p.suffix == ".srt" for p in inputs):
+                return "no_source", None
+
+            if not self.force:
+                fingerprint = self._is_unchanged(video_dir, inputs, cached)
+                if fingerprint is not None:
+                    return "skipped", fingerprint
+
+            fingerprint, contents = {}, {}
+            for path in inputs:
+                data = path.read_bytes()
+                fingerprint[path.name] = _file_fingerprint(path, data)
+                contents[path.name] = data.decode("utf-8", errors="replace")
+
+            metadata = {}
+            if "metadata.json" in contents:
+                try:
+                    metadata = json.loads(contents.pop("metadata.json"))
+                except ValueError:
+                    metadata = {}
+            return "job", _VideoJob(video_dir, key, fingerprint, contents, metadata)
+        except OSError as e:
+            return "failed", str(e)
+
+    # ============ 渲染计划 ============
+
+    def _source_language(self, job: _VideoJob, original_name: str) -> str:
+        if self.source_language:
+            return self.source_language
+        recorded = (job.metadata.get("language_config") or {}).get("source_language")
+        return recorded or _lang_from_name(original_name, "original")
+
+    def _plan(
+        self,
+        job: _VideoJob,
+        txt_tasks: List[Tuple[_VideoJob, str, str]],
+        bilingual_tasks: List[Tuple[_VideoJob, str, str, str]],
+    ) -> None:
+        """生成单个视频的渲染任务（TXT / 双语 / 章节）"""
+        originals = [n for n in job.contents if n.startswith("original.")]
+        translated = {
+            _lang_from_name(n, "translated"): n
+            for n in job.contents
+            if n.startswith("translated.")
+        }
+
+        if self.subtitle_format in ("txt", "both"):
+            for name in originals + list(translated.values()):
+                txt_tasks.append((job, name[: -len(".srt")] + ".txt", job.contents[name]))
+
+        if self.bilingual_mode == "source+target" and originals:
+            source_name = originals[0]
+            source_lang = self._source_language(job, source_name)
+            extension = "txt" if self.subtitle_format == "txt" else "srt"
+            for target_lang in self.target_languages or sorted(translated):
+                target_name = translated.get(target_lang)
+                if target_name is None and (
+                    source_lang.split("-")[0] == target_lang.split("-")[0]
+                ):
+                    # 源语言与目标语言相同：使用原始字幕作为目标字幕
+                    target_name = source_name
+                if target_name is None:
+                    continue
+                bilingual_tasks.append(
+                    (
+                        job,
+                        f"bilingual.{source_lang}-{target_lang}.{extension}",
+                        job.contents[source_name],
+                        job.contents[target_name],
+                    )
+                )
+
+        chapters = job.metadata.get("chapters")
+        video_id = job.metadata.get("video_id")
+        if chapters and video_id:
+            from core.output.formats.chapter import extract_chapters_from_ytdlp
+
+            chapter_list = extract_chapters_from_ytdlp(
+                {"id": video_id, "title": job.metadata.get("title", ""), "chapters": chapters}
+            )
+            if chapter_list.has_chapters:
+                job.outputs[f"{video_id}_chapters.md"] = chapter_list.to_markdown()
+
+    def _map(
+        self, pool: SubtitleProcessPool, task: str, tasks: List[Tuple], jobs: List[_VideoJob]
+    ) -> List[Optional[Any]]:
+        """批量执行，批量失败时逐条重试以定位出错的视频"""
+        try:
+            return pool.map(task, tasks)
+        except Exception:
+            results: List[Optional[Any]] = []
+            for args, job in zip(tasks, jobs):
+                try:
+                    results.extend(pool.map(task, [args]))
+                except Exception as e:
+                    job.error = str(e)
+                    results.append(None)
+            return results
+
+    def _render_batch(self, pool: SubtitleProcessPool, jobs: List[_VideoJob]) -> None:
+        """渲染一批视频（CPU 部分在进程池中执行）"""
+        txt_tasks: List[Tuple[_VideoJob, str, str]] = []
+        bilingual_tasks: List[Tuple[_VideoJob, str, str, str]] = []
+        for job in jobs:
+            self._plan(job, txt_tasks, bilingual_tasks)
+
+        if bilingual_tasks:
+            output_format = "txt" if self.subtitle_format == "txt" else "srt"
+            results = self._map(
+                pool,
+                "bilingual",
+                [(s, t, output_format) for _, _, s, t in bilingual_tasks],
+                [job for job, *_ in bilingual_tasks],
+            )
+            for (job, name, _, _), content in zip(bilingual_tasks, results):
+                if content is None:
+                    continue
+                job.outputs[name] = content
+                if self.subtitle_format == "both":
+                    txt_tasks.append((job, name[: -len(".srt")] + ".txt", content))
+
+        if txt_tasks:
+            results = self._map(
+                pool,
+                "srt_to_txt",
+                [(content,) for _, _, content in txt_tasks],
+                [job for job, *_ in txt_tasks],
+            )
+            for (job, name, _), content in zip(txt_tasks, results):
+                if content is not None:
+                    job.outputs[name] = content
+
+    def _write_job(self, job: _VideoJob) -> int:
+        """写入单个视频的输出并清理过期的派生文件（线程池中执行）"""
+        written = 0
+        for name, content in job.outputs.items():
+            if not _atomic_write(job.video_dir / name, content, mode="w"):
+                raise OSError(f"atomic write failed: {job.video_dir / name}")
+            written += 1
+        for pattern in DERIVED_PATTERNS:
+            for stale in job.video_dir.glob(pattern):
+                if stale.name not in job.outputs:
+                    stale.unlink(missing_ok=True)
+        return written
+
+    # ============ 主流程 ============
+
+    def run(self) -> RerenderStats:
+        """重新渲染整个输出树
+
+        Returns:
+            渲染统计
+        """
+        start = time.monotonic()
+        stats = RerenderStats()
+        video_dirs = self.find_video_dirs()
+        stats.total = len(video_dirs)
+        logger.info_i18n(
+            "log.rerender_start", total=stats.total, path=str(self.base_output_dir)
+        )
+
+        state = self._load_state()
+        pool = SubtitleProcessPool(max_workers=self.max_workers)
+        done = 0
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="rerender"
+            ) as io_pool:
+                for offset in range(0, len(video_dirs), self.batch_size):
+                    if self.cancel_token and self.cancel_token.is_cancelled():
+                        break
+                    batch = video_dirs[offset : offset + self.batch_size]
+
+                    jobs: List[_VideoJob] = []
+                    loaded = io_pool.map(
+                        lambda d: self._load_video(
+                            d, state.get(d.relative_to(self.base_output_dir).as_posix())
+                        ),
+                        batch,
+                    )
+                    for video_dir, (status, value) in zip(batch, loaded):
+                        key = video_dir.relative_to(self.base_output_dir).as_posix()
+                        if status == "skipped":
+                            stats.skipped += 1
+                            state[key]["inputs"] = value
+                        elif status == "no_source":
+                            stats.no_source += 1
+                            logger.debug_i18n("log.rerender_no_source", path=str(video_dir))
+                        elif status == "failed":
+                            stats.failed += 1
+                            logger.warning_i18n(
+                                "log.rerender_video_failed", path=str(video_dir), error=value
+                            )
+                        else:
+                            jobs.append(value)
+
+                    self._render_batch(pool, jobs)
+
+                    def write(job: _VideoJob) -> Optional[int]:
+                        if job.error is not None:
+                            return None
+                        try:
+                            return self._write_job(job)
+                        except OSError as e:
+                            job.error = str(e)
+                            return None
+
+                    for job, written in zip(jobs, io_pool.map(write, jobs)):
+                        if written is None:
+                            stats.failed += 1
+                            state.pop(job.key, None)
+                            logger.warning_i18n(
+                                "log.rerender_video_failed",
+                                path=str(job.video_dir),
+                                error=job.error,
+                            )
+                            continue
+                        stats.rendered += 1
+                        stats.files_written += written
+                        state[job.key] = {
+                            "settings": self.settings,
+                            "inputs": job.fingerprint,
+                            "outputs": sorted(job.outputs),
+                        }
+
+                    self._save_state(state)
+                    done += len(batch)
+                    if self.on_progress:
+                        self.on_progress(done, stats.total)
+        finally:
+            pool.shutdown()
+
+        stats.elapsed = time.monotonic() - start
+        logger.info_i18n(
+            "log.rerender_complete",
+            rendered=stats.rendered,
+            skipped=stats.skipped,
+            failed=stats.failed,
+            files=stats.files_written,
+            elapsed=f"{stats.elapsed:.1f}",
+        )
+        return stats
@@ -13,6 +13,8 @@ from core.logger import get_logger, translate_log, translate_exception
 from core.exceptions import AppException, ErrorType
 from core.failure_logger import _atomic_write
 from core.llm_client import LLMClient
+from core.artifact_store import ArtifactStore
+from core.profiler import traced
 
 # 导入新的模块化组件
 from .formats.subtitle import (
@@ -21,9 +23,11 @@ from .formats.subtitle import (
     merge_entries_to_txt,
     write_txt_subtitle,
 )
+from .formats.alignment import DEFAULT_ALIGN_TOLERANCE_MS
 from .formats.summary import write_summary as write_summary_format
 from .formats.metadata import write_metadata as write_metadata_format
 from .utils import sanitize_filename, extract_language_from_filename
+from .commit import OutputCommit, COMMIT_MODE_LINK, COMMIT_MODES
 
 logger = get_logger()
 
@@ -34,14 +38,33 @@ class OutputWriter:
     负责按统一结构创建目录和文件，使用语言代码命名
     """
 
-    def __init__(self, base_output_dir: Path):
+    # 组提交时是否 fsync（打包输出的暂存目录不需要）
+    sync_outputs = True
+
+    def __init__(self, base_output_dir: Path, commit_mode: str = COMMIT_MODE_LINK):
         """初始化输出写入器
 
         Args:
             base_output_dir: 基础输出目录（通常是 "out"）
+            commit_mode: 临时文件的提交方式（"link" 硬链接 + 组提交，"copy" 逐个原子写）
         """
         self.base_output_dir = Path(base_output_dir)
         self.base_output_dir.mkdir(parents=True, exist_ok=True)
+        self.commit_mode = commit_mode if commit_mode in COMMIT_MODES else COMMIT_MODE_LINK
+
+    def _new_commit(self, video_dir: Path) -> OutputCommit:
+        return OutputCommit(video_dir, sync=self.sync_outputs)
+
+    def _place_file(
+        self, source_path: Path, target_path: Path, commit: Optional[OutputCommit]
+    ) -> None:
+        """以零拷贝方式放置已完成的临时文件（未传入 commit 时单独提交）"""
+        if commit is not None:
+            commit.place(source_path, target_path)
+            return
+        single = self._new_commit(target_path.parent)
+        single.place(source_path, target_path)
+        single.commit()
 
     def get_video_output_dir(
         self,
@@ -78,8 +101,26 @@ class OutputWriter:
 
         return video_dir
 
+    def finalize_video(self, video_info: VideoInfo, video_dir: Path) -> Path:
+        """视频的全部输出（含章节）写完后调用
+
+        目录输出无需额外处理；打包输出在此入库（见 PackedOutputWriter）
+
+        Args:
+            video_info: 视频信息
+            video_dir: 视频输出目录
+
+        Returns:
+            视频输出目录路径
+        """
+        return video_dir
+
     def write_original_subtitle(
-        self, video_dir: Path, subtitle_path: Path, source_language: str
+        self,
+        video_dir: Path,
+        subtitle_path: Path,
+        source_language: str,
+        commit: Optional[OutputCommit] = None,
     ) -> Path:
         """写入原始字幕文件
 
@@ -87,21 +128,29 @@ class OutputWriter:
             video_dir: 视频输出目录
             subtitle_path: 源字幕文件路径
             source_language: 源语言代码
+            commit: 所属的组提交（可选，link 模式下由 write_all 传入）
 
         Returns:
             写入的文件路径
         """
         video_dir.mkdir(parents=True, exist_ok=True)
         target_path = video_dir / f"original.{source_language}.srt"
+        if subtitle_path == target_path:
+            # 已直接写在输出位置（产物存储中的内容）
+            return target_path
 
         try:
-            # 使用原子写机制
-            content = subtitle_path.read_text(encoding="utf-8")
-            if not _atomic_write(target_path, content, mode="w"):
-                raise AppException(
-                    message=translate_exception("exception.atomic_write_original_failed", path=str(target_path)),
-                    error_type=ErrorType.FILE_IO,
-                )
+            if self.commit_mode == COMMIT_MODE_LINK:
+                # 硬链接临时文件（跨设备时复制），不重写内容
+                self._place_file(subtitle_path, target_path, commit)
+            else:
+                # 使用原子写机制
+                content = subtitle_path.read_text(encoding="utf-8")
+                if not _atomic_write(target_path, content, mode="w"):
+                    raise AppException(
+                        message=translate_exception("exception.atomic_write_original_failed", path=str(target_path)),
+                        error_type=ErrorType.FILE_IO,
+                    )
             logger.debug_i18n(
                 "log.output_original_subtitle_written", file_name=target_path.name
             )
@@ -135,7 +184,11 @@ class OutputWriter:
             raise app_error
 
     def write_translated_subtitle(
-        self, video_dir: Path, subtitle_path: Path, target_language: str
+        self,
+        video_dir: Path,
+        subtitle_path: Path,
+        target_language: str,
+        commit: Optional[OutputCommit] = None,
     ) -> Path:
         """写入翻译字幕文件
 
@@ -143,21 +196,29 @@ class OutputWriter:
             video_dir: 视频输出目录
             subtitle_path: 源字幕文件路径
             target_language: 目标语言代码
+            commit: 所属的组提交（可选，link 模式下由 write_all 传入）
 
         Returns:
             写入的文件路径
         """
         video_dir.mkdir(parents=True, exist_ok=True)
         target_path = video_dir / f"translated.{target_language}.srt"
+        if subtitle_path == target_path:
+            # 已直接写在输出位置（产物存储中的内容）
+            return target_path
 
         try:
-            # 使用原子写机制
-            content = subtitle_path.read_text(encoding="utf-8")
-            if not _atomic_write(target_path, content, mode="w"):
-                raise AppException(
-                    message=translate_exception("exception.atomic_write_translated_failed", path=str(target_path)),
-                    error_type=ErrorType.FILE_IO,
-                )
+            if self.commit_mode == COMMIT_MODE_LINK:
+                # 硬链接临时文件（跨设备时复制），不重写内容
+                self._place_file(subtitle_path, target_path, commit)
+            else:
+                # 使用原子写机制
+                content = subtitle_path.read_text(encoding="utf-8")
+                if not _atomic_write(target_path, content, mode="w"):
+                    raise AppException(
+                        message=translate_exception("exception.atomic_write_translated_failed", path=str(target_path)),
+                        error_type=ErrorType.FILE_IO,
+                    )
             logger.debug_i18n(
                 "log.output_translated_subtitle_written", file_name=target_path.name
             )
@@ -191,7 +252,11 @@ class OutputWriter:
             raise app_error
 
     def write_summary(
-        self, video_dir: Path, summary_path: Path, summary_language: str
+        self,
+        video_dir: Path,
+        summary_path: Path,
+        summary_language: str,
+        commit: Optional[OutputCommit] = None,
     ) -> Path:
         """写入摘要文件
 
@@ -199,11 +264,22 @@ class OutputWriter:
             video_dir: 视频输出目录
             summary_path: 源摘要文件路径
             summary_language: 摘要语言代码
+            commit: 所属的组提交（可选，link 模式下由 write_all 传入）
 
         Returns:
             写入的文件路径
         """
-        return write_summary_format(video_dir, summary_path, summary_language)
+        if summary_path == video_dir / f"summary.{summary_language}.md":
+            # 已直接写在输出位置（产物存储中的内容）
+            return summary_path
+        if self.commit_mode != COMMIT_MODE_LINK:
+            return write_summary_format(video_dir, summary_path, summary_language)
+        if commit is not None:
+            return write_summary_format(video_dir, summary_path, summary_language, commit=commit)
+        single = self._new_commit(video_dir)
+        target_path = write_summary_format(video_dir, summary_path, summary_language, commit=single)
+        single.commit()
+        return target_path
 
     def write_metadata(
         self,
@@ -248,6 +324,54 @@ class OutputWriter:
             summary_llm=summary_llm,
         )
 
+    def _write_content(
+        self, target_path: Path, content: str, commit: Optional[OutputCommit]
+    ) -> Path:
+        """把内存中的内容写到输出位置（link 模式加入组提交，否则原子写）"""
+        if commit is not None:
+            return commit.write_text(target_path, content)
+        if not _atomic_write(target_path, content, mode="w"):
+            raise AppException(
+                message=translate_exception("exception.atomic_write_translated_failed", path=str(target_path)),
+                error_type=ErrorType.FILE_IO,
+            )
+        return target_path
+
+    def _write_pending_artifacts(
+        self,
+        video_dir: Path,
+        artifacts: ArtifactStore,
+        language_config: LanguageConfig,
+        translation_result: Dict[str, Optional[Path]],
+        summary_path: Optional[Path],
+        commit: Optional[OutputCommit],
+    ):
+        """把只在内存中的译文、摘要直接写到输出目录，不经过临时文件
+
+        Returns:
+            (替换为输出路径后的翻译结果, 摘要路径)
+        """
+        video_dir.mkdir(parents=True, exist_ok=True)
+        resolved = dict(translation_result)
+        for target_lang, path in translation_result.items():
+            if not artifacts.is_pending(path):
+                continue
+            if language_config.subtitle_format == "txt":
+                # 只输出 TXT 时不写 SRT，转换和双语字幕仍从临时文件读取
+                artifacts.spill(path)
+                continue
+            resolved[target_lang] = self._write_content(
+                video_dir / f"translated.{target_lang}.srt", artifacts.read_text(path), commit
+            )
+        if artifacts.is_pending(summary_path):
+            summary_path = self._write_content(
+                video_dir / f"summary.{language_config.summary_language}.md",
+                artifacts.read_text(summary_path),
+                commit,
+            )
+        return resolved, summary_path
+
+    @traced("output.write_all")
     def write_all(
         self,
         video_info: VideoInfo,
@@ -261,6 +385,7 @@ class OutputWriter:
         run_id: Optional[str] = None,
         translation_llm: Optional[LLMClient] = None,
         summary_llm: Optional[LLMClient] = None,
+        artifacts: Optional[ArtifactStore] = None,
     ) -> Path:
         """写入所有输出文件（便捷方法）
 
@@ -282,12 +407,19 @@ class OutputWriter:
             run_id: 批次ID（run_id），可选
             translation_llm: 翻译 LLM 客户端（可选），用于元数据记录
             summary_llm: 摘要 LLM 客户端（可选），用于元数据记录
+            artifacts: 阶段间产物存储（可选）；其中只在内存中的译文、摘要直接写到输出目录
 
         Returns:
             视频输出目录路径
         """
         # 获取视频输出目录
         video_dir = self.get_video_output_dir(video_info, channel_name, channel_id)
+        # link 模式下本视频的所有临时文件共用一次组提交（写元数据前统一落盘）
+        commit = self._new_commit(video_dir) if self.commit_mode == COMMIT_MODE_LINK else None
+        if artifacts:
+            translation_result, summary_path = self._write_pending_artifacts(
+                video_dir, artifacts, language_config, translation_result, summary_path, commit
+            )
 
         # 确定源语言（用于后续处理）
         original_path = download_result.get("original")
@@ -314,7 +446,7 @@ class OutputWriter:
             else:
                 # 输出 SRT（srt 或 both）
                 output_original_path = self.write_original_subtitle(
-                    video_dir, original_path, source_lang
+                    video_dir, original_path, source_lang, commit=commit
                 )
 
         # 写入翻译字幕
@@ -349,7 +481,7 @@ class OutputWriter:
                 else:
                     # 输出 SRT（srt 或 both）
                     output_translated_path = self.write_translated_subtitle(
-                        video_dir, translated_path, target_lang
+                        video_dir, translated_path, target_lang, commit=commit
                     )
                     output_translated_paths[target_lang] = output_translated_path
                 logger.info(
@@ -424,7 +556,7 @@ class OutputWriter:
                             if temp_translated_path and temp_translated_path.exists():
                                 # 写入输出目录
                                 output_translated_path = self.write_translated_subtitle(
-                                    video_dir, temp_translated_path, target_lang
+                                    video_dir, temp_translated_path, target_lang, commit=commit
                                 )
                                 output_translated_paths[target_lang] = (
                                     output_translated_path
@@ -441,7 +573,7 @@ class OutputWriter:
                             if official_path and official_path.exists():
                                 # 写入输出目录
                                 output_translated_path = self.write_translated_subtitle(
-                                    video_dir, official_path, target_lang
+                                    video_dir, official_path, target_lang, commit=commit
                                 )
                                 output_translated_paths[target_lang] = (
                                     output_translated_path
@@ -520,6 +652,7 @@ class OutputWriter:
                                     source_lang,
                                     target_lang,
                                     output_format="txt",
+                                    artifacts=artifacts,
                                 )
                             else:
                                 # 生成 SRT 格式双语字幕
@@ -530,6 +663,7 @@ class OutputWriter:
                                     source_lang,
                                     target_lang,
                                     output_format="srt",
+                                    artifacts=artifacts,
                                 )
 
                             logger.info(
@@ -555,7 +689,7 @@ class OutputWriter:
         # 写入摘要
         if summary_path and summary_path.exists():
             summary_lang = language_config.summary_language
-            write_summary_format(video_dir, summary_path, summary_lang)
+            self.write_summary(video_dir, summary_path, summary_lang, commit=commit)
 
         # 生成 TXT 格式字幕（如果配置为 both，需要从 SRT 转换）
         if language_config.subtitle_format == "both":
@@ -587,6 +721,10 @@ class OutputWriter:
                 "log.output_txt_subtitle_generated", video_id=video_info.video_id
             )
 
+        # 组提交：链接进来的文件和输出目录一次性落盘
+        if commit is not None:
+            commit.commit()
+
         # 写入元数据
         write_metadata_format(
             video_dir,
@@ -632,6 +770,8 @@ class OutputWriter:
         source_language: str,
         target_language: str,
         output_format: str = "srt",
+        tolerance_ms: int = DEFAULT_ALIGN_TOLERANCE_MS,
+        artifacts: Optional[ArtifactStore] = None,
     ) -> Path:
         """写入双语字幕文件
 
@@ -644,6 +784,8 @@ class OutputWriter:
             source_language: 源语言代码
             target_language: 目标语言代码
             output_format: 输出格式，"srt" 或 "txt"
+            tolerance_ms: 时间轴对齐容差（毫秒）
+            artifacts: 阶段间产物存储（可选），提供时优先从内存读取字幕
 
         Returns:
             写入的文件路径
@@ -656,19 +798,23 @@ class OutputWriter:
 
         try:
             # 验证文件存在
-            if not source_subtitle_path.exists():
+            if not (artifacts.exists(source_subtitle_path) if artifacts else source_subtitle_path.exists()):
                 raise AppException(
                     message=translate_exception("exception.source_subtitle_not_found", path=str(source_subtitle_path)),
                     error_type=ErrorType.FILE_IO,
                 )
-            if not target_subtitle_path.exists():
+            if not (artifacts.exists(target_subtitle_path) if artifacts else target_subtitle_path.exists()):
                 raise AppException(
                     message=translate_exception("exception.target_subtitle_not_found", path=str(target_subtitle_path)),
                     error_type=ErrorType.FILE_IO,
                 )
 
             # 读取源语言字幕
-            source_content = source_subtitle_path.read_text(encoding="utf-8")
+            source_content = (
+                artifacts.read_text(source_subtitle_path)
+                if artifacts
+                else source_subtitle_path.read_text(encoding="utf-8")
+            )
             if not source_content or not source_content.strip():
                 raise AppException(
                     message=translate_exception("exception.source_subtitle_empty", path=str(source_subtitle_path)),
@@ -685,7 +831,11 @@ class OutputWriter:
             )
 
             # 读取目标语言字幕
-            target_content = target_subtitle_path.read_text(encoding="utf-8")
+            target_content = (
+                artifacts.read_text(target_subtitle_path)
+                if artifacts
+                else target_subtitle_path.read_text(encoding="utf-8")
+            )
             if not target_content or not target_content.strip():
                 raise AppException(
                     message=translate_exception("exception.target_subtitle_empty", path=str(target_subtitle_path)),
@@ -735,10 +885,14 @@ class OutputWriter:
             # 合并字幕
             if output_format == "txt":
                 # 直接生成 TXT 格式（去掉时间轴，保持空行分隔和上下放置格式）
-                merged_content = merge_entries_to_txt(source_entries, target_entries)
+                merged_content = merge_entries_to_txt(
+                    source_entries, target_entries, tolerance_ms
+                )
             else:
                 # 生成 SRT 格式
-                merged_content = merge_srt_entries(source_entries, target_entries)
+                merged_content = merge_srt_entries(
+                    source_entries, target_entries, tolerance_ms
+                )
             logger.debug(
                 translate_log(
                     "merged_subtitle_length",
@@ -17,6 +17,7 @@ from core.llm_client import LLMClient
 from core.exceptions import ErrorType
 from core.cancel_token import CancelToken
 from core.batch_id import generate_run_id
+from core.artifact_store import DEFAULT_MAX_MEMORY_MB
 
 from .single_video import process_single_video
 from .utils import safe_log
@@ -49,6 +50,8 @@ def process_video_list(
     use_staged_pipeline: bool = True,
     initial_url_count: int = 0,  # 初始 URL 数量（用于保持 total 不变）
     fetch_failed_count: int = 0,  # URL 获取阶段失败的数量
+    artifact_memory_mb: float = DEFAULT_MAX_MEMORY_MB,  # 阶段间产物内存上限，0 表示经临时文件传递
+    worker_budget: int = 0,  # 跨阶段共享 worker 池的总线程数，0 表示使用线程级流水线
 ) -> Dict[str, int]:
     """处理视频列表（支持并发）
 
@@ -73,6 +76,10 @@ def process_video_list(
         translation_llm_init_error_type: 翻译 LLM 初始化错误类型
         translation_llm_init_error: 翻译 LLM 初始化错误信息
         use_staged_pipeline: 是否使用分阶段 Pipeline
+        artifact_memory_mb: 阶段间产物（译文、摘要）的内存上限（MB），超出后按 LRU 落盘；
+                            0 表示不使用内存产物存储
+        worker_budget: 跨阶段共享 worker 池的总线程数；大于 0 时使用分阶段队列模式，
+                       各阶段共享该预算（阶段并发数作为各阶段上限）
 
     Returns:
         统计信息
@@ -116,6 +123,8 @@ def process_video_list(
             translation_llm_init_error=translation_llm_init_error,
             initial_url_count=initial_url_count,
             fetch_failed_count=fetch_failed_count,
+            artifact_memory_mb=artifact_memory_mb,
+            worker_budget=worker_budget,
         )
 
     # 否则使用旧的实现（TaskRunner 方式）
@@ -302,6 +311,8 @@ def _process_video_list_staged(
     initial_url_count: int = 0,  # 初始 URL 数量
     fetch_failed_count: int = 0,  # URL 获取阶段失败的数量
     use_thread_pipeline: bool = True,  # 使用线程级流水线（推荐）
+    artifact_memory_mb: float = DEFAULT_MAX_MEMORY_MB,  # 阶段间产物内存上限
+    worker_budget: int = 0,  # 跨阶段共享 worker 池的总线程数
 ) -> Dict[str, int]:
     """使用分阶段队列化 Pipeline 处理视频列表
 
@@ -309,6 +320,7 @@ def _process_video_list_staged(
         与 process_video_list 相同
         use_thread_pipeline: 是否使用线程级流水线（每个线程独立处理一个视频），
                              默认 True，设为 False 使用分阶段队列模式
+        worker_budget: 跨阶段共享 worker 池的总线程数；大于 0 时使用分阶段队列模式并启用共享池
 
     Returns:
         统计信息
@@ -375,7 +387,9 @@ def _process_video_list_staged(
         except Exception as e:
             logger.warning(f"Failed to update manifest for video: {e}")
 
-    # 创建 Pipeline（根据配置选择模式）
+    # 创建 Pipeline（根据配置选择模式；配置了共享 worker 预算时使用分阶段队列模式）
+    if worker_budget > 0:
+        use_thread_pipeline = False
     if use_thread_pipeline:
         # 线程级流水线：每个线程独立处理一个视频的完整流程
         logger.info_i18n("log.using_thread_pipeline", concurrency=concurrency, ai_concurrency=ai_concurrency)
@@ -401,6 +415,7 @@ def _process_video_list_staged(
             ai_concurrency=ai_concurrency,
             translation_llm_init_error_type=translation_llm_init_error_type,
             translation_llm_init_error=translation_llm_init_error,
+            artifact_memory_mb=artifact_memory_mb,
         )
     else:
         # 分阶段队列模式：各阶段独立队列
@@ -429,6 +444,8 @@ def _process_video_list_staged(
             output_concurrency=output_concurrency,
             translation_llm_init_error_type=translation_llm_init_error_type,
             translation_llm_init_error=translation_llm_init_error,
+            artifact_memory_mb=artifact_memory_mb,
+            worker_budget=worker_budget or None,
         )
 
     # 处理视频
@@ -284,7 +284,7 @@ def _stage_output(
     msg = logger.info_i18n("output_start", video_id=ctx.video_info.video_id)
     safe_log(ctx.on_log, "INFO", msg, ctx.video_info.video_id)
     
-    output_writer.write_all(
+    video_dir = output_writer.write_all(
         video_info=ctx.video_info,
         detection_result=detection_result,
         language_config=ctx.language_config,
@@ -295,6 +295,7 @@ def _stage_output(
         translation_llm=translation_llm,
         summary_llm=summary_llm,
     )
+    output_writer.finalize_video(ctx.video_info, video_dir)
     
     msg = logger.info_i18n("output_complete", video_id=ctx.video_info.video_id)
     safe_log(ctx.on_log, "INFO", msg, ctx.video_info.video_id)
@@ -0,0 +1,291 @@
+"""
+性能分析（采样 + 热路径跟踪）
+
+用于排查"慢在哪里"：yt-dlp 子进程、格式转换的 GIL 争用、日志还是 AI 延迟。
+
+- 采样：后台线程按固定间隔抓取所有线程的调用栈（墙钟时间，阻塞中的线程也会被采到），
+  汇总为 flamegraph.pl / speedscope 可直接读取的折叠栈文件（profile_<时间>.collapsed），
+  每行以线程名开头（编号归一化，如 video_*、detect-worker-*、translate-*）
+- 跟踪：run_command、LLMClient.generate、文件写入等热路径上的 span，
+  写成 Chrome Trace Event 格式（trace_<时间>.json），可用 chrome://tracing 或 Perfetto 打开
+
+未启用时 span() / traced() 只做一次全局变量判断，开销可以忽略。
+"""
+
+import functools
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_INTERVAL = 0.01  # 采样间隔（秒），约 100 Hz
+MAX_SPANS = 200_000  # 最多记录的 span 数（超出后丢弃并计数，避免长任务占满内存）
+MAX_STACK_DEPTH = 128
+
+# 线程名中的编号（video_3、detect-worker-12、translate-0）
+_THREAD_NUMBER_PATTERN = re.compile(r"([-_])\d+")
+
+# 当前生效的分析器（同一时间只有一个）
+_active: Optional["Profiler"] = None
+_active_lock = threading.Lock()
+
+
+def _thread_label(name: str) -> str:
+    """归一化线程名，同类线程合并到一个火焰图分支"""
+    return _THREAD_NUMBER_PATTERN.sub(r"\1*", name)
+
+
+def _frame_label(code) -> str:
+    """栈帧标签：函数名 (文件名:定义行号)"""
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def get_log_dir() -> Path:
+    """本次运行的日志目录（日志文件所在目录，未写文件日志时使用默认目录）"""
+    for handler in get_logger().logger.handlers:
+        if isinstance(handler, logging.FileHandler):
+            return Path(handler.baseFilename).parent
+    from config.manager import get_user_data_dir
+
+    return get_user_data_dir() / "logs"
+
+
+class Profiler:
+    """墙钟采样分析器 + span 记录器"""
+
+    def __init__(self, output_dir: Optional[Path] = None, interval: float = DEFAULT_INTERVAL):
+        """初始化
+
+        Args:
+            output_dir: 结果输出目录（None 表示日志目录）
+            interval: 采样间隔（秒）
+        """
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.interval = interval
+        self.samples = 0
+        self.dropped_spans = 0
+        self._stacks: Counter = Counter()
+        self._spans: List[Tuple[str, int, float, float, Dict]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._origin = 0.0
+        self._started_at = datetime.now()
+
+    def start(self) -> "Profiler":
+        """开始采样"""
+        self._origin = time.perf_counter()
+        self._started_at = datetime.now()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止采样"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        names: Dict[int, str] = {}
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            if any(ident not in names for ident in frames):
+                names = {t.ident: _thread_label(t.name) for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self._stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def record_span(self, name: str, start: float, end: float, attrs: Dict) -> None:
+        """记录一个已结束的 span（时间为 perf_counter 秒）"""
+        thread = threading.current_thread()
+        with self._lock:
+            if len(self._spans) >= MAX_SPANS:
+                self.dropped_spans += 1
+                return
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self._spans.append((name, thread.ident, start, end, attrs))
+
+    def span_summary(self) -> List[Tuple[str, int, float]]:
+        """按名称汇总 span：[(名称, 次数, 总耗时秒)]，按总耗时降序"""
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            for name, _, start, end, _ in self._spans:
+                entry = totals.setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += end - start
+        return sorted(
+            ((name, int(count), total) for name, (count, total) in totals.items()),
+            key=lambda item: item[2],
+            reverse=True,
+        )
+
+    def write(self) -> Tuple[Path, Path]:
+        """写出折叠栈文件和 span 跟踪文件
+
+        Returns:
+            (折叠栈文件路径, 跟踪文件路径)
+        """
+        output_dir = self.output_dir or get_log_dir()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = self._started_at.strftime("%Y%m%d_%H%M%S")
+        collapsed_path = output_dir / f"profile_{timestamp}.collapsed"
+        trace_path = output_dir / f"trace_{timestamp}.json"
+
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self._stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        with self._lock:
+            spans = list(self._spans)
+            thread_names = dict(self._thread_names)
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": ident, "args": {"name": name}}
+            for ident, name in thread_names.items()
+        ]
+        for name, ident, start, end, attrs in spans:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": ident,
+                    "ts": round((start - self._origin) * 1e6, 1),
+                    "dur": round((end - start) * 1e6, 1),
+                    "args": attrs,
+                }
+            )
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {
+                        "samples": self.samples,
+                        "interval_ms": self.interval * 1000,
+                        "dropped_spans": self.dropped_spans,
+                    },
+                },
+                f,
+                ensure_ascii=False,
+                default=str,
+            )
+        return collapsed_path, trace_path
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    """当前生效的分析器（未启用时为 None）"""
+    return _active
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[None]:
+    """热路径跟踪 span（未启用性能分析时不做任何记录）
+
+    Args:
+        name: span 名称（如 "run_command"、"llm.generate"）
+        **attrs: 附加信息（写入跟踪文件的 args）
+    """
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record_span(name, start, time.perf_counter(), attrs)
+
+
+def traced(name: str):
+    """装饰器：调用包在 span 中（用于 LLM 客户端的 generate、文件写入等）"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with span(name, func=func.__qualname__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profiling(
+    enabled: bool = True,
+    output_dir: Optional[Path] = None,
+    interval: float = DEFAULT_INTERVAL,
+) -> Iterator[Optional[Profiler]]:
+    """在一次运行期间启用性能分析，结束时把结果写入日志目录
+
+    已有分析器在运行时（如 GUI 连续触发任务）不再嵌套启动。
+
+    Args:
+        enabled: 是否启用（False 时直接执行，便于调用方无条件包裹）
+        output_dir: 结果输出目录（None 表示日志目录）
+        interval: 采样间隔（秒）
+
+    Yields:
+        Profiler 实例；未启用或已有分析器运行时为 None
+    """
+    global _active
+    if not enabled:
+        yield None
+        return
+    with _active_lock:
+        if _active is not None:
+            profiler = None
+        else:
+            profiler = _active = Profiler(output_dir=output_dir, interval=interval)
+    if profiler is None:
+        yield None
+        return
+
+    logger.info_i18n("log.profile_started", interval_ms=round(interval * 1000, 1))
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        with _active_lock:
+            _active = None
+        try:
+            collapsed_path, trace_path = profiler.write()
+            for name, count, total in profiler.span_summary():
+                logger.info_i18n(
+                    "log.profile_span_summary", name=name, count=count, total=f"{total:.2f}"
+                )
+            logger.info_i18n(
+                "log.profile_written",
+                samples=profiler.samples,
+                collapsed=str(collapsed_path),
+                trace=str(trace_path),
+            )
+        except OSError as e:
+            logger.warning_i18n("log.profile_write_failed", error=str(e))
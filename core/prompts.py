@@ -1,13 +1,84 @@
 """
 AI Prompt 模板集中管理
 所有 AI 相关的 Prompt 模板都在这里，使用占位符从 LanguageConfig 注入语言信息
+
+build_*_prompt 把 Prompt 拆成两部分（PromptParts）：
+- system：静态指令，同一语言（对）下逐字节相同，作为 system 消息放在最前面，
+  供应商的前缀缓存（OpenAI / DeepSeek 自动缓存、Anthropic cache_control）可以命中
+  （供应商要求前缀达到最小长度，约 1024 token；翻译指令较短，达不到时不会被缓存）
+- user：可变内容（字幕文本、片段序号、建议长度、标题等）
+get_*_prompt 返回两部分拼接后的单条 Prompt（兼容只接受一条消息的调用方）。
 """
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
 from core.language import get_language_name
 
 # Prompt 版本号（当 Prompt 模板有重大变更时更新此版本号）
-PROMPT_VERSION = "1.0.0"
+PROMPT_VERSION = "1.1.0"
+
+
+@dataclass(frozen=True)
+class PromptParts:
+    """拆分为可缓存前缀（system）和可变后缀（user）的 Prompt"""
+
+    system: str
+    user: str
+
+    @property
+    def text(self) -> str:
+        """拼接后的单条 Prompt"""
+        return f"{self.system}\n\n{self.user}"
+
+
+def split_prompt(prompt: Union[str, PromptParts]) -> Tuple[str, Optional[str]]:
+    """拆成 LLMClient.generate 的 (prompt, system) 参数（单条字符串时 system 为 None）"""
+    if isinstance(prompt, PromptParts):
+        return prompt.user, prompt.system
+    return prompt, None
+
+
+def _target_language_spec(target_language: str) -> str:
+    """获取 Prompt 中目标语言的名称（中文明确区分简体 / 繁体）"""
+    if target_language.lower() in ["zh-cn", "zh_cn", "zh"]:
+        return "简体中文"
+    elif target_language.lower() in ["zh-tw", "zh_tw", "zh-hant"]:
+        return "繁体中文"
+    return get_language_name(target_language)
+
+
+def build_translation_prompt(
+    source_language: str, target_language: str, subtitle_text: str
+) -> PromptParts:
+    """构建字幕翻译 Prompt（静态指令 + 字幕内容）
+
+    指令部分只与语言对有关，同一语言对的所有分块、所有视频逐字节相同。
+
+    Args:
+        source_language: 源语言代码（如 "en", "ja"）
+        target_language: 目标语言代码（如 "zh-CN", "en-US"）
+        subtitle_text: 字幕文本内容
+
+    Returns:
+        PromptParts 对象
+    """
+    source_lang_name = get_language_name(source_language)
+    target_lang_spec = _target_language_spec(target_language)
+
+    system = f"""请将以下字幕从 {source_lang_name} 翻译成 {target_lang_spec}。
+
+要求：
+1. 保持字幕的时间轴格式（时间码）
+2. 翻译要自然流畅，符合目标语言的表达习惯
+3. 保持字幕的原始结构和换行
+4. 如果目标语言是中文，请使用简体中文（不要使用繁体中文）"""
+
+    user = f"""字幕内容：
+{subtitle_text}
+
+请直接返回翻译后的字幕内容，保持 SRT 格式。"""
+
+    return PromptParts(system=system, user=user)
 
 
 def get_translation_prompt(
@@ -25,30 +96,98 @@ def get_translation_prompt(
     Returns:
         完整的翻译 Prompt
     """
-    source_lang_name = get_language_name(source_language)
-    target_lang_name = get_language_name(target_language)
+    return build_translation_prompt(source_language, target_language, subtitle_text).text
 
-    # 如果是简体中文，在 prompt 中明确说明
-    target_lang_spec = target_lang_name
-    if target_language.lower() in ["zh-cn", "zh_cn", "zh"]:
-        target_lang_spec = "简体中文"
-    elif target_language.lower() in ["zh-tw", "zh_tw", "zh-hant"]:
-        target_lang_spec = "繁体中文"
 
-    prompt = f"""请将以下字幕从 {source_lang_name} 翻译成 {target_lang_spec}。
+def build_multi_target_translation_prompt(
+    source_language: str, target_languages: List[str], subtitle_text: str
+) -> PromptParts:
+    """构建多目标语言字幕翻译 Prompt（一次请求返回所有目标语言）
+
+    源字幕只发送一次，每种目标语言的译文包裹在
+    <translation lang="语言代码"> ... </translation> 标签中返回，
+    由 core.translator.multi_target.parse_multi_target_response 拆分。
+
+    Args:
+        source_language: 源语言代码（如 "en", "ja"）
+        target_languages: 目标语言代码列表（如 ["zh-CN", "ja-JP"]）
+        subtitle_text: 字幕文本内容
+
+    Returns:
+        PromptParts 对象
+    """
+    source_lang_name = get_language_name(source_language)
+    targets = "\n".join(
+        f"- {lang}：{_target_language_spec(lang)}" for lang in target_languages
+    )
+    example_lang = target_languages[0]
+
+    system = f"""请将以下字幕从 {source_lang_name} 分别翻译成下列每一种目标语言：
+{targets}
 
 要求：
-1. 保持字幕的时间轴格式（时间码）
+1. 保持字幕的时间轴格式（时间码），每种语言的字幕条目数必须与原文一致
 2. 翻译要自然流畅，符合目标语言的表达习惯
 3. 保持字幕的原始结构和换行
 4. 如果目标语言是中文，请使用简体中文（不要使用繁体中文）
-
-字幕内容：
+5. 每种目标语言的完整译文放在单独的标签中，标签的 lang 属性使用上面列出的语言代码，例如：
+<translation lang="{example_lang}">
+1
+00:00:01,000 --> 00:00:02,000
+译文
+</translation>"""
+
+    user = f"""字幕内容：
 {subtitle_text}
 
-请直接返回翻译后的字幕内容，保持 SRT 格式。"""
+请只返回 {len(target_languages)} 个 <translation> 标签，每个标签内保持 SRT 格式，不要添加其他说明。"""
 
-    return prompt
+    return PromptParts(system=system, user=user)
+
+
+def get_multi_target_translation_prompt(
+    source_language: str, target_languages: List[str], subtitle_text: str
+) -> str:
+    """获取多目标语言字幕翻译 Prompt（单条消息形式，见 build_multi_target_translation_prompt）
+
+    Args:
+        source_language: 源语言代码（如 "en", "ja"）
+        target_languages: 目标语言代码列表（如 ["zh-CN", "ja-JP"]）
+        subtitle_text: 字幕文本内容
+
+    Returns:
+        完整的翻译 Prompt
+    """
+    return build_multi_target_translation_prompt(
+        source_language, target_languages, subtitle_text
+    ).text
+
+
+def build_batched_prompt(system: Optional[str], user_prompts: List[str]) -> PromptParts:
+    """把多个共享同一 system 指令的请求合并为一次请求（本地模型批处理）
+
+    原 system 指令保持在最前面（不破坏前缀缓存），每个请求包裹在 <request id="n"> 标签中，
+    模型按 <response id="n"> ... </response> 返回，由 core.ai_providers.batching.parse_batched_response 拆分。
+
+    Args:
+        system: 各请求共享的 system 指令（可为 None）
+        user_prompts: 各请求的 user 部分
+
+    Returns:
+        PromptParts 对象
+    """
+    instruction = f"""下面有 {len(user_prompts)} 个相互独立的请求，每个请求位于 <request id="编号"> 标签中。
+请按照同样的要求逐个完成，每个请求的完整结果放在对应编号的标签中，例如：
+<response id="1">
+第 1 个请求的结果
+</response>
+不要合并、遗漏或交换请求，也不要在标签外添加其他说明。"""
+    batched_system = f"{system}\n\n{instruction}" if system else instruction
+    user = "\n\n".join(
+        f'<request id="{number}">\n{prompt}\n</request>'
+        for number, prompt in enumerate(user_prompts, start=1)
+    )
+    return PromptParts(system=batched_system, user=user)
 
 
 def calculate_suggested_summary_length(
@@ -83,15 +222,25 @@ def calculate_suggested_summary_length(
         return (300, 800)
 
 
-def get_summary_prompt(
+def _summary_context(
+    min_words: int, max_words: int, video_title: Optional[str]
+) -> str:
+    """摘要 Prompt 可变部分的开头：建议长度和视频标题"""
+    context = f"建议摘要长度：{min_words}-{max_words} 字（仅供参考，确保覆盖所有重要信息）"
+    if video_title:
+        context += f"\n\n视频标题：{video_title}"
+    return context
+
+
+def build_summary_prompt(
     summary_language: str,
     subtitle_text: str,
     video_title: Optional[str] = None,
     duration_minutes: int = 0,
-) -> str:
-    """获取视频摘要 Prompt
+) -> PromptParts:
+    """构建视频摘要 Prompt（静态指令 + 建议长度、标题和字幕内容）
 
-    根据字幕文本长度动态调整推荐字数
+    根据字幕文本长度动态调整推荐字数；推荐字数放在可变部分，指令部分只与摘要语言有关。
 
     Args:
         summary_language: 摘要语言代码（如 "zh-CN", "en-US"）
@@ -100,21 +249,21 @@ def get_summary_prompt(
         duration_minutes: 视频时长（分钟，已弃用）
 
     Returns:
-        完整的摘要 Prompt
+        PromptParts 对象
     """
     summary_lang_name = get_language_name(summary_language)
-    
+
     # 计算推荐字数范围（基于字幕文本长度）
     min_words, max_words = calculate_suggested_summary_length(
         content_length=len(subtitle_text),
     )
 
-    prompt = f"""请用 {summary_lang_name} 为以下视频字幕生成一份详细摘要。
+    system = f"""请用 {summary_lang_name} 为以下视频字幕生成一份详细摘要。
 
 要求：
 1. 摘要语言：{summary_lang_name}
 2. **内容完整为第一优先级**
-   - 建议摘要长度：{min_words}-{max_words} 字
+   - 建议摘要长度见字幕内容前的说明
    - 这只是参考范围，如有需要可以增加或减少字数
    - 不强制限制字数，确保覆盖所有重要信息
 3. 内容要点：
@@ -139,17 +288,38 @@ def get_summary_prompt(
    - 简化重复表述，保留核心观点
    - 过滤无意义的寒暄和过渡语"""
 
-    if video_title:
-        prompt += f"\n\n视频标题：{video_title}"
-
-    prompt += f"""
+    user = f"""{_summary_context(min_words, max_words, video_title)}
 
 字幕内容：
 {subtitle_text}
 
 请直接返回摘要内容（Markdown 格式）。"""
 
-    return prompt
+    return PromptParts(system=system, user=user)
+
+
+def get_summary_prompt(
+    summary_language: str,
+    subtitle_text: str,
+    video_title: Optional[str] = None,
+    duration_minutes: int = 0,
+) -> str:
+    """获取视频摘要 Prompt
+
+    根据字幕文本长度动态调整推荐字数
+
+    Args:
+        summary_language: 摘要语言代码（如 "zh-CN", "en-US"）
+        subtitle_text: 字幕文本内容
+        video_title: 视频标题（可选）
+        duration_minutes: 视频时长（分钟，已弃用）
+
+    Returns:
+        完整的摘要 Prompt
+    """
+    return build_summary_prompt(
+        summary_language, subtitle_text, video_title, duration_minutes
+    ).text
 
 
 def get_bilingual_subtitle_prompt(
@@ -190,13 +360,13 @@ def get_bilingual_subtitle_prompt(
     return prompt
 
 
-def get_chunk_summary_prompt(
+def build_chunk_summary_prompt(
     summary_language: str,
     chunk_text: str,
     chunk_index: int,
     total_chunks: int,
-) -> str:
-    """获取分块摘要 Prompt（Map-Reduce 的 Map 阶段）
+) -> PromptParts:
+    """构建分块摘要 Prompt（Map-Reduce 的 Map 阶段）
 
     Args:
         summary_language: 摘要语言代码
@@ -205,13 +375,11 @@ def get_chunk_summary_prompt(
         total_chunks: 总分块数
 
     Returns:
-        完整的分块摘要 Prompt
+        PromptParts 对象
     """
     summary_lang_name = get_language_name(summary_language)
 
-    prompt = f"""请用 {summary_lang_name} 为以下视频字幕片段生成一份详细摘要。
-
-这是第 {chunk_index}/{total_chunks} 个片段。
+    system = f"""请用 {summary_lang_name} 为以下视频字幕片段生成一份详细摘要。
 
 要求：
 1. 摘要语言：{summary_lang_name}
@@ -222,23 +390,47 @@ def get_chunk_summary_prompt(
    - 主要论点和观点
    - 具体数据、案例和例子
    - 重要的细节和解释
-4. 直接返回摘要内容，不要加任何前缀或标签
+4. 直接返回摘要内容，不要加任何前缀或标签"""
+
+    user = f"""这是第 {chunk_index}/{total_chunks} 个片段。
 
 字幕片段：
 {chunk_text}"""
 
-    return prompt
+    return PromptParts(system=system, user=user)
 
 
-def get_reduce_summary_prompt(
+def get_chunk_summary_prompt(
+    summary_language: str,
+    chunk_text: str,
+    chunk_index: int,
+    total_chunks: int,
+) -> str:
+    """获取分块摘要 Prompt（Map-Reduce 的 Map 阶段）
+
+    Args:
+        summary_language: 摘要语言代码
+        chunk_text: 分块文本内容
+        chunk_index: 当前分块索引（从 1 开始）
+        total_chunks: 总分块数
+
+    Returns:
+        完整的分块摘要 Prompt
+    """
+    return build_chunk_summary_prompt(
+        summary_language, chunk_text, chunk_index, total_chunks
+    ).text
+
+
+def build_reduce_summary_prompt(
     summary_language: str,
     sub_summaries: str,
     video_title: Optional[str] = None,
     total_chunks: int = 0,
     duration_minutes: int = 0,
     text_length: int = 0,
-) -> str:
-    """获取合并摘要 Prompt（Map-Reduce 的 Reduce 阶段）
+) -> PromptParts:
+    """构建合并摘要 Prompt（Map-Reduce 的 Reduce 阶段）
 
     Args:
         summary_language: 摘要语言代码
@@ -249,39 +441,19 @@ def get_reduce_summary_prompt(
         text_length: 原始字幕文本长度
 
     Returns:
-        完整的合并摘要 Prompt
+        PromptParts 对象
     """
     summary_lang_name = get_language_name(summary_language)
-    
-    # 根据字幕文本长度计算推荐字数（优先使用文本长度）
-    # 规则：
-    # - 30000+ 字字幕 → 2000-5000 字摘要
-    # - 5001-29999 字字幕 → 1500-4000 字摘要
-    # - 5000 字字幕 → 800-1500 字摘要
-    # - 3000-4999 字字幕 → 500-1000 字摘要
-    # - 3000 字以下 → 300-800 字摘要
-    if text_length >= 30000:
-        min_words = 2000
-        max_words = 5000
-    elif text_length >= 5001:
-        min_words = 1500
-        max_words = 4000
-    elif text_length >= 5000:
-        min_words = 800
-        max_words = 1500
-    elif text_length >= 3000:
-        min_words = 500
-        max_words = 1000
-    else:
-        min_words = 300
-        max_words = 800
 
-    prompt = f"""请用 {summary_lang_name} 将以下多个片段摘要合并为一份完整、详细的视频摘要。
+    # 根据原始字幕文本长度计算推荐字数（与单次摘要规则一致）
+    min_words, max_words = calculate_suggested_summary_length(content_length=text_length)
+
+    system = f"""请用 {summary_lang_name} 将以下多个片段摘要合并为一份完整、详细的视频摘要。
 
 要求：
 1. 摘要语言：{summary_lang_name}
 2. **内容完整为第一优先级**
-   - 建议摘要长度：{min_words}-{max_words} 字
+   - 建议摘要长度见片段摘要前的说明
    - 这只是参考范围，如有需要可以增加或减少字数
    - 不强制限制字数，确保覆盖所有重要信息
 3. 内容要点：
@@ -292,15 +464,42 @@ def get_reduce_summary_prompt(
 4. 格式：使用 Markdown 格式，包含标题和段落
 5. 风格：条理清晰，信息密度高，避免空洞表述"""
 
-    if video_title:
-        prompt += f"\n\n视频标题：{video_title}"
-
-    prompt += f"""
+    user = f"""{_summary_context(min_words, max_words, video_title)}
 
 片段摘要：
 {sub_summaries}
 
 请直接返回完整摘要内容（Markdown 格式）。"""
 
-    return prompt
+    return PromptParts(system=system, user=user)
+
 
+def get_reduce_summary_prompt(
+    summary_language: str,
+    sub_summaries: str,
+    video_title: Optional[str] = None,
+    total_chunks: int = 0,
+    duration_minutes: int = 0,
+    text_length: int = 0,
+) -> str:
+    """获取合并摘要 Prompt（Map-Reduce 的 Reduce 阶段）
+
+    Args:
+        summary_language: 摘要语言代码
+        sub_summaries: 所有分块摘要的合并文本
+        video_title: 视频标题（可选）
+        total_chunks: 总分块数
+        duration_minutes: 视频时长（分钟）
+        text_length: 原始字幕文本长度
+
+    Returns:
+        完整的合并摘要 Prompt
+    """
+    return build_reduce_summary_prompt(
+        summary_language,
+        sub_summaries,
+        video_title,
+        total_chunks,
+        duration_minutes,
+        text_length,
+    ).text
@@ -1,9 +1,12 @@
 """
 代理管理器模块
-实现多代理列表管理、round-robin 轮询、简单健康检查
+实现多代理列表管理、按延迟/成功率加权选择（power-of-two-choices）、并发健康探测
 """
 
+import random
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -13,6 +16,18 @@ from core.logger import get_logger
 
 logger = get_logger()
 
+# EWMA 平滑系数（越大越偏重最近的结果）
+EWMA_ALPHA = 0.3
+
+# 尚无延迟样本时的假设延迟（毫秒），让新代理有机会被选中
+DEFAULT_LATENCY_MS = 1000.0
+
+# 成功率下限，避免得分除零
+MIN_SUCCESS_RATE = 0.05
+
+# power-of-two-choices 的随机采样尝试次数（跳过已排除的代理）
+_SAMPLE_ATTEMPTS = 4
+
 
 @dataclass
 class ProxyStatus:
@@ -27,9 +42,35 @@ class ProxyStatus:
     last_failure_time: Optional[datetime] = None  # 最后失败时间
     marked_unhealthy_time: Optional[datetime] = None  # 标记为不健康的时间
     is_unhealthy: bool = False  # 是否标记为不健康
+    latency_ewma_ms: Optional[float] = None  # 请求延迟 EWMA（毫秒）
+    success_ewma: float = 1.0  # 成功率 EWMA（0~1）
 
-    def mark_success(self):
-        """标记成功"""
+    def record_outcome(self, success: bool, latency_ms: Optional[float] = None):
+        """更新延迟和成功率的 EWMA
+
+        Args:
+            success: 请求是否成功
+            latency_ms: 请求延迟（毫秒），None 表示没有延迟样本
+        """
+        self.success_ewma += EWMA_ALPHA * ((1.0 if success else 0.0) - self.success_ewma)
+        if latency_ms is not None:
+            if self.latency_ewma_ms is None:
+                self.latency_ewma_ms = latency_ms
+            else:
+                self.latency_ewma_ms += EWMA_ALPHA * (latency_ms - self.latency_ewma_ms)
+
+    def score(self) -> float:
+        """选择得分（越小越好）：期望延迟 / 成功率"""
+        latency = DEFAULT_LATENCY_MS if self.latency_ewma_ms is None else self.latency_ewma_ms
+        return latency / max(self.success_ewma, MIN_SUCCESS_RATE)
+
+    def mark_success(self, latency_ms: Optional[float] = None):
+        """标记成功
+
+        Args:
+            latency_ms: 请求延迟（毫秒），可选
+        """
+        self.record_outcome(True, latency_ms)
         self.consecutive_failures = 0
         self.total_successes += 1
         self.last_success_time = datetime.now()
@@ -46,6 +87,7 @@ class ProxyStatus:
             error: 错误原因
             failure_threshold: 失败阈值（连续失败超过此值标记为不健康），默认 5
         """
+        self.record_outcome(False)
         self.consecutive_failures += 1
         self.total_failures += 1
         self.last_error = error
@@ -82,8 +124,9 @@ class ProxyStatus:
 class ProxyManager:
     """代理管理器
 
-    实现 round-robin 轮询策略和简单健康管理。
-    支持多代理列表（数量不锁死），连续失败超过阈值暂时禁用，延迟后重试。
+    从增量维护的健康代理集合中按 power-of-two-choices 选择：随机取两个，
+    使用延迟/成功率 EWMA 得分更好的那个（O(1)，不在每次请求时重建列表）。
+    支持多代理列表（数量不锁死），连续失败超过阈值暂时禁用，延迟后并发探测恢复。
     """
 
     def __init__(
@@ -94,6 +137,8 @@ class ProxyManager:
         enable_health_probe: bool = True,
         probe_interval_minutes: int = 5,
         quiet: bool = False,
+        probe_concurrency: int = 8,
+        probe_timeout: float = 5,
     ):
         """初始化代理管理器
 
@@ -104,6 +149,8 @@ class ProxyManager:
             enable_health_probe: 是否启用健康探测，默认 True
             probe_interval_minutes: 健康探测间隔（分钟），默认 5
             quiet: 是否进入静默模式，默认 False
+            probe_concurrency: 健康探测并发数，默认 8
+            probe_timeout: 单个代理探测超时（秒），默认 5
         """
         # 验证并过滤无效代理
         valid_proxies = []
@@ -127,6 +174,8 @@ class ProxyManager:
         self.enable_health_probe = enable_health_probe
         self.probe_interval_minutes = probe_interval_minutes
         self.quiet = quiet
+        self.probe_concurrency = max(1, probe_concurrency)
+        self.probe_timeout = probe_timeout
         self.allow_direct_connection = True  # 允许直连降级
 
         # 初始化代理状态
@@ -134,7 +183,12 @@ class ProxyManager:
         for proxy in self.proxies:
             self._proxy_statuses[proxy] = ProxyStatus(proxy=proxy)
 
-        # round-robin 索引
+        # 健康代理集合（列表 + 下标索引，O(1) 增删和随机采样）
+        self._healthy: List[str] = list(self._proxy_statuses)
+        self._healthy_pos: Dict[str, int] = {p: i for i, p in enumerate(self._healthy)}
+        self._random = random.Random()
+
+        # 降级路径（无健康代理时）的 round-robin 索引
         self._current_index = 0
         self._lock = threading.Lock()
 
@@ -195,7 +249,7 @@ class ProxyManager:
             return False
 
     def get_next_proxy(self, allow_direct: bool = True, exclude: set = None) -> Optional[str]:
-        """获取下一个代理（round-robin 轮询）
+        """获取下一个代理（健康代理中按 power-of-two-choices 加权选择）
 
         Args:
             allow_direct: 如果所有代理都不健康，是否允许返回 None（表示直连），默认 True
@@ -210,33 +264,31 @@ class ProxyManager:
         exclude = exclude or set()
 
         with self._lock:
-            # 尝试找到健康的代理（排除已尝试的）
-            healthy_proxies = [
-                p for p in self.proxies 
-                if not self._proxy_statuses[p].is_unhealthy and p not in exclude
-            ]
+            # 常规路径：从健康集合中选择（排除已尝试的）
+            proxy = self._pick_healthy(exclude)
+            if proxy is not None:
+                return proxy
 
-            # 如果没有健康的代理，检查是否有可以重试的（也排除已尝试的）
-            if not healthy_proxies:
-                retryable_proxies = [
-                    p
-                    for p in self.proxies
-                    if self._proxy_statuses[p].should_retry(self.retry_delay_minutes)
-                    and p not in exclude
-                ]
-                if retryable_proxies:
-                    logger.info_i18n(
-                        "proxy_retry_attempt", count=len(retryable_proxies)
-                    )
-                    healthy_proxies = retryable_proxies
+            # 以下为降级路径：没有可用的健康代理
+            healthy_proxies: List[str] = []
+
+            # 检查是否有可以重试的（也排除已尝试的）
+            retryable_proxies = [
+                p
+                for p in self.proxies
+                if self._proxy_statuses[p].should_retry(self.retry_delay_minutes)
+                and p not in exclude
+            ]
+            if retryable_proxies:
+                logger.info_i18n(
+                    "proxy_retry_attempt", count=len(retryable_proxies)
+                )
+                healthy_proxies = retryable_proxies
 
             # 如果排除后没有可用代理，但有被排除的健康代理，降级使用
             if not healthy_proxies and exclude:
                 # 尝试使用被排除但健康的代理（最后手段）
-                excluded_healthy = [
-                    p for p in self.proxies 
-                    if not self._proxy_statuses[p].is_unhealthy and p in exclude
-                ]
+                excluded_healthy = [p for p in self._healthy if p in exclude]
                 if excluded_healthy:
                     # 选择失败次数最少的
                     best = min(excluded_healthy, 
@@ -270,6 +322,55 @@ class ProxyManager:
 
             return None
 
+    def _pick_healthy(self, exclude: set) -> Optional[str]:
+        """从健康集合中随机取两个，返回得分更好的那个（调用方持有锁）
+
+        Args:
+            exclude: 要排除的代理集合
+
+        Returns:
+            代理 URL，没有可用的健康代理时返回 None
+        """
+        candidates = self._healthy
+        if exclude and len(exclude) * 2 >= len(candidates):
+            # 排除集合覆盖了大部分健康代理（重试尾部），退化为过滤
+            candidates = [p for p in candidates if p not in exclude]
+            exclude = None
+        if not candidates:
+            return None
+
+        picks: List[str] = []
+        for _ in range(_SAMPLE_ATTEMPTS):
+            proxy = candidates[self._random.randrange(len(candidates))]
+            if exclude and proxy in exclude:
+                continue
+            if proxy not in picks:
+                picks.append(proxy)
+            if len(picks) == 2 or len(picks) == len(candidates):
+                break
+
+        if not picks:
+            remaining = [p for p in candidates if p not in exclude]
+            if not remaining:
+                return None
+            picks = [self._random.choice(remaining)]
+
+        return min(picks, key=lambda p: self._proxy_statuses[p].score())
+
+    def _sync_healthy(self, proxy: str) -> None:
+        """根据代理状态更新健康集合（调用方持有锁）"""
+        healthy = not self._proxy_statuses[proxy].is_unhealthy
+        position = self._healthy_pos.get(proxy)
+        if healthy and position is None:
+            self._healthy_pos[proxy] = len(self._healthy)
+            self._healthy.append(proxy)
+        elif not healthy and position is not None:
+            # 与末尾元素交换后弹出，O(1)
+            last = self._healthy.pop()
+            del self._healthy_pos[proxy]
+            if last != proxy:
+                self._healthy[position] = last
+                self._healthy_pos[last] = position
 
     def _get_best_unhealthy_proxy(self) -> Optional[str]:
         """获取失败最少的代理（降级策略）
@@ -298,18 +399,20 @@ class ProxyManager:
 
         return best_proxy
 
-    def mark_success(self, proxy: str):
+    def mark_success(self, proxy: str, latency_ms: Optional[float] = None):
         """标记代理成功
 
         Args:
             proxy: 代理 URL
+            latency_ms: 请求延迟（毫秒），可选，用于加权选择
         """
         if proxy not in self._proxy_statuses:
             return
 
         with self._lock:
             status = self._proxy_statuses[proxy]
-            recovered = status.mark_success()
+            recovered = status.mark_success(latency_ms)
+            self._sync_healthy(proxy)
 
             if recovered:
                 logger.info_i18n("proxy_recovered", proxy=proxy)
@@ -325,7 +428,17 @@ class ProxyManager:
             return
 
         with self._lock:
-            self._proxy_statuses[proxy].mark_failure(error, self.failure_threshold)
+            status = self._proxy_statuses[proxy]
+            was_unhealthy = status.is_unhealthy
+            status.mark_failure(error, self.failure_threshold)
+            self._sync_healthy(proxy)
+            became_unhealthy = status.is_unhealthy and not was_unhealthy
+
+        if became_unhealthy:
+            # 丢弃该代理会话中的陈旧连接（恢复后按需重建）
+            from core.http_client import get_http_client
+
+            get_http_client().close_proxy(proxy)
 
     def get_proxy_status(self, proxy: str) -> Optional[ProxyStatus]:
         """获取代理状态
@@ -354,9 +467,7 @@ class ProxyManager:
             健康代理数量
         """
         with self._lock:
-            return sum(
-                1 for status in self._proxy_statuses.values() if not status.is_unhealthy
-            )
+            return len(self._healthy)
 
     def get_unhealthy_count(self) -> int:
         """获取不健康代理数量
@@ -365,9 +476,7 @@ class ProxyManager:
             不健康代理数量
         """
         with self._lock:
-            return sum(
-                1 for status in self._proxy_statuses.values() if status.is_unhealthy
-            )
+            return len(self._proxy_statuses) - len(self._healthy)
 
     def reset_proxy(self, proxy: str):
         """重置代理状态（手动恢复）
@@ -384,16 +493,18 @@ class ProxyManager:
             status.is_unhealthy = False
             status.marked_unhealthy_time = None
             status.last_error = None
+            self._sync_healthy(proxy)
             logger.info_i18n("proxy_status_reset", proxy=proxy)
 
     def reset_all(self):
         """重置所有代理状态"""
         with self._lock:
-            for status in self._proxy_statuses.values():
+            for proxy, status in self._proxy_statuses.items():
                 status.consecutive_failures = 0
                 status.is_unhealthy = False
                 status.marked_unhealthy_time = None
                 status.last_error = None
+                self._sync_healthy(proxy)
             logger.info_i18n("proxy_all_status_reset")
 
     def _start_health_probe(self):
@@ -404,21 +515,14 @@ class ProxyManager:
         def probe_worker():
             """健康探测工作线程"""
             try:
-                import requests
+                import requests  # noqa: F401
             except ImportError:
                 logger.warning_i18n("proxy_health_probe_unavailable")
                 return
 
-            from requests.adapters import HTTPAdapter
-            from urllib3.util.retry import Retry
+            from core.http_client import get_http_client
 
-            # 配置重试策略
-            retry_strategy = Retry(
-                total=1,  # 只重试 1 次
-                backoff_factor=0.5,
-                status_forcelist=[429, 500, 502, 503, 504],
-            )
-            adapter = HTTPAdapter(max_retries=retry_strategy)
+            http_client = get_http_client()
 
             while not self._stop_probe.is_set():
                 try:
@@ -426,66 +530,7 @@ class ProxyManager:
                     if self._stop_probe.wait(timeout=self.probe_interval_minutes * 60):
                         break  # 收到停止信号
 
-                    # 获取需要探测的代理（unhealthy 且已过重试延迟）
-                    with self._lock:
-                        unhealthy_proxies = [
-                            (proxy, status)
-                            for proxy, status in self._proxy_statuses.items()
-                            if status.is_unhealthy
-                            and status.should_retry(self.retry_delay_minutes)
-                        ]
-
-                    if not unhealthy_proxies:
-                        continue
-
-                    logger.debug_i18n(
-                        "proxy_health_probe_start", count=len(unhealthy_proxies)
-                    )
-
-                    # 对每个 unhealthy 代理进行轻量探测
-                    for proxy, status in unhealthy_proxies:
-                        if self._stop_probe.is_set():
-                            break
-
-                        try:
-                            # 轻量探测：尝试访问一个简单的 URL
-                            session = requests.Session()
-                            session.mount("http://", adapter)
-                            session.mount("https://", adapter)
-
-                            # 配置代理
-                            proxies = {"http": proxy, "https": proxy}
-
-                            # 轻量探测请求（使用 Google 的简单页面）
-                            response = session.get(
-                                "http://www.google.com",
-                                proxies=proxies,
-                                timeout=5,  # 5 秒超时
-                                allow_redirects=False,
-                            )
-
-                            # 如果请求成功（任何状态码都算成功，说明代理可用）
-                            if response.status_code in [200, 301, 302, 307, 308]:
-                                with self._lock:
-                                    if proxy in self._proxy_statuses:
-                                        self.mark_success(proxy)
-                                        logger.info_i18n(
-                                            "proxy_health_probe_success", proxy=proxy
-                                        )
-                            else:
-                                logger.debug_i18n(
-                                    "proxy_health_probe_failed_status",
-                                    proxy=proxy,
-                                    status_code=response.status_code,
-                                )
-
-                        except Exception as e:
-                            logger.debug_i18n(
-                                "proxy_health_probe_failed_error",
-                                proxy=proxy,
-                                error=str(e),
-                            )
-                            # 探测失败不影响代理状态（不增加失败计数）
+                    self.probe_unhealthy(http_client)
 
                 except Exception as e:
                     logger.warning_i18n("proxy_health_probe_thread_error", error=str(e))
@@ -497,6 +542,75 @@ class ProxyManager:
         if not getattr(self, "quiet", False):
             logger.debug_i18n("proxy_health_probe_started")
 
+    def probe_unhealthy(self, http_client=None) -> int:
+        """并发探测所有 unhealthy 且已过重试延迟的代理
+
+        使用有界线程池，一轮探测耗时约为 ceil(N / probe_concurrency) × probe_timeout，
+        而不是逐个探测的 N × probe_timeout
+
+        Args:
+            http_client: HttpClient 实例，None 时使用全局实例
+
+        Returns:
+            本轮恢复的代理数量
+        """
+        with self._lock:
+            proxies = [
+                proxy
+                for proxy, status in self._proxy_statuses.items()
+                if status.is_unhealthy and status.should_retry(self.retry_delay_minutes)
+            ]
+        if not proxies:
+            return 0
+
+        if http_client is None:
+            from core.http_client import get_http_client
+
+            http_client = get_http_client()
+
+        logger.debug_i18n("proxy_health_probe_start", count=len(proxies))
+        workers = min(self.probe_concurrency, len(proxies))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="proxy-probe") as pool:
+            results = list(pool.map(lambda p: self._probe_proxy(http_client, p), proxies))
+        return sum(results)
+
+    def _probe_proxy(self, http_client, proxy: str) -> bool:
+        """探测单个代理，成功时恢复为健康并记录延迟
+
+        Returns:
+            是否探测成功
+        """
+        if self._stop_probe.is_set():
+            return False
+        try:
+            started = time.perf_counter()
+            # 轻量探测请求（使用 Google 的简单页面，复用该代理的会话）
+            response = http_client.get(
+                "http://www.google.com",
+                proxy=proxy,
+                timeout=self.probe_timeout,
+                retries=0,
+                allow_redirects=False,
+            )
+            latency_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            # 探测失败不影响代理状态（不增加失败计数）
+            logger.debug_i18n("proxy_health_probe_failed_error", proxy=proxy, error=str(e))
+            return False
+
+        # 如果请求成功（任何状态码都算成功，说明代理可用）
+        if response.status_code in [200, 301, 302, 307, 308]:
+            self.mark_success(proxy, latency_ms=latency_ms)
+            logger.info_i18n("proxy_health_probe_success", proxy=proxy)
+            return True
+
+        logger.debug_i18n(
+            "proxy_health_probe_failed_status",
+            proxy=proxy,
+            status_code=response.status_code,
+        )
+        return False
+
     def stop_health_probe(self):
         """停止健康探测线程"""
         if self._probe_thread and self._probe_thread.is_alive():
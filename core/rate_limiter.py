@@ -0,0 +1,325 @@
+"""
+YouTube 请求限速模块
+按出口身份（代理 + Cookie）维护令牌桶，所有 yt-dlp 调用和直连字幕下载都从中获取令牌：
+
+- 默认不限速；配置了速率时令牌桶按该速率匀速补充，允许最多 burst 个请求突发，
+  令牌不足时精确等待到下一个令牌可用
+- 同一出口身份的所有 worker 共享一个桶，不同代理 / Cookie 互不影响
+- 遇到 429 / 机器人验证时按乘法降低该身份的速率，之后每次成功请求逐步恢复（AIMD）；
+  未配置速率的出口在被限流后才开始按 THROTTLE_RATE 限速，恢复后回到不限速
+
+取代原先固定的随机睡眠（首次 0.5–1.5 秒、重试 5–10 秒）。
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+# 默认速率：每个出口身份每秒请求数（0 表示不限速，只在被限流后自适应限速）
+DEFAULT_RATE = 0.0
+
+# 未配置速率的出口被限流后开始限速的基准速率（每秒请求数）
+THROTTLE_RATE = 1.0
+
+# 默认突发大小（桶容量）
+DEFAULT_BURST = 3
+
+# 遇到限流时的速率乘数
+BACKOFF_FACTOR = 0.5
+
+# 速率下限（相对配置速率）
+MIN_RATE_FACTOR = 0.1
+
+# 每次成功请求恢复的速率（相对配置速率）
+RECOVERY_STEP = 0.05
+
+# 限流 / 机器人验证的错误特征（小写；不匹配裸的 "429"，视频 ID / URL 中可能包含）
+THROTTLE_MARKERS = (
+    "http error 429",
+    "status code 429",
+    "too many requests",
+    "rate limit",
+    "rate-limit",
+    "sign in to confirm",
+    "not a bot",
+)
+
+_DIRECT = "direct"  # 直连出口的键
+
+
+def is_throttle_error(message: Optional[str]) -> bool:
+    """判断错误信息是否为限流或机器人验证
+
+    Args:
+        message: 错误信息（如 yt-dlp stderr、HTTP 异常文本）
+
+    Returns:
+        是否为限流类错误
+    """
+    if not message:
+        return False
+    lower = message.lower()
+    return any(marker in lower for marker in THROTTLE_MARKERS)
+
+
+def identity_from_command(cmd: Union[Sequence[str], str]) -> Tuple[Optional[str], Optional[str]]:
+    """从 yt-dlp 命令行中提取出口身份
+
+    Args:
+        cmd: yt-dlp 命令（列表）
+
+    Returns:
+        (代理 URL, Cookie 文件路径)，未指定的项为 None
+    """
+    if isinstance(cmd, str):
+        return None, None
+    args: List[str] = list(cmd)
+    proxy = cookie = None
+    for i, arg in enumerate(args[:-1]):
+        if arg == "--proxy":
+            proxy = args[i + 1] or None
+        elif arg == "--cookies":
+            cookie = args[i + 1] or None
+    return proxy, cookie
+
+
+class TokenBucket:
+    """令牌桶（线程安全）
+
+    acquire 先预订令牌再等待：并发调用按到达顺序排队，各自精确睡眠到自己的令牌可用，
+    不会出现忙等或同时醒来再次争抢。
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数（0 表示不限速）
+            burst: 桶容量（允许的突发请求数）
+            clock: 单调时钟（测试时可替换）
+        """
+        self.rate = max(0.0, rate)
+        self.burst = max(1, burst)
+        self.factor = 1.0  # 当前速率 = rate * factor
+        # 未配置速率、因被限流才开始限速（恢复后回到不限速）
+        self.adaptive = False
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def current_rate(self) -> float:
+        """当前生效的速率（每秒请求数）"""
+        return self.rate * self.factor
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.current_rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """预订一个令牌
+
+        Returns:
+            需要等待的秒数（0 表示立即可用）
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.current_rate
+
+    def refund(self) -> None:
+        """归还一个未使用的预订令牌（等待被取消时）"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + 1)
+
+    def acquire(self, cancel_token=None) -> float:
+        """获取一个令牌，必要时等待
+
+        Args:
+            cancel_token: 取消令牌（可选），取消时立即返回并归还令牌
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = self.reserve()
+        if wait <= 0:
+            return 0.0
+        if cancel_token is not None:
+            if cancel_token.wait(wait):
+                self.refund()
+        else:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self) -> float:
+        """遇到限流：降低速率并清空剩余突发额度（不限速的桶从 THROTTLE_RATE 开始限速）
+
+        Returns:
+            降低后的速率
+        """
+        with self._lock:
+            now = self._clock()
+            if self.rate <= 0:
+                self.rate = THROTTLE_RATE
+                self.factor = 1.0
+                self.adaptive = True
+                self._updated = now
+            self._refill(now)
+            self.factor = max(MIN_RATE_FACTOR, self.factor * BACKOFF_FACTOR)
+            self._tokens = min(self._tokens, 0.0)
+            return self.current_rate
+
+    def reward(self) -> None:
+        """请求成功：逐步恢复速率（自适应限速的桶完全恢复后回到不限速）"""
+        if self.factor >= 1.0:
+            return
+        with self._lock:
+            self._refill(self._clock())
+            self.factor = min(1.0, self.factor + RECOVERY_STEP)
+            if self.adaptive and self.factor >= 1.0:
+                self.rate = 0.0
+                self.adaptive = False
+                self._tokens = float(self.burst)
+
+    def configure(self, rate: float, burst: int) -> None:
+        """更新速率和突发大小（保留当前降速状态；仍在自适应限速中的桶不受不限速配置影响）"""
+        with self._lock:
+            self._refill(self._clock())
+            if rate > 0 or not self.adaptive:
+                self.rate = max(0.0, rate)
+                self.adaptive = False
+            self.burst = max(1, burst)
+            self._tokens = min(self._tokens, float(self.burst))
+
+
+class RateLimiter:
+    """按出口身份（代理 + Cookie）划分的令牌桶集合（线程安全）"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """初始化限速器
+
+        Args:
+            rate: 每个出口身份每秒请求数（0 表示不限速）
+            burst: 每个出口身份允许的突发请求数
+        """
+        self.rate = max(0.0, rate)
+        self.burst = max(1, burst)
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """更新速率和突发大小（同时应用到已有的桶）
+
+        Args:
+            rate: 每个出口身份每秒请求数，None 表示不变
+            burst: 突发请求数，None 表示不变
+        """
+        with self._lock:
+            if rate is not None:
+                self.rate = max(0.0, rate)
+            if burst is not None:
+                self.burst = max(1, burst)
+            buckets = list(self._buckets.values())
+        for bucket in buckets:
+            bucket.configure(self.rate, self.burst)
+
+    def bucket(self, proxy: Optional[str] = None, cookie: Optional[str] = None) -> TokenBucket:
+        """获取（必要时创建）出口身份对应的令牌桶
+
+        Args:
+            proxy: 代理 URL，None 表示直连
+            cookie: Cookie 文件路径，None 表示不使用 Cookie
+        """
+        key = (proxy or _DIRECT, cookie or "")
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[key] = bucket
+        return bucket
+
+    def acquire(
+        self,
+        proxy: Optional[str] = None,
+        cookie: Optional[str] = None,
+        cancel_token=None,
+    ) -> float:
+        """在发起 YouTube 请求前获取令牌
+
+        Args:
+            proxy: 代理 URL，None 表示直连
+            cookie: Cookie 文件路径
+            cancel_token: 取消令牌（可选）
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = self.bucket(proxy, cookie).acquire(cancel_token)
+        if waited > 0:
+            logger.debug(f"限速等待 {waited:.2f}s（出口: {(proxy or _DIRECT)[:30]}）")
+        return waited
+
+    def report(
+        self,
+        proxy: Optional[str] = None,
+        cookie: Optional[str] = None,
+        throttled: bool = False,
+    ) -> None:
+        """报告请求结果，限流时降低该出口身份的速率，成功时逐步恢复
+
+        Args:
+            proxy: 代理 URL，None 表示直连
+            cookie: Cookie 文件路径
+            throttled: 是否遇到 429 / 机器人验证
+        """
+        bucket = self.bucket(proxy, cookie)
+        if throttled:
+            rate = bucket.penalize()
+            logger.warning_i18n(
+                "log.rate_limit_reduced",
+                identity=(proxy or _DIRECT)[:30],
+                rate=f"{rate:.2f}",
+            )
+        else:
+            bucket.reward()
+
+
+# 全局单例
+_global_rate_limiter: Optional[RateLimiter] = None
+_global_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取全局限速器实例（单例模式）
+
+    Returns:
+        RateLimiter 实例
+    """
+    global _global_rate_limiter
+
+    if _global_rate_limiter is None:
+        with _global_lock:
+            if _global_rate_limiter is None:
+                _global_rate_limiter = RateLimiter()
+    return _global_rate_limiter
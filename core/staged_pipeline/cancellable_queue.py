@@ -0,0 +1,167 @@
+"""
+可取消的阶段输入队列
+
+基于条件变量实现，替代 ``queue.Queue`` + 超时轮询：
+- worker 阻塞在条件变量上，没有周期性空转唤醒
+- ``close()`` 以及取消令牌触发时立即唤醒所有等待者（包括阻塞在 put 上的生产者）
+- 关闭是队列状态而不是放入队列的哨兵，因此队列满时也不会丢失停止信号
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Optional
+
+from core.cancel_token import CancelToken
+
+
+class QueueClosed(Exception):
+    """队列已关闭（或已取消），不再产出/接收数据"""
+
+
+class CancellableQueue:
+    """可取消、可关闭的有界 FIFO 队列
+
+    接口与 ``queue.Queue`` 保持相近（put/get/task_done/join/qsize/empty），
+    差别在于关闭与取消语义：
+
+    - ``close(drain=False)``：立即唤醒所有等待者，get 直接抛出 QueueClosed，
+      队列中剩余数据被保留但不再产出
+    - ``close(drain=True)``：不再接收新数据，已入队的数据取完后 get 才抛出 QueueClosed
+    - 绑定的取消令牌触发时等同于 ``close(drain=False)``
+    """
+
+    def __init__(self, maxsize: int = 0, cancel_token: Optional[CancelToken] = None):
+        """初始化队列
+
+        Args:
+            maxsize: 最大长度，<= 0 表示不限制
+            cancel_token: 取消令牌（可选），取消时队列立即关闭
+        """
+        self.maxsize = maxsize
+        self._items: Deque[Any] = deque()
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_done = threading.Condition(self._mutex)
+        self._unfinished = 0
+        self._closed = False
+        self._drain = False
+        self._cancel_token = cancel_token
+        if cancel_token is not None:
+            cancel_token.register_callback(self._on_cancel)
+
+    def _on_cancel(self):
+        """取消令牌回调"""
+        self.close(drain=False)
+
+    def detach(self):
+        """从取消令牌上注销回调（队列不再使用时调用，避免令牌持有引用）"""
+        if self._cancel_token is not None:
+            self._cancel_token.unregister_callback(self._on_cancel)
+
+    @property
+    def closed(self) -> bool:
+        """队列是否已关闭"""
+        with self._mutex:
+            return self._closed
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        """放入数据，队列满时阻塞
+
+        Args:
+            item: 数据
+            timeout: 最长等待时间（秒），None 表示一直等到有空间或队列关闭
+
+        Raises:
+            QueueClosed: 队列已关闭
+            TimeoutError: 等待超时
+        """
+        with self._not_full:
+            if self.maxsize > 0:
+                if not self._not_full.wait_for(
+                    lambda: self._closed or len(self._items) < self.maxsize,
+                    timeout=timeout,
+                ):
+                    raise TimeoutError("CancellableQueue.put timed out")
+            if self._closed:
+                raise QueueClosed()
+            self._items.append(item)
+            self._unfinished += 1
+            self._not_empty.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """取出数据，队列空时阻塞
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等到有数据或队列关闭
+
+        Returns:
+            队首数据
+
+        Raises:
+            QueueClosed: 队列已关闭（drain 模式下为关闭且已取空）
+            TimeoutError: 等待超时
+        """
+        with self._not_empty:
+            ready = self._not_empty.wait_for(
+                lambda: self._closed or self._items, timeout=timeout
+            )
+            if not ready:
+                raise TimeoutError("CancellableQueue.get timed out")
+            if self._closed and not (self._drain and self._items):
+                raise QueueClosed()
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def task_done(self) -> None:
+        """标记一个已取出的数据处理完成"""
+        with self._all_done:
+            if self._unfinished <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished -= 1
+            if self._unfinished == 0:
+                self._all_done.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已入队的数据处理完成（或队列关闭）
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            完成（或关闭）返回 True，超时返回 False
+        """
+        with self._all_done:
+            return self._all_done.wait_for(
+                lambda: self._unfinished == 0 or (self._closed and not self._drain),
+                timeout=timeout,
+            )
+
+    def close(self, drain: bool = False) -> None:
+        """关闭队列并唤醒所有等待者
+
+        Args:
+            drain: True 时已入队数据仍可被取出；False 时立即停止产出
+        """
+        with self._mutex:
+            if self._closed:
+                # 已关闭：只允许从 drain 收紧为立即停止
+                if not drain:
+                    self._drain = False
+            else:
+                self._closed = True
+                self._drain = drain
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            self._all_done.notify_all()
+
+    def qsize(self) -> int:
+        """队列中等待的数据数量"""
+        with self._mutex:
+            return len(self._items)
+
+    def empty(self) -> bool:
+        """队列是否为空"""
+        with self._mutex:
+            return not self._items
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 
 from core.models import VideoInfo, DetectionResult
 from core.exceptions import ErrorType
+from core.artifact_store import ArtifactStore
 
 
 @dataclass
@@ -31,3 +32,21 @@ class StageData:
     is_processed: bool = False  # 是否已处理（用于增量管理）
     processing_failed: bool = False  # 处理是否失败（用于资源清理）
     run_id: Optional[str] = None  # 批次ID（run_id），用于日志和失败记录
+    artifacts: Optional[ArtifactStore] = None  # 阶段间产物存储（译文、摘要保存在内存中传递）
+
+    def artifact_exists(self, path: Optional[Path]) -> bool:
+        """产物是否存在（内存中或磁盘上）"""
+        if not path:
+            return False
+        if self.artifacts:
+            return self.artifacts.exists(path)
+        return path.exists()
+
+    def release_artifacts(self) -> None:
+        """释放本视频在产物存储中的内容
+
+        未完成输出的视频（失败、跳过、取消）先把只在内存中的中间结果写回临时目录，
+        与逐阶段写临时文件时一样保留给重跑续传。OUTPUT 阶段已释放时不做任何事。
+        """
+        if self.artifacts and self.temp_dir:
+            self.artifacts.discard(self.temp_dir, spill=True)
@@ -9,6 +9,7 @@ from core.logger import get_logger, set_log_context, clear_log_context, translat
 from core.exceptions import ErrorType, AppException, TaskCancelledError
 from core.cancel_token import CancelToken
 from core.detector import SubtitleDetector
+from core.language import LanguageConfig
 from core.i18n import t
 from ..data_types import StageData
 
@@ -33,6 +34,7 @@ class DetectProcessor:
         dry_run: bool,
         cancel_token: Optional[CancelToken],
         on_log: Optional[Callable[[str, str, Optional[str]], None]] = None,
+        language_config: Optional[LanguageConfig] = None,
     ):
         """初始化检测处理器
 
@@ -44,6 +46,7 @@ class DetectProcessor:
             dry_run: 是否 Dry Run 模式
             cancel_token: 取消令牌
             on_log: 日志回调
+            language_config: 语言配置（可选），提供时检测结果只保留相关字幕轨道
         """
         self.cookie_manager = cookie_manager
         self.incremental_manager = incremental_manager
@@ -52,6 +55,7 @@ class DetectProcessor:
         self.dry_run = dry_run
         self.cancel_token = cancel_token
         self.on_log = on_log
+        self.language_config = language_config
 
     def process(self, data: StageData) -> StageData:
         """处理 DETECT 阶段
@@ -107,7 +111,9 @@ class DetectProcessor:
 
             # 执行字幕检测
             detector = SubtitleDetector(cookie_manager=self.cookie_manager)
-            detection_result = detector.detect(data.video_info)
+            detection_result = detector.detect(
+                data.video_info, language_config=self.language_config
+            )
             data.detection_result = detection_result
 
             # 检查是否有字幕
@@ -108,7 +108,7 @@ class OutputProcessor:
                         and target_lang in official_translations
                     ):
                         official_path = official_translations[target_lang]
-                        if official_path and official_path.exists():
+                        if data.artifact_exists(official_path):
                             translation_result[target_lang] = official_path
                             logger.debug(
                                 f"补充官方字幕到翻译结果: {target_lang} <- {official_path}",
@@ -116,7 +116,7 @@ class OutputProcessor:
                             )
 
                 # 写入所有输出文件
-                self.output_writer.write_all(
+                output_dir = self.output_writer.write_all(
                     data.video_info,
                     data.detection_result,
                     self.language_config,
@@ -128,6 +128,7 @@ class OutputProcessor:
                     run_id=data.run_id,
                     translation_llm=self.translation_llm,
                     summary_llm=self.summary_llm,
+                    artifacts=data.artifacts,
                 )
 
                 # 写入章节文件（如果有章节）
@@ -144,12 +145,6 @@ class OutputProcessor:
                     }
                     chapter_list = extract_chapters_from_ytdlp(info_dict)
                     if chapter_list.has_chapters:
-                        # 获取输出目录
-                        output_dir = self.output_writer.get_video_output_dir(
-                            data.video_info,
-                            channel_name=data.video_info.channel_name,
-                            channel_id=data.video_info.channel_id,
-                        )
                         chapters_path = write_chapters_markdown(
                             chapter_list,
                             output_dir,
@@ -162,6 +157,7 @@ class OutputProcessor:
                                 count=chapter_list.chapter_count,
                             )
 
+                self.output_writer.finalize_video(data.video_info, output_dir)
                 logger.info_i18n("output_file_complete", video_id=vid)
             else:
                 logger.debug(f"[Dry Run] 跳过写入输出文件: {vid}", video_id=vid)
@@ -213,7 +209,9 @@ class OutputProcessor:
             logger.debug(traceback.format_exc(), video_id=vid)
             return data
         finally:
-            # 步骤 3: 清理临时目录（无论成功/失败/被取消都尝试清理）
+            # 步骤 3: 释放内存中的产物并清理临时目录（无论成功/失败/被取消都尝试清理）
+            if data.artifacts:
+                data.artifacts.discard(data.temp_dir)
             if data.temp_dir_created and data.temp_dir and data.temp_dir.exists():
                 try:
                     shutil.rmtree(data.temp_dir)
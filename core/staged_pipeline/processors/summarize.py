@@ -72,12 +72,12 @@ class SummarizeProcessor:
             has_translation = False
             if data.translation_result:
                 has_translation = any(
-                    path and path.exists() for path in data.translation_result.values()
+                    data.artifact_exists(path) for path in data.translation_result.values()
                 )
 
             has_original = False
             if data.download_result and data.download_result.get("original"):
-                has_original = data.download_result["original"].exists()
+                has_original = data.artifact_exists(data.download_result["original"])
 
             if not (has_translation or has_original):
                 logger.debug_i18n("summary_no_subtitle_skip", video_id=vid)
@@ -95,7 +95,9 @@ class SummarizeProcessor:
 
             # 生成摘要
             summarizer = Summarizer(
-                llm=self.summary_llm, language_config=self.language_config
+                llm=self.summary_llm,
+                language_config=self.language_config,
+                artifacts=data.artifacts,
             )
             summary_path = summarizer.summarize(
                 data.video_info,
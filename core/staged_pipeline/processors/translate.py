@@ -285,7 +285,9 @@ class TranslateProcessor:
                         "calling_translator", languages=needs_translation, video_id=vid
                     )
                     translator = SubtitleTranslator(
-                        llm=self.translation_llm, language_config=self.language_config
+                        llm=self.translation_llm,
+                        language_config=self.language_config,
+                        artifacts=data.artifacts,
                     )
                     # 只翻译需要的语言
                     partial_result = translator.translate(
@@ -320,17 +322,11 @@ class TranslateProcessor:
                     video_id=vid,
                 )
 
-            # 检查是否有翻译结果
-            any(
-                path and path.exists() for path in translation_result.values()
-            )
-
-            # 检查是否所有目标语言都有翻译结果
+            # 检查是否所有目标语言都有翻译结果（译文可能只在产物存储中）
             missing_languages = [
                 target_lang
                 for target_lang in self.language_config.subtitle_target_languages
-                if not translation_result.get(target_lang)
-                or not translation_result[target_lang].exists()
+                if not data.artifact_exists(translation_result.get(target_lang))
             ]
 
             if missing_languages:
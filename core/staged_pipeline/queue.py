@@ -2,9 +2,9 @@
 阶段队列管理
 """
 
-import queue
 import threading
-from typing import Optional, Dict, List, Callable
+import time
+from typing import Optional, Dict, List, Callable, TYPE_CHECKING
 from concurrent.futures import ThreadPoolExecutor
 
 from core.logger import get_logger
@@ -13,6 +13,10 @@ from core.exceptions import ErrorType, AppException, TaskCancelledError
 from core.cancel_token import CancelToken
 from core.failure_logger import FailureLogger
 from .data_types import StageData
+from .cancellable_queue import CancellableQueue, QueueClosed
+
+if TYPE_CHECKING:
+    from .worker_pool import SharedWorkerPool
 
 logger = get_logger()
 
@@ -20,13 +24,18 @@ logger = get_logger()
 class StageQueue:
     """阶段队列
 
-    管理单个阶段的队列和执行器，支持并发处理和错误处理
+    管理单个阶段的队列和执行器，支持并发处理和错误处理。
+    worker 阻塞在可取消队列上，取消或停止时立即被唤醒（无轮询）。
+
+    两种执行方式：
+    - 独立 worker：start() 为本阶段启动专属线程
+    - 共享 worker 池：传入 worker_pool 时不启动线程，由 SharedWorkerPool 跨阶段调度
     """
 
     def __init__(
         self,
         stage_name: str,
-        executor: ThreadPoolExecutor,
+        executor: Optional[ThreadPoolExecutor],
         processor: Callable[[StageData], StageData],
         next_stage_queue: Optional["StageQueue"] = None,
         max_queue_size: int = 100,  # 最大队列大小，防止内存溢出
@@ -34,12 +43,14 @@ class StageQueue:
         cancel_token: Optional[CancelToken] = None,  # 取消令牌
         on_error: Optional[Callable[[StageData], None]] = None,  # 错误回调
         on_complete: Optional[Callable[[StageData], None]] = None,  # 完成回调（用于最后阶段）
+        on_progress: Optional[Callable[[], None]] = None,  # 进度回调（每处理完一条数据）
+        worker_pool: Optional["SharedWorkerPool"] = None,  # 共享 worker 池（可选）
     ):
         """初始化阶段队列
 
         Args:
             stage_name: 阶段名称（如 "detect", "download" 等）
-            executor: 线程池执行器
+            executor: 线程池执行器（仅用于读取默认 worker 数，可为 None）
             processor: 阶段处理函数 (StageData) -> StageData
             next_stage_queue: 下一阶段的队列（如果为 None 则表示这是最后一个阶段）
             max_queue_size: 最大队列大小
@@ -47,6 +58,8 @@ class StageQueue:
             cancel_token: 取消令牌
             on_error: 错误回调
             on_complete: 完成回调（最后阶段成功时调用）
+            on_progress: 进度回调（每处理完一条数据调用，用于唤醒调度器）
+            worker_pool: 共享 worker 池，设置后本阶段不启动专属线程
         """
         self.stage_name = stage_name
         self.executor = executor
@@ -56,27 +69,53 @@ class StageQueue:
         self.cancel_token = cancel_token
         self.on_error = on_error
         self.on_complete = on_complete
-        self.input_queue = queue.Queue(maxsize=max_queue_size)  # 限制队列大小
+        self.on_progress = on_progress
+        self.worker_pool = worker_pool
+        # 限制队列大小；绑定取消令牌，取消时立即唤醒所有 worker
+        self.input_queue = CancellableQueue(
+            maxsize=max_queue_size, cancel_token=cancel_token
+        )
         self.running = False
         self.workers: List[threading.Thread] = []
         self._lock = threading.Lock()
         self._processed_count = 0
         self._failed_count = 0
         self._total_count = 0
+        self._max_workers = 0
+        self._active_count = 0
+        self._busy_seconds = 0.0
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
 
     def enqueue(self, data: StageData):
         """将数据加入队列
 
-        如果队列已满，会阻塞直到有空间
+        如果队列已满，会阻塞直到有空间；队列已停止或已取消时丢弃数据
 
         Args:
             data: 阶段数据
+
+        Returns:
+            是否成功加入队列
         """
         try:
-            self.input_queue.put(data, block=True, timeout=None)
+            # 先计数再入队，避免 worker 处理完成时总数尚未更新
             with self._lock:
                 self._total_count += 1
+            self.input_queue.put(data)
+            if self.worker_pool:
+                self.worker_pool.notify()
+            return True
+        except QueueClosed:
+            with self._lock:
+                self._total_count -= 1
+            logger.debug(
+                f"Stage {self.stage_name} is closed, dropping {data.video_info.video_id}"
+            )
+            return False
         except Exception as e:
+            with self._lock:
+                self._total_count -= 1
             logger.error_i18n(
                 "log.stage_enqueue_failed", stage=self.stage_name, error=str(e)
             )
@@ -86,7 +125,8 @@ class StageQueue:
         """启动阶段处理
 
         Args:
-            num_workers: worker 线程数量，如果为 None 则使用 executor 的 max_workers
+            num_workers: worker 线程数量，如果为 None 则使用 executor 的 max_workers；
+                         使用共享 worker 池时为本阶段的并发上限
         """
         if self.running:
             logger.warning_i18n("log.stage_already_running", stage=self.stage_name)
@@ -94,9 +134,17 @@ class StageQueue:
 
         self.running = True
         num_workers = num_workers or self.executor._max_workers
+        self._max_workers = num_workers
+        self._started_at = time.monotonic()
+        self._stopped_at = None
 
         logger.info_i18n("stage_start", stage=self.stage_name, workers=num_workers)
 
+        if self.worker_pool:
+            # 共享池模式：只注册阶段，由池中的 worker 跨阶段领取任务
+            self.worker_pool.attach(self, max_workers=num_workers)
+            return
+
         for i in range(num_workers):
             worker = threading.Thread(
                 target=self._worker_loop,
@@ -118,13 +166,16 @@ class StageQueue:
         logger.debug(f"Stopping stage {self.stage_name}...")
         self.running = False
 
-        # 向队列中放入停止信号
-        for _ in range(len(self.workers)):
-            try:
-                self.input_queue.put(None, block=False)  # None 作为停止信号
-            except queue.Full:
-                # 队列已满，等待一下再试
-                pass
+        # 关闭队列：停止信号是队列状态而非哨兵，队列满时也能送达，
+        # 所有阻塞在 get/put 上的线程被立即唤醒
+        self.input_queue.close()
+
+        # 共享池模式：等待池中正在处理本阶段数据的 worker 完成
+        if self.worker_pool:
+            if not self.worker_pool.detach(self, timeout=timeout):
+                logger.warning_i18n(
+                    "log.worker_thread_timeout", worker_name=self.stage_name
+                )
 
         # 等待所有 worker 线程停止
         for worker in self.workers:
@@ -135,95 +186,23 @@ class StageQueue:
                 )
 
         self.workers.clear()
+        self.input_queue.detach()
+        self._stopped_at = time.monotonic()
         logger.debug(f"Stage {self.stage_name} stopped")
 
     def _worker_loop(self):
-        """Worker 线程主循环"""
-        while self.running:
+        """Worker 线程主循环（独立 worker 模式）"""
+        while True:
             try:
-                # 检查取消状态
-                if self.cancel_token and self.cancel_token.is_cancelled():
-                    # 使用 debug 级别避免日志过多
-                    logger.debug(f"Stage {self.stage_name} worker detected cancellation")
-                    break
-
-                # 从队列中获取数据（带超时，以便定期检查取消状态）
+                # 阻塞等待数据；队列关闭（stop 或取消令牌触发）时立即抛出 QueueClosed
                 try:
-                    data = self.input_queue.get(timeout=1.0)
-                except queue.Empty:
-                    continue
-
-                # None 作为停止信号
-                if data is None:
+                    data = self.input_queue.get()
+                except QueueClosed:
+                    # 使用 debug 级别避免日志过多
+                    logger.debug(f"Stage {self.stage_name} worker exiting (queue closed)")
                     break
 
-                # 处理数据
-                try:
-                    result = self.processor(data)
-
-                    # 如果处理失败，记录失败信息
-                    if result.error and self.failure_logger:
-                        self._log_failure(result)
-                        if self.on_error:
-                            self.on_error(result)
-
-                    # 如果处理成功且没有跳过或失败，传递给下一阶段
-                    if (
-                        not result.error
-                        and not result.processing_failed  # 也检查 processing_failed
-                        and not result.skip_reason
-                        and self.next_stage_queue
-                    ):
-                        self.next_stage_queue.enqueue(result)
-                    
-                    # 如果是最后阶段且成功完成，调用 on_complete 回调
-                    if (
-                        not result.error
-                        and not result.processing_failed  # 也检查 processing_failed
-                        and not result.skip_reason
-                        and self.next_stage_queue is None
-                        and self.on_complete
-                    ):
-                        try:
-                            self.on_complete(result)
-                        except Exception as callback_error:
-                            logger.warning(f"on_complete callback failed: {callback_error}")
-
-                    # 更新统计
-                    with self._lock:
-                        if result.error or result.processing_failed or result.skip_reason:
-                            # 错误、处理失败、或跳过（如无字幕）都计入失败
-                            self._failed_count += 1
-                        else:
-                            self._processed_count += 1
-
-                except Exception as e:
-                    logger.error_i18n(
-                        "log.stage_process_exception",
-                        stage=self.stage_name,
-                        error=str(e),
-                    )
-                    import traceback
-
-                    logger.debug(traceback.format_exc())
-                    if data:
-                        data.error = e
-                        data.error_stage = self.stage_name
-                        # 尝试提取错误类型
-                        if isinstance(e, AppException):
-                            data.error_type = e.error_type
-                        else:
-                            data.error_type = ErrorType.UNKNOWN
-                        if self.failure_logger:
-                            self._log_failure(data)
-                        if self.on_error:
-                            self.on_error(data)
-
-                    with self._lock:
-                        self._failed_count += 1
-
-                finally:
-                    self.input_queue.task_done()
+                self._process_item(data)
 
             except Exception as e:
                 logger.error_i18n("log.worker_thread_exception", error=str(e))
@@ -231,6 +210,93 @@ class StageQueue:
 
                 logger.debug(traceback.format_exc())
 
+    def _process_item(self, data: StageData):
+        """处理一条已出队的数据（独立 worker 与共享池共用）
+
+        负责调用处理器、失败记录、传递给下一阶段、统计与 task_done
+
+        Args:
+            data: 已从 input_queue 取出的阶段数据
+        """
+        with self._lock:
+            self._active_count += 1
+        start = time.monotonic()
+        try:
+            result = self.processor(data)
+
+            # 如果处理失败，记录失败信息
+            if result.error and self.failure_logger:
+                self._log_failure(result)
+                if self.on_error:
+                    self.on_error(result)
+
+            # 如果处理成功且没有跳过或失败，传递给下一阶段
+            if (
+                not result.error
+                and not result.processing_failed  # 也检查 processing_failed
+                and not result.skip_reason
+                and self.next_stage_queue
+            ):
+                self.next_stage_queue.enqueue(result)
+            
+            # 如果是最后阶段且成功完成，调用 on_complete 回调
+            if (
+                not result.error
+                and not result.processing_failed  # 也检查 processing_failed
+                and not result.skip_reason
+                and self.next_stage_queue is None
+                and self.on_complete
+            ):
+                try:
+                    self.on_complete(result)
+                except Exception as callback_error:
+                    logger.warning(f"on_complete callback failed: {callback_error}")
+
+            # 未进入下一阶段的视频：释放产物存储中的内容
+            if result.error or result.processing_failed or result.skip_reason:
+                result.release_artifacts()
+
+            # 更新统计
+            with self._lock:
+                if result.error or result.processing_failed or result.skip_reason:
+                    # 错误、处理失败、或跳过（如无字幕）都计入失败
+                    self._failed_count += 1
+                else:
+                    self._processed_count += 1
+
+        except Exception as e:
+            logger.error_i18n(
+                "log.stage_process_exception",
+                stage=self.stage_name,
+                error=str(e),
+            )
+            import traceback
+
+            logger.debug(traceback.format_exc())
+            if data:
+                data.error = e
+                data.error_stage = self.stage_name
+                # 尝试提取错误类型
+                if isinstance(e, AppException):
+                    data.error_type = e.error_type
+                else:
+                    data.error_type = ErrorType.UNKNOWN
+                if self.failure_logger:
+                    self._log_failure(data)
+                if self.on_error:
+                    self.on_error(data)
+
+            with self._lock:
+                self._failed_count += 1
+
+        finally:
+            with self._lock:
+                self._active_count -= 1
+                self._busy_seconds += time.monotonic() - start
+            self.input_queue.task_done()
+            if self.on_progress:
+                self.on_progress()
+
     def _log_failure(self, data: StageData):
         """记录失败信息
 
@@ -340,13 +406,43 @@ class StageQueue:
                 "processing": processing,
             }
 
+    def get_utilization(self) -> Dict[str, float]:
+        """获取阶段 worker 使用情况
+
+        Returns:
+            {
+                "active": 当前正在处理的 worker 数,
+                "max_workers": 并发上限,
+                "busy_seconds": 累计处理耗时,
+                "utilization": 忙碌时间 / (运行时间 × 并发上限)，0~1
+            }
+        """
+        with self._lock:
+            if self._started_at is None:
+                elapsed = 0.0
+            else:
+                end = self._stopped_at if self._stopped_at is not None else time.monotonic()
+                elapsed = end - self._started_at
+            capacity = elapsed * self._max_workers
+            return {
+                "active": self._active_count,
+                "max_workers": self._max_workers,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "utilization": round(min(1.0, self._busy_seconds / capacity), 4)
+                if capacity > 0
+                else 0.0,
+            }
+
     def wait_for_completion(self, timeout: Optional[float] = None):
         """等待队列中的所有任务完成
 
         Args:
             timeout: 超时时间（秒），如果为 None 则无限等待
+
+        Returns:
+            完成（或队列已关闭）返回 True，超时返回 False
         """
-        self.input_queue.join()
+        return self.input_queue.join(timeout=timeout)
 
     def is_empty(self) -> bool:
         """检查队列是否为空
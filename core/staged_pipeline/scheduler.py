@@ -3,20 +3,21 @@
 """
 
 import threading
-import time
 from pathlib import Path
 from typing import Optional, Dict, List, Callable, Any
-from concurrent.futures import ThreadPoolExecutor
 
 from core.models import VideoInfo
 from core.logger import get_logger
 from core.exceptions import ErrorType
 from core.cancel_token import CancelToken
 from core.failure_logger import FailureLogger
+from core.http_client import get_http_client
+from core.artifact_store import ArtifactStore, DEFAULT_MAX_MEMORY_MB
 from core.i18n import t
 
 from .data_types import StageData
 from .queue import StageQueue
+from .worker_pool import SharedWorkerPool
 from .processors.detect import DetectProcessor
 from .processors.download import DownloadProcessor
 from .processors.translate import TranslateProcessor
@@ -29,7 +30,9 @@ logger = get_logger()
 class StagedPipeline:
     """分阶段 Pipeline 编排器
 
-    将视频处理流程拆分为多个阶段，每个阶段有独立的队列和执行器
+    将视频处理流程拆分为多个阶段，每个阶段有独立的队列。
+    默认每个阶段启动固定数量的专属 worker；设置 worker_budget 后所有阶段共享
+    一个全局 worker 池，按队列深度和资源配额（network / ai / disk）动态分配 worker。
     """
 
     def __init__(
@@ -58,6 +61,11 @@ class StagedPipeline:
         output_concurrency: int = 10,
         translation_llm_init_error_type: Optional[ErrorType] = None,
         translation_llm_init_error: Optional[str] = None,
+        # 共享 worker 池配置（None 表示每个阶段使用专属 worker）
+        worker_budget: Optional[int] = None,
+        resource_limits: Optional[Dict[str, int]] = None,
+        # 阶段间产物内存上限（MB），0 表示经临时文件传递
+        artifact_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
     ):
         """初始化分阶段 Pipeline
 
@@ -83,6 +91,11 @@ class StagedPipeline:
             output_concurrency: OUTPUT 阶段并发数
             translation_llm_init_error_type: 翻译 LLM 初始化错误类型
             translation_llm_init_error: 翻译 LLM 初始化错误信息
+            worker_budget: 全局 worker 预算；设置后启用跨阶段共享 worker 池，
+                           各阶段并发数作为该阶段的上限
+            resource_limits: 资源类别并发上限（如 {"network": 10, "ai": 5, "disk": 4}），
+                             未指定的类别按对应阶段并发数的最大值推导
+            artifact_memory_mb: 阶段间产物（译文、摘要）的内存上限（MB），超出后按 LRU 落盘
         """
         self.language_config = language_config
         self.translation_llm = translation_llm
@@ -101,24 +114,37 @@ class StagedPipeline:
         self.on_video_complete = on_video_complete
         self.translation_llm_init_error_type = translation_llm_init_error_type
         self.translation_llm_init_error = translation_llm_init_error
-
-        # 创建各阶段的执行器
-        self.detect_executor = ThreadPoolExecutor(
-            max_workers=detect_concurrency, thread_name_prefix="detect"
-        )
-        self.download_executor = ThreadPoolExecutor(
-            max_workers=download_concurrency, thread_name_prefix="download"
-        )
-        self.translate_executor = ThreadPoolExecutor(
-            max_workers=translate_concurrency, thread_name_prefix="translate"
-        )
-        self.summarize_executor = ThreadPoolExecutor(
-            max_workers=summarize_concurrency, thread_name_prefix="summarize"
-        )
-        self.output_executor = ThreadPoolExecutor(
-            max_workers=output_concurrency, thread_name_prefix="output"
+        self.artifacts = ArtifactStore(artifact_memory_mb) if artifact_memory_mb > 0 else None
+
+        # 各阶段并发数（独立 worker 模式下为线程数，共享池模式下为阶段上限）
+        self.stage_concurrency = {
+            "detect": max(1, detect_concurrency),
+            "download": max(1, download_concurrency),
+            "translate": max(1, translate_concurrency),
+            "summarize": max(1, summarize_concurrency),
+            "output": max(1, output_concurrency),
+        }
+
+        # 直连 HTTP 请求（字幕文件下载、代理探测）的连接池与网络阶段并发数对齐
+        get_http_client().ensure_pool_size(
+            max(self.stage_concurrency["detect"], self.stage_concurrency["download"])
         )
 
+        # 共享 worker 池（可选）
+        self.worker_pool: Optional[SharedWorkerPool] = None
+        if worker_budget:
+            limits = {
+                "network": max(detect_concurrency, download_concurrency),
+                "ai": max(translate_concurrency, summarize_concurrency),
+                "disk": output_concurrency,
+            }
+            limits.update(resource_limits or {})
+            self.worker_pool = SharedWorkerPool(
+                max_workers=worker_budget,
+                resource_limits=limits,
+                cancel_token=cancel_token,
+            )
+
         # 创建各阶段的处理器（显式参数注入）
         self.detect_processor = DetectProcessor(
             cookie_manager=self.cookie_manager,
@@ -128,6 +154,7 @@ class StagedPipeline:
             dry_run=self.dry_run,
             cancel_token=self.cancel_token,
             on_log=self.on_log,
+            language_config=self.language_config,
         )
 
         self.download_processor = DownloadProcessor(
@@ -169,61 +196,74 @@ class StagedPipeline:
             summary_llm=self.summary_llm,
         )
 
+        # 阶段进度/取消事件：任一阶段处理完一条数据或取消时唤醒 process_videos
+        self._wakeup = threading.Event()
+
         # 创建各阶段的队列（从后往前创建，以便设置 next_stage_queue）
         # OUTPUT 阶段（最后一个阶段）
         self.output_queue = StageQueue(
             stage_name="output",
-            executor=self.output_executor,
+            executor=None,
             processor=self.output_processor.process,
             next_stage_queue=None,  # 最后一个阶段
             failure_logger=failure_logger,
             cancel_token=cancel_token,
             on_error=on_error,
             on_complete=self.on_video_complete,  # 视频完成回调
+            on_progress=self._wakeup.set,
+            worker_pool=self.worker_pool,
         )
 
         # SUMMARIZE 阶段
         self.summarize_queue = StageQueue(
             stage_name="summarize",
-            executor=self.summarize_executor,
+            executor=None,
             processor=self.summarize_processor.process,
             next_stage_queue=self.output_queue,
             failure_logger=failure_logger,
             cancel_token=cancel_token,
             on_error=on_error,
+            on_progress=self._wakeup.set,
+            worker_pool=self.worker_pool,
         )
 
         # TRANSLATE 阶段
         self.translate_queue = StageQueue(
             stage_name="translate",
-            executor=self.translate_executor,
+            executor=None,
             processor=self.translate_processor.process,
             next_stage_queue=self.summarize_queue,
             failure_logger=failure_logger,
             cancel_token=cancel_token,
             on_error=on_error,
+            on_progress=self._wakeup.set,
+            worker_pool=self.worker_pool,
         )
 
         # DOWNLOAD 阶段
         self.download_queue = StageQueue(
             stage_name="download",
-            executor=self.download_executor,
+            executor=None,
             processor=self.download_processor.process,
             next_stage_queue=self.translate_queue,
             failure_logger=failure_logger,
             cancel_token=cancel_token,
             on_error=on_error,
+            on_progress=self._wakeup.set,
+            worker_pool=self.worker_pool,
         )
 
         # DETECT 阶段（第一个阶段）
         self.detect_queue = StageQueue(
             stage_name="detect",
-            executor=self.detect_executor,
+            executor=None,
             processor=self.detect_processor.process,
             next_stage_queue=self.download_queue,
             failure_logger=failure_logger,
             cancel_token=cancel_token,
             on_error=on_error,
+            on_progress=self._wakeup.set,
+            worker_pool=self.worker_pool,
         )
 
         # 统计信息
@@ -275,23 +315,26 @@ class StagedPipeline:
 
         try:
             # 1. 启动所有阶段
-            self.detect_queue.start()
-            self.download_queue.start()
-            self.translate_queue.start()
-            self.summarize_queue.start()
-            self.output_queue.start()
+            for stage_queue in self._all_queues():
+                stage_queue.start(self.stage_concurrency[stage_queue.stage_name])
+            if self.worker_pool:
+                self.worker_pool.start()
 
             # 2. 将视频加入 DETECT 阶段（第一个阶段）
             for video in videos:
                 data = StageData(
                     video_info=video,
                     run_id=self.run_id,  # 添加 run_id 到 data（用于失败记录）
+                    artifacts=self.artifacts,
                 )
                 self.detect_queue.enqueue(data)
 
             # 3. 等待所有阶段完成
-            # 等待所有队列为空且所有任务完成
+            # 等待所有队列为空且所有任务完成（事件驱动：进度或取消时立即唤醒）
+            if self.cancel_token:
+                self.cancel_token.register_callback(self._wakeup.set)
             while True:
+                self._wakeup.clear()
                 if self.cancel_token and self.cancel_token.is_cancelled():
                     logger.info_i18n("log.cancel_signal_detected")
                     # 立即停止所有阶段的 worker 线程
@@ -308,7 +351,8 @@ class StagedPipeline:
                 ):
                     break
 
-                time.sleep(0.5)  # 等待 0.5 秒后再次检查
+                # 超时仅作兜底，正常情况下由 on_progress / 取消回调唤醒
+                self._wakeup.wait(timeout=1.0)
 
             # 4. 汇总统计信息
             detect_stats = self.detect_queue.get_stats()
@@ -341,6 +385,9 @@ class StagedPipeline:
             }
 
         finally:
+            if self.cancel_token:
+                self.cancel_token.unregister_callback(self._wakeup.set)
+
             # 5. 停止所有阶段
             self.output_queue.stop()
             self.summarize_queue.stop()
@@ -348,25 +395,53 @@ class StagedPipeline:
             self.download_queue.stop()
             self.detect_queue.stop()
 
-            # 关闭所有执行器
-            self.output_executor.shutdown(wait=True)
-            self.summarize_executor.shutdown(wait=True)
-            self.translate_executor.shutdown(wait=True)
-            self.download_executor.shutdown(wait=True)
-            self.detect_executor.shutdown(wait=True)
+            if self.worker_pool:
+                self.worker_pool.shutdown()
 
-    def __del__(self):
-        """析构函数，确保资源清理"""
+            self._log_stage_utilization()
+
+    def _all_queues(self) -> List[StageQueue]:
+        """按流水线顺序返回所有阶段队列"""
+        return [
+            self.detect_queue,
+            self.download_queue,
+            self.translate_queue,
+            self.summarize_queue,
+            self.output_queue,
+        ]
+
+    def get_stage_utilization(self) -> Dict[str, Dict[str, float]]:
+        """获取各阶段的 worker 使用情况
+
+        Returns:
+            {stage_name: {"active", "max_workers", "busy_seconds", "utilization",
+                          "pending"}}；
+            共享池模式下额外包含 "peak"、"dispatched" 和 "share"（占全局预算比例）
+        """
+        pool_stats = self.worker_pool.get_utilization() if self.worker_pool else {}
+        result = {}
+        for stage_queue in self._all_queues():
+            stats = stage_queue.get_utilization()
+            stats["pending"] = stage_queue.input_queue.qsize()
+            if stage_queue.stage_name in pool_stats:
+                pool_stage = pool_stats[stage_queue.stage_name]
+                stats["peak"] = pool_stage["peak"]
+                stats["dispatched"] = pool_stage["dispatched"]
+                stats["share"] = pool_stage["share"]
+            result[stage_queue.stage_name] = stats
+        return result
+
+    def _log_stage_utilization(self):
+        """在任务结束时记录各阶段 worker 使用情况"""
         try:
-            if hasattr(self, "output_executor"):
-                self.output_executor.shutdown(wait=False)
-            if hasattr(self, "summarize_executor"):
-                self.summarize_executor.shutdown(wait=False)
-            if hasattr(self, "translate_executor"):
-                self.translate_executor.shutdown(wait=False)
-            if hasattr(self, "download_executor"):
-                self.download_executor.shutdown(wait=False)
-            if hasattr(self, "detect_executor"):
-                self.detect_executor.shutdown(wait=False)
-        except Exception:
-            pass
+            for stage_name, stats in self.get_stage_utilization().items():
+                logger.info_i18n(
+                    "log.stage_utilization",
+                    stage=stage_name,
+                    busy=f"{stats['busy_seconds']:.1f}",
+                    workers=stats["max_workers"],
+                    percent=f"{stats['utilization'] * 100:.0f}",
+                    run_id=self.run_id,
+                )
+        except Exception as e:
+            logger.debug(f"Failed to log stage utilization: {e}")
@@ -18,6 +18,8 @@ from core.logger import get_logger, set_log_context, clear_log_context
 from core.exceptions import ErrorType, AppException, TaskCancelledError
 from core.cancel_token import CancelToken
 from core.failure_logger import FailureLogger
+from core.http_client import get_http_client
+from core.artifact_store import ArtifactStore, DEFAULT_MAX_MEMORY_MB
 
 from .data_types import StageData
 from .processors.detect import DetectProcessor
@@ -60,6 +62,7 @@ class ThreadPipeline:
         ai_concurrency: int = 3,  # AI API 并发数（翻译+摘要共享）
         translation_llm_init_error_type: Optional[ErrorType] = None,
         translation_llm_init_error: Optional[str] = None,
+        artifact_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
     ):
         """初始化线程级 Pipeline
 
@@ -87,6 +90,7 @@ class ThreadPipeline:
         self.on_stats = on_stats
         self.translation_llm_init_error_type = translation_llm_init_error_type
         self.translation_llm_init_error = translation_llm_init_error
+        self.artifacts = ArtifactStore(artifact_memory_mb) if artifact_memory_mb > 0 else None
 
         # 并发控制
         self.concurrency = concurrency
@@ -96,6 +100,8 @@ class ThreadPipeline:
         self.executor = ThreadPoolExecutor(
             max_workers=concurrency, thread_name_prefix="video"
         )
+        # 直连 HTTP 请求的连接池与视频并发数对齐
+        get_http_client().ensure_pool_size(concurrency)
 
         # 统计信息（线程安全）
         self._stats_lock = Lock()
@@ -118,6 +124,7 @@ class ThreadPipeline:
             dry_run=self.dry_run,
             cancel_token=self.cancel_token,
             on_log=self.on_log,
+            language_config=self.language_config,
         )
 
         self.download_processor = DownloadProcessor(
@@ -229,7 +236,7 @@ class ThreadPipeline:
             处理结果
         """
         vid = video.video_id
-        data = StageData(video_info=video, run_id=self.run_id)
+        data = StageData(video_info=video, run_id=self.run_id, artifacts=self.artifacts)
 
         # 更新运行中列表
         self._add_running(vid)
@@ -306,6 +313,8 @@ class ThreadPipeline:
             logger.error(f"视频处理异常: {vid} - {e}")
             return data
         finally:
+            # 未走到 OUTPUT 阶段的视频：内存中的中间结果写回临时目录（供重跑续传）并释放
+            data.release_artifacts()
             # 清理日志上下文
             clear_log_context()
             # 移除运行中列表
@@ -0,0 +1,287 @@
+"""
+跨阶段共享 worker 池
+
+所有阶段共享一个全局 worker 预算，空闲 worker 从任意阶段的队列中"窃取"任务，
+不再为每个阶段固定分配线程。调度规则：
+- 按队列深度分配：优先选择 待处理数 / (当前 worker 数 + 1) 最大的阶段
+- 受阶段并发上限约束（如 translate_concurrency）
+- 受资源类别上限约束（network / ai / disk），同类阶段共享同一配额
+- 分数相同时优先下游阶段，尽快排空流水线、释放内存
+- 下游队列已满的阶段暂不调度（背压），worker 不会阻塞在 put 上
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from core.logger import get_logger
+from core.cancel_token import CancelToken
+from .cancellable_queue import QueueClosed
+
+if TYPE_CHECKING:
+    from .queue import StageQueue
+
+logger = get_logger()
+
+
+# 默认阶段资源类别
+RESOURCE_NETWORK = "network"
+RESOURCE_AI = "ai"
+RESOURCE_DISK = "disk"
+
+DEFAULT_STAGE_RESOURCES: Dict[str, str] = {
+    "detect": RESOURCE_NETWORK,
+    "download": RESOURCE_NETWORK,
+    "translate": RESOURCE_AI,
+    "summarize": RESOURCE_AI,
+    "output": RESOURCE_DISK,
+}
+
+
+@dataclass
+class _StageSlot:
+    """共享池中单个阶段的调度状态"""
+
+    stage: "StageQueue"
+    max_workers: int
+    resource: Optional[str]
+    order: int  # 注册顺序（越大越靠下游）
+    active: int = 0
+    peak_active: int = 0
+    busy_seconds: float = 0.0
+    dispatched: int = 0
+
+
+class SharedWorkerPool:
+    """跨阶段共享 worker 池
+
+    Example:
+        pool = SharedWorkerPool(max_workers=20, resource_limits={"ai": 5})
+        stage_queue = StageQueue(..., worker_pool=pool)
+        stage_queue.start(num_workers=10)  # 注册到池中，10 为该阶段并发上限
+        pool.start()
+        ...
+        pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        resource_limits: Optional[Dict[str, int]] = None,
+        stage_resources: Optional[Dict[str, str]] = None,
+        cancel_token: Optional[CancelToken] = None,
+        thread_name_prefix: str = "pipeline",
+    ):
+        """初始化共享 worker 池
+
+        Args:
+            max_workers: 全局 worker 预算（线程总数）
+            resource_limits: 资源类别并发上限，如 {"network": 10, "ai": 5, "disk": 4}
+            stage_resources: 阶段名 -> 资源类别，默认 DEFAULT_STAGE_RESOURCES
+            cancel_token: 取消令牌，取消时立即唤醒并结束所有 worker
+            thread_name_prefix: worker 线程名前缀
+        """
+        self.max_workers = max(1, max_workers)
+        self.resource_limits = dict(resource_limits or {})
+        self.stage_resources = dict(stage_resources or DEFAULT_STAGE_RESOURCES)
+        self.cancel_token = cancel_token
+        self.thread_name_prefix = thread_name_prefix
+
+        self._cond = threading.Condition()
+        self._slots: Dict[str, _StageSlot] = {}
+        self._resource_active: Dict[str, int] = {}
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def attach(self, stage: "StageQueue", max_workers: int) -> None:
+        """注册阶段（由 StageQueue.start 调用）
+
+        Args:
+            stage: 阶段队列
+            max_workers: 该阶段并发上限
+        """
+        with self._cond:
+            self._slots[stage.stage_name] = _StageSlot(
+                stage=stage,
+                max_workers=max(1, max_workers),
+                resource=self.stage_resources.get(stage.stage_name),
+                order=len(self._slots),
+            )
+            self._cond.notify_all()
+
+    def detach(self, stage: "StageQueue", timeout: Optional[float] = None) -> bool:
+        """注销阶段，等待该阶段正在处理的任务结束（由 StageQueue.stop 调用）
+
+        Args:
+            stage: 阶段队列
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            该阶段任务在超时前全部结束返回 True
+        """
+        with self._cond:
+            slot = self._slots.get(stage.stage_name)
+            if slot is None:
+                return True
+            finished = self._cond.wait_for(lambda: slot.active == 0, timeout=timeout)
+            # 保留统计信息，只是不再调度（队列已关闭）
+            return finished
+
+    def start(self) -> None:
+        """启动所有 worker 线程"""
+        with self._cond:
+            if self._workers:
+                return
+            self._shutdown = False
+            self._started_at = time.monotonic()
+            self._stopped_at = None
+        if self.cancel_token:
+            self.cancel_token.register_callback(self.notify)
+
+        logger.debug(
+            f"Shared worker pool starting: budget={self.max_workers}, "
+            f"resource_limits={self.resource_limits}"
+        )
+        for i in range(self.max_workers):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"{self.thread_name_prefix}-worker-{i}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def notify(self) -> None:
+        """有新任务入队或状态变化时唤醒空闲 worker"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """停止所有 worker 线程
+
+        Args:
+            timeout: 每个 worker 的等待超时（秒）
+        """
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if self.cancel_token:
+            self.cancel_token.unregister_callback(self.notify)
+
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+            if worker.is_alive():
+                logger.warning_i18n("log.worker_thread_timeout", worker_name=worker.name)
+        self._workers.clear()
+        with self._cond:
+            if self._started_at is not None and self._stopped_at is None:
+                self._stopped_at = time.monotonic()
+
+    def _is_cancelled(self) -> bool:
+        return bool(self.cancel_token and self.cancel_token.is_cancelled())
+
+    def _select_locked(self):
+        """在持有锁的情况下选择阶段并取出一条数据
+
+        Returns:
+            (slot, data) 或 None（当前没有可调度的任务）
+        """
+        candidates = []
+        for slot in self._slots.values():
+            if slot.active >= slot.max_workers:
+                continue
+            if slot.resource is not None:
+                limit = self.resource_limits.get(slot.resource)
+                if limit is not None and self._resource_active.get(slot.resource, 0) >= limit:
+                    continue
+            pending = slot.stage.input_queue.qsize()
+            if pending <= 0:
+                continue
+            # 背压：下游队列没有余量时不调度，避免所有 worker 阻塞在 put 上导致死锁
+            next_queue = slot.stage.next_stage_queue
+            if next_queue is not None and next_queue.input_queue.maxsize > 0:
+                if next_queue.input_queue.qsize() + slot.active >= next_queue.input_queue.maxsize:
+                    continue
+            candidates.append((pending / (slot.active + 1), slot.order, slot))
+
+        # 按队列深度（相对于已分配 worker）降序，同分优先下游阶段
+        candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+        for _, _, slot in candidates:
+            try:
+                data = slot.stage.input_queue.get(timeout=0)
+            except (QueueClosed, TimeoutError):
+                continue
+            return slot, data
+        return None
+
+    def _worker_loop(self):
+        """worker 主循环：窃取任意阶段的任务执行"""
+        while True:
+            with self._cond:
+                picked = None
+                while True:
+                    if self._shutdown or self._is_cancelled():
+                        return
+                    picked = self._select_locked()
+                    if picked is not None:
+                        break
+                    self._cond.wait()
+
+                slot, data = picked
+                slot.active += 1
+                slot.dispatched += 1
+                slot.peak_active = max(slot.peak_active, slot.active)
+                if slot.resource is not None:
+                    self._resource_active[slot.resource] = (
+                        self._resource_active.get(slot.resource, 0) + 1
+                    )
+
+            start = time.monotonic()
+            try:
+                slot.stage._process_item(data)
+            except Exception as e:
+                logger.error_i18n("log.worker_thread_exception", error=str(e))
+            finally:
+                elapsed = time.monotonic() - start
+                with self._cond:
+                    slot.active -= 1
+                    slot.busy_seconds += elapsed
+                    if slot.resource is not None:
+                        self._resource_active[slot.resource] -= 1
+                    # 释放了阶段/资源配额，其他等待中的 worker 可能可以调度了
+                    self._cond.notify_all()
+
+    def get_utilization(self) -> Dict[str, Dict[str, float]]:
+        """获取各阶段的 worker 使用情况
+
+        Returns:
+            {stage_name: {
+                "active": 当前 worker 数,
+                "peak": 峰值 worker 数,
+                "max_workers": 阶段并发上限,
+                "dispatched": 已调度任务数,
+                "busy_seconds": 累计忙碌时间,
+                "share": 占全局 worker 预算的比例（0~1）,
+            }}
+        """
+        with self._cond:
+            if self._started_at is None:
+                elapsed = 0.0
+            else:
+                end = self._stopped_at if self._stopped_at is not None else time.monotonic()
+                elapsed = end - self._started_at
+            capacity = elapsed * self.max_workers
+            return {
+                name: {
+                    "active": slot.active,
+                    "peak": slot.peak_active,
+                    "max_workers": slot.max_workers,
+                    "dispatched": slot.dispatched,
+                    "busy_seconds": round(slot.busy_seconds, 3),
+                    "share": round(slot.busy_seconds / capacity, 4) if capacity > 0 else 0.0,
+                }
+                for name, slot in self._slots.items()
+            }
@@ -12,6 +12,7 @@ Chunk Tracker - 翻译 chunk 级恢复模块
 
 import json
 import os
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional, Dict, Any
@@ -21,6 +22,215 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# ============ 纯函数（无状态，可在子进程中执行，见 core.subtitle.process_pool）============
+
+
+def parse_srt_entries(content: str) -> List[Dict]:
+    """解析 SRT/VTT 内容为条目列表
+    
+    同时支持：
+    - SRT 格式（有序号）
+    - VTT 格式（无序号，以 WEBVTT 开头）
+    """
+    entries = []
+    
+    # 检测是否是 VTT 格式
+    is_vtt = content.strip().startswith('WEBVTT')
+    
+    if is_vtt:
+        # VTT 格式：没有序号
+        # 跳过 WEBVTT 头部
+        lines = content.split('\n')
+        content_lines = []
+        in_header = True
+        for line in lines:
+            if in_header:
+                if line.strip() == '' and content_lines:
+                    in_header = False
+                elif '-->' in line:
+                    in_header = False
+                    content_lines.append(line)
+            else:
+                content_lines.append(line)
+        
+        content = '\n'.join(content_lines)
+        
+        # VTT 时间轴格式：00:00:00.000 --> 00:00:01.520
+        pattern = re.compile(
+            r"(\d{2}:\d{2}:\d{2}[.,]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[.,]\d{3})\s*\n"
+            r"((?:(?!\n\n|\n\d{2}:\d{2}:\d{2}).)*)",
+            re.DOTALL,
+        )
+        
+        index = 1
+        for match in pattern.finditer(content):
+            text = match.group(3).strip()
+            # 清理 VTT 特有的标签和 HTML 实体
+            text = re.sub(r'<[^>]+>', '', text)  # 移除 HTML 标签
+            text = text.replace('&gt;', '>').replace('&lt;', '<')
+            text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
+            
+            entries.append({
+                "index": index,
+                "start": match.group(1),
+                "end": match.group(2),
+                "text": text,
+            })
+            index += 1
+    else:
+        # SRT 格式：有序号
+        pattern = re.compile(
+            r"(\d+)\s*\n"
+            r"(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*\n"
+            r"((?:(?!\n\n|\n\d+\n\d{2}:\d{2}:\d{2}).)*)",
+            re.DOTALL,
+        )
+
+        for match in pattern.finditer(content):
+            entries.append({
+                "index": int(match.group(1)),
+                "start": match.group(2),
+                "end": match.group(3),
+                "text": match.group(4).strip(),
+            })
+
+    return entries
+
+
+def format_srt_entry(entry: Dict) -> str:
+    """格式化单个条目为 SRT 格式"""
+    return f"{entry['index']}\n{entry['start']} --> {entry['end']}\n{entry['text']}\n\n"
+
+
+def split_srt_entries(
+    entries: List[Dict], chunk_size: int, max_chars: int
+) -> List[List[Dict]]:
+    """按条目数和字符数将字幕条目分组
+
+    Args:
+        entries: parse_srt_entries 返回的条目列表
+        chunk_size: 每组最多条目数
+        max_chars: 每组最大字符数（按 SRT 格式化后的长度计算）
+
+    Returns:
+        条目分组列表
+    """
+    groups: List[List[Dict]] = []
+    current_entries: List[Dict] = []
+    current_chars = 0
+
+    for entry in entries:
+        entry_chars = len(format_srt_entry(entry))
+
+        # 检查是否需要开始新 chunk
+        if current_entries and (
+            len(current_entries) >= chunk_size
+            or current_chars + entry_chars > max_chars
+        ):
+            groups.append(current_entries)
+            current_entries = []
+            current_chars = 0
+
+        current_entries.append(entry)
+        current_chars += entry_chars
+
+    # 处理最后一个 chunk
+    if current_entries:
+        groups.append(current_entries)
+
+    return groups
+
+
+def validate_timeline(srt_content: str) -> List[str]:
+    """检查时间轴是否有问题
+    
+    Args:
+        srt_content: SRT 格式内容
+        
+    Returns:
+        警告列表
+    """
+    warnings = []
+    
+    # 提取所有时间轴
+    pattern = r'(\d{2}:\d{2}:\d{2}[,\.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,\.]\d{3})'
+    matches = re.findall(pattern, srt_content)
+    
+    if not matches:
+        return warnings
+    
+    def time_to_ms(time_str: str) -> int:
+        """将时间字符串转换为毫秒"""
+        time_str = time_str.replace(',', '.').replace('.', ':')
+        parts = time_str.split(':')
+        if len(parts) == 4:
+            h, m, s, ms = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
+            return h * 3600000 + m * 60000 + s * 1000 + ms
+        return 0
+    
+    prev_end = 0
+    for i, (start, end) in enumerate(matches):
+        start_ms = time_to_ms(start)
+        end_ms = time_to_ms(end)
+        
+        # 检查开始时间是否小于结束时间
+        if start_ms >= end_ms:
+            warnings.append(f"Entry {i+1}: Invalid timeline (start >= end)")
+        
+        # 检查是否与前一条重叠
+        if start_ms < prev_end and prev_end > 0:
+            warnings.append(f"Entry {i+1}: Timeline overlaps with previous entry")
+        
+        prev_end = end_ms
+    
+    return warnings
+
+
+def renumber_srt(srt_content: str) -> str:
+    """重新编号 SRT 字幕序号，确保连续
+    
+    Args:
+        srt_content: SRT 格式内容
+        
+    Returns:
+        重新编号后的 SRT 内容
+    """
+    # 按字幕块拆分
+    blocks = re.split(r'\n\n+', srt_content.strip())
+    
+    renumbered_blocks = []
+    new_index = 1
+    
+    for block in blocks:
+        block = block.strip()
+        if not block:
+            continue
+        
+        # 匹配 SRT 块：序号 + 时间轴 + 文本
+        # 序号可能在第一行
+        lines = block.split('\n')
+        if len(lines) < 2:
+            continue
+        
+        # 检查第一行是否是纯数字（序号）
+        first_line = lines[0].strip()
+        if first_line.isdigit():
+            # 替换序号
+            lines[0] = str(new_index)
+            new_index += 1
+            renumbered_blocks.append('\n'.join(lines))
+        elif ' --> ' in first_line:
+            # 没有序号行，只有时间轴，添加序号
+            new_block = f"{new_index}\n" + '\n'.join(lines)
+            new_index += 1
+            renumbered_blocks.append(new_block)
+        else:
+            # 无法识别的格式，保持原样
+            renumbered_blocks.append(block)
+    
+    return '\n\n'.join(renumbered_blocks)
+
+
 @dataclass
 class SubtitleChunk:
     """字幕块
@@ -52,6 +262,8 @@ class ChunkProgress:
         last_error: 最后的错误信息
         started_at: 开始时间
         updated_at: 更新时间
+        chunk_size: 拆分时使用的条目数上限（恢复时沿用，保证 chunk 边界不变）
+        max_chars: 拆分时使用的字符数上限
     """
     total_chunks: int = 0
     completed_chunks: List[int] = field(default_factory=list)
@@ -59,6 +271,8 @@ class ChunkProgress:
     last_error: Optional[str] = None
     started_at: Optional[str] = None
     updated_at: Optional[str] = None
+    chunk_size: Optional[int] = None
+    max_chars: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -69,6 +283,8 @@ class ChunkProgress:
             "last_error": self.last_error,
             "started_at": self.started_at,
             "updated_at": self.updated_at,
+            "chunk_size": self.chunk_size,
+            "max_chars": self.max_chars,
         }
 
     @classmethod
@@ -81,6 +297,8 @@ class ChunkProgress:
             last_error=data.get("last_error"),
             started_at=data.get("started_at"),
             updated_at=data.get("updated_at"),
+            chunk_size=data.get("chunk_size"),
+            max_chars=data.get("max_chars"),
         )
 
     @property
@@ -140,6 +358,13 @@ class ChunkTracker:
         self.progress = self._load_progress()
         self.chunks: List[SubtitleChunk] = []
 
+        # 恢复已有进度时沿用上次的分块大小（分块大小会随模型自适应变化，chunk 索引必须保持一致）
+        if self.progress.total_chunks and self.progress.chunk_size and self.progress.max_chars:
+            self.chunk_size = self.progress.chunk_size
+            self.max_chars = self.progress.max_chars
+        self.progress.chunk_size = self.chunk_size
+        self.progress.max_chars = self.max_chars
+
     def _load_progress(self) -> ChunkProgress:
         """加载进度"""
         if self.progress_file.exists():
@@ -217,36 +442,12 @@ class ChunkTracker:
             return []
 
         # 按条目数和字符数拆分
-        chunks = []
-        current_entries = []
-        current_chars = 0
-        chunk_index = 0
-
-        for entry in entries:
-            entry_text = self._format_entry(entry)
-            entry_chars = len(entry_text)
-
-            # 检查是否需要开始新 chunk
-            should_split = False
-            if current_entries:
-                if len(current_entries) >= self.chunk_size:
-                    should_split = True
-                elif current_chars + entry_chars > self.max_chars:
-                    should_split = True
-
-            if should_split:
-                # 保存当前 chunk
-                chunks.append(self._create_chunk(chunk_index, current_entries))
-                chunk_index += 1
-                current_entries = []
-                current_chars = 0
-
-            current_entries.append(entry)
-            current_chars += entry_chars
-
-        # 处理最后一个 chunk
-        if current_entries:
-            chunks.append(self._create_chunk(chunk_index, current_entries))
+        chunks = [
+            self._create_chunk(chunk_index, chunk_entries)
+            for chunk_index, chunk_entries in enumerate(
+                split_srt_entries(entries, self.chunk_size, self.max_chars)
+            )
+        ]
 
         # 更新进度
         self.chunks = chunks
@@ -260,81 +461,12 @@ class ChunkTracker:
         return chunks
 
     def _parse_srt(self, content: str) -> List[Dict]:
-        """解析 SRT/VTT 内容为条目列表
-        
-        同时支持：
-        - SRT 格式（有序号）
-        - VTT 格式（无序号，以 WEBVTT 开头）
-        """
-        import re
-
-        entries = []
-        
-        # 检测是否是 VTT 格式
-        is_vtt = content.strip().startswith('WEBVTT')
-        
-        if is_vtt:
-            # VTT 格式：没有序号
-            # 跳过 WEBVTT 头部
-            lines = content.split('\n')
-            content_lines = []
-            in_header = True
-            for line in lines:
-                if in_header:
-                    if line.strip() == '' and content_lines:
-                        in_header = False
-                    elif '-->' in line:
-                        in_header = False
-                        content_lines.append(line)
-                else:
-                    content_lines.append(line)
-            
-            content = '\n'.join(content_lines)
-            
-            # VTT 时间轴格式：00:00:00.000 --> 00:00:01.520
-            pattern = re.compile(
-                r"(\d{2}:\d{2}:\d{2}[.,]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[.,]\d{3})\s*\n"
-                r"((?:(?!\n\n|\n\d{2}:\d{2}:\d{2}).)*)",
-                re.DOTALL,
-            )
-            
-            index = 1
-            for match in pattern.finditer(content):
-                text = match.group(3).strip()
-                # 清理 VTT 特有的标签和 HTML 实体
-                text = re.sub(r'<[^>]+>', '', text)  # 移除 HTML 标签
-                text = text.replace('&gt;', '>').replace('&lt;', '<')
-                text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
-                
-                entries.append({
-                    "index": index,
-                    "start": match.group(1),
-                    "end": match.group(2),
-                    "text": text,
-                })
-                index += 1
-        else:
-            # SRT 格式：有序号
-            pattern = re.compile(
-                r"(\d+)\s*\n"
-                r"(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*\n"
-                r"((?:(?!\n\n|\n\d+\n\d{2}:\d{2}:\d{2}).)*)",
-                re.DOTALL,
-            )
-
-            for match in pattern.finditer(content):
-                entries.append({
-                    "index": int(match.group(1)),
-                    "start": match.group(2),
-                    "end": match.group(3),
-                    "text": match.group(4).strip(),
-                })
-
-        return entries
+        """解析 SRT/VTT 内容为条目列表（见 parse_srt_entries）"""
+        return parse_srt_entries(content)
 
     def _format_entry(self, entry: Dict) -> str:
         """格式化单个条目为 SRT 格式"""
-        return f"{entry['index']}\n{entry['start']} --> {entry['end']}\n{entry['text']}\n\n"
+        return format_srt_entry(entry)
 
     def _create_chunk(self, index: int, entries: List[Dict]) -> SubtitleChunk:
         """创建 SubtitleChunk"""
@@ -476,96 +608,12 @@ class ChunkTracker:
         return len(entries) > 0
     
     def _validate_timeline(self, srt_content: str) -> List[str]:
-        """检查时间轴是否有问题
-        
-        Args:
-            srt_content: SRT 格式内容
-            
-        Returns:
-            警告列表
-        """
-        import re
-        
-        warnings = []
-        
-        # 提取所有时间轴
-        pattern = r'(\d{2}:\d{2}:\d{2}[,\.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,\.]\d{3})'
-        matches = re.findall(pattern, srt_content)
-        
-        if not matches:
-            return warnings
-        
-        def time_to_ms(time_str: str) -> int:
-            """将时间字符串转换为毫秒"""
-            time_str = time_str.replace(',', '.').replace('.', ':')
-            parts = time_str.split(':')
-            if len(parts) == 4:
-                h, m, s, ms = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
-                return h * 3600000 + m * 60000 + s * 1000 + ms
-            return 0
-        
-        prev_end = 0
-        for i, (start, end) in enumerate(matches):
-            start_ms = time_to_ms(start)
-            end_ms = time_to_ms(end)
-            
-            # 检查开始时间是否小于结束时间
-            if start_ms >= end_ms:
-                warnings.append(f"Entry {i+1}: Invalid timeline (start >= end)")
-            
-            # 检查是否与前一条重叠
-            if start_ms < prev_end and prev_end > 0:
-                warnings.append(f"Entry {i+1}: Timeline overlaps with previous entry")
-            
-            prev_end = end_ms
-        
-        return warnings
-    
+        """检查时间轴是否有问题（见 validate_timeline）"""
+        return validate_timeline(srt_content)
+
     def _renumber_srt(self, srt_content: str) -> str:
-        """重新编号 SRT 字幕序号，确保连续
-        
-        Args:
-            srt_content: SRT 格式内容
-            
-        Returns:
-            重新编号后的 SRT 内容
-        """
-        import re
-        
-        # 按字幕块拆分
-        blocks = re.split(r'\n\n+', srt_content.strip())
-        
-        renumbered_blocks = []
-        new_index = 1
-        
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-            
-            # 匹配 SRT 块：序号 + 时间轴 + 文本
-            # 序号可能在第一行
-            lines = block.split('\n')
-            if len(lines) < 2:
-                continue
-            
-            # 检查第一行是否是纯数字（序号）
-            first_line = lines[0].strip()
-            if first_line.isdigit():
-                # 替换序号
-                lines[0] = str(new_index)
-                new_index += 1
-                renumbered_blocks.append('\n'.join(lines))
-            elif ' --> ' in first_line:
-                # 没有序号行，只有时间轴，添加序号
-                new_block = f"{new_index}\n" + '\n'.join(lines)
-                new_index += 1
-                renumbered_blocks.append(new_block)
-            else:
-                # 无法识别的格式，保持原样
-                renumbered_blocks.append(block)
-        
-        return '\n\n'.join(renumbered_blocks)
+        """重新编号 SRT 字幕序号（见 renumber_srt）"""
+        return renumber_srt(srt_content)
 
     def cleanup(self) -> None:
         """清理临时文件"""
@@ -5,8 +5,11 @@ Subprocess 工具函数
 
 import subprocess
 import sys
+from pathlib import Path
 from typing import Any, Dict, Optional, List, Union
 
+from core.profiler import span
+
 
 def get_subprocess_kwargs() -> Dict[str, Any]:
     """获取 subprocess.run 的平台相关参数
@@ -50,11 +53,48 @@ def run_command(
     # 合并平台相关参数
     platform_kwargs = get_subprocess_kwargs()
     platform_kwargs.update(kwargs)
-    
-    return subprocess.run(
-        cmd,
-        capture_output=capture_output,
-        text=text,
-        timeout=timeout,
-        **platform_kwargs
-    )
+
+    program = cmd[0] if isinstance(cmd, list) and cmd else str(cmd).split(" ", 1)[0]
+    with span("run_command", program=Path(program).name):
+        return subprocess.run(
+            cmd,
+            capture_output=capture_output,
+            text=text,
+            timeout=timeout,
+            **platform_kwargs
+        )
+
+
+def run_ytdlp_command(
+    cmd: List[str],
+    timeout: Optional[int] = None,
+    cancel_token=None,
+    **kwargs
+) -> subprocess.CompletedProcess:
+    """执行访问 YouTube 的 yt-dlp 命令（按出口身份限速）
+
+    执行前从命令行中的 --proxy / --cookies 对应的令牌桶获取令牌，
+    执行后根据 stderr 判断是否遇到 429 / 机器人验证并调整该出口身份的速率。
+
+    Args:
+        cmd: yt-dlp 命令（列表）
+        timeout: 超时时间（秒）
+        cancel_token: 取消令牌（可选），等待令牌时可被取消打断
+        **kwargs: 其他传递给 run_command 的参数
+
+    Returns:
+        subprocess.CompletedProcess 对象
+    """
+    from core.rate_limiter import get_rate_limiter, identity_from_command, is_throttle_error
+
+    limiter = get_rate_limiter()
+    proxy, cookie = identity_from_command(cmd)
+    limiter.acquire(proxy, cookie, cancel_token)
+
+    result = run_command(cmd, timeout=timeout, **kwargs)
+
+    if result.returncode == 0:
+        limiter.report(proxy, cookie, throttled=False)
+    elif is_throttle_error(result.stderr if isinstance(result.stderr, str) else None):
+        limiter.report(proxy, cookie, throttled=True)
+    return result
@@ -0,0 +1,293 @@
+"""
+字幕纯函数多进程批处理
+
+格式转换、cue 合并、chunk 拆分/重编号/校验、双语合并、简繁检测都是纯 CPU 计算，
+在流水线 worker 线程中执行时受 GIL 限制只能用满一个核心。批量重处理大量已下载字幕
+（如修改输出格式后重新导出）时，可通过本模块把这些函数分发到进程池执行。
+
+- 任务按名称注册（见 TASKS），子进程按名称导入函数，参数与返回值均为可 pickle 的基础类型
+- 批量 API（map / 各 *_batch 方法）按 chunksize 打包提交，摊薄进程间通信开销
+- max_workers <= 1、批量过小或进程池不可用时自动回退为当前进程内顺序执行，结果一致
+"""
+
+import importlib
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.subtitle.merger import MergerConfig, SubtitleCue, SubtitleMerger
+
+
+# 任务名 -> "模块:函数"（子进程中按需导入，避免 pickle 函数对象）
+TASKS: Dict[str, str] = {
+    # 格式转换
+    "convert_to_srt": "core.subtitle_format:convert_to_srt",
+    "convert_vtt_to_srt": "core.subtitle_format:convert_vtt_to_srt",
+    "convert_srv3_to_srt": "core.subtitle_format:convert_srv3_to_srt",
+    "convert_json3_to_srt": "core.subtitle_format:convert_json3_to_srt",
+    # 智能合并
+    "merge_cues": "core.subtitle.process_pool:merge_cues_task",
+    # ChunkTracker 拆分/重编号/校验
+    "parse_srt_entries": "core.state.chunk_tracker:parse_srt_entries",
+    "split_srt_entries": "core.state.chunk_tracker:split_srt_entries",
+    "renumber_srt": "core.state.chunk_tracker:renumber_srt",
+    "validate_timeline": "core.state.chunk_tracker:validate_timeline",
+    # 输出格式（双语合并 / TXT）
+    "parse_srt": "core.output.formats.subtitle:parse_srt",
+    "srt_to_txt": "core.output.formats.subtitle:srt_to_txt",
+    "bilingual": "core.subtitle.process_pool:bilingual_task",
+    # 简繁检测
+    "detect_chinese_variant": "core.chinese_detector:detect_chinese_variant",
+}
+
+_resolved: Dict[str, Callable[..., Any]] = {}
+
+
+def _resolve(task: str) -> Callable[..., Any]:
+    """按任务名解析函数（每个进程缓存一次）"""
+    func = _resolved.get(task)
+    if func is None:
+        if task not in TASKS:
+            raise ValueError(f"Unknown subtitle task: {task}")
+        module_name, func_name = TASKS[task].split(":")
+        func = getattr(importlib.import_module(module_name), func_name)
+        _resolved[task] = func
+    return func
+
+
+def _run_chunk(task: str, args_chunk: List[Tuple]) -> List[Any]:
+    """在子进程中执行一批任务"""
+    func = _resolve(task)
+    return [func(*args) for args in args_chunk]
+
+
+def _init_worker() -> None:
+    """子进程初始化：使用静默 logger，避免每个子进程创建日志文件或刷屏"""
+    from core import logger as logger_module
+
+    if logger_module._global_logger is None:
+        # spawn：全新进程，安装不写文件的 logger
+        logger_module.set_global_logger(
+            logger_module.Logger(
+                level="WARNING",
+                console_output=False,
+                file_output=False,
+                auto_cleanup=False,
+            )
+        )
+    else:
+        # fork：沿用父进程 logger 的副本，只提高级别
+        logger_module.get_logger().set_level("WARNING")
+
+
+# ============ 组合任务（需要多个步骤的纯函数）============
+
+
+def merge_cues_task(
+    cues: List[SubtitleCue], config: Optional[MergerConfig] = None
+) -> list:
+    """SubtitleMerger.merge_cues 的无状态封装"""
+    return SubtitleMerger(config).merge_cues(cues)
+
+
+def bilingual_task(
+    source_content: str,
+    target_content: str,
+    output_format: str = "srt",
+    tolerance_ms: Optional[int] = None,
+) -> str:
+    """解析源/目标字幕并生成双语内容
+
+    Args:
+        source_content: 源语言字幕内容（SRT/VTT）
+        target_content: 目标语言字幕内容（SRT/VTT）
+        output_format: "srt" 或 "txt"
+        tolerance_ms: 时间轴对齐容差（毫秒），None 表示默认值
+
+    Returns:
+        双语字幕内容
+    """
+    from core.output.formats.subtitle import (
+        parse_srt,
+        merge_srt_entries,
+        merge_entries_to_txt,
+    )
+
+    from core.output.formats.alignment import DEFAULT_ALIGN_TOLERANCE_MS
+
+    if tolerance_ms is None:
+        tolerance_ms = DEFAULT_ALIGN_TOLERANCE_MS
+    source_entries = parse_srt(source_content)
+    target_entries = parse_srt(target_content)
+    if output_format == "txt":
+        return merge_entries_to_txt(source_entries, target_entries, tolerance_ms)
+    return merge_srt_entries(source_entries, target_entries, tolerance_ms)
+
+
+class SubtitleProcessPool:
+    """字幕纯函数进程池
+
+    Example:
+        with SubtitleProcessPool(max_workers=4) as pool:
+            srt_list = pool.convert_to_srt_batch(vtt_contents)
+            txt_list = pool.map("srt_to_txt", [(srt,) for srt in srt_list])
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        min_batch_size: int = 8,
+        chunksize: Optional[int] = None,
+    ):
+        """初始化进程池（子进程在首次批量提交时才创建）
+
+        Args:
+            max_workers: 进程数，None 表示 CPU 核数；<= 1 表示不使用子进程
+            min_batch_size: 批量小于该值时直接在当前进程执行（启动子进程不划算）
+            chunksize: 每次提交给子进程的任务数，None 表示按批量大小自动计算
+        """
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.min_batch_size = max(1, min_batch_size)
+        self.chunksize = chunksize
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._disabled = self.max_workers <= 1
+
+    @property
+    def uses_processes(self) -> bool:
+        """是否会使用子进程执行"""
+        return not self._disabled
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._disabled:
+                return None
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, initializer=_init_worker
+                    )
+                except (OSError, NotImplementedError, ValueError) as e:
+                    self._disable(e)
+                    return None
+            return self._executor
+
+    def _disable(self, error: Exception) -> None:
+        """进程池不可用时回退为进程内执行"""
+        from core.logger import get_logger
+
+        get_logger().warning_i18n("log.subtitle_process_pool_fallback", error=str(error))
+        self._disabled = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _chunk(self, items: List[Tuple]) -> List[List[Tuple]]:
+        size = self.chunksize or max(1, math.ceil(len(items) / (self.max_workers * 4)))
+        return [items[i : i + size] for i in range(0, len(items), size)]
+
+    def map(self, task: str, args_list: Iterable[Sequence[Any]]) -> List[Any]:
+        """批量执行任务，结果顺序与输入一致
+
+        Args:
+            task: 任务名（见 TASKS）
+            args_list: 每个元素为一次调用的位置参数
+
+        Returns:
+            结果列表
+        """
+        items = [tuple(args) for args in args_list]
+        if not items:
+            return []
+        _resolve(task)  # 尽早暴露未知任务名
+
+        executor = None
+        if len(items) >= self.min_batch_size:
+            executor = self._get_executor()
+        if executor is None:
+            return _run_chunk(task, items)
+
+        try:
+            futures = [
+                executor.submit(_run_chunk, task, chunk) for chunk in self._chunk(items)
+            ]
+            results: List[Any] = []
+            for future in futures:
+                results.extend(future.result())
+            return results
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._disable(e)
+            return _run_chunk(task, items)
+
+    # ============ 便捷批量接口 ============
+
+    def convert_to_srt_batch(
+        self, contents: Sequence[str], source_format: Optional[str] = None
+    ) -> List[str]:
+        """批量转换为 SRT（VTT / JSON3 / SRV3 / SRT 自动检测）"""
+        return self.map("convert_to_srt", [(c, source_format) for c in contents])
+
+    def merge_cues_batch(
+        self, cue_lists: Sequence[List[SubtitleCue]], config: Optional[MergerConfig] = None
+    ) -> list:
+        """批量执行 SubtitleMerger.merge_cues"""
+        return self.map("merge_cues", [(cues, config) for cues in cue_lists])
+
+    def renumber_srt_batch(self, contents: Sequence[str]) -> List[str]:
+        """批量重新编号 SRT"""
+        return self.map("renumber_srt", [(c,) for c in contents])
+
+    def validate_timeline_batch(self, contents: Sequence[str]) -> List[List[str]]:
+        """批量校验时间轴"""
+        return self.map("validate_timeline", [(c,) for c in contents])
+
+    def split_srt_batch(
+        self, contents: Sequence[str], chunk_size: int, max_chars: int
+    ) -> List[List[List[Dict]]]:
+        """批量解析并拆分字幕为 chunk 条目分组"""
+        entries_list = self.map("parse_srt_entries", [(c,) for c in contents])
+        return self.map(
+            "split_srt_entries", [(e, chunk_size, max_chars) for e in entries_list]
+        )
+
+    def srt_to_txt_batch(self, contents: Sequence[str]) -> List[str]:
+        """批量 SRT -> TXT"""
+        return self.map("srt_to_txt", [(c,) for c in contents])
+
+    def bilingual_batch(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        output_format: str = "srt",
+        tolerance_ms: Optional[int] = None,
+    ) -> List[str]:
+        """批量生成双语字幕
+
+        Args:
+            pairs: (源语言内容, 目标语言内容) 列表
+            output_format: "srt" 或 "txt"
+            tolerance_ms: 时间轴对齐容差（毫秒），None 表示默认值
+        """
+        return self.map(
+            "bilingual", [(s, t, output_format, tolerance_ms) for s, t in pairs]
+        )
+
+    def detect_chinese_variant_batch(self, texts: Sequence[str]) -> List[str]:
+        """批量简繁检测"""
+        return self.map("detect_chinese_variant", [(text,) for text in texts])
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭子进程"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def __enter__(self) -> "SubtitleProcessPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
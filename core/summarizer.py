@@ -5,14 +5,22 @@ AI 摘要模块
 """
 
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 
 from core.models import VideoInfo
 from core.language import LanguageConfig
-from core.prompts import get_summary_prompt, get_chunk_summary_prompt, get_reduce_summary_prompt
+from core.prompts import (
+    PromptParts,
+    build_chunk_summary_prompt,
+    build_reduce_summary_prompt,
+    build_summary_prompt,
+    split_prompt,
+)
 from core.logger import get_logger
 from core.llm_client import LLMClient, LLMException, LLMErrorType
 from core.exceptions import AppException, ErrorType, map_llm_error_to_app_error
+from core.artifact_store import ArtifactStore
+from core.failure_logger import _atomic_write
 
 logger = get_logger()
 
@@ -29,15 +37,22 @@ class Summarizer:
     根据 LanguageConfig 生成单语言摘要
     """
 
-    def __init__(self, llm: LLMClient, language_config: LanguageConfig):
+    def __init__(
+        self,
+        llm: LLMClient,
+        language_config: LanguageConfig,
+        artifacts: Optional[ArtifactStore] = None,
+    ):
         """初始化摘要生成器
 
         Args:
             llm: LLM 客户端实例（符合 ai_design.md 规范）
             language_config: 语言配置
+            artifacts: 阶段间产物存储（可选）；提供时从中读取字幕，摘要只保存在内存中
         """
         self.llm = llm
         self.language_config = language_config
+        self.artifacts = artifacts
         # 保存摘要错误信息（用于 pipeline 记录失败时获取 error_type）
         self._last_summary_error: Optional[AppException] = None
 
@@ -84,7 +99,7 @@ class Summarizer:
         summary_path = output_path / f"summary.{summary_lang}.md"
 
         # 检查是否已存在摘要文件（避免重复调用 AI）
-        if summary_path.exists() and not force_regenerate:
+        if self._exists(summary_path) and not force_regenerate:
             logger.info_i18n(
                 "summary_file_exists_skip",
                 file_name=summary_path.name,
@@ -97,7 +112,7 @@ class Summarizer:
             summary_lang, translation_result, download_result
         )
 
-        if not source_subtitle_path or not source_subtitle_path.exists():
+        if not self._exists(source_subtitle_path):
             logger.warning_i18n(
                 "summary_source_not_found_skip", video_id=video_info.video_id
             )
@@ -155,7 +170,7 @@ class Summarizer:
                 
                 # 生成摘要 Prompt（传入视频时长用于动态计算推荐字数）
                 duration_minutes = (video_info.duration // 60) if video_info.duration else 0
-                prompt = get_summary_prompt(
+                prompt = build_summary_prompt(
                     summary_language=summary_lang,
                     subtitle_text=plain_text,
                     video_title=video_info.title,
@@ -169,10 +184,10 @@ class Summarizer:
                 )
                 return None
 
-            # 保存摘要文件（使用原子写）
-            from core.failure_logger import _atomic_write
-
-            if not _atomic_write(summary_path, summary_content, mode="w"):
+            # 保存摘要（产物存储或原子写）
+            if self.artifacts:
+                self.artifacts.write_text(summary_path, summary_content)
+            elif not _atomic_write(summary_path, summary_content, mode="w"):
                 logger.error_i18n(
                     "summary_save_failed",
                     video_id=video_info.video_id,
@@ -259,7 +274,7 @@ class Summarizer:
         """
         # 优先使用翻译后的字幕（如果存在）
         translated_path = translation_result.get(summary_language)
-        if translated_path and translated_path.exists():
+        if self._exists(translated_path):
             logger.info_i18n(
                 "summary_source_translated", file_name=translated_path.name
             )
@@ -267,13 +282,13 @@ class Summarizer:
 
         # 否则使用原始字幕
         original_path = download_result.get("original")
-        if original_path and original_path.exists():
+        if self._exists(original_path):
             logger.info_i18n("summary_source_original", file_name=original_path.name)
             return original_path
 
         # 如果都没有，尝试使用任何可用的翻译字幕
         for lang, path in translation_result.items():
-            if path and path.exists():
+            if self._exists(path):
                 logger.info_i18n(
                     "summary_source_translated_lang", file_name=path.name, lang=lang
                 )
@@ -281,6 +296,12 @@ class Summarizer:
 
         return None
 
+    def _exists(self, path: Optional[Path]) -> bool:
+        """文件是否存在（包括只保存在产物存储中的译文、摘要）"""
+        if self.artifacts:
+            return self.artifacts.exists(path)
+        return bool(path) and path.exists()
+
     def _read_srt_file(self, srt_path: Path) -> Optional[str]:
         """读取 SRT 字幕文件
 
@@ -291,6 +312,8 @@ class Summarizer:
             字幕文本内容，如果失败则返回 None
         """
         try:
+            if self.artifacts:
+                return self.artifacts.read_text(srt_path)
             return srt_path.read_text(encoding="utf-8")
         except (OSError, IOError, PermissionError) as e:
             # 文件IO错误
@@ -373,11 +396,11 @@ class Summarizer:
         # 合并文本行，用空格分隔
         return " ".join(text_lines)
 
-    def _call_ai_api(self, prompt: str) -> Optional[str]:
+    def _call_ai_api(self, prompt: Union[str, PromptParts]) -> Optional[str]:
         """调用 AI API 生成摘要
 
         Args:
-            prompt: 摘要提示词
+            prompt: 摘要提示词（PromptParts 的静态指令作为 system 消息发送）
 
         Returns:
             摘要文本，如果失败则返回 None
@@ -386,7 +409,8 @@ class Summarizer:
             LLMException: 当 LLM 调用失败时抛出
         """
         try:
-            result = self.llm.generate(prompt)
+            user, system = split_prompt(prompt)
+            result = self.llm.generate(user, system=system)
             return result.text
         except LLMException:
             # 重新抛出 LLMException，由调用方处理
@@ -443,7 +467,7 @@ class Summarizer:
         
         def summarize_chunk(chunk_index: int, chunk_text: str, max_retries: int = 2):
             """摘要单个 chunk 的工作函数（带重试）"""
-            prompt = get_chunk_summary_prompt(
+            prompt = build_chunk_summary_prompt(
                 summary_language=summary_lang,
                 chunk_text=chunk_text,
                 chunk_index=chunk_index + 1,
@@ -521,7 +545,7 @@ class Summarizer:
         )
         
         combined_text = "\n\n---\n\n".join(sub_summaries)
-        reduce_prompt = get_reduce_summary_prompt(
+        reduce_prompt = build_reduce_summary_prompt(
             summary_language=summary_lang,
             sub_summaries=combined_text,
             video_title=video_title,
@@ -0,0 +1,175 @@
+"""
+跨视频的字幕条目翻译记忆
+
+频道批量处理时，很多视频有相同的字幕条目：片头片尾、赞助口播、[Music]、[Applause] 等音效标记。
+翻译记忆按 (源语言, 目标语言, 条目文本) 记录已翻译的条目，同一批任务中的后续视频直接复用：
+
+- 先按原文精确匹配，再按归一化文本（Unicode NFKC、合并空白、忽略大小写）匹配
+- single-flight：同一条文本正在被其他视频翻译时，等待其结果而不是重复请求；
+  翻译方失败时释放，由等待方自己翻译
+- 每个 LLM 客户端一份（同一批任务共享），按 LRU 限制条目数
+"""
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.llm_client import ClientRegistry
+
+# 最多记忆的归一化条目数
+MAX_ENTRIES = 20000
+
+_WHITESPACE = re.compile(r"\s+")
+# 音效 / 音乐标记：[Music]、(Applause)、♪ ... ♪
+_SOUND_TAG = re.compile(r"^[\[\(（【♪♫].*[\]\)）】♪♫]$", re.DOTALL)
+# 完整句子的结尾
+_SENTENCE_END = re.compile(r"[.!?。！？…]['\"”’）)]*$")
+
+_Key = Tuple[str, str, str]
+
+
+def normalize_cue_text(text: str) -> str:
+    """归一化条目文本（NFKC、合并空白、忽略大小写）"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+def is_reusable_cue(text: str) -> bool:
+    """条目译文能否脱离上下文复用
+
+    LLM 按上下文翻译，半句话的条目（自动字幕常见）译文可能包含相邻条目的内容，不能复用。
+    只复用音效标记和完整的句子（不以小写字母开头、以句末标点结尾）。
+    """
+    text = text.strip()
+    if not text:
+        return False
+    if _SOUND_TAG.match(text):
+        return True
+    return bool(_SENTENCE_END.search(text)) and not text[0].islower()
+
+
+class TranslationMemory:
+    """条目级翻译记忆（线程安全）"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        """初始化
+
+        Args:
+            max_entries: 最多记忆的归一化条目数
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.coalesced = 0
+        # 归一化键 -> {原文: 译文}（同一归一化文本的不同写法分别记录，精确匹配优先）
+        self._entries: "OrderedDict[_Key, Dict[str, str]]" = OrderedDict()
+        self._flights: Dict[_Key, Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(source: str, target: str, text: str) -> _Key:
+        return (source, target, normalize_cue_text(text))
+
+    def lookup(self, source: str, target: str, text: str) -> Optional[str]:
+        """只查找，不登记"""
+        with self._lock:
+            return self._lookup(self._key(source, target, text), text)
+
+    def _lookup(self, key: _Key, text: str) -> Optional[str]:
+        variants = self._entries.get(key)
+        if not variants:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return variants.get(text) or next(iter(variants.values()))
+
+    def claim(self, source: str, target: str, text: str) -> Tuple[Optional[str], Optional[Future]]:
+        """查找条目，未命中时登记为翻译方
+
+        Returns:
+            命中：(译文, None)；其他调用方正在翻译：(None, Future)，结果为译文或 None（翻译方失败）；
+            否则 (None, None)，调用方成为翻译方，之后必须调用 resolve
+        """
+        key = self._key(source, target, text)
+        with self._lock:
+            translation = self._lookup(key, text)
+            if translation is not None:
+                return translation, None
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return None, flight
+            self._flights[key] = Future()
+            return None, None
+
+    def resolve(self, source: str, target: str, text: str, translation: Optional[str]) -> None:
+        """翻译方提交结果（None 表示失败，释放给等待方重新翻译）"""
+        key = self._key(source, target, text)
+        with self._lock:
+            if translation:
+                self._entries.setdefault(key, {})[text] = translation
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.set_result(translation or None)
+
+    def translate(self, source: str, target: str, text: str, fn: Callable[[], Optional[str]]) -> Optional[str]:
+        """同步的 single-flight 翻译：命中直接返回，其他线程正在翻译时等待，否则调用 fn 并记录结果"""
+        while True:
+            translation, flight = self.claim(source, target, text)
+            if translation is not None:
+                return translation
+            if flight is None:
+                break
+            translation = flight.result()
+            if translation is not None:
+                return translation
+            # 翻译方失败：重新竞争，由本线程翻译
+
+        try:
+            translation = fn()
+        except BaseException:
+            self.resolve(source, target, text, None)
+            raise
+        self.resolve(source, target, text, translation)
+        return translation
+
+    def bind(self, source: str, target: str) -> "BoundTranslationMemory":
+        """绑定语言对"""
+        return BoundTranslationMemory(self, source, target)
+
+
+class BoundTranslationMemory:
+    """绑定了语言对的翻译记忆（供逐条翻译任务使用）"""
+
+    def __init__(self, memory: TranslationMemory, source: str, target: str):
+        self.memory = memory
+        self.source = source
+        self.target = target
+
+    def claim(self, text: str) -> Tuple[Optional[str], Optional[Future]]:
+        return self.memory.claim(self.source, self.target, text)
+
+    def resolve(self, text: str, translation: Optional[str]) -> None:
+        self.memory.resolve(self.source, self.target, text, translation)
+
+
+_memories: ClientRegistry[TranslationMemory] = ClientRegistry(lambda llm: TranslationMemory())
+
+
+def get_translation_memory(llm: Any) -> TranslationMemory:
+    """获取 LLM 客户端对应的翻译记忆（同一客户端处理的所有视频共享）
+
+    Args:
+        llm: LLM 客户端实例
+
+    Returns:
+        TranslationMemory 实例
+    """
+    return _memories.get(llm)
@@ -0,0 +1,293 @@
+"""
+按上下文窗口自适应的分块大小
+
+分块大小由当前 LLM 客户端的 max_input_tokens / max_output_tokens 和按语言估算的 token 数决定：
+本地小模型用小块，200K 上下文的云端模型用大块，每个视频的请求次数随之减少。
+
+运行中按结果在线调整（每个 LLM 客户端一份状态，所有视频共享）：
+- 输出被截断：缩小一半
+- 其他失败（缺条目、乱码、异常）：缩小四分之一
+- 连续若干次快速成功：放大，最多到估算预算的上限
+
+未提供 token 限制的客户端（如测试用的假客户端）使用固定的默认分块。
+
+多目标语言翻译一次请求输出所有目标语言，输出预算按各语言的估算输出之和计算。
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from core.language import normalize_language_code
+from core.llm_client import ClientRegistry
+from core.logger import get_logger
+from core.state.chunk_tracker import ChunkTracker, parse_srt_entries
+
+from .salvage import timing_key
+
+logger = get_logger()
+
+# 系统指令、语言说明等 Prompt 固定部分预留的 token 数
+PROMPT_RESERVE_TOKENS = 1500
+# 输出预算只用到 max_output_tokens 的这个比例（估算误差 + 模型偶尔的多余输出）
+OUTPUT_SAFETY_RATIO = 0.8
+# 每条字幕的序号和时间轴约合的 token 数
+CUE_OVERHEAD_TOKENS = 12
+
+# 单个 chunk 的上下限（条目过多时模型容易错位，过少时请求次数太多）
+MIN_CHUNK_CHARS = 1000
+MAX_CHUNK_CUES = 400
+
+# 在线调整：初始比例、上下限和步长
+INITIAL_SCALE = 0.75
+MIN_SCALE = 0.125
+MAX_SCALE = 1.0
+TRUNCATED_FACTOR = 0.5
+FAILED_FACTOR = 0.75
+GROW_FACTOR = 1.25
+GROW_AFTER_SUCCESSES = 3  # 连续快速成功多少次后放大
+FAST_REQUEST_SECONDS = 45.0  # 快速成功的耗时上限
+
+# 未提供 token 限制时的固定分块（与 ChunkTracker 默认值一致），以及直接翻译的阈值
+LEGACY_DIRECT_MAX_CHARS = 8000
+LEGACY_DIRECT_MAX_CUES = 100
+
+# 中日文字（汉字、假名）和韩文
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_HANGUL = re.compile(r"[\uac00-\ud7af]")
+
+# 各语言译文相对英文的字符数比例
+_LENGTH_RATIO: Dict[str, float] = {
+    "zh": 0.35,
+    "ja": 0.5,
+    "ko": 0.55,
+    "de": 1.2,
+    "fr": 1.15,
+    "es": 1.15,
+    "pt": 1.15,
+    "it": 1.1,
+    "ru": 1.1,
+    "ar": 0.9,
+}
+
+# 各语言文本每个字符约合的 token 数（常见 BPE 分词器的经验值）
+_TOKENS_PER_CHAR: Dict[str, float] = {
+    "zh": 1.0,
+    "ja": 1.0,
+    "ko": 0.8,
+    "ru": 0.4,
+    "uk": 0.4,
+    "ar": 0.45,
+    "hi": 0.6,
+    "th": 0.6,
+}
+_DEFAULT_TOKENS_PER_CHAR = 0.28
+
+
+def _base_language(language: Optional[str]) -> str:
+    """语言代码的主语言部分（zh-CN -> zh）"""
+    if not language:
+        return ""
+    return normalize_language_code(language).split("-")[0].lower()
+
+
+def estimate_tokens(text: str) -> int:
+    """按文字系统估算 token 数（中日文约 1 字 1 token，韩文 0.8，其他按约 4 字符 1 token）"""
+    cjk = len(_CJK.findall(text))
+    hangul = len(_HANGUL.findall(text))
+    ascii_chars = sum(1 for char in text if char < "\x80")
+    other = len(text) - cjk - hangul - ascii_chars
+    return int(cjk + hangul * 0.8 + ascii_chars * 0.25 + other * 0.45) + 1
+
+
+def estimate_output_tokens(srt_content: str, source_language: str, target_language: str) -> int:
+    """估算把 SRT 内容翻译成目标语言后的输出 token 数"""
+    source = _base_language(source_language)
+    target = _base_language(target_language)
+    ratio = _LENGTH_RATIO.get(target, 1.0) / _LENGTH_RATIO.get(source, 1.0)
+    tokens_per_char = _TOKENS_PER_CHAR.get(target, _DEFAULT_TOKENS_PER_CHAR)
+
+    entries = parse_srt_entries(srt_content)
+    text_chars = sum(len(entry["text"]) for entry in entries)
+    return int(text_chars * ratio * tokens_per_char + len(entries) * CUE_OVERHEAD_TOKENS) + 1
+
+
+@dataclass(frozen=True)
+class ChunkLimits:
+    """单个 chunk 的大小上限"""
+
+    chunk_size: int  # 条目数
+    max_chars: int  # 字符数（按 SRT 格式计算）
+
+
+DEFAULT_LIMITS = ChunkLimits(
+    chunk_size=ChunkTracker.DEFAULT_CHUNK_SIZE, max_chars=ChunkTracker.DEFAULT_MAX_CHARS
+)
+
+
+class AdaptiveChunkSizer:
+    """按 LLM 客户端的 token 限制计算分块大小，并按请求结果在线调整（线程安全）"""
+
+    def __init__(self, max_input_tokens: Optional[int] = None, max_output_tokens: Optional[int] = None):
+        """初始化
+
+        Args:
+            max_input_tokens: 客户端最大输入 token 数（None 表示未知，使用固定分块）
+            max_output_tokens: 客户端最大输出 token 数（None 表示未知，使用固定分块）
+        """
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.scale = INITIAL_SCALE
+        self._fast_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def adaptive(self) -> bool:
+        return bool(self.max_input_tokens and self.max_output_tokens)
+
+    def limits(
+        self,
+        subtitle_text: str,
+        source_language: str,
+        target_language: Union[str, Sequence[str]],
+    ) -> ChunkLimits:
+        """计算当前的分块上限
+
+        Args:
+            subtitle_text: 整个字幕的 SRT 内容（用于估算每字符 token 数和平均条目长度）
+            source_language: 源语言
+            target_language: 目标语言（多目标语言翻译时为语言列表）
+
+        Returns:
+            ChunkLimits
+        """
+        targets = [target_language] if isinstance(target_language, str) else list(target_language)
+        chars = len(subtitle_text)
+        cues = subtitle_text.count("-->")
+        if not self.adaptive or chars == 0 or cues == 0:
+            if len(targets) > 1:
+                # 固定分块：输出长度随语言数增长，按语言数缩小源字幕长度
+                return ChunkLimits(
+                    chunk_size=DEFAULT_LIMITS.chunk_size,
+                    max_chars=max(MIN_CHUNK_CHARS, DEFAULT_LIMITS.max_chars // len(targets)),
+                )
+            return DEFAULT_LIMITS
+
+        input_per_char = estimate_tokens(subtitle_text) / chars
+        output_per_char = sum(
+            estimate_output_tokens(subtitle_text, source_language, target) for target in targets
+        ) / chars
+        input_budget = max(self.max_input_tokens - PROMPT_RESERVE_TOKENS, 0)
+        output_budget = self.max_output_tokens * OUTPUT_SAFETY_RATIO
+        budget_chars = min(input_budget / input_per_char, output_budget / output_per_char)
+
+        with self._lock:
+            scale = self.scale
+        max_chars = max(int(budget_chars * scale), MIN_CHUNK_CHARS)
+        chars_per_cue = chars / cues
+        chunk_size = max(1, min(int(max_chars / chars_per_cue) + 1, MAX_CHUNK_CUES))
+        return ChunkLimits(chunk_size=chunk_size, max_chars=max_chars)
+
+    def needs_chunking(
+        self,
+        subtitle_text: str,
+        source_language: str,
+        target_language: Union[str, Sequence[str]],
+    ) -> bool:
+        """字幕是否超过单次请求的上限，需要分块翻译（target_language 可以是多目标语言列表）"""
+        cues = subtitle_text.count("-->")
+        if not self.adaptive:
+            return (
+                len(subtitle_text) > LEGACY_DIRECT_MAX_CHARS
+                or subtitle_text.count("\n\n") > LEGACY_DIRECT_MAX_CUES
+            )
+        limits = self.limits(subtitle_text, source_language, target_language)
+        return len(subtitle_text) > limits.max_chars or cues > limits.chunk_size
+
+    def record(self, requested: str, response: Optional[str], elapsed: float) -> None:
+        """记录一次分块请求的结果并调整比例
+
+        Args:
+            requested: 请求的 SRT 原文
+            response: 模型输出（None 表示失败）
+            elapsed: 请求耗时（秒）
+        """
+        self.record_many(requested, [response], elapsed)
+
+    def record_many(self, requested: str, responses: List[Optional[str]], elapsed: float) -> None:
+        """记录一次多目标语言请求的结果（按最差的语言调整，每次请求只计一次）
+
+        Args:
+            requested: 请求的 SRT 原文
+            responses: 各目标语言的输出（None 表示该语言失败）
+            elapsed: 请求耗时（秒）
+        """
+        if not self.adaptive:
+            return
+
+        expected = parse_srt_entries(requested)
+        factors = [self._classify(expected, response) for response in responses]
+        factor = min((f for f in factors if f is not None), default=None)
+        if factor is None and elapsed > FAST_REQUEST_SECONDS:
+            # 成功但较慢，不放大也不缩小
+            with self._lock:
+                self._fast_successes = 0
+            return
+
+        self._adjust(factor)
+
+    @staticmethod
+    def _classify(expected: List[Dict], response: Optional[str]) -> Optional[float]:
+        """按单个输出判断调整系数（None 表示成功）"""
+        received_timings = {
+            timing_key(e["start"], e["end"])
+            for e in parse_srt_entries(response or "")
+            if e["text"].strip()
+        }
+        last_timing = timing_key(expected[-1]["start"], expected[-1]["end"]) if expected else None
+        if received_timings and last_timing not in received_timings:
+            # 开头的条目回来了、结尾的没有：输出被截断
+            return TRUNCATED_FACTOR
+        if len(received_timings) < len(expected):
+            return FAILED_FACTOR
+        return None
+
+    def _adjust(self, factor: Optional[float]) -> None:
+        """按调整系数更新比例（None 表示一次快速成功）"""
+        with self._lock:
+            previous = self.scale
+            if factor is None:
+                self._fast_successes += 1
+                if self._fast_successes < GROW_AFTER_SUCCESSES:
+                    return
+                self._fast_successes = 0
+                self.scale = min(self.scale * GROW_FACTOR, MAX_SCALE)
+            else:
+                self._fast_successes = 0
+                self.scale = max(self.scale * factor, MIN_SCALE)
+            scale = self.scale
+        if scale != previous:
+            logger.debug_i18n(
+                "log.chunk_size_adjusted", previous=f"{previous:.2f}", scale=f"{scale:.2f}"
+            )
+
+
+def _create_sizer(llm: Any) -> AdaptiveChunkSizer:
+    limits = [getattr(llm, name, None) for name in ("max_input_tokens", "max_output_tokens")]
+    return AdaptiveChunkSizer(*(value if isinstance(value, int) else None for value in limits))
+
+
+_sizers: ClientRegistry[AdaptiveChunkSizer] = ClientRegistry(_create_sizer)
+
+
+def get_chunk_sizer(llm: Any) -> AdaptiveChunkSizer:
+    """获取 LLM 客户端对应的分块大小状态（同一客户端的所有视频共享在线调整结果）
+
+    Args:
+        llm: LLM 客户端实例
+
+    Returns:
+        AdaptiveChunkSizer 实例
+    """
+    return _sizers.get(llm)
@@ -0,0 +1,78 @@
+"""
+多目标语言翻译响应解析
+
+一次请求翻译多种目标语言时，模型按语言返回
+<translation lang="zh-CN"> ... </translation> 标签，这里负责拆分并逐语言校验。
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from core.language import normalize_language_code
+
+_TRANSLATION_BLOCK = re.compile(
+    r"<translation\s+lang\s*=\s*[\"']?([^\"'>\s]+)[\"']?\s*>(.*?)</translation\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_BLOCK_OPEN = re.compile(r"<translation\b[^>]*>", re.IGNORECASE)
+_BLOCK_CLOSE = re.compile(r"</translation\s*>", re.IGNORECASE)
+
+# 模型偶尔会给 SRT 内容再包一层代码块
+_CODE_FENCE = re.compile(r"^```[a-zA-Z]*\n(.*?)\n```$", re.DOTALL)
+
+
+def _match_language(code: str, target_languages: List[str]) -> Optional[str]:
+    """将响应中的语言代码匹配到请求的目标语言（忽略大小写和 _ / - 差异）"""
+    wanted = code.strip().replace("_", "-").lower()
+    for lang in target_languages:
+        if lang.lower() == wanted:
+            return lang
+    normalized = normalize_language_code(code.strip()).lower()
+    for lang in target_languages:
+        if normalize_language_code(lang).lower() == normalized:
+            return lang
+    return None
+
+
+def unfinished_block(text: Optional[str]) -> Optional[str]:
+    """响应被截断时最后一个未闭合的语言块内容（用于判断截断，其余情况返回 None）"""
+    openings = list(_BLOCK_OPEN.finditer(text or ""))
+    if not openings:
+        return None
+    tail = text[openings[-1].end():]
+    if _BLOCK_CLOSE.search(tail):
+        return None
+    return tail.strip() or None
+
+
+def parse_multi_target_response(text: str, target_languages: List[str]) -> Dict[str, str]:
+    """将多目标语言翻译响应拆分为各语言的 SRT 内容
+
+    Args:
+        text: 模型返回的完整文本
+        target_languages: 请求的目标语言列表
+
+    Returns:
+        {目标语言: SRT 内容}，未返回或内容为空的语言不包含在内
+    """
+    result: Dict[str, str] = {}
+    if not text:
+        return result
+
+    for code, body in _TRANSLATION_BLOCK.findall(text):
+        lang = _match_language(code, target_languages)
+        if not lang or lang in result:
+            continue
+        body = body.strip()
+        fenced = _CODE_FENCE.match(body)
+        if fenced:
+            body = fenced.group(1).strip()
+        if body:
+            result[lang] = body
+    return result
+
+
+def is_complete_translation(source_srt: str, translated_srt: str) -> bool:
+    """检查译文的字幕条目数是否与原文一致"""
+    return bool(translated_srt) and source_srt.count("-->") == translated_srt.count("-->")
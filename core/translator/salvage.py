@@ -0,0 +1,374 @@
+"""
+分块翻译的逐条校验与局部修复
+
+chunk 的翻译响应按字幕条目（以时间轴对齐）逐条校验：正确翻译的条目全部保留，
+只对缺失或损坏的连续区间重新请求。各区间作为独立请求提交到翻译调度器并发执行，
+修复成本与缺陷大小成正比，而不是与 chunk 大小成正比。
+
+某个区间的请求一条都没有收回时，下次在句子边界处拆成两半再请求（通常是区间太长或内容触发了模型的异常输出）。
+
+可以复用的条目（见 core/translation_memory.py）先查翻译记忆：命中的直接填入，
+其他视频正在翻译的条目等待其结果，只有剩余的条目才发起请求。
+"""
+
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from core.exceptions import TaskCancelledError
+from core.logger import get_logger, translate_log
+from core.state.chunk_tracker import format_srt_entry, parse_srt_entries
+from core.translation_memory import BoundTranslationMemory, is_reusable_cue
+
+logger = get_logger()
+
+# 每条字幕最多请求次数（含首次请求）
+MAX_CUE_ATTEMPTS = 4
+
+# 句子结束标点（高优先级拆分点）
+_SENTENCE_END = re.compile(r'[.!?。！？][\s"\'）\]\}]*$')
+# 次要标点（低优先级拆分点）
+_CLAUSE_END = re.compile(r'[,;:，；：、][\s"\'）\]\}]*$')
+
+# 模型输出乱码时常见的替换字符
+_REPLACEMENT_CHAR = "\ufffd"
+
+
+def best_split_index(texts: List[str]) -> int:
+    """在中点附近寻找最佳拆分位置
+
+    允许在中点 ±25% 范围内移动，优先选择句子结束标点之后，其次是逗号、分号等次要标点。
+
+    Args:
+        texts: 各条字幕的文本
+
+    Returns:
+        拆分位置（前半部分的条目数），条目少于 2 条时返回 0
+    """
+    total = len(texts)
+    if total < 2:
+        return 0
+
+    mid = total // 2
+    min_idx = max(1, int(total * 0.25))
+    max_idx = min(total - 1, int(total * 0.75))
+
+    best_idx = mid
+    best_score = 0.0
+    for i in range(min_idx, max_idx + 1):
+        lines = texts[i - 1].split("\n")
+        text = lines[-1] if lines else ""
+
+        # 距离中点越近且有句子结束标点的得分越高
+        distance_score = 1.0 - abs(i - mid) / (max_idx - min_idx + 1)
+        if _SENTENCE_END.search(text):
+            punctuation_score = 2.0
+        elif _CLAUSE_END.search(text):
+            punctuation_score = 1.0
+        else:
+            punctuation_score = 0.0
+
+        score = distance_score + punctuation_score
+        if score > best_score:
+            best_score = score
+            best_idx = i
+    return best_idx
+
+
+def timing_key(start: str, end: str) -> Tuple[str, str]:
+    """时间轴对齐键（忽略 VTT 的 . 与 SRT 的 , 差异）"""
+    return start.replace(".", ","), end.replace(".", ",")
+
+
+def _is_valid_cue_text(text: str) -> bool:
+    """单条译文是否可用（非空且没有乱码替换字符）"""
+    return bool(text.strip()) and _REPLACEMENT_CHAR not in text
+
+
+class CueRepairTask:
+    """一个 chunk 的逐条翻译状态
+
+    区间用 [start, end) 表示 chunk 内的条目位置。所有方法只在协调线程中调用，不需要加锁。
+    """
+
+    def __init__(
+        self,
+        chunk_index: int,
+        content: str,
+        max_attempts: int = MAX_CUE_ATTEMPTS,
+        memory: Optional[BoundTranslationMemory] = None,
+    ):
+        """初始化
+
+        Args:
+            chunk_index: chunk 索引
+            content: chunk 原文（SRT 格式）
+            max_attempts: 每条字幕最多请求次数
+            memory: 翻译记忆（None 表示不复用其他视频的译文）
+        """
+        self.chunk_index = chunk_index
+        self.content = content
+        self.entries = parse_srt_entries(content)
+        self.translations: List[Optional[str]] = [None] * len(self.entries)
+        self.attempts = [0] * len(self.entries)
+        self.max_attempts = max_attempts
+        self.requests = 0
+        self.aborted = False
+        self.memory = memory
+        self.memory_hits = 0
+        self._in_flight: Set[int] = set()
+        # 等待其他视频翻译的条目：位置 -> 翻译记忆的 Future
+        self._waiting: Dict[int, Future] = {}
+        # 由本任务负责翻译并写入翻译记忆的条目：位置 -> 原文
+        self._owned: Dict[int, str] = {}
+        # 上次请求一条都没收回的区间，下次在这些位置拆开
+        self._breaks: Set[int] = set()
+        self._positions: Dict[Tuple[str, str], List[int]] = {}
+        for position, entry in enumerate(self.entries):
+            key = timing_key(entry["start"], entry["end"])
+            self._positions.setdefault(key, []).append(position)
+
+    @property
+    def total(self) -> int:
+        return len(self.entries)
+
+    @property
+    def translated_count(self) -> int:
+        return sum(1 for text in self.translations if text is not None)
+
+    @property
+    def complete(self) -> bool:
+        return self.total > 0 and self.translated_count == self.total
+
+    @property
+    def done(self) -> bool:
+        """没有进行中的请求，没有等待中的条目，也没有可以再请求的条目"""
+        return not self._in_flight and not self._waiting and not self._claimable()
+
+    @property
+    def waits(self) -> Dict[int, Future]:
+        """等待翻译记忆的条目（位置 -> Future）"""
+        return dict(self._waiting)
+
+    def _claimable(self) -> List[int]:
+        if self.aborted:
+            return []
+        return [
+            position
+            for position, text in enumerate(self.translations)
+            if text is None
+            and position not in self._in_flight
+            and position not in self._waiting
+            and self.attempts[position] < self.max_attempts
+        ]
+
+    def _apply_memory(self) -> None:
+        """待请求的可复用条目先查翻译记忆：命中的填入，其他视频正在翻译的转为等待"""
+        if self.memory is None:
+            return
+        for position in self._claimable():
+            if position in self._owned:
+                continue
+            text = self.entries[position]["text"]
+            if not is_reusable_cue(text):
+                continue
+            translation, flight = self.memory.claim(text)
+            if translation is not None:
+                self.translations[position] = translation
+                self.memory_hits += 1
+            elif flight is not None:
+                self._waiting[position] = flight
+            else:
+                self._owned[position] = text
+
+    def claim_ranges(self) -> List[Tuple[int, int]]:
+        """取出所有待请求的连续区间，并标记为进行中
+
+        Returns:
+            [(start, end)]，每个区间对应一次请求
+        """
+        self._apply_memory()
+
+        ranges: List[Tuple[int, int]] = []
+        for position in self._claimable():
+            if ranges and ranges[-1][1] == position and position not in self._breaks:
+                ranges[-1] = (ranges[-1][0], position + 1)
+            else:
+                ranges.append((position, position + 1))
+
+        for start, end in ranges:
+            for position in range(start, end):
+                self._in_flight.add(position)
+                self.attempts[position] += 1
+            self.requests += 1
+        return ranges
+
+    def range_content(self, start: int, end: int) -> str:
+        """区间原文（保留原序号和时间轴，便于按时间轴对齐译文；整个区间直接使用原文）"""
+        if start == 0 and end == self.total:
+            return self.content
+        return "".join(format_srt_entry(entry) for entry in self.entries[start:end]).strip()
+
+    def absorb(self, start: int, end: int, text: Optional[str]) -> int:
+        """收回区间请求的结果，逐条校验并保留可用的译文
+
+        Args:
+            start: 区间起点
+            end: 区间终点（不含）
+            text: 模型返回的文本（None 表示请求失败或被中止且没有可用内容）
+
+        Returns:
+            本次收回的条目数
+        """
+        for position in range(start, end):
+            self._in_flight.discard(position)
+
+        salvaged = 0
+        for entry in parse_srt_entries(text or ""):
+            key = timing_key(entry["start"], entry["end"])
+            for position in self._positions.get(key, ()):
+                if start <= position < end and self.translations[position] is None:
+                    if _is_valid_cue_text(entry["text"]):
+                        self.translations[position] = entry["text"]
+                        salvaged += 1
+                    break
+
+        if salvaged == 0 and end - start > 1:
+            texts = [entry["text"] for entry in self.entries[start:end]]
+            self._breaks.add(start + best_split_index(texts))
+        self._publish()
+        return salvaged
+
+    def abort(self, start: int, end: int) -> None:
+        """请求抛出异常：释放区间，且不再为该 chunk 发起新请求"""
+        for position in range(start, end):
+            self._in_flight.discard(position)
+        self.aborted = True
+        self._publish()
+
+    def resolve_wait(self, position: int, translation: Optional[str]) -> None:
+        """等待的条目有了结果（None 表示翻译方失败，该条目重新变为可请求）"""
+        if self._waiting.pop(position, None) is None:
+            return
+        if translation is not None and self.translations[position] is None:
+            self.translations[position] = translation
+            self.memory_hits += 1
+
+    def _publish(self) -> None:
+        """把本任务负责的条目结果写入翻译记忆；放弃的条目释放给等待方"""
+        for position, text in list(self._owned.items()):
+            translation = self.translations[position]
+            if translation is not None:
+                self.memory.resolve(text, translation)
+            elif position not in self._in_flight and (
+                self.aborted or self.attempts[position] >= self.max_attempts
+            ):
+                self.memory.resolve(text, None)
+            else:
+                continue
+            del self._owned[position]
+
+    def release(self) -> None:
+        """释放所有尚未完成的翻译记忆登记（取消或异常退出时调用，避免其他视频一直等待）"""
+        for text in self._owned.values():
+            self.memory.resolve(text, None)
+        self._owned.clear()
+
+    def render(self) -> str:
+        """按原序号和时间轴输出译文（仅在 complete 时调用）"""
+        return "".join(
+            format_srt_entry({**entry, "text": text})
+            for entry, text in zip(self.entries, self.translations)
+        ).strip()
+
+
+def run_cue_repair(
+    tasks: List[CueRepairTask],
+    submit: Callable[..., Future],
+    translate: Callable[[str], Optional[str]],
+    on_done: Callable[[CueRepairTask], None],
+    video_id: str = "",
+    cancel_token=None,
+) -> None:
+    """并发翻译多个 chunk，只重试缺失或损坏的条目区间
+
+    在调用方（视频）线程中协调：所有区间请求提交给 submit 并发执行，
+    每个请求返回后立即校验并为剩余区间提交新请求。工作线程只执行叶子请求，不会嵌套等待。
+
+    Args:
+        tasks: 各 chunk 的修复状态（等待翻译记忆的条目也在这里等待）
+        submit: 提交函数 submit(fn, *args) -> Future（通常是翻译调度器）
+        translate: 区间翻译函数，参数为区间原文，返回模型输出（可为 None）
+        on_done: chunk 结束（全部翻译或放弃）时的回调
+        video_id: 视频 ID（用于日志）
+        cancel_token: 取消令牌
+
+    Raises:
+        TaskCancelledError: 取消令牌被触发时抛出
+    """
+    in_flight: Dict[Future, Tuple[CueRepairTask, int, int]] = {}
+    # 翻译记忆的 Future -> [(任务, 条目位置)]
+    waits: Dict[Future, List[Tuple[CueRepairTask, int]]] = {}
+
+    def dispatch(task: CueRepairTask) -> None:
+        for start, end in task.claim_ranges():
+            future = submit(translate, task.range_content(start, end))
+            in_flight[future] = (task, start, end)
+        for position, flight in task.waits.items():
+            entries = waits.setdefault(flight, [])
+            if (task, position) not in entries:
+                entries.append((task, position))
+        if task.done:
+            on_done(task)
+
+    def check_cancelled() -> None:
+        if cancel_token and cancel_token.is_cancelled():
+            reason = cancel_token.get_reason() or translate_log("log.user_cancelled")
+            raise TaskCancelledError(reason)
+
+    try:
+        for task in tasks:
+            check_cancelled()
+            dispatch(task)
+
+        while in_flight or waits:
+            finished, _ = wait(list(in_flight) + list(waits), return_when=FIRST_COMPLETED)
+            check_cancelled()
+            for future in finished:
+                if future in waits:
+                    woken = []
+                    for task, position in waits.pop(future):
+                        task.resolve_wait(position, future.result())
+                        if task not in woken:
+                            woken.append(task)
+                    for task in woken:
+                        dispatch(task)
+                    continue
+
+                task, start, end = in_flight.pop(future)
+                try:
+                    text = future.result()
+                except TaskCancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Chunk {task.chunk_index} translation error: {e}")
+                    task.abort(start, end)
+                else:
+                    salvaged = task.absorb(start, end, text)
+                    missing = task.total - task.translated_count
+                    if missing and salvaged:
+                        logger.info_i18n(
+                            "log.chunk_cues_salvaged",
+                            video_id=video_id,
+                            chunk_index=task.chunk_index,
+                            kept=task.translated_count,
+                            total=task.total,
+                            missing=missing,
+                        )
+                dispatch(task)
+    finally:
+        # 取消或异常退出时撤销尚未开始的请求
+        for future in in_flight:
+            future.cancel()
+        for task in tasks:
+            task.release()
@@ -0,0 +1,130 @@
+"""
+翻译调度器
+把各视频的翻译工作单元（目标语言 × chunk）分配到 AI 供应商的并发预算上：
+
+- 每个 LLM 客户端一个调度器，worker 数等于该客户端的 max_concurrency
+- 按视频轮询取任务：每个视频各取一个单元后再轮到下一个，长视频不会饿死其他视频
+- 调用方通过 submit 拿到 concurrent.futures.Future，用法与线程池一致
+
+worker 只执行叶子任务（一次 LLM 调用及其拆分重试），不会在 worker 内再次提交并等待，避免死锁。
+"""
+
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Tuple
+
+from core.llm_client import ClientRegistry
+from core.logger import get_logger
+
+logger = get_logger()
+
+# 默认并发预算（LLM 客户端未提供 max_concurrency 时使用）
+DEFAULT_MAX_WORKERS = 5
+
+# 空闲 worker 的存活时间（秒），超时后退出，有新任务时再创建
+WORKER_IDLE_TIMEOUT = 30.0
+
+_Unit = Tuple[Future, Callable[..., Any], tuple, dict]
+
+
+class TranslationScheduler:
+    """按视频公平分配的翻译工作单元调度器（线程安全）"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """初始化调度器
+
+        Args:
+            max_workers: 最大并发工作单元数（通常为 LLM 客户端的并发预算）
+        """
+        self.max_workers = max(1, max_workers)
+        self._queues: "OrderedDict[str, Deque[_Unit]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._idle = 0
+        self._pending = 0
+
+    def submit(self, video_id: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """提交一个工作单元
+
+        Args:
+            video_id: 所属视频 ID（公平调度的单位）
+            fn: 要执行的函数
+            *args, **kwargs: 传给 fn 的参数
+
+        Returns:
+            Future，可用 result() / as_completed() 等待；未开始的单元可 cancel()
+        """
+        future: Future = Future()
+        with self._cond:
+            self._queues.setdefault(video_id, deque()).append((future, fn, args, kwargs))
+            self._pending += 1
+            # 等待的单元比空闲 worker 多时补充 worker（一次突发提交不会全部排在同一个空闲 worker 后面）
+            while self._pending > self._idle and len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"translate-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        return future
+
+    def pending_count(self) -> int:
+        """等待执行的工作单元数"""
+        with self._cond:
+            return self._pending
+
+    def _next_unit(self) -> _Unit:
+        """轮询取下一个工作单元：取队首视频的一个单元，并把该视频移到队尾"""
+        video_id, queue = next(iter(self._queues.items()))
+        unit = queue.popleft()
+        self._pending -= 1
+        if queue:
+            self._queues.move_to_end(video_id)
+        else:
+            del self._queues[video_id]
+        return unit
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queues:
+                    self._idle += 1
+                    self._cond.wait(timeout=WORKER_IDLE_TIMEOUT)
+                    self._idle -= 1
+                    if not self._queues:
+                        self._workers.remove(threading.current_thread())
+                        return
+                future, fn, args, kwargs = self._next_unit()
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+# 每个 LLM 客户端一个调度器
+def _create_scheduler(llm: Any) -> TranslationScheduler:
+    max_workers = getattr(llm, "max_concurrency", DEFAULT_MAX_WORKERS) or DEFAULT_MAX_WORKERS
+    scheduler = TranslationScheduler(max_workers)
+    logger.debug(f"创建翻译调度器，并发预算 {scheduler.max_workers}")
+    return scheduler
+
+
+_schedulers: ClientRegistry[TranslationScheduler] = ClientRegistry(_create_scheduler)
+
+
+def get_translation_scheduler(llm: Any) -> TranslationScheduler:
+    """获取 LLM 客户端对应的翻译调度器（同一客户端的所有视频共享并发预算）
+
+    Args:
+        llm: LLM 客户端实例
+
+    Returns:
+        TranslationScheduler 实例
+    """
+    return _schedulers.get(llm)
@@ -0,0 +1,92 @@
+"""
+流式翻译输出的增量校验
+
+边接收边检查 SRT 结构，一旦输出明显跑偏（时间轴格式错误、序号乱序、条目数超出预期、
+迟迟不出现字幕内容）就立即中止请求，不必等模型生成完整的错误结果再重试。
+
+多目标语言翻译的响应由多个 <translation lang="..."> 块组成，每个块内序号从 1 重新开始，
+序号和条目数按块分别检查。
+"""
+
+import re
+from typing import Optional
+
+_TIMECODE_LINE = re.compile(
+    r"^\s*\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}\s*-->\s*\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}(\s.*)?$"
+)
+
+# 允许序号向前跳跃的最大幅度（模型偶尔合并相邻条目）
+MAX_INDEX_JUMP = 5
+
+# 多目标语言响应中每种语言的开始标签
+_BLOCK_START = re.compile(r"<translation\b", re.IGNORECASE)
+
+# 第一条时间轴出现前允许的最大字符数（模型的开场白、代码块标记等）
+MAX_PREAMBLE_CHARS = 2000
+
+
+class SrtStreamValidator:
+    """逐段喂入模型输出，发现结构错误时返回中止原因"""
+
+    def __init__(self, expected_cues: Optional[int] = None):
+        """初始化校验器
+
+        Args:
+            expected_cues: 原文字幕条目数（None 表示不检查条目数上限；多目标语言响应按每块检查）
+        """
+        self.expected_cues = expected_cues
+        self.cue_count = 0
+        self._block_cues = 0
+        self._buffer = ""
+        self._received = 0
+        self._previous_line = ""
+        self._last_index: Optional[int] = None
+        self._max_cues = (
+            expected_cues + max(2, expected_cues // 10) if expected_cues else None
+        )
+
+    def feed(self, delta: str) -> Optional[str]:
+        """喂入一段增量输出
+
+        Args:
+            delta: 新收到的文本
+
+        Returns:
+            中止原因；输出仍然合法时返回 None
+        """
+        self._buffer += delta
+        self._received += len(delta)
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            reason = self._check_line(line.rstrip("\r"))
+            if reason:
+                return reason
+
+        if self.cue_count == 0 and self._received > MAX_PREAMBLE_CHARS:
+            return f"no subtitle timecode within first {MAX_PREAMBLE_CHARS} characters"
+        return None
+
+    def _check_line(self, line: str) -> Optional[str]:
+        previous, self._previous_line = self._previous_line, line
+        if _BLOCK_START.search(line):
+            # 新的语言块：序号和条目数重新计算
+            self._last_index = None
+            self._block_cues = 0
+        if "-->" not in line:
+            return None
+        if not _TIMECODE_LINE.match(line):
+            return f"malformed timecode line: {line.strip()[:80]}"
+
+        self.cue_count += 1
+        self._block_cues += 1
+        if self._max_cues is not None and self._block_cues > self._max_cues:
+            return f"cue count {self._block_cues} exceeds expected {self.expected_cues}"
+
+        index_text = previous.strip()
+        if index_text.isdigit():
+            index = int(index_text)
+            last = self._last_index
+            if last is not None and not (last < index <= last + MAX_INDEX_JUMP):
+                return f"cue index {index} out of order after {last}"
+            self._last_index = index
+        return None
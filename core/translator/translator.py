@@ -5,21 +5,28 @@
 """
 
 import re
+import time
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Union
 
 from core.models import VideoInfo, DetectionResult
 from core.language import LanguageConfig
-from core.prompts import get_translation_prompt
+from core.prompts import PromptParts, build_translation_prompt, split_prompt
 from core.logger import get_logger, translate_log
-from core.llm_client import LLMClient, LLMException, LLMErrorType
+from core.llm_client import LLMClient, LLMException, LLMErrorType, supports_streaming
+from core.artifact_store import ArtifactStore
+from core.translation_memory import BoundTranslationMemory, get_translation_memory
 from core.exceptions import (
     AppException,
     ErrorType,
     map_llm_error_to_app_error,
     TaskCancelledError,
 )
+from .chunk_sizing import get_chunk_sizer
+from .salvage import CueRepairTask, run_cue_repair
+from .scheduler import get_translation_scheduler
 from .source_selector import select_source_subtitle
+from .stream_validator import SrtStreamValidator
 
 logger = get_logger()
 
@@ -30,15 +37,22 @@ class SubtitleTranslator:
     根据翻译策略决定是否调用 AI 翻译，或使用官方字幕
     """
 
-    def __init__(self, llm: LLMClient, language_config: LanguageConfig):
+    def __init__(
+        self,
+        llm: LLMClient,
+        language_config: LanguageConfig,
+        artifacts: Optional[ArtifactStore] = None,
+    ):
         """初始化字幕翻译器
 
         Args:
             llm: LLM 客户端实例（符合 ai_design.md 规范）
             language_config: 语言配置
+            artifacts: 阶段间产物存储（可选）；提供时译文只保存在内存中交给下游阶段
         """
         self.llm = llm
         self.language_config = language_config
+        self.artifacts = artifacts
         # 保存翻译错误信息（用于 pipeline 记录失败时获取 error_type）
         self._last_translation_errors: Dict[str, AppException] = {}
 
@@ -120,7 +134,31 @@ class SubtitleTranslator:
         # 确保输出目录存在
         output_path.mkdir(parents=True, exist_ok=True)
 
+        # 多目标语言合并翻译：共用同一源字幕的语言一次请求完成，失败的语言回退到逐语言翻译
+        multi_target_paths: Dict[str, Path] = {}
+        if language_config.multi_target_translation:
+            groups = self._group_multi_target_languages(
+                languages_to_translate,
+                detection_result,
+                language_config,
+                download_result,
+                output_path,
+                force_retranslate,
+            )
+            for source_subtitle_path, group_languages in groups.items():
+                multi_target_paths.update(
+                    self._translate_multi_target(
+                        source_subtitle_path,
+                        group_languages,
+                        output_path,
+                        detection_result,
+                        video_info=video_info,
+                        cancel_token=cancel_token,
+                    )
+                )
+
         # 对需要翻译的语言进行翻译
+        ai_jobs: List[tuple] = []
         for target_lang in languages_to_translate:
             # 检查取消状态
             if cancel_token and cancel_token.is_cancelled():
@@ -135,10 +173,16 @@ class SubtitleTranslator:
                 target_lang=target_lang,
                 video_id=video_info.video_id,
             )
+
+            # 已在多目标语言请求中翻译完成
+            if target_lang in multi_target_paths:
+                result[target_lang] = multi_target_paths[target_lang]
+                continue
+
             translated_path = output_path / f"translated.{target_lang}.srt"
 
             # 检查是否已存在翻译文件（避免重复调用 AI）
-            if translated_path.exists() and not force_retranslate:
+            if self._exists(translated_path) and not force_retranslate:
                 logger.info_i18n(
                     "translation_file_exists_skip",
                     file_name=translated_path.name,
@@ -154,7 +198,7 @@ class SubtitleTranslator:
                 target_lang
             )
 
-            if official_path and official_path.exists():
+            if self._exists(official_path):
                 # 有官方翻译字幕，直接使用（不调用 AI）
                 # 注意：如果 target_languages 被传入，这种情况理论上不应该发生
                 logger.warning_i18n(
@@ -191,7 +235,7 @@ class SubtitleTranslator:
                 download_result, detection_result, target_language=target_lang
             )
 
-            if not source_subtitle_path or not source_subtitle_path.exists():
+            if not self._exists(source_subtitle_path):
                 logger.warning_i18n(
                     "log.no_source_subtitle_for_ai",
                     target_lang=target_lang,
@@ -211,83 +255,133 @@ class SubtitleTranslator:
                 video_id=video_info.video_id,
             )
 
-            # 调用 AI 翻译
-            try:
-                logger.info_i18n(
-                    "calling_ai_translation",
-                    source_file=source_subtitle_path.name,
-                    target_lang=target_lang,
-                    video_id=video_info.video_id,
-                )
-                translated_path = self._translate_with_ai(
+            # 先收集需要 AI 翻译的语言，循环结束后统一执行
+            ai_jobs.append((target_lang, source_subtitle_path, translated_path))
+
+        # 各目标语言的 AI 翻译并发执行，实际的 LLM 调用（语言 × chunk）由翻译调度器
+        # 按供应商并发预算和视频间公平原则分配
+        if len(ai_jobs) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(
+                max_workers=len(ai_jobs), thread_name_prefix="translate-lang"
+            ) as executor:
+                futures = {
+                    target_lang: executor.submit(
+                        self._run_ai_translation,
+                        source_subtitle_path,
+                        target_lang,
+                        translated_path,
+                        detection_result,
+                        video_info,
+                        cancel_token,
+                    )
+                    for target_lang, source_subtitle_path, translated_path in ai_jobs
+                }
+                for target_lang, future in futures.items():
+                    result[target_lang] = future.result()
+        else:
+            for target_lang, source_subtitle_path, translated_path in ai_jobs:
+                result[target_lang] = self._run_ai_translation(
                     source_subtitle_path,
                     target_lang,
                     translated_path,
                     detection_result,
-                    video_info=video_info,
-                    cancel_token=cancel_token,
+                    video_info,
+                    cancel_token,
                 )
-                if translated_path:
-                    result[target_lang] = translated_path
-                    logger.info_i18n(
-                        "ai_translation_complete",
-                        file_name=translated_path.name,
-                        path=str(translated_path),
-                        exists=translated_path.exists(),
-                        video_id=video_info.video_id,
-                    )
-                else:
-                    logger.warning_i18n(
-                        "ai_translation_returned_none",
-                        target_lang=target_lang,
-                        video_id=video_info.video_id,
-                    )
-                    result[target_lang] = None
-            except TaskCancelledError:
-                # 取消操作，直接重新抛出（不要包装成 AppException）
-                raise
-            except LLMException as e:
-                # 将 LLMException 适配为 AppException
-                error_msg = translate_log(
-                    "ai_translation_failed", target_lang=target_lang, error=str(e)
-                )
-                app_error = AppException(
-                    message=error_msg,
-                    error_type=map_llm_error_to_app_error(e.error_type.value),
-                    cause=e,
-                )
-                logger.error_i18n(
-                    "ai_translation_failed",
-                    target_lang=target_lang,
-                    error=str(app_error),
+
+        return result
+
+    def _run_ai_translation(
+        self,
+        source_subtitle_path: Path,
+        target_lang: str,
+        translated_path: Path,
+        detection_result: DetectionResult,
+        video_info: VideoInfo,
+        cancel_token=None,
+    ) -> Optional[Path]:
+        """调用 AI 翻译单个目标语言，并把 LLM 错误记录到 _last_translation_errors
+
+        Returns:
+            翻译后的字幕文件路径，失败返回 None
+
+        Raises:
+            TaskCancelledError: 任务被取消
+        """
+        try:
+            logger.info_i18n(
+                "calling_ai_translation",
+                source_file=source_subtitle_path.name,
+                target_lang=target_lang,
+                video_id=video_info.video_id,
+            )
+            translated_path = self._translate_with_ai(
+                source_subtitle_path,
+                target_lang,
+                translated_path,
+                detection_result,
+                video_info=video_info,
+                cancel_token=cancel_token,
+            )
+            if translated_path:
+                logger.info_i18n(
+                    "ai_translation_complete",
+                    file_name=translated_path.name,
+                    path=str(translated_path),
+                    exists=self._exists(translated_path),
                     video_id=video_info.video_id,
-                    error_type=app_error.error_type.value,
                 )
-                # 保存错误信息，供 pipeline 使用
-                self._last_translation_errors[target_lang] = app_error
-                result[target_lang] = None
-                # 不抛出异常，继续处理其他语言
-            except Exception as e:
-                # 未映射的异常，转换为 AppException
-                error_msg = translate_log(
-                    "ai_translation_failed", target_lang=target_lang, error=str(e)
-                )
-                app_error = AppException(
-                    message=error_msg, error_type=ErrorType.UNKNOWN, cause=e
-                )
-                logger.error_i18n(
-                    "ai_translation_failed",
+            else:
+                logger.warning_i18n(
+                    "ai_translation_returned_none",
                     target_lang=target_lang,
-                    error=str(app_error),
                     video_id=video_info.video_id,
-                    error_type=app_error.error_type.value,
                 )
-                # 保存错误信息，供 pipeline 使用
-                self._last_translation_errors[target_lang] = app_error
-                result[target_lang] = None
-
-
-        return result
+            return translated_path
+        except TaskCancelledError:
+            # 取消操作，直接重新抛出（不要包装成 AppException）
+            raise
+        except LLMException as e:
+            # 将 LLMException 适配为 AppException
+            error_msg = translate_log(
+                "ai_translation_failed", target_lang=target_lang, error=str(e)
+            )
+            app_error = AppException(
+                message=error_msg,
+                error_type=map_llm_error_to_app_error(e.error_type.value),
+                cause=e,
+            )
+            logger.error_i18n(
+                "ai_translation_failed",
+                target_lang=target_lang,
+                error=str(app_error),
+                video_id=video_info.video_id,
+                error_type=app_error.error_type.value,
+            )
+            # 保存错误信息，供 pipeline 使用
+            self._last_translation_errors[target_lang] = app_error
+            # 不抛出异常，继续处理其他语言
+            return None
+        except Exception as e:
+            # 未映射的异常，转换为 AppException
+            error_msg = translate_log(
+                "ai_translation_failed", target_lang=target_lang, error=str(e)
+            )
+            app_error = AppException(
+                message=error_msg, error_type=ErrorType.UNKNOWN, cause=e
+            )
+            logger.error_i18n(
+                "ai_translation_failed",
+                target_lang=target_lang,
+                error=str(app_error),
+                video_id=video_info.video_id,
+                error_type=app_error.error_type.value,
+            )
+            # 保存错误信息，供 pipeline 使用
+            self._last_translation_errors[target_lang] = app_error
+            return None
 
     def _copy_to_translated(self, source_path: Path, target_path: Path) -> None:
         """将官方翻译字幕复制到 translated.<lang>.srt
@@ -308,6 +402,9 @@ class SubtitleTranslator:
                 )
                 return
 
+            if self.artifacts:
+                self.artifacts.write_text(target_path, self.artifacts.read_text(source_path))
+                return
             shutil.copy2(source_path, target_path)
         except (OSError, IOError, PermissionError) as e:
             # 文件IO错误
@@ -337,6 +434,194 @@ class SubtitleTranslator:
                 extra={"error_type": app_error.error_type.value},
             )
 
+    def _group_multi_target_languages(
+        self,
+        languages: List[str],
+        detection_result: DetectionResult,
+        language_config: LanguageConfig,
+        download_result: Dict[str, Optional[Path]],
+        output_path: Path,
+        force_retranslate: bool,
+    ) -> Dict[Path, List[str]]:
+        """按源字幕将需要 AI 翻译的目标语言分组
+
+        跳过条件与逐语言翻译一致（已有译文、有官方字幕、OFFICIAL_ONLY、无源字幕），
+        只返回包含 2 种及以上语言的分组。
+
+        Returns:
+            {源字幕路径: [目标语言, ...]}
+        """
+        if language_config.translation_strategy == "OFFICIAL_ONLY":
+            return {}
+
+        groups: Dict[Path, List[str]] = {}
+        for target_lang in languages:
+            translated_path = output_path / f"translated.{target_lang}.srt"
+            if self._exists(translated_path) and not force_retranslate:
+                continue
+            official_path = download_result.get("official_translations", {}).get(
+                target_lang
+            )
+            if self._exists(official_path):
+                continue
+            source_subtitle_path = select_source_subtitle(
+                download_result, detection_result, target_language=target_lang
+            )
+            if not self._exists(source_subtitle_path):
+                continue
+            groups.setdefault(source_subtitle_path, []).append(target_lang)
+
+        return {path: langs for path, langs in groups.items() if len(langs) > 1}
+
+    def _translate_multi_target(
+        self,
+        source_subtitle_path: Path,
+        target_languages: List[str],
+        output_dir: Path,
+        detection_result: DetectionResult,
+        video_info: Optional[VideoInfo] = None,
+        cancel_token=None,
+    ) -> Dict[str, Path]:
+        """一次请求翻译多种目标语言（每个 chunk 只发送一次源字幕）
+
+        模型按语言返回带标签的译文，逐语言校验条目数；任一 chunk 校验失败的语言
+        不再出现在后续请求中，由调用方回退到逐语言翻译。各 chunk 通过翻译调度器并发执行。
+
+        Args:
+            source_subtitle_path: 源字幕文件路径
+            target_languages: 目标语言列表
+            output_dir: 输出目录（译文保存为 translated.<lang>.srt）
+            detection_result: 检测结果（用于确定源语言）
+            video_info: 视频信息
+            cancel_token: 取消令牌
+
+        Returns:
+            翻译成功的语言及其译文路径：{target_lang: Path}
+        """
+        import threading
+
+        from core.prompts import build_multi_target_translation_prompt
+        from core.state.chunk_tracker import (
+            format_srt_entry,
+            parse_srt_entries,
+            renumber_srt,
+            split_srt_entries,
+        )
+        from .multi_target import (
+            is_complete_translation,
+            parse_multi_target_response,
+            unfinished_block,
+        )
+
+        video_id = video_info.video_id if video_info else detection_result.video_id
+
+        try:
+            subtitle_text = self._read_srt_file(source_subtitle_path)
+            if not subtitle_text:
+                return {}
+            source_language = self._resolve_source_language(
+                source_subtitle_path, detection_result, video_id
+            )
+            if not source_language:
+                return {}
+
+            # 输出长度随语言数增长：分块上限按所有目标语言的输出之和计算
+            sizer = get_chunk_sizer(self.llm)
+            use_chunks = sizer.needs_chunking(subtitle_text, source_language, target_languages)
+            if use_chunks:
+                limits = sizer.limits(subtitle_text, source_language, target_languages)
+                entry_groups = split_srt_entries(
+                    parse_srt_entries(subtitle_text),
+                    limits.chunk_size,
+                    limits.max_chars,
+                )
+                chunks = [
+                    "".join(format_srt_entry(entry) for entry in group)
+                    for group in entry_groups
+                ]
+            else:
+                chunks = [subtitle_text]
+
+            logger.info_i18n(
+                "log.multi_target_translation_start",
+                video_id=video_id,
+                languages=target_languages,
+                chunks=len(chunks),
+            )
+
+            failed: set = set()
+            failed_lock = threading.Lock()
+
+            def translate_chunk(chunk: str) -> Dict[str, str]:
+                if cancel_token and cancel_token.is_cancelled():
+                    reason = cancel_token.get_reason() or translate_log("log.user_cancelled")
+                    raise TaskCancelledError(reason)
+                with failed_lock:
+                    pending = [lang for lang in target_languages if lang not in failed]
+                if not pending:
+                    return {}
+
+                prompt = build_multi_target_translation_prompt(
+                    source_language, pending, chunk
+                )
+                started = time.perf_counter()
+                response = self._call_ai_api(prompt, cancel_token, expected_cues=chunk.count("-->"))
+                parsed = parse_multi_target_response(response, pending)
+                if use_chunks:
+                    # 每次请求按最差的语言调整分块大小；截断时最后一个语言块没有闭合
+                    outputs = [parsed.get(lang) for lang in pending]
+                    if len(parsed) < len(pending):
+                        outputs.append(unfinished_block(response))
+                    sizer.record_many(chunk, outputs, time.perf_counter() - started)
+                translated = {
+                    lang: text
+                    for lang, text in parsed.items()
+                    if is_complete_translation(chunk, text)
+                }
+                with failed_lock:
+                    failed.update(lang for lang in pending if lang not in translated)
+                return translated
+
+            scheduler = get_translation_scheduler(self.llm)
+            futures = [scheduler.submit(video_id, translate_chunk, chunk) for chunk in chunks]
+            try:
+                chunk_results = [future.result() for future in futures]
+            finally:
+                for future in futures:
+                    future.cancel()
+
+            paths: Dict[str, Path] = {}
+            for target_lang in target_languages:
+                if target_lang in failed:
+                    continue
+                merged = "\n\n".join(result[target_lang] for result in chunk_results)
+                if use_chunks:
+                    merged = renumber_srt(merged)
+                self._check_translation_completeness(subtitle_text, merged, video_id)
+                translated_path = output_dir / f"translated.{target_lang}.srt"
+                if self._save_translation(translated_path, merged):
+                    paths[target_lang] = translated_path
+
+            fallback = [lang for lang in target_languages if lang not in paths]
+            if fallback:
+                logger.warning_i18n(
+                    "log.multi_target_language_fallback",
+                    video_id=video_id,
+                    languages=fallback,
+                )
+            return paths
+
+        except TaskCancelledError:
+            raise
+        except Exception as e:
+            # 整体失败（如 LLM 调用异常）：全部回退到逐语言翻译，错误由逐语言路径记录
+            logger.warning_i18n(
+                "log.multi_target_translation_failed",
+                video_id=video_id,
+                error=str(e),
+            )
+            return {}
+
     def _translate_with_ai(
         self,
         source_subtitle_path: Path,
@@ -377,37 +662,14 @@ class SubtitleTranslator:
                 )
             )
 
-            # 确定源语言（优先从文件名提取，更准确）
-            source_language = self._extract_language_from_filename(
-                source_subtitle_path.name
+            source_language = self._resolve_source_language(
+                source_subtitle_path, detection_result, video_id
             )
             if not source_language:
-                # 如果无法从文件名提取，使用检测结果
-                source_language = self._determine_source_language(detection_result)
-                logger.warning_i18n(
-                    "source_language_extract_failed",
-                    source_lang=source_language,
-                    file_name=source_subtitle_path.name,
-                    video_id=video_id,
-                )
-
-            if not source_language:
-                logger.error_i18n(
-                    "source_language_undetermined",
-                    file_name=source_subtitle_path.name,
-                    video_id=video_id,
-                )
                 return None
 
-            logger.info_i18n(
-                "source_language_determined",
-                source_lang=source_language,
-                file_name=source_subtitle_path.name,
-                video_id=video_id,
-            )
-
             # 生成翻译 Prompt
-            prompt = get_translation_prompt(
+            prompt = build_translation_prompt(
                 source_language, target_language, subtitle_text
             )
 
@@ -419,9 +681,10 @@ class SubtitleTranslator:
                 )
                 raise TaskCancelledError(reason)
 
-            # 判断是否需要分块翻译（长字幕使用 ChunkTracker）
-            # 阈值：>100 条字幕或 >8000 字符
-            use_chunks = len(subtitle_text) > 8000 or subtitle_text.count('\n\n') > 100
+            # 判断是否需要分块翻译（超过当前模型单次请求上限的字幕使用 ChunkTracker）
+            use_chunks = get_chunk_sizer(self.llm).needs_chunking(
+                subtitle_text, source_language, target_language
+            )
 
             if use_chunks and video_id:
                 # 使用 ChunkTracker 分块翻译
@@ -438,17 +701,28 @@ class SubtitleTranslator:
                     logger.warning_i18n("log.chunk_fallback_direct", video_id=video_id)
                     translated_text = self._call_ai_api(prompt, cancel_token)
             else:
-                # 短字幕直接翻译
-                translated_text = self._call_ai_api(prompt, cancel_token)
+                # 短字幕整体作为一个条目任务翻译（同样逐条校验、复用翻译记忆，并经过翻译调度器）
+                task = CueRepairTask(0, subtitle_text, memory=self._memory_for(source_language, target_language))
+                if task.total:
+                    self._run_cue_tasks(
+                        [task], source_language, target_language, video_id or "", cancel_token
+                    )
+                    translated_text = task.render() if task.complete else None
+                else:
+                    translated_text = get_translation_scheduler(self.llm).submit(
+                        video_id or "",
+                        self._call_ai_api,
+                        prompt,
+                        cancel_token,
+                        subtitle_text.count("-->"),
+                    ).result()
 
             if not translated_text:
                 logger.error_i18n("log.ai_api_call_failed")
                 return None
 
-            # 保存翻译后的字幕文件（使用原子写）
-            from core.failure_logger import _atomic_write
-
-            if not _atomic_write(output_path, translated_text, mode="w"):
+            # 保存翻译后的字幕（产物存储或原子写）
+            if not self._save_translation(output_path, translated_text):
                 logger.error_i18n(
                     "log.translation_save_failed", error_type=ErrorType.FILE_IO.value
                 )
@@ -498,6 +772,51 @@ class SubtitleTranslator:
             )
             return None
 
+    def _resolve_source_language(
+        self,
+        source_subtitle_path: Path,
+        detection_result: DetectionResult,
+        video_id: Optional[str],
+    ) -> Optional[str]:
+        """确定源字幕的语言（优先从文件名提取，更准确）
+
+        Args:
+            source_subtitle_path: 源字幕文件路径
+            detection_result: 检测结果（文件名无法提取时使用）
+            video_id: 视频 ID（用于日志）
+
+        Returns:
+            源语言代码，如果无法确定则返回 None
+        """
+        source_language = self._extract_language_from_filename(
+            source_subtitle_path.name
+        )
+        if not source_language:
+            # 如果无法从文件名提取，使用检测结果
+            source_language = self._determine_source_language(detection_result)
+            logger.warning_i18n(
+                "source_language_extract_failed",
+                source_lang=source_language,
+                file_name=source_subtitle_path.name,
+                video_id=video_id,
+            )
+
+        if not source_language:
+            logger.error_i18n(
+                "source_language_undetermined",
+                file_name=source_subtitle_path.name,
+                video_id=video_id,
+            )
+            return None
+
+        logger.info_i18n(
+            "source_language_determined",
+            source_lang=source_language,
+            file_name=source_subtitle_path.name,
+            video_id=video_id,
+        )
+        return source_language
+
     def _extract_language_from_filename(self, filename: str) -> Optional[str]:
         """从文件名中提取语言代码
 
@@ -518,6 +837,67 @@ class SubtitleTranslator:
             return match.group(1)
         return None
 
+    def _memory_for(self, source_language: str, target_language: str) -> BoundTranslationMemory:
+        """当前 LLM 客户端的翻译记忆（同一批任务的所有视频共享）"""
+        return get_translation_memory(self.llm).bind(source_language, target_language)
+
+    def _run_cue_tasks(
+        self,
+        tasks: List[CueRepairTask],
+        source_language: str,
+        target_language: str,
+        video_id: str,
+        cancel_token=None,
+        on_done: Optional[Callable[[CueRepairTask], None]] = None,
+        record: Optional[Callable[[str, Optional[str], float], None]] = None,
+    ) -> None:
+        """逐条校验地翻译条目任务，区间请求提交到翻译调度器
+
+        Args:
+            tasks: 条目任务
+            source_language: 源语言代码
+            target_language: 目标语言代码
+            video_id: 视频 ID
+            cancel_token: 取消令牌
+            on_done: 任务结束（全部翻译或放弃）时的回调
+            record: 每个区间请求结束后的回调 record(区间原文, 模型输出, 耗时秒数)
+        """
+        scheduler = get_translation_scheduler(self.llm)
+
+        def translate_range(content: str) -> Optional[str]:
+            """翻译一个条目区间（在调度器工作线程中执行）"""
+            started = time.perf_counter()
+            translated = None
+            try:
+                translated = self._call_ai_api(
+                    build_translation_prompt(source_language, target_language, content),
+                    cancel_token,
+                    expected_cues=content.count("-->"),
+                    keep_partial=True,
+                )
+                return translated
+            finally:
+                if record and not (cancel_token and cancel_token.is_cancelled()):
+                    record(content, translated, time.perf_counter() - started)
+
+        run_cue_repair(
+            tasks,
+            submit=lambda fn, *args: scheduler.submit(video_id, fn, *args),
+            translate=translate_range,
+            on_done=on_done or (lambda task: None),
+            video_id=video_id,
+            cancel_token=cancel_token,
+        )
+
+        hits = sum(task.memory_hits for task in tasks)
+        if hits:
+            logger.info_i18n(
+                "log.translation_memory_hits",
+                video_id=video_id,
+                hits=hits,
+                total=sum(task.total for task in tasks),
+            )
+
     def _translate_with_chunks(
         self,
         subtitle_text: str,
@@ -543,14 +923,23 @@ class SubtitleTranslator:
             翻译后的 SRT 内容，失败返回 None
         """
         from core.state.chunk_tracker import ChunkTracker
-        from core.prompts import get_translation_prompt
-
         try:
-            # 初始化 ChunkTracker
+            # 初始化 ChunkTracker（分块大小按模型的 token 限制和在线调整结果计算）
+            sizer = get_chunk_sizer(self.llm)
+            limits = sizer.limits(subtitle_text, source_language, target_language)
             tracker = ChunkTracker(
                 video_id=video_id,
                 target_language=target_language,
                 work_dir=work_dir,
+                chunk_size=limits.chunk_size,
+                max_chars=limits.max_chars,
+            )
+            logger.debug_i18n(
+                "log.chunk_limits",
+                video_id=video_id,
+                cues=tracker.chunk_size,
+                chars=tracker.max_chars,
+                scale=f"{sizer.scale:.2f}",
             )
 
             # 拆分字幕为 chunks
@@ -573,135 +962,79 @@ class SubtitleTranslator:
             # 获取待翻译的 chunks
             pending_chunks = tracker.get_pending_chunks()
             
-            # 确定并发数：取 AI 并发数和 3 的较小值
-            ai_concurrency = getattr(self.llm, 'max_concurrency', 5)
-            chunk_workers = min(3, ai_concurrency, len(pending_chunks))
-            
-            if chunk_workers > 1 and len(pending_chunks) > 1:
-                # 多线程并发翻译
+            # 区间请求提交到翻译调度器：与其他目标语言、其他视频共享 AI 并发预算
+            scheduler = get_translation_scheduler(self.llm)
+            chunk_workers = min(scheduler.max_workers, len(pending_chunks))
+            if chunk_workers > 1:
                 logger.info_i18n(
                     "log.chunk_parallel_start",
                     video_id=video_id,
                     workers=chunk_workers,
                     pending=len(pending_chunks),
                 )
-                
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-                import threading
-                
-                # 线程安全的进度计数器
-                completed_count = [0]
-                count_lock = threading.Lock()
-                
-                def translate_single_chunk(chunk):
-                    """翻译单个 chunk 的工作函数"""
-                    # 检查取消状态
-                    if cancel_token and cancel_token.is_cancelled():
-                        return (chunk.index, None, "cancelled")
-                    
-                    translated = self._translate_chunk_with_retry(
-                        chunk_content=chunk.content,
-                        source_language=source_language,
-                        target_language=target_language,
-                        video_id=video_id,
-                        cancel_token=cancel_token,
-                        max_chars=tracker.max_chars,
-                        min_chars=500,
-                    )
-                    
-                    return (chunk.index, translated, None)
-                
-                with ThreadPoolExecutor(max_workers=chunk_workers) as executor:
-                    # 提交所有任务
-                    futures = {
-                        executor.submit(translate_single_chunk, chunk): chunk
-                        for chunk in pending_chunks
-                    }
-                    
-                    # 进度汇总变量
-                    last_progress_milestone = 0
-                    
-                    # 处理完成的任务
-                    for future in as_completed(futures):
-                        chunk = futures[future]
-                        
-                        # 检查取消状态
-                        if cancel_token and cancel_token.is_cancelled():
-                            reason = cancel_token.get_reason() or translate_log("log.user_cancelled")
-                            raise TaskCancelledError(reason)
-                        
-                        try:
-                            chunk_index, translated, error = future.result()
-                            
-                            if error == "cancelled":
-                                continue
-                            
-                            with count_lock:
-                                completed_count[0] += 1
-                                current = completed_count[0]
-                            
-                            # 汇总进度日志（每 25% 输出一次）
-                            progress = (current * 100) // total_chunks
-                            if progress >= last_progress_milestone + 25:
-                                logger.info_i18n(
-                                    "log.chunk_progress_summary",
-                                    video_id=video_id,
-                                    completed=current,
-                                    total=total_chunks,
-                                    percent=progress,
-                                )
-                                last_progress_milestone = (progress // 25) * 25
-                            
-                            if translated:
-                                tracker.mark_chunk_completed(chunk_index, translated)
-                            else:
-                                tracker.mark_chunk_failed(chunk_index, "translation failed")
-                                logger.warning_i18n(
-                                    "log.chunk_translation_failed",
-                                    video_id=video_id,
-                                    chunk_index=chunk_index,
-                                )
-                        except Exception as e:
-                            logger.error(f"Chunk {chunk.index} translation error: {e}")
-                            tracker.mark_chunk_failed(chunk.index, str(e))
-            else:
-                # 单个 chunk 或串行模式
-                for chunk in pending_chunks:
-                    # 检查取消状态
-                    if cancel_token and cancel_token.is_cancelled():
-                        reason = cancel_token.get_reason() or translate_log("log.user_cancelled")
-                        logger.info_i18n(
-                            "log.translation_cancelled", reason=reason, video_id=video_id
-                        )
-                        raise TaskCancelledError(reason)
 
+            # 进度汇总（每 25% 输出一次）
+            finished_count = [0]
+            last_progress_milestone = [0]
+
+            def on_chunk_done(task: CueRepairTask) -> None:
+                """chunk 全部翻译或放弃后立即写入 ChunkTracker 进度"""
+                finished_count[0] += 1
+                progress = (finished_count[0] * 100) // total_chunks
+                if progress >= last_progress_milestone[0] + 25:
                     logger.info_i18n(
-                        "log.chunk_processing",
+                        "log.chunk_progress_summary",
                         video_id=video_id,
-                        chunk_index=chunk.index + 1,
-                        total_chunks=total_chunks,
+                        completed=finished_count[0],
+                        total=total_chunks,
+                        percent=progress,
                     )
+                    last_progress_milestone[0] = (progress // 25) * 25
 
-                    # 使用递归式重试翻译
-                    translated = self._translate_chunk_with_retry(
-                        chunk_content=chunk.content,
-                        source_language=source_language,
-                        target_language=target_language,
+                if task.complete:
+                    if task.requests > 1:
+                        logger.info_i18n(
+                            "log.chunk_repair_complete",
+                            video_id=video_id,
+                            chunk_index=task.chunk_index,
+                            requests=task.requests,
+                        )
+                    tracker.mark_chunk_completed(task.chunk_index, task.render())
+                else:
+                    tracker.mark_chunk_failed(
+                        task.chunk_index,
+                        f"{task.total - task.translated_count}/{task.total} cues untranslated",
+                    )
+                    logger.warning_i18n(
+                        "log.chunk_translation_failed",
                         video_id=video_id,
-                        cancel_token=cancel_token,
-                        max_chars=tracker.max_chars,
-                        min_chars=500,
+                        chunk_index=task.chunk_index,
                     )
 
-                    if translated:
-                        tracker.mark_chunk_completed(chunk.index, translated)
-                    else:
-                        tracker.mark_chunk_failed(chunk.index, "recursive retry failed")
-                        logger.warning_i18n(
-                            "log.chunk_translation_failed",
-                            video_id=video_id,
-                            chunk_index=chunk.index,
-                        )
+            memory = self._memory_for(source_language, target_language)
+            tasks = [
+                CueRepairTask(chunk.index, chunk.content, memory=memory) for chunk in pending_chunks
+            ]
+            # 只有整块请求的结果用于调整分块大小（修复请求的大小由缺陷决定）
+            full_chunks = {task.range_content(0, task.total) for task in tasks}
+
+            def record(content: str, translated: Optional[str], elapsed: float) -> None:
+                if content in full_chunks:
+                    sizer.record(content, translated, elapsed)
+
+            try:
+                self._run_cue_tasks(
+                    tasks,
+                    source_language,
+                    target_language,
+                    video_id,
+                    cancel_token,
+                    on_done=on_chunk_done,
+                    record=record,
+                )
+            except TaskCancelledError as e:
+                logger.info_i18n("log.translation_cancelled", reason=str(e), video_id=video_id)
+                raise
 
             # 合并翻译结果
             merged = tracker.merge_translated_chunks()
@@ -739,178 +1072,6 @@ class SubtitleTranslator:
             )
             return None
 
-    def _translate_chunk_with_retry(
-        self,
-        chunk_content: str,
-        source_language: str,
-        target_language: str,
-        video_id: str,
-        cancel_token=None,
-        max_chars: int = 8000,
-        min_chars: int = 500,
-        depth: int = 0,
-    ) -> Optional[str]:
-        """递归式翻译 chunk，失败时减小大小重试
-        
-        Args:
-            chunk_content: chunk 内容（SRT 格式）
-            source_language: 源语言
-            target_language: 目标语言
-            video_id: 视频 ID
-            cancel_token: 取消令牌
-            max_chars: 当前最大字符数
-            min_chars: 最小字符数（不再拆分的阈值）
-            depth: 递归深度（用于日志）
-            
-        Returns:
-            翻译后的内容，失败返回 None
-        """
-        from core.prompts import get_translation_prompt
-        
-        # 检查取消状态
-        if cancel_token and cancel_token.is_cancelled():
-            return None
-        
-        # 生成翻译 prompt
-        chunk_prompt = get_translation_prompt(
-            source_language, target_language, chunk_content
-        )
-        
-        # 尝试翻译
-        translated = self._call_ai_api(chunk_prompt, cancel_token)
-        
-        if translated:
-            return translated
-        
-        # 翻译失败，检查是否可以继续拆分
-        content_len = len(chunk_content)
-        if content_len <= min_chars:
-            # 已经是最小大小，无法继续拆分
-            logger.warning(
-                f"Chunk 翻译失败且无法继续拆分 (size={content_len}, min={min_chars})",
-                extra={"video_id": video_id},
-            )
-            return None
-        
-        # 拆分成两个子块
-        logger.info_i18n(
-            "log.chunk_retry_split",
-            video_id=video_id,
-            original_size=content_len,
-            depth=depth + 1,
-        )
-        
-        sub_chunks = self._split_chunk_in_half(chunk_content)
-        
-        if len(sub_chunks) < 2:
-            # 无法拆分
-            logger.warning(
-                f"Chunk 无法拆分 (只有 {len(sub_chunks)} 个子块)",
-                extra={"video_id": video_id},
-            )
-            return None
-        
-        # 递归翻译子块
-        translated_parts = []
-        new_max_chars = max_chars // 2
-        
-        for i, sub_chunk in enumerate(sub_chunks):
-            logger.debug(
-                f"翻译子块 {i + 1}/{len(sub_chunks)} (depth={depth + 1}, size={len(sub_chunk)})",
-                extra={"video_id": video_id},
-            )
-            
-            sub_translated = self._translate_chunk_with_retry(
-                chunk_content=sub_chunk,
-                source_language=source_language,
-                target_language=target_language,
-                video_id=video_id,
-                cancel_token=cancel_token,
-                max_chars=new_max_chars,
-                min_chars=min_chars,
-                depth=depth + 1,
-            )
-            
-            if sub_translated:
-                translated_parts.append(sub_translated)
-            else:
-                # 子块翻译失败，整个 chunk 失败
-                logger.warning(
-                    f"子块 {i + 1} 翻译失败",
-                    extra={"video_id": video_id},
-                )
-                return None
-        
-        # 合并子块翻译结果
-        return "\n".join(translated_parts)
-    
-    def _split_chunk_in_half(self, srt_content: str) -> List[str]:
-        """将 SRT 内容在句子边界处拆分成两半
-        
-        优先在句子结束标点（句号、问号、感叹号）附近的字幕条目边界处拆分，
-        其次在逗号、分号等次要标点处拆分，最后才在中点分割。
-        
-        Args:
-            srt_content: SRT 格式内容
-            
-        Returns:
-            两个子块的列表
-        """
-        import re
-        
-        # 按字幕条目拆分
-        entries = re.split(r'\n\n+', srt_content.strip())
-        entries = [e.strip() for e in entries if e.strip()]
-        
-        if len(entries) < 2:
-            return [srt_content]
-        
-        # 计算中点范围（允许在中点 ±25% 范围内寻找最佳分割点）
-        total = len(entries)
-        mid = total // 2
-        min_idx = max(1, int(total * 0.25))  # 至少保留 25% 在第一部分
-        max_idx = min(total - 1, int(total * 0.75))  # 至少保留 25% 在第二部分
-        
-        # 句子结束标点（高优先级）
-        sentence_end_pattern = re.compile(r'[.!?。！？][\s"\'）\]\}]*$')
-        # 次要标点（低优先级）
-        clause_end_pattern = re.compile(r'[,;:，；：、][\s"\'）\]\}]*$')
-        
-        # 在中点附近寻找最佳分割点
-        best_idx = mid
-        best_score = 0
-        
-        for i in range(min_idx, max_idx + 1):
-            # 获取当前条目的文本内容（最后几行是字幕文本）
-            entry = entries[i - 1]
-            lines = entry.split('\n')
-            text = lines[-1] if lines else ""
-            
-            # 计算分数：距离中点越近且有句子结束标点的得分越高
-            distance_score = 1.0 - abs(i - mid) / (max_idx - min_idx + 1)
-            
-            if sentence_end_pattern.search(text):
-                # 句子结束标点：高分
-                punctuation_score = 2.0
-            elif clause_end_pattern.search(text):
-                # 次要标点：中分
-                punctuation_score = 1.0
-            else:
-                # 无标点：低分
-                punctuation_score = 0.0
-            
-            score = distance_score + punctuation_score
-            
-            if score > best_score:
-                best_score = score
-                best_idx = i
-        
-        first_half = "\n\n".join(entries[:best_idx])
-        second_half = "\n\n".join(entries[best_idx:])
-        
-        return [first_half, second_half]
-
-
     def _determine_source_language(
         self, detection_result: DetectionResult
     ) -> Optional[str]:
@@ -929,6 +1090,21 @@ class SubtitleTranslator:
         else:
             return None
 
+    def _exists(self, path: Optional[Path]) -> bool:
+        """字幕文件是否存在（包括只保存在产物存储中的译文）"""
+        if self.artifacts:
+            return self.artifacts.exists(path)
+        return bool(path) and path.exists()
+
+    def _save_translation(self, path: Path, text: str) -> bool:
+        """保存译文：有产物存储时只写内存，否则原子写临时文件"""
+        if self.artifacts:
+            self.artifacts.write_text(path, text)
+            return True
+        from core.failure_logger import _atomic_write
+
+        return _atomic_write(path, text, mode="w")
+
     def _read_srt_file(self, srt_path: Path) -> Optional[str]:
         """读取 SRT 字幕文件
 
@@ -939,6 +1115,8 @@ class SubtitleTranslator:
             字幕文本内容，如果失败则返回 None
         """
         try:
+            if self.artifacts:
+                return self.artifacts.read_text(srt_path)
             return srt_path.read_text(encoding="utf-8")
         except (OSError, IOError, PermissionError) as e:
             # 文件IO错误
@@ -969,12 +1147,20 @@ class SubtitleTranslator:
             )
             return None
 
-    def _call_ai_api(self, prompt: str, cancel_token=None) -> Optional[str]:
+    def _call_ai_api(
+        self,
+        prompt: Union[str, PromptParts],
+        cancel_token=None,
+        expected_cues: Optional[int] = None,
+        keep_partial: bool = False,
+    ) -> Optional[str]:
         """调用 AI API 进行翻译
 
         Args:
-            prompt: 翻译提示词
+            prompt: 翻译提示词（PromptParts 的静态指令作为 system 消息发送，便于供应商缓存前缀）
             cancel_token: 取消令牌（可选）
+            expected_cues: 原文字幕条目数（可选，流式调用时用于提前发现跑偏的输出）
+            keep_partial: 流式输出提前中止时返回已接收的部分（分块翻译会逐条保留其中可用的字幕）
 
         Returns:
             翻译后的文本，如果失败则返回 None
@@ -993,9 +1179,15 @@ class SubtitleTranslator:
             if hasattr(self.llm, "_cancel_token"):
                 self.llm._cancel_token = cancel_token
 
+            if supports_streaming(self.llm):
+                return self._call_ai_api_streaming(
+                    prompt, cancel_token, expected_cues, keep_partial
+                )
+
             # 注意：generate 调用是同步的，在调用期间无法检查取消状态
             # 取消检查需要在字幕块级别的循环中进行（在 GoogleTranslateClient 内部）
-            result = self.llm.generate(prompt)
+            user, system = split_prompt(prompt)
+            result = self.llm.generate(user, system=system)
 
             # 清除 cancel_token（避免影响后续调用）
             if hasattr(self.llm, "_cancel_token"):
@@ -1024,6 +1216,51 @@ class SubtitleTranslator:
                 LLMErrorType.UNKNOWN,
             )
 
+    def _call_ai_api_streaming(
+        self,
+        prompt: Union[str, PromptParts],
+        cancel_token=None,
+        expected_cues: Optional[int] = None,
+        keep_partial: bool = False,
+    ) -> Optional[str]:
+        """以流式方式调用 AI API，边接收边校验 SRT 结构
+
+        取消令牌触发时立即关闭连接；输出结构出错时提前中止，返回 None 由调用方按失败处理，
+        keep_partial 为 True 时返回中止前已接收的部分（分块翻译只重新请求缺失的条目）。
+
+        Raises:
+            LLMException: 当 LLM 调用失败时抛出
+            TaskCancelledError: 当取消令牌被触发时抛出
+        """
+        user, system = split_prompt(prompt)
+        stream = self.llm.generate_stream(user, system=system)
+        if cancel_token:
+            cancel_token.register_callback(stream.close)
+        try:
+            validator = SrtStreamValidator(expected_cues)
+            for delta in stream:
+                reason = validator.feed(delta)
+                if reason:
+                    logger.warning_i18n(
+                        "log.ai_stream_aborted", reason=reason, chars=len(stream.text)
+                    )
+                    return stream.text if keep_partial else None
+
+            if cancel_token and cancel_token.is_cancelled():
+                reason = cancel_token.get_reason() or translate_log("user_cancelled")
+                raise TaskCancelledError(reason)
+            return stream.text
+        except LLMException:
+            # 取消导致的连接中断按取消处理
+            if cancel_token and cancel_token.is_cancelled():
+                reason = cancel_token.get_reason() or translate_log("user_cancelled")
+                raise TaskCancelledError(reason)
+            raise
+        finally:
+            stream.close()
+            if cancel_token:
+                cancel_token.unregister_callback(stream.close)
+
     def _check_translation_completeness(
         self, original: str, translated: str, video_id: str
     ) -> bool:
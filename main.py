@@ -4,8 +4,12 @@ GUI 入口
 """
 import sys
 import os
+import time
 from pathlib import Path
 
+# 启动计时起点（在导入 customtkinter 和 UI 模块之前），用于统计可交互耗时
+_LAUNCH_STARTED = time.perf_counter()
+
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
@@ -27,9 +31,13 @@ def main():
     ctk.set_default_color_theme("blue")
     
     # 创建并启动主窗口
-    app = MainWindow()
+    app = MainWindow(launch_started=_LAUNCH_STARTED)
     app.mainloop()
 
 
 if __name__ == "__main__":
+    # 打包后的 exe 中启用多进程支持（字幕批处理进程池）
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+StageQueue 取消/停止延迟基准测试
+
+测试场景（默认 5 个阶段 × 10 个 worker，与 StagedPipeline 结构一致）：
+1. 繁忙取消：各阶段持续处理数据时触发 CancelToken，测量从 cancel() 到所有 worker 退出的耗时
+2. 空闲停止：所有阶段空闲时依次 stop()，测量总停止耗时
+3. 满队列停止：阶段队列已满且无 worker 消费时 stop()，验证停止信号不会丢失
+
+用法：
+    python scripts/benchmark_cancel_latency.py [--stages N] [--workers N] [--rounds N]
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import threading
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.models import VideoInfo
+from core.cancel_token import CancelToken
+from core.staged_pipeline.data_types import StageData
+from core.staged_pipeline.queue import StageQueue
+
+
+STAGE_NAMES = ["detect", "download", "translate", "summarize", "output"]
+
+
+def _make_processor(cancel_token: CancelToken, work_seconds: float):
+    """模拟阶段处理：可被取消的等待（对应处理器内部的取消检查）"""
+
+    def process(data: StageData) -> StageData:
+        cancel_token.wait(work_seconds)
+        return data
+
+    return process
+
+
+def _build_stages(
+    num_stages: int, cancel_token: CancelToken, work_seconds: float
+) -> List[StageQueue]:
+    """从后往前构建串联的阶段队列"""
+    stages: List[StageQueue] = []
+    next_queue = None
+    for i in reversed(range(num_stages)):
+        name = STAGE_NAMES[i] if i < len(STAGE_NAMES) else f"stage{i}"
+        stage = StageQueue(
+            stage_name=name,
+            executor=None,
+            processor=_make_processor(cancel_token, work_seconds),
+            next_stage_queue=next_queue,
+            cancel_token=cancel_token,
+        )
+        stages.insert(0, stage)
+        next_queue = stage
+    return stages
+
+
+def _alive_workers(stages: List[StageQueue]) -> int:
+    return sum(1 for s in stages for w in s.workers if w.is_alive())
+
+
+def _wait_all_exited(stages: List[StageQueue], deadline: float) -> bool:
+    while time.perf_counter() < deadline:
+        if _alive_workers(stages) == 0:
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def bench_busy_cancel(num_stages: int, num_workers: int, work_seconds: float) -> float:
+    """繁忙状态下取消，返回 cancel() 到全部 worker 退出的耗时（秒）"""
+    cancel_token = CancelToken()
+    stages = _build_stages(num_stages, cancel_token, work_seconds)
+    for stage in stages:
+        stage.start(num_workers)
+
+    # 持续向第一阶段灌入数据，直到取消
+    def feeder():
+        i = 0
+        while not cancel_token.is_cancelled():
+            video = VideoInfo(video_id=f"v{i}", url=f"https://youtu.be/v{i}", title="")
+            if not stages[0].enqueue(StageData(video_info=video)):
+                break
+            i += 1
+
+    feeder_thread = threading.Thread(target=feeder, daemon=True)
+    feeder_thread.start()
+    time.sleep(0.3)  # 让所有阶段进入繁忙状态
+
+    start = time.perf_counter()
+    cancel_token.cancel("benchmark")
+    exited = _wait_all_exited(stages, start + 30)
+    elapsed = time.perf_counter() - start
+
+    for stage in stages:
+        stage.stop(timeout=1.0)
+    feeder_thread.join(timeout=1.0)
+    if not exited:
+        raise RuntimeError("workers did not exit within 30s after cancel")
+    return elapsed
+
+
+def bench_idle_stop(num_stages: int, num_workers: int) -> float:
+    """空闲状态下停止所有阶段，返回总耗时（秒）"""
+    cancel_token = CancelToken()
+    stages = _build_stages(num_stages, cancel_token, 0.0)
+    for stage in stages:
+        stage.start(num_workers)
+    time.sleep(0.05)
+
+    start = time.perf_counter()
+    for stage in reversed(stages):
+        stage.stop()
+    return time.perf_counter() - start
+
+
+def bench_full_queue_stop(num_workers: int) -> float:
+    """队列已满时停止，返回停止耗时（秒）"""
+    release = threading.Event()
+
+    def blocking_processor(data: StageData) -> StageData:
+        release.wait()
+        return data
+
+    stage = StageQueue(
+        stage_name="full",
+        executor=None,
+        processor=blocking_processor,
+        max_queue_size=num_workers,
+    )
+    stage.start(num_workers)
+    # 先占满所有 worker，再占满队列
+    for i in range(num_workers * 2):
+        video = VideoInfo(video_id=f"v{i}", url="", title="")
+        stage.enqueue(StageData(video_info=video))
+    time.sleep(0.05)
+
+    start = time.perf_counter()
+    stop_thread = threading.Thread(target=stage.stop, daemon=True)
+    stop_thread.start()
+    time.sleep(0.01)
+    release.set()  # 放行正在处理的数据
+    stop_thread.join(timeout=60)
+    return time.perf_counter() - start
+
+
+def _fmt(samples: List[float]) -> str:
+    ms = [s * 1000 for s in samples]
+    return (
+        f"min={min(ms):.1f}ms median={statistics.median(ms):.1f}ms max={max(ms):.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StageQueue cancel latency benchmark")
+    parser.add_argument("--stages", type=int, default=5, help="阶段数量")
+    parser.add_argument("--workers", type=int, default=10, help="每个阶段的 worker 数")
+    parser.add_argument("--rounds", type=int, default=5, help="重复次数")
+    parser.add_argument(
+        "--work-ms", type=float, default=50.0, help="模拟的单条数据处理耗时（毫秒）"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=500.0,
+        help="繁忙取消延迟中位数上限（毫秒），超过则返回非零退出码",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(
+        f"StageQueue 取消延迟基准：{args.stages} 阶段 × {args.workers} worker，"
+        f"{args.rounds} 轮"
+    )
+    print("=" * 60)
+
+    busy = [
+        bench_busy_cancel(args.stages, args.workers, args.work_ms / 1000)
+        for _ in range(args.rounds)
+    ]
+    idle = [bench_idle_stop(args.stages, args.workers) for _ in range(args.rounds)]
+    full = [bench_full_queue_stop(args.workers) for _ in range(args.rounds)]
+
+    print(f"繁忙取消 (cancel -> 全部 worker 退出): {_fmt(busy)}")
+    print(f"空闲停止 (依次 stop 所有阶段):        {_fmt(idle)}")
+    print(f"满队列停止 (队列已满时 stop):          {_fmt(full)}")
+
+    median_ms = statistics.median(busy) * 1000
+    if median_ms > args.budget_ms:
+        print(f"\n❌ 取消延迟中位数 {median_ms:.1f}ms 超过预算 {args.budget_ms:.0f}ms")
+        return 1
+    print(f"\n✅ 取消延迟中位数 {median_ms:.1f}ms（预算 {args.budget_ms:.0f}ms）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
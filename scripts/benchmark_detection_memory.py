@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+DetectionResult 内存占用基准测试
+
+模拟一批视频的检测结果常驻内存（StageData / GUI 检测列表）时的占用：
+- raw：旧行为，直接保存 yt-dlp 原始 subtitles / automatic_captions 字典
+- projected：每种语言只保留一个下载格式（project_subtitle_info）
+- compact：再按 LanguageConfig 只保留相关语言，并 intern 语言代码
+
+合成数据贴近真实 YouTube 返回：约 150 种自动翻译语言 × 6 种格式的带签名 URL。
+
+用法：
+    python scripts/benchmark_detection_memory.py [--videos N] [--auto-langs N]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import logger as logger_module
+
+# 静默 logger（需在导入 detector 之前设置），避免每个视频的检测日志影响测量
+logger_module.set_global_logger(
+    logger_module.Logger(
+        level="WARNING", console_output=False, file_output=False, auto_cleanup=False
+    )
+)
+
+from core.detector import SubtitleDetector, project_subtitle_info  # noqa: E402
+from core.language import LanguageConfig  # noqa: E402
+from core.models import DetectionResult, VideoInfo  # noqa: E402
+
+FORMATS = ["json3", "srv1", "srv2", "srv3", "ttml", "vtt"]
+MANUAL_LANGS = ["en", "en-GB", "es"]
+
+
+def _tracks(video_id: str, langs: List[str], kind: str) -> dict:
+    return {
+        lang: [
+            {
+                "ext": ext,
+                "url": (
+                    f"https://www.youtube.com/api/timedtext?v={video_id}&ei=AbCdEfGh{kind}"
+                    f"&caps=asr&opi=112496729&xoaf=5&hl=en&ip=0.0.0.0&ipbits=0"
+                    f"&expire=1700000000&sparams=ip,ipbits,expire,v,ei,caps,opi,xoaf"
+                    f"&signature=ABCDEF0123456789{video_id}{lang}{ext}ABCDEF0123456789"
+                    f"&key=yt8&lang={lang}&fmt={ext}&tlang={lang}"
+                ),
+                "name": f"{lang} ({kind})",
+                "protocol": "https",
+            }
+            for ext in FORMATS
+        ]
+        for lang in langs
+    }
+
+
+def make_info_dict(index: int, auto_langs: List[str]) -> dict:
+    """合成单个视频的 yt-dlp info_dict（只包含检测相关字段）"""
+    video_id = f"vid{index:08d}"
+    return {
+        "id": video_id,
+        "subtitles": _tracks(video_id, MANUAL_LANGS, "manual"),
+        "automatic_captions": _tracks(video_id, auto_langs, "auto"),
+        "chapters": [],
+    }
+
+
+def _raw(info: dict, video: VideoInfo, detector, language_config) -> DetectionResult:
+    # 旧行为：原始字典 + 未 intern 的语言列表
+    return DetectionResult(
+        video_id=video.video_id,
+        has_subtitles=True,
+        manual_languages=[str(lang) + "" for lang in info["subtitles"]],
+        auto_languages=[str(lang) + "" for lang in info["automatic_captions"]],
+        subtitle_urls=info["subtitles"],
+        auto_subtitle_urls=info["automatic_captions"],
+    )
+
+
+def _projected(info: dict, video: VideoInfo, detector, language_config) -> DetectionResult:
+    video.prefetched_subtitle_info = project_subtitle_info(info)
+    return detector.detect(video)
+
+
+def _compact(info: dict, video: VideoInfo, detector, language_config) -> DetectionResult:
+    video.prefetched_subtitle_info = project_subtitle_info(info)
+    return detector.detect(video, language_config=language_config)
+
+
+def measure(build: Callable, videos: int, auto_langs: List[str]) -> float:
+    """返回保留 videos 个检测结果时的内存增量（MB）"""
+    detector = SubtitleDetector()
+    language_config = LanguageConfig(subtitle_target_languages=["zh-CN", "ja"])
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    results = []
+    for i in range(videos):
+        info = make_info_dict(i, auto_langs)
+        video = VideoInfo(video_id=info["id"], url=f"https://youtu.be/{info['id']}", title="")
+        results.append(build(info, video, detector, language_config))
+        del info
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    assert len(results) == videos
+    return used / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DetectionResult memory benchmark")
+    parser.add_argument("--videos", type=int, default=2000, help="视频数量")
+    parser.add_argument("--auto-langs", type=int, default=150, help="自动字幕语言数量")
+    args = parser.parse_args()
+
+    auto_langs = ["en", "zh-Hans", "zh-Hant", "ja", "de", "fr", "es", "ko"]
+    auto_langs += [f"x{i:03d}" for i in range(max(0, args.auto_langs - len(auto_langs)))]
+
+    print("=" * 60)
+    print(
+        f"DetectionResult 内存基准：{args.videos} 个视频，"
+        f"{len(auto_langs)} 种自动字幕语言 × {len(FORMATS)} 种格式"
+    )
+    print("=" * 60)
+
+    results = {}
+    for name, build in (("raw", _raw), ("projected", _projected), ("compact", _compact)):
+        results[name] = measure(build, args.videos, auto_langs)
+        per_video_kb = results[name] * 1024 / args.videos
+        print(f"{name:10s}: {results[name]:8.1f} MB  ({per_video_kb:6.1f} KB/视频)")
+
+    print(f"\ncompact / raw = {results['compact'] / results['raw']:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+输出提交基准测试
+
+模拟输出阶段把临时目录中已完成的文件（原始字幕、各语言译文、摘要）提交到视频输出目录：
+- copy：旧行为，逐个读出内容后原子写（每个文件一次写入 + fsync）
+- link：硬链接临时文件，每个视频一次目录 fsync（组提交）
+
+临时目录与输出目录位于同一文件系统（与 StageData.temp_dir 的实际情况一致）。
+
+用法：
+    python scripts/benchmark_output_commit.py [--videos N] [--languages N] [--dir PATH]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import logger as logger_module
+
+# 静默 logger，避免每个文件的调试日志影响测量
+logger_module.set_global_logger(
+    logger_module.Logger(
+        level="WARNING", console_output=False, file_output=False, auto_cleanup=False
+    )
+)
+
+from core.output import OutputWriter  # noqa: E402
+from core.output.commit import OutputCommit  # noqa: E402
+
+# 约 20 分钟视频的字幕（300 条）
+CUES = 300
+
+
+def _srt(tag: str) -> str:
+    return "".join(
+        f"{i}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\n"
+        f"{tag} subtitle line number {i}\n\n"
+        for i in range(1, CUES + 1)
+    )
+
+
+def prepare_temp(root: Path, videos: int, languages: int) -> list:
+    """生成每个视频的临时文件，返回 [(video_id, original, {lang: path}, summary)]"""
+    langs = [f"l{i}" for i in range(languages)]
+    original_text = _srt("en")
+    translated_text = {lang: _srt(lang) for lang in langs}
+    items = []
+    for v in range(videos):
+        temp_dir = root / f"vid{v:06d}"
+        temp_dir.mkdir(parents=True)
+        original = temp_dir / "original.en.srt"
+        original.write_text(original_text, encoding="utf-8")
+        translated = {}
+        for lang in langs:
+            path = temp_dir / f"translated.{lang}.srt"
+            path.write_text(translated_text[lang], encoding="utf-8")
+            translated[lang] = path
+        summary = temp_dir / "summary.md"
+        summary.write_text("# Summary\n" + "- point\n" * 50, encoding="utf-8")
+        items.append((f"vid{v:06d}", original, translated, summary))
+    return items
+
+
+def run(mode: str, items: list, out_root: Path) -> float:
+    """提交所有视频的文件，返回耗时（秒）"""
+    writer = OutputWriter(out_root, commit_mode=mode)
+    started = time.perf_counter()
+    for video_id, original, translated, summary in items:
+        video_dir = out_root / video_id
+        commit = OutputCommit(video_dir) if mode == "link" else None
+        writer.write_original_subtitle(video_dir, original, "en", commit=commit)
+        for lang, path in translated.items():
+            writer.write_translated_subtitle(video_dir, path, lang, commit=commit)
+        writer.write_summary(video_dir, summary, "zh-CN", commit=commit)
+        if commit is not None:
+            commit.commit()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Output commit benchmark")
+    parser.add_argument("--videos", type=int, default=5000, help="视频数量")
+    parser.add_argument("--languages", type=int, default=2, help="每个视频的目标语言数")
+    parser.add_argument("--dir", default=None, help="测试目录（默认系统临时目录）")
+    args = parser.parse_args()
+
+    files_per_video = args.languages + 2
+    total_files = args.videos * files_per_video
+
+    print("=" * 60)
+    print(
+        f"输出提交基准：{args.videos} 个视频 × {files_per_video} 个文件 = {total_files} 个文件"
+    )
+    print("=" * 60)
+
+    root = Path(tempfile.mkdtemp(prefix="bench_output_", dir=args.dir))
+    try:
+        items = prepare_temp(root / "temp", args.videos, args.languages)
+        # 流水线中的临时文件由写入方 fsync 过，这里同样先全部落盘
+        if hasattr(os, "sync"):
+            os.sync()
+        results = {}
+        for mode in ("copy", "link"):
+            elapsed = run(mode, items, root / f"out_{mode}")
+            results[mode] = elapsed
+            print(f"{mode:5s}: {elapsed:8.2f} s  ({total_files / elapsed:10.0f} 文件/秒)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"\nlink / copy 吞吐 = {results['copy'] / results['link']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
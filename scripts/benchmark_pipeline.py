@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+"""
+离线端到端流水线基准
+
+不访问 YouTube、不需要真实 AI Key，可重复运行：
+- 假 yt-dlp（scripts/offline_bench/fake_ytdlp.py）放在 PATH 最前面，返回固定的视频信息和字幕，
+  可配置延迟和失败率
+- 本地 OpenAI 兼容桩服务（scripts/offline_bench/llm_stub.py），可配置延迟、token 速率和 429 注入
+- 分别用 ThreadPipeline 和 StagedPipeline 处理 100 / 1k / 10k 个视频
+
+每个用例在独立子进程中运行（峰值 RSS 不受其他用例影响），报告吞吐、各阶段耗时 p50/p95、
+峰值 RSS 和峰值线程数，结果写入 JSON 文件，便于跟踪回归。
+
+AI 路径需要安装 openai 库（与正式运行相同）；--no-ai 只测检测 / 下载 / 输出。
+假 yt-dlp 以可执行脚本形式提供，仅支持 POSIX 系统。
+
+用法：
+    python scripts/benchmark_pipeline.py [--sizes 100,1000,10000] [--pipelines thread,staged]
+        [--output benchmark_pipeline.json] [--no-ai] [--llm-429-rate 0.05] ...
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.offline_bench import StubConfig, StubLLMServer  # noqa: E402
+
+FAKE_YTDLP = PROJECT_ROOT / "scripts" / "offline_bench" / "fake_ytdlp.py"
+STAGES = ("detect", "download", "translate", "summarize", "output")
+SCHEMA_VERSION = 1
+
+
+# ============ 子进程：运行单个用例 ============
+
+
+def _percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    """本进程的峰值 RSS（MB）"""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 单位为 KB，macOS 为字节
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+
+            return psutil.Process().memory_info().peak_wset / 1024 / 1024
+        except Exception:
+            return 0.0
+
+
+def _instrument(pipeline, timings: dict) -> None:
+    """包装各阶段处理器，记录每次处理耗时（两种 Pipeline 共用同一组处理器属性名）"""
+    for stage in STAGES:
+        processor = getattr(pipeline, f"{stage}_processor")
+        samples = timings.setdefault(stage, [])
+
+        def timed(data, _process=processor.process, _samples=samples):
+            started = time.perf_counter()
+            try:
+                return _process(data)
+            finally:
+                _samples.append(time.perf_counter() - started)
+
+        processor.process = timed
+        # StagedPipeline 的队列在初始化时已绑定处理函数
+        queue = getattr(pipeline, f"{stage}_queue", None)
+        if queue is not None:
+            queue.processor = timed
+
+
+def run_case(case: dict) -> dict:
+    """在当前进程中运行一个用例，返回指标"""
+    from core import logger as logger_module
+
+    logger_module.set_global_logger(
+        logger_module.Logger(
+            level="WARNING", console_output=False, file_output=False, auto_cleanup=False
+        )
+    )
+
+    from config.manager import AIConfig
+    from core.ai_providers import create_llm_client
+    from core.failure_logger import FailureLogger
+    from core.language import LanguageConfig
+    from core.models import VideoInfo
+    from core.output import OutputWriter
+    from core.rate_limiter import get_rate_limiter
+    from core.staged_pipeline import StagedPipeline
+    from core.staged_pipeline.thread_pipeline import ThreadPipeline
+
+    # 假后端不需要限速
+    get_rate_limiter().configure(rate=0)
+
+    out_dir = Path(case["out_dir"])
+    translation_llm = summary_llm = None
+    targets = []
+    if case["ai"]:
+        ai_config = AIConfig(
+            provider="openai",
+            model="stub-model",
+            base_url=f"{case['llm_url']}/v1",
+            timeout_seconds=120,
+            max_retries=5,
+            max_concurrency=case["ai_concurrency"],
+            stream=case["stream"],
+            api_keys={"openai": "sk-offline-benchmark"},
+        )
+        translation_llm = create_llm_client(ai_config)
+        summary_llm = create_llm_client(ai_config)
+        targets = case["targets"]
+    language_config = LanguageConfig(
+        subtitle_target_languages=targets,
+        translation_strategy="AI_ONLY",
+        multi_target_translation=len(targets) > 1,
+    )
+    videos = [
+        VideoInfo(
+            video_id=f"b{i:010d}",
+            url=f"https://www.youtube.com/watch?v=b{i:010d}",
+            title=f"Benchmark video {i}",
+        )
+        for i in range(case["videos"])
+    ]
+
+    common = dict(
+        language_config=language_config,
+        translation_llm=translation_llm,
+        summary_llm=summary_llm,
+        output_writer=OutputWriter(out_dir),
+        failure_logger=FailureLogger(out_dir),
+        incremental_manager=None,
+        archive_path=None,
+        force=True,
+    )
+    concurrency = case["concurrency"]
+    ai_concurrency = case["ai_concurrency"]
+    if case["pipeline"] == "thread":
+        pipeline = ThreadPipeline(
+            concurrency=concurrency, ai_concurrency=ai_concurrency, **common
+        )
+    else:
+        pipeline = StagedPipeline(
+            detect_concurrency=concurrency,
+            download_concurrency=concurrency,
+            translate_concurrency=ai_concurrency,
+            summarize_concurrency=ai_concurrency,
+            output_concurrency=concurrency,
+            **common,
+        )
+
+    timings: dict = {}
+    _instrument(pipeline, timings)
+
+    peak_threads = [threading.active_count()]
+    stop = threading.Event()
+
+    def sample_threads():
+        while not stop.wait(0.05):
+            peak_threads[0] = max(peak_threads[0], threading.active_count())
+
+    sampler = threading.Thread(target=sample_threads, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        stats = pipeline.process_videos(videos)
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        sampler.join()
+
+    return {
+        "pipeline": case["pipeline"],
+        "videos": case["videos"],
+        "success": stats.get("success", 0),
+        "failed": stats.get("failed", 0),
+        "elapsed_s": round(elapsed, 3),
+        "videos_per_s": round(case["videos"] / elapsed, 3) if elapsed > 0 else 0.0,
+        "stage_p50_ms": {s: round(_percentile(v, 50) * 1000, 1) for s, v in timings.items()},
+        "stage_p95_ms": {s: round(_percentile(v, 95) * 1000, 1) for s, v in timings.items()},
+        "stage_count": {s: len(v) for s, v in timings.items()},
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "peak_threads": peak_threads[0] - 1,  # 不计采样线程
+    }
+
+
+# ============ 父进程：准备假后端并逐个运行用例 ============
+
+
+def _install_fake_ytdlp(bin_dir: Path) -> None:
+    """在 bin_dir 中生成名为 yt-dlp 的可执行脚本"""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    launcher = bin_dir / "yt-dlp"
+    launcher.write_text(
+        f"#!{sys.executable} -S\n"
+        "import runpy, sys\n"
+        f"sys.argv[0] = {str(FAKE_YTDLP)!r}\n"
+        f"runpy.run_path({str(FAKE_YTDLP)!r}, run_name='__main__')\n",
+        encoding="utf-8",
+    )
+    launcher.chmod(launcher.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def _git_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _run_in_subprocess(case: dict, env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", json.dumps(case)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        return {
+            "pipeline": case["pipeline"],
+            "videos": case["videos"],
+            "error": (result.stderr or result.stdout).strip()[-2000:],
+        }
+    return json.loads(lines[-1])
+
+
+def _print_row(result: dict) -> None:
+    if "error" in result:
+        print(f"{result['pipeline']:7s} {result['videos']:>6d}  失败: {result['error'].splitlines()[-1]}")
+        return
+    p95 = " ".join(f"{s[:4]}={result['stage_p95_ms'].get(s, 0):.0f}" for s in STAGES)
+    print(
+        f"{result['pipeline']:7s} {result['videos']:>6d} {result['videos_per_s']:>9.2f}/s "
+        f"ok={result['success']:<6d} fail={result['failed']:<5d} "
+        f"rss={result['peak_rss_mb']:>7.1f}MB thr={result['peak_threads']:<4d} p95ms[{p95}]"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--sizes", default="100,1000,10000", help="视频数量（逗号分隔）")
+    parser.add_argument("--pipelines", default="thread,staged", help="thread / staged（逗号分隔）")
+    parser.add_argument("--concurrency", type=int, default=10, help="视频并发数")
+    parser.add_argument("--ai-concurrency", type=int, default=5, help="AI 并发数")
+    parser.add_argument("--targets", default="zh-CN", help="翻译目标语言（逗号分隔）")
+    parser.add_argument("--no-ai", action="store_true", help="不翻译、不摘要（无需 openai 库）")
+    parser.add_argument("--no-stream", action="store_true", help="AI 调用不使用流式输出")
+    parser.add_argument("--cues", type=int, default=60, help="每个视频的字幕条目数")
+    parser.add_argument("--ytdlp-latency-ms", type=float, default=50.0, help="假 yt-dlp 每次调用的延迟")
+    parser.add_argument("--ytdlp-error-rate", type=float, default=0.0, help="假 yt-dlp 失败率（0～1）")
+    parser.add_argument("--llm-latency-ms", type=float, default=100.0, help="桩服务首字延迟")
+    parser.add_argument("--llm-tps", type=float, default=2000.0, help="桩服务输出 token/秒（0 不限）")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="桩服务返回 429 的比例（0～1）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--output", default="benchmark_pipeline.json", help="结果 JSON 文件")
+    parser.add_argument("--dir", default=None, help="工作目录（默认系统临时目录）")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(json.loads(args.worker))))
+        return 0
+
+    if os.name == "nt":
+        print("假 yt-dlp 以可执行脚本形式提供，目前仅支持 POSIX 系统")
+        return 1
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    pipelines = [p.strip() for p in args.pipelines.split(",") if p.strip()]
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_pipeline_", dir=args.dir))
+    stub = StubLLMServer(
+        StubConfig(
+            latency_ms=args.llm_latency_ms,
+            tokens_per_second=args.llm_tps,
+            rate_limit_ratio=args.llm_429_rate,
+            seed=args.seed,
+            cues=args.cues,
+        )
+    ).start()
+
+    results = []
+    try:
+        bin_dir = work_dir / "bin"
+        _install_fake_ytdlp(bin_dir)
+        env = dict(os.environ)
+        env.update(
+            PATH=f"{bin_dir}{os.pathsep}{env.get('PATH', '')}",
+            PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")])),
+            FAKE_YTDLP_LATENCY_MS=str(args.ytdlp_latency_ms),
+            FAKE_YTDLP_ERROR_RATE=str(args.ytdlp_error_rate),
+            FAKE_YTDLP_CUES=str(args.cues),
+            FAKE_YTDLP_SEED=str(args.seed),
+            FAKE_YTDLP_SUBTITLE_BASE=f"{stub.base_url}/subtitles",
+        )
+
+        print("=" * 100)
+        print(f"离线流水线基准：pipelines={pipelines} sizes={sizes} ai={not args.no_ai}")
+        print("=" * 100)
+        for size in sizes:
+            for pipeline in pipelines:
+                case_dir = work_dir / f"{pipeline}_{size}"
+                case = {
+                    "pipeline": pipeline,
+                    "videos": size,
+                    "out_dir": str(case_dir),
+                    "concurrency": args.concurrency,
+                    "ai_concurrency": args.ai_concurrency,
+                    "ai": not args.no_ai,
+                    "stream": not args.no_stream,
+                    "targets": [t.strip() for t in args.targets.split(",") if t.strip()],
+                    "llm_url": stub.base_url,
+                }
+                stub.stats(reset=True)
+                result = _run_in_subprocess(case, env)
+                result["llm"] = stub.stats(reset=True)
+                results.append(result)
+                _print_row(result)
+                shutil.rmtree(case_dir, ignore_errors=True)
+    finally:
+        stub.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("worker", "output", "dir")},
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n结果已写入 {args.output}")
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
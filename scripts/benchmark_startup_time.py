@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+CLI 冷启动导入耗时基准测试
+
+在全新的子进程中以 `python -X importtime -c "import <module>"` 导入入口模块，
+解析 importtime 输出：
+1. 入口模块的累计导入耗时（多轮取中位数），超过预算时返回非零退出码
+2. 自身耗时最高的模块（定位新引入的重依赖）
+3. 启动时不应导入的延迟模块（AI 供应商 SDK、子命令实现、流水线等），出现即失败
+
+用法：
+    python scripts/benchmark_startup_time.py [--module cli.main] [--rounds N] [--budget-ms N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 启动阶段（解析参数、--help）不应导入的模块：只在对应命令执行时才需要
+DEFERRED_MODULES = [
+    "requests",
+    "openai",
+    "anthropic",
+    "google.generativeai",
+    "core.ai_providers",
+    "core.pipeline",
+    "core.staged_pipeline",
+    "core.downloader",
+    "core.fetcher",
+    "cli.channel",
+    "cli.urls",
+    "cli.ai_smoke_test",
+    "cli.rerender",
+]
+
+
+def run_importtime(module: str) -> List[Tuple[int, int, str]]:
+    """在子进程中导入模块，返回 [(自身耗时 us, 累计耗时 us, 带缩进的模块名)]"""
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        entries.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+    return entries
+
+
+def cumulative_us(entries: List[Tuple[int, int, str]], module: str) -> int:
+    """入口模块的累计导入耗时（顶层条目）"""
+    for _, cumulative, name in entries:
+        if name.strip() == module and name.startswith(" ") and not name.startswith("  "):
+            return cumulative
+    raise RuntimeError(f"{module} not found in importtime output")
+
+
+def deferred_imports(entries: List[Tuple[int, int, str]]) -> List[str]:
+    """启动时被导入的延迟模块"""
+    imported = {name.strip() for _, _, name in entries}
+    return [
+        name
+        for name in sorted(imported)
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    ]
+
+
+def top_self_time(entries: List[Tuple[int, int, str]], limit: int) -> List[Tuple[int, str]]:
+    totals: Dict[str, int] = {}
+    for self_us, _, name in entries:
+        totals[name.strip()] = self_us
+    return sorted(((us, name) for name, us in totals.items()), reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold-start import time benchmark")
+    parser.add_argument("--module", default="cli.main", help="入口模块")
+    parser.add_argument("--rounds", type=int, default=5, help="重复次数（每轮一个新进程）")
+    parser.add_argument("--top", type=int, default=10, help="显示自身耗时最高的 N 个模块")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=150.0,
+        help="累计导入耗时中位数上限（毫秒），超过则返回非零退出码",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"冷启动导入基准：import {args.module}，{args.rounds} 轮")
+    print("=" * 60)
+
+    runs = [run_importtime(args.module) for _ in range(args.rounds)]
+    timings_ms = [cumulative_us(entries, args.module) / 1000 for entries in runs]
+    median_ms = statistics.median(timings_ms)
+
+    print(
+        f"累计导入耗时: 中位数 {median_ms:.1f}ms，"
+        f"最小 {min(timings_ms):.1f}ms，最大 {max(timings_ms):.1f}ms"
+    )
+    print(f"\n自身耗时最高的 {args.top} 个模块（最后一轮）：")
+    for self_us, name in top_self_time(runs[-1], args.top):
+        print(f"  {self_us / 1000:7.2f}ms  {name}")
+
+    failed = False
+    deferred = deferred_imports(runs[-1])
+    if deferred:
+        print(f"\n❌ 启动时导入了应延迟加载的模块: {', '.join(deferred)}")
+        failed = True
+
+    if median_ms > args.budget_ms:
+        print(f"\n❌ 导入耗时中位数 {median_ms:.1f}ms 超过预算 {args.budget_ms:.0f}ms")
+        failed = True
+    else:
+        print(f"\n✅ 导入耗时中位数 {median_ms:.1f}ms（预算 {args.budget_ms:.0f}ms）")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
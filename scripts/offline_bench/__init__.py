@@ -0,0 +1,12 @@
+"""
+离线端到端基准的假后端
+
+- fake_ytdlp：放在 PATH 最前面的假 yt-dlp 可执行脚本
+- llm_stub：本地 OpenAI 兼容桩服务（同时提供字幕文件）
+
+由 scripts/benchmark_pipeline.py 使用，不需要访问 YouTube 或真实 AI Key。
+"""
+
+from .llm_stub import StubConfig, StubLLMServer
+
+__all__ = ["StubConfig", "StubLLMServer"]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+离线基准用的假 yt-dlp
+
+支持流水线实际用到的两种调用：
+- --dump-json <url>：输出视频信息 JSON（含一条人工英文字幕轨道和章节）
+- --write-subs / --write-auto-subs --sub-langs <lang> --output <模板> <url>：写出 <模板>.<lang>.srt
+
+通过环境变量配置（由 benchmark_pipeline.py 设置）：
+- FAKE_YTDLP_LATENCY_MS：每次调用的模拟网络延迟（毫秒）
+- FAKE_YTDLP_ERROR_RATE：失败概率（0～1），失败时按 yt-dlp 的格式输出 HTTP 503 错误
+- FAKE_YTDLP_CUES：每个字幕文件的条目数
+- FAKE_YTDLP_SUBTITLE_BASE：字幕轨道 URL 前缀（供直接下载的回退路径使用，可选）
+- FAKE_YTDLP_SEED：随机种子；同一视频、同一种调用的成败是确定的，便于复现
+
+只依赖标准库，启动开销尽量小（每次调用都是一个新进程）。
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+VERSION = "2099.01.01-fake"
+
+
+def _video_id(url: str) -> str:
+    if "v=" in url:
+        return url.split("v=", 1)[1].split("&", 1)[0]
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _fails(kind: str, video_id: str) -> bool:
+    rate = float(os.environ.get("FAKE_YTDLP_ERROR_RATE", "0") or 0)
+    if rate <= 0:
+        return False
+    seed = os.environ.get("FAKE_YTDLP_SEED", "0")
+    digest = hashlib.sha1(f"{seed}:{kind}:{video_id}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32 < rate
+
+
+def make_srt(video_id: str, cues: int) -> str:
+    """生成确定性的英文 SRT 内容"""
+    lines = []
+    for i in range(1, cues + 1):
+        start = (i - 1) * 3
+        lines.append(
+            f"{i}\n"
+            f"{start // 3600:02d}:{start // 60 % 60:02d}:{start % 60:02d},000 --> "
+            f"{start // 3600:02d}:{start // 60 % 60:02d}:{start % 60:02d},900\n"
+            f"Line {i} of video {video_id}, a short sentence for translation.\n"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def make_info(video_id: str, url: str) -> dict:
+    """生成 --dump-json 的视频信息"""
+    base = os.environ.get("FAKE_YTDLP_SUBTITLE_BASE", "http://127.0.0.1:9/subtitles")
+    return {
+        "id": video_id,
+        "title": f"Benchmark video {video_id}",
+        "webpage_url": url,
+        "duration": 600,
+        "channel_id": "UCbenchmark",
+        "channel": "Benchmark",
+        "subtitles": {
+            "en": [
+                {"ext": "srt", "url": f"{base}/{video_id}.en.srt"},
+                {"ext": "vtt", "url": f"{base}/{video_id}.en.vtt"},
+            ]
+        },
+        "automatic_captions": {},
+        "chapters": [
+            {"start_time": 0.0, "end_time": 300.0, "title": "Intro"},
+            {"start_time": 300.0, "end_time": 600.0, "title": "Main"},
+        ],
+    }
+
+
+def _option(args: list, name: str):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
+
+def main(argv: list) -> int:
+    if "--version" in argv:
+        print(VERSION)
+        return 0
+
+    latency_ms = float(os.environ.get("FAKE_YTDLP_LATENCY_MS", "0") or 0)
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000)
+
+    urls = [a for a in argv if a.startswith("http://") or a.startswith("https://")]
+    if not urls:
+        sys.stderr.write("ERROR: no URL given\n")
+        return 2
+    url = urls[-1]
+    video_id = _video_id(url)
+
+    if "--dump-json" in argv:
+        if _fails("info", video_id):
+            sys.stderr.write(
+                f"ERROR: [youtube] {video_id}: Unable to download API page: "
+                "HTTP Error 503: Service Unavailable\n"
+            )
+            return 1
+        sys.stdout.write(json.dumps(make_info(video_id, url)))
+        return 0
+
+    if "--write-subs" in argv or "--write-auto-subs" in argv:
+        if _fails("subs", video_id):
+            sys.stderr.write(
+                f"ERROR: Unable to download video subtitles for 'en': "
+                "HTTP Error 503: Service Unavailable\n"
+            )
+            return 1
+        template = _option(argv, "--output") or video_id
+        lang = _option(argv, "--sub-langs") or "en"
+        if lang != "en":
+            # 只有英文字幕：与真实 yt-dlp 一样成功退出但不写文件
+            return 0
+        cues = int(os.environ.get("FAKE_YTDLP_CUES", "60") or 60)
+        with open(f"{template}.{lang}.srt", "w", encoding="utf-8") as f:
+            f.write(make_srt(video_id, cues))
+        return 0
+
+    sys.stderr.write(f"ERROR: unsupported arguments: {' '.join(argv)}\n")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
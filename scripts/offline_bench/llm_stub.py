@@ -0,0 +1,340 @@
+"""
+离线基准用的本地 OpenAI 兼容桩服务
+
+- POST /v1/chat/completions：按提示词中的 SRT 条目原样“翻译”（每行加 [语言] 前缀），
+  多目标语言提示词返回 <translation lang=...> 标签，其他提示词（摘要）返回固定 Markdown；
+  支持 stream=true（SSE），可配置首字延迟、输出 token 速率和 429 注入比例；
+  模拟自动前缀缓存：重复出现的 system 消息计入 usage.prompt_tokens_details.cached_tokens
+- GET /v1/models：本地模型心跳
+- GET /subtitles/<视频ID>.<语言>.<srt|vtt>：假 yt-dlp 信息 JSON 中字幕轨道的 URL（直接下载的回退路径）
+
+只依赖标准库。
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from .fake_ytdlp import make_srt
+
+# SRT 时间码行
+_TIMING_PATTERN = re.compile(r"^\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}$")
+# 多目标语言提示词中的目标语言列表行（"- zh-CN：..."）
+_TARGET_LINE_PATTERN = re.compile(r"(?m)^- ([A-Za-z]{2,3}(?:-[A-Za-z0-9]+)*)：")
+# 单目标提示词中的目标语言（"翻译成 简体中文。"，可能是语言代码或显示名）
+_TARGET_PATTERN = re.compile(r"翻译成\s*([^\s。，,]+)")
+
+SUMMARY_TEXT = "# Summary\n\n- First key point of the video.\n- Second key point.\n- Conclusion.\n"
+
+
+@dataclass
+class StubConfig:
+    """桩服务行为配置"""
+
+    latency_ms: float = 100.0  # 首字延迟（毫秒）
+    tokens_per_second: float = 2000.0  # 输出 token 速率，0 表示不限
+    rate_limit_ratio: float = 0.0  # 返回 429 的请求比例（0～1）
+    seed: int = 0  # 429 注入的随机种子
+    cues: int = 60  # /subtitles 返回的字幕条目数
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数（约 4 个字符一个 token）"""
+    return max(1, len(text) // 4)
+
+
+def _extract_cues(prompt: str) -> List[tuple]:
+    """提取提示词中的 SRT 条目 [(序号, 时间码, 文本)]"""
+    cues = []
+    for block in re.split(r"\n\s*\n", prompt):
+        lines = [line.strip() for line in block.strip().split("\n")]
+        for i in range(len(lines) - 1):
+            if lines[i].isdigit() and _TIMING_PATTERN.match(lines[i + 1]):
+                cues.append((lines[i], lines[i + 1], "\n".join(lines[i + 2:])))
+                break
+    return cues
+
+
+def _render_cues(cues: List[tuple], lang: str) -> str:
+    blocks = []
+    for index, timing, text in cues:
+        lines = [f"[{lang}] {line}" for line in text.strip("\n").split("\n")]
+        blocks.append(f"{index}\n{timing}\n" + "\n".join(lines) + "\n")
+    return "\n".join(blocks)
+
+
+def build_reply(prompt: str, content: Optional[str] = None) -> str:
+    """根据提示词生成回复内容
+
+    Args:
+        prompt: 全部消息拼接后的提示词（用于识别指令）
+        content: 字幕所在的 user 消息（None 表示同 prompt；system 中的示例条目不会被当作字幕）
+    """
+    cues = _extract_cues(prompt if content is None else content)
+    if cues and "<translation lang=" in prompt:
+        targets = list(dict.fromkeys(_TARGET_LINE_PATTERN.findall(prompt)))
+        return "\n".join(
+            f'<translation lang="{lang}">\n{_render_cues(cues, lang)}</translation>'
+            for lang in targets
+        )
+    if cues and "翻译" in prompt:
+        match = _TARGET_PATTERN.search(prompt)
+        return _render_cues(cues, match.group(1) if match else "xx")
+    return SUMMARY_TEXT
+
+
+class _StubState:
+    """计数器和随机源（线程安全）"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {}
+        self._seen_prefixes: set = set()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._seen_prefixes.clear()
+            self.counters = {
+                "requests": 0,
+                "streamed": 0,
+                "rate_limited": 0,
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+                "completion_tokens": 0,
+                "subtitle_requests": 0,
+            }
+
+    def add(self, **deltas: int) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self.counters[key] += value
+
+    def cached_prefix_tokens(self, system: str) -> int:
+        """模拟自动前缀缓存：同一 system 消息第二次出现起按缓存命中计"""
+        if not system:
+            return 0
+        with self._lock:
+            if system in self._seen_prefixes:
+                return estimate_tokens(system)
+            self._seen_prefixes.add(system)
+            return 0
+
+    def should_rate_limit(self) -> bool:
+        if self.config.rate_limit_ratio <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.config.rate_limit_ratio
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StubHTTPServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - 覆盖基类签名
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802 - http.server 约定
+        state = self.server.state
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+            return
+        match = re.match(r"^/subtitles/([^/.]+)\.([\w-]+)\.(srt|vtt)$", self.path)
+        if not match:
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        state.add(subtitle_requests=1)
+        video_id, _, ext = match.groups()
+        content = make_srt(video_id, state.config.cues)
+        if ext == "vtt":
+            content = "WEBVTT\n\n" + content.replace(",", ".")
+        body = content.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # noqa: N802 - http.server 约定
+        state = self.server.state
+        config = state.config
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        state.add(requests=1)
+        if state.should_rate_limit():
+            state.add(rate_limited=1)
+            self._send_json(
+                429,
+                {
+                    "error": {
+                        "message": "Rate limit reached (injected by offline stub)",
+                        "type": "rate_limit_error",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+                headers={"retry-after-ms": "50"},
+            )
+            return
+
+        messages = request.get("messages", [])
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+        system = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+        user = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") != "system")
+        reply = build_reply(prompt, user)
+        prompt_tokens = estimate_tokens(prompt)
+        cached_tokens = state.cached_prefix_tokens(system)
+        completion_tokens = estimate_tokens(reply)
+        state.add(
+            prompt_tokens=prompt_tokens,
+            cached_tokens=cached_tokens,
+            completion_tokens=completion_tokens,
+        )
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+        model = request.get("model", "stub-model")
+
+        time.sleep(config.latency_ms / 1000)
+        if request.get("stream"):
+            state.add(streamed=1)
+            self._stream(reply, usage, model, request)
+            return
+
+        if config.tokens_per_second > 0:
+            time.sleep(completion_tokens / config.tokens_per_second)
+        self._send_json(
+            200,
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _stream(self, reply: str, usage: dict, model: str, request: dict) -> None:
+        """SSE 流式输出（每块约 16 个 token，按 token 速率分段发送）"""
+        config = self.server.state.config
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(choices: list, extra: Optional[dict] = None) -> None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+            }
+            payload.update(extra or {})
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk_chars = 64
+        delay = (chunk_chars / 4) / config.tokens_per_second if config.tokens_per_second > 0 else 0
+        try:
+            for start in range(0, len(reply), chunk_chars):
+                event([{"index": 0, "delta": {"content": reply[start:start + chunk_chars]}, "finish_reason": None}])
+                if delay:
+                    time.sleep(delay)
+            event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if (request.get("stream_options") or {}).get("include_usage"):
+                event([], {"usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前关闭流（取消或增量校验中止）
+            pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    state: _StubState
+
+
+class StubLLMServer:
+    """在后台线程中运行的桩服务
+
+    用法：
+        with StubLLMServer(StubConfig(latency_ms=50)) as server:
+            base_url = server.base_url  # http://127.0.0.1:<端口>
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self._server = _StubHTTPServer((host, port), _Handler)
+        self._server.state = _StubState(self.config)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="llm-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def stats(self, reset: bool = False) -> Dict[str, int]:
+        """请求计数（reset=True 时读取后清零）"""
+        snapshot = self._server.state.snapshot()
+        if reset:
+            self._server.state.reset()
+        return snapshot
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
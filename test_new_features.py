@@ -73,74 +73,11 @@ def test_summary_length_rules():
     return all_passed
 
 
-def test_chunk_split():
-    """测试分块拆分逻辑（句子边界分割）"""
-    print()
-    print("=" * 60)
-    print("测试 2: 分块拆分逻辑（句子边界分割）")
-    print("=" * 60)
-    
-    from core.translator.translator import SubtitleTranslator
-    
-    # 创建一个模拟的 SRT 内容，包含句子结束标点
-    srt_content = """1
-00:00:01,000 --> 00:00:03,000
-Hello world.
-
-2
-00:00:04,000 --> 00:00:06,000
-How are you?
-
-3
-00:00:07,000 --> 00:00:09,000
-I am fine,
-
-4
-00:00:10,000 --> 00:00:12,000
-thank you!
-
-5
-00:00:13,000 --> 00:00:15,000
-What is your name
-
-6
-00:00:16,000 --> 00:00:18,000
-My name is Bob."""
-
-    # 测试拆分函数
-    translator = SubtitleTranslator.__new__(SubtitleTranslator)  # 不调用 __init__
-    
-    # 调用拆分方法
-    sub_chunks = translator._split_chunk_in_half(srt_content)
-    
-    print(f"  原始内容包含 6 条字幕")
-    print(f"  拆分后得到 {len(sub_chunks)} 个子块")
-    
-    if len(sub_chunks) == 2:
-        print("  ✓ 拆分数量正确 (2 个子块)")
-        
-        # 检查每个子块
-        for i, chunk in enumerate(sub_chunks):
-            entries = chunk.count("-->")
-            # 检查分割点是否在句子结束处
-            last_line = chunk.strip().split('\n')[-1]
-            has_sentence_end = any(p in last_line for p in ['.', '!', '?', '。', '！', '？'])
-            
-            print(f"    子块 {i+1}: {entries} 条字幕, 末尾: '{last_line}'")
-            if i == 0 and has_sentence_end:
-                print(f"    ✓ 子块 1 在句子结束处分割")
-        
-        return True
-    else:
-        print("  ✗ 拆分数量不正确")
-        return False
-
-
 def test_srt_renumber():
     """测试 SRT 重新编号逻辑"""
     print()
     print("=" * 60)
-    print("测试 3: SRT 重新编号逻辑")
+    print("测试 2: SRT 重新编号逻辑")
     print("=" * 60)
     
     from core.state.chunk_tracker import ChunkTracker
@@ -196,7 +133,7 @@ def test_srt_format_validation():
     """测试 SRT 格式验证"""
     print()
     print("=" * 60)
-    print("测试 4: SRT 格式验证")
+    print("测试 3: SRT 格式验证")
     print("=" * 60)
     
     from core.state.chunk_tracker import ChunkTracker
@@ -233,7 +170,7 @@ def test_timeline_validation():
     """测试时间轴校验"""
     print()
     print("=" * 60)
-    print("测试 5: 时间轴校验")
+    print("测试 4: 时间轴校验")
     print("=" * 60)
     
     from core.state.chunk_tracker import ChunkTracker
@@ -299,7 +236,7 @@ def test_translation_completeness():
     """测试翻译完整性检查"""
     print()
     print("=" * 60)
-    print("测试 6: 翻译完整性检查")
+    print("测试 5: 翻译完整性检查")
     print("=" * 60)
     
     from core.translator.translator import SubtitleTranslator
@@ -362,12 +299,6 @@ def main():
         print(f"  ✗ 测试失败: {e}")
         results.append(("摘要推荐字数规则", False))
     
-    try:
-        results.append(("分块拆分逻辑", test_chunk_split()))
-    except Exception as e:
-        print(f"  ✗ 测试失败: {e}")
-        results.append(("分块拆分逻辑", False))
-    
     try:
         results.append(("SRT 重新编号", test_srt_renumber()))
     except Exception as e:
@@ -0,0 +1,116 @@
+"""
+Tests for core/artifact_store.py（阶段间内存产物传递）
+
+运行: python -m pytest tests/test_artifact_store.py -v
+"""
+
+from core.artifact_store import ArtifactStore
+from core.language import LanguageConfig
+from core.llm_client import LLMResult
+from core.models import DetectionResult, VideoInfo
+from core.output import OutputWriter
+from core.staged_pipeline.data_types import StageData
+from core.translator import SubtitleTranslator
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n"
+
+
+class TestArtifactStore:
+    """产物存储测试"""
+
+    def test_write_stays_in_memory(self, tmp_path):
+        store = ArtifactStore()
+        path = tmp_path / "temp" / "translated.ja.srt"
+        store.write_text(path, "text")
+
+        assert store.read_text(path) == "text"
+        assert store.exists(path) and store.is_pending(path)
+        assert not path.exists()
+
+    def test_read_through_cached(self, tmp_path):
+        store = ArtifactStore()
+        path = tmp_path / "original.en.srt"
+        path.write_text(SRT, encoding="utf-8")
+
+        assert store.read_text(path) == SRT
+        path.unlink()
+        assert store.read_text(path) == SRT
+        assert store.stats()["misses"] == 1 and store.stats()["hits"] == 1
+
+    def test_lru_spill_over_cap(self, tmp_path):
+        store = ArtifactStore(max_memory_mb=1)
+        big = "x" * (600 * 1024)
+        first, second = tmp_path / "a.srt", tmp_path / "b.srt"
+        store.write_text(first, big)
+        store.write_text(second, big)
+
+        # 最久未使用的产物落盘后移出内存，仍可读取
+        assert first.read_text(encoding="utf-8") == big
+        assert not store.is_pending(first)
+        assert store.is_pending(second) and not second.exists()
+        assert store.stats()["spills"] == 1
+        assert store.read_text(first) == big
+
+    def test_discard(self, tmp_path):
+        store = ArtifactStore()
+        done, failed, other = tmp_path / "v1", tmp_path / "v2", tmp_path / "v3"
+        store.write_text(done / "translated.ja.srt", "a")
+        store.write_text(failed / "translated.ja.srt", "b")
+        store.write_text(other / "translated.ja.srt", "c")
+
+        store.discard(done)
+        store.discard(failed, spill=True)
+
+        assert not store.exists(done / "translated.ja.srt")
+        assert (failed / "translated.ja.srt").read_text(encoding="utf-8") == "b"
+        assert store.stats()["entries"] == 1
+
+    def test_release_artifacts_keeps_partial_results(self, tmp_path):
+        store = ArtifactStore()
+        data = StageData(
+            video_info=VideoInfo(video_id="abc123", url="", title=""),
+            temp_dir=tmp_path,
+            artifacts=store,
+        )
+        store.write_text(tmp_path / "translated.ja.srt", SRT)
+        assert data.artifact_exists(tmp_path / "translated.ja.srt")
+
+        data.processing_failed = True
+        data.release_artifacts()
+        assert (tmp_path / "translated.ja.srt").exists()
+        assert store.stats()["entries"] == 0
+
+
+class _EchoLLM:
+    max_concurrency = 1
+
+    def generate(self, prompt, **kwargs):
+        return LLMResult(text=prompt.split("字幕内容：\n", 1)[1].rsplit("\n\n请", 1)[0])
+
+
+def test_translation_passed_in_memory_to_output(tmp_path):
+    """译文从翻译阶段经内存直接写到输出目录，临时目录中不产生译文文件"""
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+    original = temp_dir / "original.en.srt"
+    original.write_text(SRT, encoding="utf-8")
+    config = LanguageConfig(subtitle_target_languages=["ja"], translation_strategy="AI_ONLY")
+    video = VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title")
+    detection = DetectionResult(
+        video_id="abc123", has_subtitles=True, manual_languages=["en"], auto_languages=[]
+    )
+    download_result = {"original": original, "official_translations": {}}
+    store = ArtifactStore()
+
+    result = SubtitleTranslator(_EchoLLM(), config, artifacts=store).translate(
+        video, detection, config, download_result, temp_dir
+    )
+    assert not result["ja"].exists() and store.is_pending(result["ja"])
+
+    video_dir = OutputWriter(tmp_path / "out").write_all(
+        video, detection, config, download_result, result, None, artifacts=store
+    )
+    assert (video_dir / "translated.ja.srt").read_text(encoding="utf-8").count("-->") == 1
+    assert not result["ja"].exists()
+    # 原始字幕只从磁盘读取一次
+    assert store.stats()["misses"] == 1
@@ -0,0 +1,166 @@
+"""
+Tests for core/translator/salvage.py（逐条校验与局部修复）
+
+运行: python -m pytest tests/test_chunk_salvage.py -v
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.exceptions import TaskCancelledError
+from core.language import LanguageConfig
+from core.llm_client import LLMResult
+from core.models import DetectionResult, VideoInfo
+from core.state.chunk_tracker import parse_srt_entries
+from core.translator import SubtitleTranslator
+from core.translator.salvage import CueRepairTask, run_cue_repair
+
+
+def _srt(start, end):
+    return "".join(
+        f"{i}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\nLine {i}.\n\n"
+        for i in range(start, end)
+    )
+
+
+def _translate_all(content, drop=(), garble=()):
+    """把每条 Line n 译为 [ja] Line n，drop 中的条目缺失，garble 中的条目输出乱码"""
+    lines = []
+    for entry in parse_srt_entries(content):
+        number = entry["index"]
+        if number in drop:
+            continue
+        text = "��" if number in garble else f"[ja] {entry['text']}"
+        lines.append(f"{number}\n{entry['start']} --> {entry['end']}\n{text}\n")
+    return "\n".join(lines)
+
+
+class TestCueRepairTask:
+    """CueRepairTask 测试"""
+
+    def test_keeps_good_cues_and_requests_only_missing_ranges(self):
+        task = CueRepairTask(0, _srt(1, 11))
+        assert task.claim_ranges() == [(0, 10)]
+
+        salvaged = task.absorb(0, 10, _translate_all(task.range_content(0, 10), drop={3}, garble={7, 8}))
+
+        assert salvaged == 7
+        assert task.claim_ranges() == [(2, 3), (6, 8)]
+        assert task.range_content(6, 8).count("-->") == 2
+        assert "7\n00:00:07,000" in task.range_content(6, 8)
+
+    def test_cues_outside_requested_range_ignored(self):
+        task = CueRepairTask(0, _srt(1, 5))
+        task.claim_ranges()
+        task.absorb(0, 4, _translate_all(task.range_content(0, 4), drop={2, 3}))
+        ranges = task.claim_ranges()
+
+        # 模型把整段都返回了，只采用本次请求区间内的条目
+        task.absorb(*ranges[0], _translate_all(_srt(1, 5)))
+        assert task.complete
+        assert task.render().count("[ja]") == 4
+        assert task.render().startswith("1\n00:00:01,000 --> 00:00:01,900\n[ja] Line 1.")
+
+    def test_empty_response_splits_range_then_gives_up(self):
+        task = CueRepairTask(0, _srt(1, 9), max_attempts=2)
+        task.claim_ranges()
+        assert task.absorb(0, 8, None) == 0
+
+        first, second = task.claim_ranges()
+        assert first[0] == 0 and first[1] == second[0] and second[1] == 8
+        task.absorb(*first, "")
+        task.absorb(*second, "")
+
+        assert task.done and not task.complete
+        assert task.requests == 3
+
+
+def test_repair_ranges_run_concurrently():
+    """多个缺失区间同时请求，修复请求只包含缺失的条目"""
+    tasks = [CueRepairTask(0, _srt(1, 21)), CueRepairTask(1, _srt(21, 41))]
+    barrier = threading.Barrier(3, timeout=5)
+    requests = []
+    lock = threading.Lock()
+
+    def translate(content):
+        cues = content.count("-->")
+        with lock:
+            requests.append(cues)
+            first_round = len(requests) <= 2
+        if first_round:
+            return _translate_all(content, drop={5, 25}, garble={15})
+        barrier.wait()
+        return _translate_all(content)
+
+    done = []
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        run_cue_repair(tasks, pool.submit, translate, done.append, video_id="v")
+
+    assert sorted(requests) == [1, 1, 1, 20, 20]
+    assert [task.complete for task in done] == [True, True]
+    assert all(task.render().count("[ja]") == 20 for task in tasks)
+
+
+def test_exception_aborts_chunk_and_cancel_raises():
+    task = CueRepairTask(0, _srt(1, 5))
+    done = []
+
+    def failing(content):
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        run_cue_repair([task], pool.submit, failing, done.append)
+    assert done == [task] and task.aborted and not task.complete
+
+    class Token:
+        def is_cancelled(self):
+            return True
+
+        def get_reason(self):
+            return "stop"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with pytest.raises(TaskCancelledError):
+            run_cue_repair([CueRepairTask(0, _srt(1, 3))], pool.submit, failing, done.append, cancel_token=Token())
+
+
+class _PartialLLM:
+    """首次请求丢掉最后一条字幕，之后正常翻译"""
+
+    max_concurrency = 4
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, **kwargs):
+        content = prompt.split("字幕内容：\n", 1)[1].rsplit("\n\n请", 1)[0]
+        with self._lock:
+            self.prompts.append(content)
+            first = len(self.prompts) == 1
+        last = parse_srt_entries(content)[-1]["index"]
+        return LLMResult(text=_translate_all(content, drop={last} if first else ()))
+
+
+def test_translator_rerequests_only_missing_cue(tmp_path):
+    source = tmp_path / "original.en.srt"
+    # 超过 100 条字幕走分块翻译（3 个 chunk）
+    source.write_text(_srt(1, 121), encoding="utf-8")
+    config = LanguageConfig(subtitle_target_languages=["ja"], translation_strategy="AI_ONLY")
+    llm = _PartialLLM()
+
+    result = SubtitleTranslator(llm, config).translate(
+        VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title"),
+        DetectionResult(
+            video_id="abc123", has_subtitles=True, manual_languages=["en"], auto_languages=[]
+        ),
+        config,
+        {"original": source, "official_translations": {}},
+        tmp_path,
+    )
+
+    text = result["ja"].read_text(encoding="utf-8")
+    assert text.count("[ja]") == 120
+    assert sorted(p.count("-->") for p in llm.prompts) == [1, 20, 50, 50]
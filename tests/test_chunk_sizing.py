@@ -0,0 +1,123 @@
+"""
+Tests for core/translator/chunk_sizing.py（按上下文窗口自适应的分块大小）
+
+运行: python -m pytest tests/test_chunk_sizing.py -v
+"""
+
+from core.state.chunk_tracker import ChunkTracker
+from core.translator.chunk_sizing import (
+    DEFAULT_LIMITS,
+    INITIAL_SCALE,
+    MAX_SCALE,
+    AdaptiveChunkSizer,
+    estimate_output_tokens,
+    estimate_tokens,
+    get_chunk_sizer,
+)
+
+
+def _srt(count, text="This is a fairly ordinary subtitle line"):
+    return "".join(
+        f"{i}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\n{text} {i}.\n\n"
+        for i in range(1, count + 1)
+    )
+
+
+SRT = _srt(300)
+
+
+class TestTokenEstimate:
+    """token 估算测试"""
+
+    def test_script_aware(self):
+        assert estimate_tokens("你好世界你好世界") > estimate_tokens("hello world")
+        assert 20 <= estimate_tokens("a" * 100) <= 30
+
+    def test_output_depends_on_target_language(self):
+        ja = estimate_output_tokens(SRT, "en", "ja")
+        fr = estimate_output_tokens(SRT, "en", "fr")
+        assert ja > fr
+
+
+class TestAdaptiveChunkSizer:
+    """分块大小测试"""
+
+    def test_limits_follow_client_token_limits(self):
+        local = AdaptiveChunkSizer(max_input_tokens=4000, max_output_tokens=2048)
+        frontier = AdaptiveChunkSizer(max_input_tokens=200000, max_output_tokens=32000)
+
+        small = local.limits(SRT, "en", "zh-CN")
+        large = frontier.limits(SRT, "en", "zh-CN")
+
+        assert small.max_chars < DEFAULT_LIMITS.max_chars < large.max_chars
+        assert small.chunk_size < large.chunk_size
+        assert local.needs_chunking(SRT, "en", "zh-CN")
+        assert not frontier.needs_chunking(SRT, "en", "zh-CN")
+
+    def test_unknown_client_uses_fixed_chunks(self):
+        sizer = get_chunk_sizer(object())
+
+        assert not sizer.adaptive
+        assert sizer.limits(SRT, "en", "ja") == DEFAULT_LIMITS
+        assert sizer.needs_chunking(SRT, "en", "ja")
+        assert not sizer.needs_chunking(_srt(20), "en", "ja")
+
+    def test_shrinks_on_truncation_and_grows_after_fast_successes(self):
+        sizer = AdaptiveChunkSizer(max_input_tokens=8000, max_output_tokens=4096)
+        request = _srt(10)
+        before = sizer.limits(SRT, "en", "ja").max_chars
+
+        sizer.record(request, _srt(6), elapsed=5.0)
+        assert sizer.scale == INITIAL_SCALE * 0.5
+        assert sizer.limits(SRT, "en", "ja").max_chars < before
+
+        sizer.record(request, None, elapsed=5.0)
+        assert sizer.scale == INITIAL_SCALE * 0.5 * 0.75
+
+        for _ in range(30):
+            sizer.record(request, request, elapsed=1.0)
+        assert sizer.scale == MAX_SCALE
+
+        # 成功但较慢时不放大
+        sizer.scale = INITIAL_SCALE
+        for _ in range(5):
+            sizer.record(request, request, elapsed=120.0)
+        assert sizer.scale == INITIAL_SCALE
+
+
+class TestMultiTargetSizing:
+    """多目标语言的分块大小"""
+
+    def test_output_budget_scales_with_languages(self):
+        sizer = AdaptiveChunkSizer(max_input_tokens=32000, max_output_tokens=4096)
+        single = sizer.limits(SRT, "en", "fr")
+        multi = sizer.limits(SRT, "en", ["fr", "de", "es"])
+        assert multi.max_chars < single.max_chars
+
+        fixed = get_chunk_sizer(object())
+        assert fixed.limits(SRT, "en", ["fr", "de"]).max_chars == DEFAULT_LIMITS.max_chars // 2
+
+    def test_record_many_uses_worst_language(self):
+        sizer = AdaptiveChunkSizer(max_input_tokens=8000, max_output_tokens=4096)
+        request = _srt(10)
+
+        sizer.record_many(request, [request, _srt(4)], elapsed=5.0)
+        assert sizer.scale == INITIAL_SCALE * 0.5
+
+        # 所有语言都成功才算一次快速成功
+        for _ in range(3):
+            sizer.record_many(request, [request, request], elapsed=1.0)
+        assert sizer.scale > INITIAL_SCALE * 0.5
+
+
+def test_tracker_resumes_with_saved_chunk_size(tmp_path):
+    """恢复时沿用上次的分块大小，已完成的 chunk 索引不会错位"""
+    first = ChunkTracker("v1", "ja", tmp_path, chunk_size=40, max_chars=100000)
+    assert len(first.split_subtitle(SRT)) == 8
+
+    resumed = ChunkTracker("v1", "ja", tmp_path, chunk_size=200, max_chars=100000)
+    assert resumed.chunk_size == 40
+    assert len(resumed.split_subtitle(SRT)) == 8
+
+    fresh = ChunkTracker("v1", "fr", tmp_path, chunk_size=200, max_chars=100000)
+    assert len(fresh.split_subtitle(SRT)) == 2
@@ -0,0 +1,144 @@
+"""
+Tests for 紧凑检测结果（只保留与语言配置相关的字幕轨道）
+
+运行: python -m pytest tests/test_detection_compact.py -v
+"""
+
+import time
+
+from core.detector import (
+    SubtitleDetector,
+    compact_detection_result,
+    compact_tracks,
+    project_subtitle_info,
+)
+from core.downloader import SubtitleDownloader
+from core.language import LanguageConfig
+from core.models import DetectionResult, VideoInfo
+
+
+def _formats(lang):
+    return [
+        {"ext": ext, "url": f"https://example.com/{lang}.{ext}", "name": lang, "protocol": "https"}
+        for ext in ("json3", "srv1", "vtt", "ttml")
+    ]
+
+
+FULL_INFO = {
+    "subtitles": {"en": _formats("en"), "es": _formats("es")},
+    "automatic_captions": {
+        lang: _formats(lang) for lang in ("en", "zh-Hans", "ja", "sw", "tr", "uk")
+    },
+    "chapters": [],
+}
+
+
+def _video():
+    return VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title")
+
+
+class TestCompactTracks:
+    """格式精简测试"""
+
+    def test_keeps_first_preferred_format(self):
+        compact = compact_tracks({"en": _formats("en")})
+        assert compact == {"en": [{"ext": "json3", "url": "https://example.com/en.json3"}]}
+
+    def test_falls_back_to_first_entry(self):
+        compact = compact_tracks({"en": [{"ext": "ttml", "url": "u"}], "ja": []})
+        assert compact == {"en": [{"ext": "ttml", "url": "u"}]}
+
+
+class TestCompactDetectionResult:
+    """按语言配置精简检测结果测试"""
+
+    def test_detect_keeps_only_relevant_tracks(self):
+        video = _video()
+        video.prefetched_subtitle_info = project_subtitle_info(FULL_INFO)
+        config = LanguageConfig(subtitle_target_languages=["zh-CN"])
+
+        result = SubtitleDetector().detect(video, language_config=config)
+
+        assert result.compact
+        assert result.video_url == video.url
+        # 语言列表保持完整（代码已规范化）
+        assert result.auto_languages == ["en", "zh", "ja", "sw", "tr", "uk"]
+        # 轨道只保留相关语言（目标语言、源语言优先级列表）
+        assert set(result.subtitle_urls) == {"en", "es"}
+        assert set(result.auto_subtitle_urls) == {"en", "zh-Hans", "ja"}
+
+    def test_language_codes_are_interned(self):
+        results = []
+        for _ in range(2):
+            video = _video()
+            video.prefetched_subtitle_info = project_subtitle_info(
+                {k: dict(v) if isinstance(v, dict) else v for k, v in FULL_INFO.items()}
+            )
+            results.append(SubtitleDetector().detect(video))
+        assert results[0].auto_languages[3] is results[1].auto_languages[3]
+
+    def test_without_config_keeps_all_tracks(self):
+        video = _video()
+        video.prefetched_subtitle_info = project_subtitle_info(FULL_INFO)
+
+        result = SubtitleDetector().detect(video)
+
+        assert not result.compact
+        assert len(result.auto_subtitle_urls) == 6
+
+    def test_first_track_kept_as_fallback(self):
+        result = DetectionResult(
+            video_id="abc123",
+            has_subtitles=True,
+            manual_languages=[],
+            auto_languages=["sw", "tr"],
+            auto_subtitle_urls=compact_tracks({"sw": _formats("sw"), "tr": _formats("tr")}),
+        )
+        compact_detection_result(result, LanguageConfig(subtitle_target_languages=["ja"]))
+        assert set(result.auto_subtitle_urls) == {"sw"}
+
+
+class TestDownloaderRefetch:
+    """下载时按需重新获取完整轨道测试"""
+
+    def _compact_result(self):
+        video = _video()
+        video.prefetched_subtitle_info = project_subtitle_info(FULL_INFO)
+        config = LanguageConfig(subtitle_target_languages=["zh-CN"])
+        return SubtitleDetector().detect(video, language_config=config)
+
+    def test_find_url_without_refetch(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            SubtitleDetector, "_get_subtitle_info_ytdlp", lambda self, url: calls.append(url)
+        )
+        result = self._compact_result()
+
+        url, ext = SubtitleDownloader()._find_subtitle_url(result, "zh-CN")
+
+        assert (url, ext) == ("https://example.com/zh-Hans.json3", "json3")
+        assert calls == []
+
+    def test_refetch_restores_dropped_language(self, monkeypatch):
+        calls = []
+
+        def fake_info(self, url):
+            calls.append(url)
+            return {**project_subtitle_info(FULL_INFO), "fetched_at": time.time()}
+
+        monkeypatch.setattr(SubtitleDetector, "_get_subtitle_info_ytdlp", fake_info)
+        result = self._compact_result()
+        downloader = SubtitleDownloader()
+        assert downloader._find_subtitle_url(result, "uk") == (None, None)
+
+        assert downloader._refetch_full_tracks(result)
+
+        assert calls == ["https://youtu.be/abc123"]
+        assert not result.compact
+        assert downloader._find_subtitle_url(result, "uk")[0] == "https://example.com/uk.json3"
+
+    def test_refetch_failure(self, monkeypatch):
+        monkeypatch.setattr(SubtitleDetector, "_get_subtitle_info_ytdlp", lambda self, url: None)
+        result = self._compact_result()
+        assert not SubtitleDownloader()._refetch_full_tracks(result)
+        assert result.compact
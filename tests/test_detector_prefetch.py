@@ -0,0 +1,79 @@
+"""
+Tests for 获取视频信息与字幕检测合并（预取字幕信息）
+
+运行: python -m pytest tests/test_detector_prefetch.py -v
+"""
+
+import json
+import subprocess
+
+import pytest
+
+import core.detector as detector_module
+import core.fetcher as fetcher_module
+from core.detector import SubtitleDetector
+from core.fetcher import VideoFetcher
+
+
+INFO_DICT = {
+    "id": "abc123",
+    "webpage_url": "https://www.youtube.com/watch?v=abc123",
+    "title": "Title",
+    "channel_id": "UC1",
+    "channel": "Channel",
+    "subtitles": {"en": [{"ext": "vtt", "url": "https://example.com/en.vtt"}]},
+    "automatic_captions": {"ja": [{"ext": "vtt", "url": "https://example.com/ja.vtt"}]},
+    "chapters": [{"title": "Intro", "start_time": 0, "end_time": 10}],
+    "formats": [{"format_id": str(i)} for i in range(50)],
+}
+
+
+@pytest.fixture
+def ytdlp_calls(monkeypatch):
+    """替换 yt-dlp 调用并记录调用次数"""
+    calls = []
+
+    def fake_run_command(cmd, timeout=None, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(INFO_DICT), stderr="")
+
+    monkeypatch.setattr(VideoFetcher, "_check_yt_dlp", lambda self: None)
+    monkeypatch.setattr(fetcher_module, "run_ytdlp_command", fake_run_command)
+    monkeypatch.setattr(detector_module, "run_ytdlp_command", fake_run_command)
+    return calls
+
+
+def test_fetch_then_detect_uses_single_extraction(ytdlp_calls):
+    """测试获取视频信息后检测不再调用 yt-dlp"""
+    videos = VideoFetcher().fetch_single_video(INFO_DICT["webpage_url"])
+    assert len(ytdlp_calls) == 1
+    video = videos[0]
+    assert set(video.prefetched_subtitle_info) == {
+        "subtitles",
+        "automatic_captions",
+        "chapters",
+        "fetched_at",
+    }
+
+    result = SubtitleDetector().detect(video)
+
+    assert len(ytdlp_calls) == 1
+    assert result.manual_languages == ["en"]
+    assert result.auto_languages == ["ja"]
+    assert result.chapters == INFO_DICT["chapters"]
+    assert result.subtitle_urls == INFO_DICT["subtitles"]
+    # 使用后释放，不在 VideoInfo 上长期持有
+    assert video.prefetched_subtitle_info is None
+
+
+def test_expired_prefetch_is_redetected(ytdlp_calls):
+    """测试预取信息过期时重新调用 yt-dlp 检测"""
+    video = VideoFetcher().fetch_single_video(INFO_DICT["webpage_url"])[0]
+    video.prefetched_subtitle_info["fetched_at"] -= (
+        detector_module.PREFETCH_MAX_AGE_SECONDS + 1
+    )
+
+    result = SubtitleDetector().detect(video)
+
+    assert len(ytdlp_calls) == 2
+    assert result.has_subtitles
@@ -0,0 +1,90 @@
+"""
+Tests for core/http_client.py
+
+运行: python -m pytest tests/test_http_client.py -v
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from core.http_client import HttpClient  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = set()
+    status_codes = []
+
+    def do_GET(self):
+        type(self).connections.add(self.client_address)
+        status = type(self).status_codes.pop(0) if type(self).status_codes else 200
+        body = b"1\n00:00:01,000 --> 00:00:02,000\nHello\n"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = set()
+    _Handler.status_codes = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sequential_requests_reuse_connection(server):
+    """测试同一会话的连续请求复用 TCP 连接"""
+    client = HttpClient()
+    for i in range(20):
+        response = client.get(f"{server}/sub{i}.srt")
+        assert response.status_code == 200
+        assert "Hello" in response.text
+    assert len(_Handler.connections) == 1
+    client.close()
+
+
+def test_session_per_proxy_and_retry_profile():
+    client = HttpClient()
+    direct = client.session()
+    assert client.session(None) is direct
+    assert client.session("http://127.0.0.1:8080") is not direct
+    assert client.session("http://127.0.0.1:8080").proxies["https"] == "http://127.0.0.1:8080"
+    assert client.session(retries=0) is not direct
+
+    client.close_proxy("http://127.0.0.1:8080")
+    assert client.session("http://127.0.0.1:8080") is not None
+    client.close()
+
+
+def test_ensure_pool_size_only_grows():
+    client = HttpClient(pool_size=4)
+    session = client.session()
+    client.ensure_pool_size(2)
+    assert client.pool_size == 4
+    client.ensure_pool_size(16)
+    assert client.pool_size == 16
+    assert session.get_adapter("https://example.com")._pool_maxsize == 16
+    client.close()
+
+
+def test_5xx_retried_but_429_returned(server):
+    """测试 5xx 在传输层重试，429 直接返回给调用方处理"""
+    client = HttpClient(retries=2)
+    _Handler.status_codes = [503, 200]
+    assert client.get(f"{server}/a").status_code == 200
+
+    _Handler.status_codes = [429, 200]
+    assert client.get(f"{server}/b").status_code == 429
+    client.close()
@@ -0,0 +1,160 @@
+"""
+Tests for 流式 LLM 调用（增量校验、提前中止、取消）
+
+运行: python -m pytest tests/test_llm_streaming.py -v
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.ai_providers.streaming import open_stream
+from core.cancel_token import CancelToken
+from core.exceptions import TaskCancelledError
+from core.language import LanguageConfig
+from core.llm_client import LLMErrorType, LLMException, LLMStream, supports_streaming
+from core.translator import SubtitleTranslator
+from core.translator.stream_validator import SrtStreamValidator
+
+
+def _srt(count, start=1):
+    return "".join(
+        f"{i}\n00:00:{i % 60:02d},000 --> 00:00:{i % 60:02d},900\nLine {i}\n\n"
+        for i in range(start, start + count)
+    )
+
+
+class _StreamingLLM:
+    """按固定片段逐段输出的假流式 LLM"""
+
+    max_concurrency = 1
+    supports_streaming = True
+
+    def __init__(self, output, piece=20, delay=0.0):
+        self.output = output
+        self.piece = piece
+        self.delay = delay
+        self.streams = []
+        self.yielded = 0
+
+    def generate(self, prompt, **kwargs):
+        raise AssertionError("流式客户端不应调用 generate")
+
+    def generate_stream(self, prompt, **kwargs):
+        stream = LLMStream(provider="fake", model="fake")
+        self.streams.append(stream)
+
+        def deltas():
+            for i in range(0, len(self.output), self.piece):
+                if stream.closed:
+                    return
+                time.sleep(self.delay)
+                self.yielded += 1
+                yield self.output[i : i + self.piece]
+
+        return stream.attach(deltas())
+
+
+def _translator(llm):
+    return SubtitleTranslator(llm, LanguageConfig(subtitle_target_languages=["ja"]))
+
+
+class TestSrtStreamValidator:
+    """增量校验测试"""
+
+    def test_valid_output_split_anywhere(self):
+        text = "```srt\n" + _srt(10) + "```"
+        validator = SrtStreamValidator(expected_cues=10)
+        for i in range(0, len(text), 7):
+            assert validator.feed(text[i : i + 7]) is None
+        assert validator.cue_count == 10
+
+    def test_malformed_timecode(self):
+        validator = SrtStreamValidator()
+        assert validator.feed("1\n00:00:01 --> 00:00:02\n")
+
+    def test_index_out_of_order(self):
+        validator = SrtStreamValidator()
+        assert validator.feed(_srt(3)) is None
+        assert validator.feed(_srt(1, start=2)) is not None
+
+    def test_too_many_cues(self):
+        validator = SrtStreamValidator(expected_cues=10)
+        assert validator.feed(_srt(12)) is None
+        assert validator.feed(_srt(1, start=13)) is not None
+
+    def test_long_preamble(self):
+        validator = SrtStreamValidator()
+        assert validator.feed("Sure! " * 400) is not None
+
+
+class TestStreamingTranslation:
+    """翻译器流式调用测试"""
+
+    def test_supports_streaming(self):
+        assert supports_streaming(_StreamingLLM(""))
+        assert not supports_streaming(object())
+
+    def test_returns_full_text(self):
+        llm = _StreamingLLM(_srt(5))
+        assert _translator(llm)._call_ai_api("prompt", expected_cues=5) == _srt(5)
+        assert llm.streams[0].closed
+
+    def test_aborts_early_on_bad_output(self):
+        # 第 3 条开始序号乱序，后面还有大量输出
+        bad = _srt(2) + _srt(200, start=1)
+        llm = _StreamingLLM(bad)
+        assert _translator(llm)._call_ai_api("prompt", expected_cues=200) is None
+        assert llm.streams[0].closed
+        assert llm.yielded * llm.piece < len(bad) // 10
+
+    def test_cancel_closes_stream(self):
+        llm = _StreamingLLM(_srt(100), delay=0.01)
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel, args=("stop",)).start()
+
+        started = time.perf_counter()
+        with pytest.raises(TaskCancelledError):
+            _translator(llm)._call_ai_api("prompt", cancel_token=token)
+        assert time.perf_counter() - started < 1.0
+        assert llm.streams[0].closed
+
+
+class TestOpenStream:
+    """建立流式连接的重试与并发名额测试"""
+
+    def test_retry_then_release_once(self, monkeypatch):
+        monkeypatch.setattr("core.ai_providers.streaming.time.sleep", lambda s: None)
+        semaphore = threading.Semaphore(1)
+        attempts = []
+
+        def open_fn():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("boom")
+            return "response"
+
+        def map_error(e):
+            return LLMException(str(e), LLMErrorType.NETWORK)
+
+        response, release = open_stream(open_fn, map_error, semaphore, max_retries=2)
+        assert response == "response" and len(attempts) == 2
+        assert not semaphore.acquire(blocking=False)
+        release()
+        release()
+        assert semaphore.acquire(blocking=False)
+        assert not semaphore.acquire(blocking=False)
+
+    def test_non_retryable_error(self):
+        semaphore = threading.Semaphore(1)
+
+        def open_fn():
+            raise ValueError("bad key")
+
+        def map_error(e):
+            return LLMException(str(e), LLMErrorType.AUTH)
+
+        with pytest.raises(LLMException):
+            open_stream(open_fn, map_error, semaphore, max_retries=3)
+        assert semaphore.acquire(blocking=False)
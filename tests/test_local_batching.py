@@ -0,0 +1,174 @@
+"""
+Tests for core/ai_providers/batching.py 及本地模型的槽位探测
+
+运行: python -m pytest tests/test_local_batching.py -v
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config.manager import AIConfig
+from core.ai_providers.batching import PromptBatcher, _share_usage, parse_batched_response
+from core.ai_providers.local_model import LocalModelClient
+from core.llm_client import LLMResult, LLMUsage
+
+_REQUEST = re.compile(r'<request id="(\d+)">\n(.*?)\n</request>', re.DOTALL)
+
+
+class _FakeServer:
+    """单槽位的慢速服务：合并请求按 <response> 标签逐个回答，可以漏掉指定内容"""
+
+    def __init__(self, delay=0.1, skip=None):
+        self.delay = delay
+        self.skip = skip
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def send(self, prompt, system=None, **kwargs):
+        with self._lock:
+            self.calls.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+        parts = _REQUEST.findall(prompt)
+        if not parts:
+            return LLMResult(text=f"R:{prompt}")
+        text = "\n".join(
+            f'<response id="{number}">\nR:{body}\n</response>'
+            for number, body in parts
+            if body != self.skip
+        )
+        return LLMResult(text=text, usage=LLMUsage(prompt_tokens=100, completion_tokens=40, total_tokens=140))
+
+
+def test_parse_batched_response():
+    text = '<response id="2">b</response>\n<response id=1>\na\n</response><response id="3"> </response>'
+    assert parse_batched_response(text, 3) == {1: "a", 2: "b"}
+    assert parse_batched_response("no tags", 2) == {}
+
+
+def test_share_usage_keeps_cache_fields():
+    usage = LLMUsage(
+        prompt_tokens=400, completion_tokens=100, total_tokens=500, cached_tokens=200, cache_write_tokens=40
+    )
+    shared = _share_usage(usage, 0.25)
+    assert (shared.prompt_tokens, shared.cached_tokens, shared.cache_write_tokens) == (100, 50, 10)
+    assert _share_usage(None, 0.5) is None
+
+
+class TestPromptBatcher:
+    """批处理器测试"""
+
+    def test_saturated_requests_are_batched_and_demultiplexed(self):
+        server = _FakeServer(delay=0.2, skip="p3")
+        batcher = PromptBatcher(server.send, slots=1, max_parts=4)
+        prompts = [f"p{i}" for i in range(6)]
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda p: batcher.generate(p, system="rules"), prompts))
+
+        assert [r.text for r in results] == [f"R:{p}" for p in prompts]
+        assert server.peak == 1
+        assert batcher.batches >= 1
+        # 漏掉的 p3 单独重发；其余请求合并后总请求数明显少于 6
+        assert server.calls.count("p3") == 1
+        assert len(server.calls) < len(prompts)
+
+    def test_idle_slot_sends_immediately(self):
+        server = _FakeServer(delay=0)
+        batcher = PromptBatcher(server.send, slots=2, max_parts=4)
+
+        assert batcher.generate("hello").text == "R:hello"
+        assert server.calls == ["hello"] and batcher.batches == 0
+
+    def test_long_prompts_and_different_system_not_merged(self):
+        server = _FakeServer(delay=0.1)
+        batcher = PromptBatcher(server.send, slots=1, max_parts=4, max_part_chars=10)
+        jobs = [("x" * 20, "a"), ("y" * 20, "a"), ("s1", "a"), ("s2", "b")]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda job: batcher.generate(job[0], system=job[1]), jobs))
+
+        assert [r.text for r in results] == [f"R:{p}" for p, _ in jobs]
+        assert len(server.calls) == 4 and batcher.batches == 0
+
+    def test_error_reaches_every_caller(self):
+        def failing(prompt, system=None, **kwargs):
+            time.sleep(0.1)
+            raise RuntimeError("server down")
+
+        batcher = PromptBatcher(failing, slots=1, max_parts=4)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(batcher.generate, f"p{i}") for i in range(3)]
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result(timeout=5)
+
+
+def _local_client(provider, **config):
+    """不连接服务、不检查依赖地构造客户端"""
+    client = LocalModelClient.__new__(LocalModelClient)
+    client.ai_config = AIConfig(provider=provider, model="m", base_url="http://localhost:11434", **config)
+    client.provider_name = provider
+    client._max_concurrency = client.ai_config.max_concurrency
+    client._batcher = None
+    client._slots_lock = threading.Lock()
+    return client
+
+
+def test_ollama_slots_and_keep_alive(monkeypatch):
+    monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "2")
+    client = _local_client("ollama", local_batch_size=3)
+    client._get_batcher()
+
+    assert client.parallel_slots == 2
+    assert client.max_concurrency == 6
+    assert not client.supports_streaming
+    assert client._extra_body() == {"keep_alive": 1800}
+
+    unbatched = _local_client("lm_studio", local_batch_size=1, keep_alive_seconds=60)
+    monkeypatch.setattr(unbatched, "_discover_parallel_slots", lambda: None)
+    unbatched._get_batcher()
+    assert unbatched.parallel_slots == unbatched.ai_config.max_concurrency
+    assert unbatched._extra_body() == {"ttl": 60}
+
+
+def test_slot_discovery_happens_once_in_setup(monkeypatch):
+    """读取 max_concurrency 不访问服务端；槽位数在首次请求前的准备阶段探测一次"""
+    client = _local_client("llama_cpp")
+    client._warmed_up = True
+    client._service_checked = False
+    client._ready_lock = threading.Lock()
+    calls = []
+    monkeypatch.setattr(client, "_check_service_available", lambda: True)
+    monkeypatch.setattr(client, "_discover_parallel_slots", lambda: calls.append(1) or 2)
+
+    assert client.max_concurrency == client.ai_config.max_concurrency
+    assert calls == []
+
+    client._ensure_ready()
+    client._ensure_ready()
+    assert calls == [1]
+    assert client.max_concurrency == 2
+
+
+def test_batching_is_opt_in(monkeypatch):
+    """默认不合并请求，开启流式输出时本地模型保留流式输出"""
+    monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "2")
+    client = _local_client("ollama", stream=True)
+    client._get_batcher()
+
+    assert AIConfig().local_batch_size == 1
+    assert client.batch_size == 1
+    assert client.max_concurrency == 2
+    assert client.supports_streaming
+    assert not _local_client("ollama").supports_streaming
@@ -0,0 +1,202 @@
+"""
+Tests for 多目标语言合并翻译（一次请求翻译所有目标语言）
+
+运行: python -m pytest tests/test_multi_target_translation.py -v
+"""
+
+import re
+import threading
+
+from core.language import LanguageConfig
+from core.llm_client import LLMResult, LLMStream
+from core.models import DetectionResult, VideoInfo
+from core.translator import SubtitleTranslator
+from core.translator.chunk_sizing import INITIAL_SCALE, get_chunk_sizer
+from core.translator.multi_target import (
+    is_complete_translation,
+    parse_multi_target_response,
+    unfinished_block,
+)
+
+SOURCE_SRT = "".join(
+    f"{i}\n00:00:{i:02d},000 --> 00:00:{i:02d},900\nLine {i}\n\n" for i in range(1, 6)
+)
+
+TARGETS = ["zh-CN", "ja", "fr"]
+
+
+def _cues(srt, lang):
+    """把 SRT 的文本行替换为 [lang] 前缀，模拟译文"""
+    return re.sub(r"^(Line \d+)$", rf"[{lang}] \1", srt.strip(), flags=re.M)
+
+
+def _source_block(prompt):
+    return prompt.split("字幕内容：\n", 1)[1].rsplit("\n\n请", 1)[0]
+
+
+class _FakeLLM:
+    """根据 Prompt 类型返回译文并记录输入长度的假 LLM"""
+
+    max_concurrency = 1
+
+    def __init__(self, broken_languages=()):
+        self.broken_languages = set(broken_languages)
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, system=None, **kwargs):
+        # 静态指令（语言列表）通过 system 传入
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        with self._lock:
+            self.prompts.append(prompt)
+        source = _source_block(prompt)
+        if "<translation" in prompt:
+            langs = re.findall(r"^- (\S+)：", prompt, flags=re.M)
+            parts = []
+            for lang in langs:
+                body = _cues(source, lang)
+                if lang in self.broken_languages:
+                    body = body.split("\n\n")[0]
+                parts.append(f'<translation lang="{lang}">\n{body}\n</translation>')
+            return LLMResult(text="\n".join(parts))
+        lang = "single"
+        return LLMResult(text=_cues(source, lang))
+
+
+class _StreamingFakeLLM(_FakeLLM):
+    """同样的响应按小片段流式输出（ai.stream 开启时的默认路径）"""
+
+    supports_streaming = True
+
+    def generate_stream(self, prompt, system=None, **kwargs):
+        text = self.generate(prompt, system=system).text
+        stream = LLMStream(provider="fake", model="fake")
+        return stream.attach(text[i : i + 7] for i in range(0, len(text), 7))
+
+
+def _run(tmp_path, llm, multi_target=True, source_srt=SOURCE_SRT):
+    source = tmp_path / "original.en.srt"
+    source.write_text(source_srt, encoding="utf-8")
+    config = LanguageConfig(
+        subtitle_target_languages=list(TARGETS),
+        translation_strategy="AI_ONLY",
+        multi_target_translation=multi_target,
+    )
+    detection = DetectionResult(
+        video_id="abc123",
+        has_subtitles=True,
+        manual_languages=["en"],
+        auto_languages=[],
+    )
+    video = VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title")
+    translator = SubtitleTranslator(llm, config)
+    return translator.translate(
+        video,
+        detection,
+        config,
+        {"original": source, "official_translations": {}},
+        tmp_path,
+    )
+
+
+class TestParseMultiTargetResponse:
+    """响应解析测试"""
+
+    def test_splits_by_language(self):
+        text = (
+            'Sure!\n<translation lang="zh-CN">\n```srt\n1\nA\n```\n</translation>\n'
+            "<translation lang='ja-JP'>\n1\nB\n</translation>\n"
+            '<translation lang="de"></translation>'
+        )
+        parsed = parse_multi_target_response(text, ["zh-CN", "ja", "de"])
+        assert parsed == {"zh-CN": "1\nA", "ja": "1\nB"}
+
+    def test_unknown_language_ignored(self):
+        assert parse_multi_target_response('<translation lang="ko">x</translation>', ["ja"]) == {}
+
+    def test_unfinished_block(self):
+        assert unfinished_block('<translation lang="ja">\n1\nA\n</translation>') is None
+        assert unfinished_block('<translation lang="ja">x</translation><translation lang="fr">\n1\nB') == "1\nB"
+        assert unfinished_block("no tags") is None
+
+    def test_is_complete_translation(self):
+        assert is_complete_translation(SOURCE_SRT, _cues(SOURCE_SRT, "ja"))
+        assert not is_complete_translation(SOURCE_SRT, _cues(SOURCE_SRT, "ja").split("\n\n")[0])
+
+
+class TestMultiTargetTranslate:
+    """合并翻译流程测试"""
+
+    def test_single_request_for_all_targets(self, tmp_path):
+        llm = _FakeLLM()
+        result = _run(tmp_path, llm)
+
+        assert len(llm.prompts) == 1
+        assert set(result) == set(TARGETS)
+        for lang in TARGETS:
+            text = result[lang].read_text(encoding="utf-8")
+            assert f"[{lang}] Line 5" in text
+            assert text.count("-->") == 5
+
+    def test_streaming_response_validated_per_language(self, tmp_path):
+        """每个语言块的序号从 1 重新开始，流式校验不能因此中止"""
+        llm = _StreamingFakeLLM()
+        result = _run(tmp_path, llm)
+
+        assert len(llm.prompts) == 1
+        assert set(result) == set(TARGETS)
+        assert "[ja] Line 5" in result["ja"].read_text(encoding="utf-8")
+
+    def test_input_cost_reduced(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        per_language = _FakeLLM()
+        _run(tmp_path / "a", per_language, multi_target=False)
+        multi = _FakeLLM()
+        _run(tmp_path / "b", multi)
+
+        assert len(per_language.prompts) == 3
+        # 源字幕只发送一次：输入的字幕内容为逐语言翻译的 1/3
+        sent_per_language = sum(len(_source_block(p)) for p in per_language.prompts)
+        sent_multi = sum(len(_source_block(p)) for p in multi.prompts)
+        assert sent_multi * 3 == sent_per_language
+
+    def test_failed_language_falls_back(self, tmp_path):
+        llm = _FakeLLM(broken_languages={"ja"})
+        result = _run(tmp_path, llm)
+
+        # 1 次合并请求 + ja 的逐语言回退请求
+        assert len(llm.prompts) == 2
+        assert "<translation" not in llm.prompts[1]
+        assert "[single] Line 5" in result["ja"].read_text(encoding="utf-8")
+        assert "[fr] Line 5" in result["fr"].read_text(encoding="utf-8")
+
+    def test_chunks_sized_from_client_limits(self, tmp_path):
+        """分块按客户端 token 限制和目标语言数计算，每次请求的结果用于在线调整"""
+        srt = "".join(
+            f"{i}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\nLine {i}\n\n"
+            for i in range(1, 81)
+        )
+        llm = _FakeLLM()
+        llm.max_input_tokens = 8000
+        llm.max_output_tokens = 1024
+        result = _run(tmp_path, llm, source_srt=srt)
+
+        # 80 条不超过旧的固定阈值，但 3 种语言的输出超过 1024 token 的预算
+        assert len(llm.prompts) > 1
+        assert result["ja"].read_text(encoding="utf-8").count("-->") == 80
+        assert get_chunk_sizer(llm).scale > INITIAL_SCALE
+
+    def test_long_subtitle_chunked_and_renumbered(self, tmp_path):
+        long_srt = "".join(
+            f"{i}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\nLine {i}\n\n"
+            for i in range(1, 151)
+        )
+        llm = _FakeLLM()
+        result = _run(tmp_path, llm, source_srt=long_srt)
+
+        assert len(llm.prompts) > 1
+        text = result["fr"].read_text(encoding="utf-8")
+        assert text.count("-->") == 150
+        assert text.startswith("1\n") and "\n150\n" in text
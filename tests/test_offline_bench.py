@@ -0,0 +1,162 @@
+"""
+Tests for scripts/offline_bench（离线基准的假 yt-dlp 和 LLM 桩服务）
+
+运行: python -m pytest tests/test_offline_bench.py -v
+"""
+
+import json
+import os
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from core.detector import project_subtitle_info
+from core.prompts import build_translation_prompt, get_translation_prompt
+from core.state.chunk_tracker import validate_timeline
+from scripts.offline_bench import StubConfig, StubLLMServer
+from scripts.offline_bench.fake_ytdlp import make_srt
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FAKE_YTDLP = PROJECT_ROOT / "scripts" / "offline_bench" / "fake_ytdlp.py"
+URL = "https://www.youtube.com/watch?v=b0000000001"
+
+
+def _fake_ytdlp(args, **env):
+    return subprocess.run(
+        [sys.executable, str(FAKE_YTDLP), *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **env},
+    )
+
+
+def _chat(base_url, body):
+    request = urllib.request.Request(
+        f"{base_url}/v1/chat/completions",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.read().decode("utf-8")
+
+
+class TestFakeYtdlp:
+    """假 yt-dlp 测试"""
+
+    def test_dump_json_has_manual_english_track(self):
+        result = _fake_ytdlp(["--dump-json", "--no-warnings", "--skip-download", URL])
+        info = project_subtitle_info(json.loads(result.stdout))
+
+        assert result.returncode == 0
+        assert list(info["subtitles"]) == ["en"]
+        assert len(info["chapters"]) == 2
+
+    def test_write_subs(self, tmp_path):
+        template = tmp_path / "temp_original.en"
+        result = _fake_ytdlp(
+            ["--skip-download", "--output", str(template), URL, "--write-subs", "--sub-langs", "en"],
+            FAKE_YTDLP_CUES="5",
+        )
+
+        assert result.returncode == 0
+        content = (tmp_path / "temp_original.en.en.srt").read_text(encoding="utf-8")
+        assert content.count("-->") == 5
+
+    def test_error_injection(self):
+        result = _fake_ytdlp(["--dump-json", URL], FAKE_YTDLP_ERROR_RATE="1")
+
+        assert result.returncode == 1
+        assert "HTTP Error 503" in result.stderr
+
+
+class TestLLMStub:
+    """OpenAI 兼容桩服务测试"""
+
+    def test_translation_keeps_cues(self):
+        prompt = get_translation_prompt("en", "zh-CN", make_srt("abc", 4))
+        with StubLLMServer(StubConfig(latency_ms=0, tokens_per_second=0)) as server:
+            body = json.loads(
+                _chat(server.base_url, {"model": "m", "messages": [{"role": "user", "content": prompt}]})
+            )
+            stats = server.stats()
+
+        text = body["choices"][0]["message"]["content"]
+        assert text.count("-->") == 4 and "[简体中文]" in text
+        assert validate_timeline(text) == []
+        assert body["usage"]["completion_tokens"] > 0
+        assert stats["requests"] == 1
+
+    def test_stream_sse(self):
+        prompt = get_translation_prompt("en", "ja", make_srt("abc", 3))
+        with StubLLMServer(StubConfig(latency_ms=0, tokens_per_second=0)) as server:
+            raw = _chat(
+                server.base_url,
+                {
+                    "model": "m",
+                    "stream": True,
+                    "stream_options": {"include_usage": True},
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            )
+
+        events = [line[6:] for line in raw.splitlines() if line.startswith("data: ")]
+        assert events[-1] == "[DONE]"
+        chunks = [json.loads(e) for e in events[:-1]]
+        text = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"])
+        assert text.count("-->") == 3
+        assert "usage" in chunks[-1]
+
+    def test_repeated_system_prefix_reported_as_cached(self):
+        parts = build_translation_prompt("en", "ja", make_srt("abc", 2))
+        messages = [
+            {"role": "system", "content": parts.system},
+            {"role": "user", "content": parts.user},
+        ]
+        with StubLLMServer(StubConfig(latency_ms=0, tokens_per_second=0)) as server:
+            first, second = (
+                json.loads(_chat(server.base_url, {"model": "m", "messages": messages}))
+                for _ in range(2)
+            )
+
+        assert first["usage"]["prompt_tokens_details"]["cached_tokens"] == 0
+        assert second["usage"]["prompt_tokens_details"]["cached_tokens"] > 0
+        assert second["choices"][0]["message"]["content"].count("-->") == 2
+
+    def test_rate_limit_injection(self):
+        with StubLLMServer(StubConfig(latency_ms=0, rate_limit_ratio=1.0)) as server:
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                _chat(server.base_url, {"model": "m", "messages": [{"role": "user", "content": "hi"}]})
+            assert server.stats()["rate_limited"] == 1
+        assert excinfo.value.code == 429
+
+
+@pytest.mark.skipif(os.name == "nt", reason="假 yt-dlp 仅支持 POSIX")
+def test_benchmark_without_ai(tmp_path):
+    """两种 Pipeline 的离线端到端基准可运行并输出机器可读结果"""
+    output = tmp_path / "result.json"
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(PROJECT_ROOT / "scripts" / "benchmark_pipeline.py"),
+            "--no-ai",
+            "--sizes", "3",
+            "--ytdlp-latency-ms", "0",
+            "--output", str(output),
+            "--dir", str(tmp_path),
+        ],
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert [r["pipeline"] for r in report["results"]] == ["thread", "staged"]
+    for row in report["results"]:
+        assert row["success"] == 3
+        assert set(row["stage_p95_ms"]) == {"detect", "download", "translate", "summarize", "output"}
+        assert row["peak_rss_mb"] > 0 and row["peak_threads"] > 0
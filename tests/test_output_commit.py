@@ -0,0 +1,119 @@
+"""
+Tests for core/output/commit.py（零拷贝输出提交）
+
+运行: python -m pytest tests/test_output_commit.py -v
+"""
+
+import errno
+import os
+
+import pytest
+
+from core.language import LanguageConfig
+from core.models import DetectionResult, VideoInfo
+from core.output import OutputWriter
+from core.output import commit as commit_module
+from core.output.commit import OutputCommit
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n"
+
+
+@pytest.fixture
+def fsync_calls(monkeypatch):
+    calls = []
+    original = commit_module._fsync_path
+
+    def record(path):
+        calls.append(path)
+        original(path)
+
+    monkeypatch.setattr(commit_module, "_fsync_path", record)
+    return calls
+
+
+def _temp_file(tmp_path, name, content=SRT):
+    path = tmp_path / "temp" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestOutputCommit:
+    """OutputCommit 测试"""
+
+    def test_hardlink_keeps_source(self, tmp_path):
+        source = _temp_file(tmp_path, "original.en.srt")
+        target = tmp_path / "out" / "original.en.srt"
+        target.parent.mkdir()
+        commit = OutputCommit(target.parent)
+        commit.place(source, target)
+        commit.commit()
+
+        assert source.exists()
+        assert os.path.samefile(source, target)
+        assert not target.with_suffix(".srt.tmp").exists()
+
+    def test_replaces_existing_output(self, tmp_path):
+        source = _temp_file(tmp_path, "original.en.srt", "new")
+        target = tmp_path / "out" / "original.en.srt"
+        target.parent.mkdir()
+        target.write_text("old", encoding="utf-8")
+
+        OutputCommit(target.parent).place(source, target)
+        assert target.read_text(encoding="utf-8") == "new"
+
+    def test_copy_when_cross_device(self, tmp_path, monkeypatch):
+        def cross_device(src, dst):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(commit_module.os, "link", cross_device)
+        source = _temp_file(tmp_path, "original.en.srt")
+        target = tmp_path / "out" / "original.en.srt"
+        target.parent.mkdir()
+        commit = OutputCommit(target.parent)
+        commit.place(source, target)
+
+        assert commit.copied == 1
+        assert target.read_text(encoding="utf-8") == SRT
+        assert not os.path.samefile(source, target)
+
+
+def _write_all(tmp_path, commit_mode):
+    original = _temp_file(tmp_path, "original.en.srt")
+    translated = {
+        lang: _temp_file(tmp_path, f"translated.{lang}.srt") for lang in ("zh-CN", "ja")
+    }
+    summary = _temp_file(tmp_path, "summary.md", "# Summary\n")
+    writer = OutputWriter(tmp_path / "out", commit_mode=commit_mode)
+    video_dir = writer.write_all(
+        VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title"),
+        DetectionResult(
+            video_id="abc123", has_subtitles=True, manual_languages=["en"], auto_languages=[]
+        ),
+        LanguageConfig(subtitle_target_languages=["zh-CN", "ja"], summary_language="zh-CN"),
+        {"original": original, "official_translations": {}},
+        translated,
+        summary,
+    )
+    return video_dir, original
+
+
+class TestWriteAllCommit:
+    """write_all 组提交测试"""
+
+    def test_link_mode_group_commit(self, tmp_path, fsync_calls):
+        video_dir, original = _write_all(tmp_path, "link")
+
+        assert os.path.samefile(original, video_dir / "original.en.srt")
+        assert (video_dir / "translated.ja.srt").read_text(encoding="utf-8") == SRT
+        assert (video_dir / "summary.zh-CN.md").exists()
+        assert (video_dir / "metadata.json").exists()
+        # 整个视频只 fsync 一次目录
+        assert fsync_calls.count(video_dir) == 1
+
+    def test_copy_mode_keeps_legacy_behavior(self, tmp_path, fsync_calls):
+        video_dir, original = _write_all(tmp_path, "copy")
+
+        assert not os.path.samefile(original, video_dir / "original.en.srt")
+        assert (video_dir / "original.en.srt").read_text(encoding="utf-8") == SRT
+        assert fsync_calls == []
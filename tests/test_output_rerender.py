@@ -0,0 +1,116 @@
+"""
+Tests for core/output/rerender.py
+
+运行: python -m pytest tests/test_output_rerender.py -v
+"""
+
+import json
+import os
+
+from core.output.rerender import OutputRerenderer, RERENDER_STATE_FILE
+
+
+SOURCE_SRT = """1
+00:00:01,000 --> 00:00:02,000
+Hello
+
+2
+00:00:03,000 --> 00:00:04,000
+World
+"""
+
+TARGET_SRT = """1
+00:00:01,000 --> 00:00:02,000
+你好
+
+2
+00:00:03,000 --> 00:00:04,000
+世界
+"""
+
+
+def _make_video(base, video_id="abc123", chapters=None):
+    video_dir = base / f"{video_id}  Title"
+    video_dir.mkdir(parents=True)
+    (video_dir / "original.en.srt").write_text(SOURCE_SRT, encoding="utf-8")
+    (video_dir / "translated.zh-CN.srt").write_text(TARGET_SRT, encoding="utf-8")
+    metadata = {
+        "video_id": video_id,
+        "title": "Title",
+        "language_config": {"source_language": None},
+        "chapters": chapters or [],
+    }
+    (video_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+    return video_dir
+
+
+def _rerender(base, **kwargs):
+    kwargs.setdefault("max_workers", 1)
+    return OutputRerenderer(base, **kwargs).run()
+
+
+class TestOutputRerenderer:
+    """离线重新渲染测试"""
+
+    def test_renders_txt_bilingual_and_chapters(self, tmp_path):
+        """测试生成 TXT、双语和章节文件"""
+        chapters = [{"title": "Intro", "start_time": 0, "end_time": 60}]
+        video_dir = _make_video(tmp_path, chapters=chapters)
+
+        stats = _rerender(tmp_path, subtitle_format="both", bilingual_mode="source+target")
+
+        assert stats.rendered == 1 and stats.failed == 0
+        assert (video_dir / "original.en.txt").exists()
+        assert (video_dir / "translated.zh-CN.txt").exists()
+        bilingual = (video_dir / "bilingual.en-zh-CN.srt").read_text(encoding="utf-8")
+        assert "Hello" in bilingual and "你好" in bilingual
+        assert (video_dir / "bilingual.en-zh-CN.txt").exists()
+        assert "Intro" in (video_dir / "abc123_chapters.md").read_text(encoding="utf-8")
+        assert (tmp_path / RERENDER_STATE_FILE).exists()
+
+    def test_skips_unchanged_and_detects_content_change(self, tmp_path):
+        """测试未变化的视频被跳过，仅 mtime 变化不触发渲染，内容变化触发渲染"""
+        video_dir = _make_video(tmp_path)
+        _make_video(tmp_path, video_id="def456")
+        assert _rerender(tmp_path, subtitle_format="txt").rendered == 2
+
+        stats = _rerender(tmp_path, subtitle_format="txt")
+        assert stats.rendered == 0 and stats.skipped == 2
+
+        # 仅修改 mtime：内容哈希相同，仍然跳过
+        source = video_dir / "original.en.srt"
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        assert _rerender(tmp_path, subtitle_format="txt").skipped == 2
+
+        # 修改内容：重新渲染该视频
+        source.write_text(SOURCE_SRT.replace("Hello", "Hi"), encoding="utf-8")
+        stats = _rerender(tmp_path, subtitle_format="txt")
+        assert stats.rendered == 1 and stats.skipped == 1
+        assert "Hi" in (video_dir / "original.en.txt").read_text(encoding="utf-8")
+
+    def test_settings_change_rerenders_and_cleans_stale_outputs(self, tmp_path):
+        """测试渲染设置变化时重新渲染，并清理不再需要的派生文件（保留 SRT 输入）"""
+        video_dir = _make_video(tmp_path)
+        _rerender(tmp_path, subtitle_format="both", bilingual_mode="source+target")
+        assert (video_dir / "bilingual.en-zh-CN.srt").exists()
+
+        stats = _rerender(tmp_path, subtitle_format="srt", bilingual_mode="none")
+
+        assert stats.rendered == 1
+        assert not list(video_dir.glob("*.txt"))
+        assert not list(video_dir.glob("bilingual.*"))
+        assert (video_dir / "original.en.srt").exists()
+        assert (video_dir / "translated.zh-CN.srt").exists()
+
+    def test_video_without_srt_is_reported(self, tmp_path):
+        """测试没有 SRT 输入（如以 txt 格式输出）的视频不被渲染"""
+        video_dir = tmp_path / "xyz  Title"
+        video_dir.mkdir()
+        (video_dir / "original.en.txt").write_text("Hello", encoding="utf-8")
+        (video_dir / "metadata.json").write_text("{}", encoding="utf-8")
+
+        stats = _rerender(tmp_path, subtitle_format="srt")
+
+        assert stats.no_source == 1 and stats.rendered == 0
+        assert (video_dir / "original.en.txt").exists()
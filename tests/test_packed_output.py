@@ -0,0 +1,83 @@
+"""
+Tests for core/output/packed.py（打包输出存储）
+
+运行: python -m pytest tests/test_packed_output.py -v
+"""
+
+from core.language import LanguageConfig
+from core.models import DetectionResult, VideoInfo
+from core.output import OutputWriter, PackedOutputWriter, create_output_writer
+from core.output.packed import PACKED_DB_NAME, STAGING_DIR_NAME, PackedOutputStore
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n"
+
+
+def _temp_file(tmp_path, name, content=SRT):
+    path = tmp_path / "temp" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _write_video(writer, tmp_path, video_id="abc123", content=SRT):
+    video = VideoInfo(video_id=video_id, url=f"https://youtu.be/{video_id}", title="Title")
+    video_dir = writer.write_all(
+        video,
+        DetectionResult(
+            video_id=video_id, has_subtitles=True, manual_languages=["en"], auto_languages=[]
+        ),
+        LanguageConfig(subtitle_target_languages=["ja"], bilingual_mode="source+target"),
+        {"original": _temp_file(tmp_path, "original.en.srt", content), "official_translations": {}},
+        {"ja": _temp_file(tmp_path, "translated.ja.srt", content)},
+        _temp_file(tmp_path, "summary.md", "# Summary\n"),
+        channel_name="Channel",
+        channel_id="UC123",
+    )
+    writer.finalize_video(video, video_dir)
+    return video_dir
+
+
+def test_packed_writer_stores_one_row_set_per_video(tmp_path):
+    writer = PackedOutputWriter(tmp_path / "out")
+    _write_video(writer, tmp_path)
+
+    # 只剩数据库，视频暂存目录入库后已删除
+    assert not list((tmp_path / "out" / STAGING_DIR_NAME).rglob("*.srt"))
+    assert not (tmp_path / "out" / "Channel [UC123]").exists()
+    assert writer.store.get_dir("abc123") == "Channel [UC123]/abc123  Title"
+    assert "translated.ja.srt" in writer.store.list_files("abc123")
+    assert "metadata.json" in writer.store.list_files("abc123")
+    assert writer.store.read_file("abc123", "original.en.srt").decode("utf-8") == SRT
+
+
+def test_reprocess_replaces_video(tmp_path):
+    writer = PackedOutputWriter(tmp_path / "out")
+    _write_video(writer, tmp_path)
+    _write_video(writer, tmp_path, content=SRT.replace("Hello", "Again"))
+
+    assert writer.store.video_ids() == ["abc123"]
+    assert b"Again" in writer.store.read_file("abc123", "translated.ja.srt")
+
+
+def test_export_matches_directory_layout(tmp_path):
+    dir_writer = OutputWriter(tmp_path / "dir_out")
+    expected_dir = _write_video(dir_writer, tmp_path)
+    packed_writer = create_output_writer(tmp_path / "packed_out", backend="packed")
+    _write_video(packed_writer, tmp_path)
+    packed_writer.store.close()
+
+    store = PackedOutputStore(tmp_path / "packed_out" / PACKED_DB_NAME)
+    videos, files = store.export(tmp_path / "exported")
+    exported_dir = tmp_path / "exported" / expected_dir.relative_to(tmp_path / "dir_out")
+
+    assert videos == 1
+    assert sorted(p.name for p in exported_dir.iterdir()) == sorted(
+        p.name for p in expected_dir.iterdir()
+    )
+    assert files == len(list(expected_dir.iterdir()))
+    assert (exported_dir / "bilingual.en-ja.srt").read_bytes() == (
+        expected_dir / "bilingual.en-ja.srt"
+    ).read_bytes()
+    # 已存在的文件默认不覆盖
+    assert store.export(tmp_path / "exported") == (1, 0)
+    assert store.export(tmp_path / "exported", video_ids=["missing"]) == (0, 0)
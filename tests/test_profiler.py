@@ -0,0 +1,78 @@
+"""
+Tests for core/profiler.py（采样分析器和热路径跟踪）
+
+运行: python -m pytest tests/test_profiler.py -v
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from core.llm_client import LLMStream
+from core.profiler import get_active_profiler, profiling, span, traced
+from core.subprocess_utils import run_command
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+class TestProfiling:
+    """profiling() 上下文测试"""
+
+    def test_writes_collapsed_stacks_and_trace(self, tmp_path):
+        @traced("file.write")
+        def write_file():
+            (tmp_path / "x.txt").write_text("x", encoding="utf-8")
+
+        with profiling(output_dir=tmp_path, interval=0.002) as profiler:
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="video") as pool:
+                list(pool.map(_busy, [0.1, 0.1]))
+            run_command([sys.executable, "-c", "pass"])
+            write_file()
+
+        assert get_active_profiler() is None
+        collapsed = next(tmp_path.glob("profile_*.collapsed")).read_text(encoding="utf-8")
+        lines = collapsed.splitlines()
+        assert any(line.startswith("video_*;") and "_busy (test_profiler.py" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert profiler.samples > 0
+
+        trace = json.loads(next(tmp_path.glob("trace_*.json")).read_text(encoding="utf-8"))
+        spans = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+        assert spans["run_command"]["args"]["program"] == Path(sys.executable).name
+        assert spans["file.write"]["args"]["func"].endswith("write_file")
+
+    def test_disabled_records_nothing(self, tmp_path):
+        with profiling(enabled=False, output_dir=tmp_path) as profiler:
+            with span("run_command"):
+                pass
+
+        assert profiler is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_nested_profiling_does_not_restart(self, tmp_path):
+        with profiling(output_dir=tmp_path, interval=0.005) as outer:
+            with profiling(output_dir=tmp_path) as inner:
+                assert inner is None
+                assert get_active_profiler() is outer
+
+
+def test_llm_stream_records_span(tmp_path):
+    """流式调用从创建到结束记录为一个 span"""
+    with profiling(output_dir=tmp_path, interval=0.005) as profiler:
+        stream = LLMStream(provider="openai", model="m").attach(iter(["a", "b"]))
+        assert "".join(stream) == "ab"
+        stream.close()
+        worker = threading.Thread(target=lambda: LLMStream(provider="openai").close())
+        worker.start()
+        worker.join()
+
+    names = [name for name, *_ in profiler.span_summary()]
+    assert names == ["llm.generate_stream"]
+    assert profiler.span_summary()[0][1] == 2
@@ -0,0 +1,109 @@
+"""
+Tests for 可缓存的静态 Prompt 前缀（PromptParts、供应商缓存字段）
+
+运行: python -m pytest tests/test_prompt_prefix.py -v
+"""
+
+from types import SimpleNamespace
+
+from core.ai_providers.anthropic import _cached_system
+from core.ai_providers.anthropic import _usage_from_response as anthropic_usage
+from core.ai_providers.openai_compatible import _usage_from_response as openai_usage
+from core.language import LanguageConfig
+from core.llm_client import LLMResult
+from core.prompts import (
+    build_chunk_summary_prompt,
+    build_summary_prompt,
+    build_translation_prompt,
+    get_translation_prompt,
+)
+from core.translator import SubtitleTranslator
+
+SRT_A = "1\n00:00:01,000 --> 00:00:02,000\nHello\n"
+SRT_B = "1\n00:00:05,000 --> 00:00:06,000\nWorld\n"
+
+
+class TestPromptParts:
+    """Prompt 拆分测试"""
+
+    def test_translation_prefix_is_stable(self):
+        a = build_translation_prompt("en", "zh-CN", SRT_A)
+        b = build_translation_prompt("en", "zh-CN", SRT_B)
+
+        assert a.system == b.system
+        assert SRT_A not in a.system and SRT_A in a.user
+        assert a.text == get_translation_prompt("en", "zh-CN", SRT_A)
+
+    def test_summary_prefix_independent_of_content(self):
+        short = build_summary_prompt("zh-CN", "短", video_title="A")
+        long = build_summary_prompt("zh-CN", "长" * 40000, video_title="B")
+        chunk1 = build_chunk_summary_prompt("zh-CN", "x", 1, 3)
+        chunk2 = build_chunk_summary_prompt("zh-CN", "y", 2, 3)
+
+        assert short.system == long.system
+        assert "300-800" in short.user and "2000-5000" in long.user
+        assert chunk1.system == chunk2.system
+
+
+class _RecordingLLM:
+    max_concurrency = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompt, system=None, **kwargs):
+        self.calls.append((system, prompt))
+        return LLMResult(text=prompt.split("字幕内容：\n", 1)[1].rsplit("\n\n请", 1)[0])
+
+
+def test_translator_sends_instructions_as_system():
+    """翻译请求的静态指令作为 system 发送，字幕只在 user 中"""
+    llm = _RecordingLLM()
+    translator = SubtitleTranslator(llm, LanguageConfig(subtitle_target_languages=["ja"]))
+    translator._call_ai_api(build_translation_prompt("en", "ja", SRT_A))
+    translator._call_ai_api(build_translation_prompt("en", "ja", SRT_B))
+
+    (system_a, user_a), (system_b, user_b) = llm.calls
+    assert system_a == system_b and "翻译成" in system_a
+    assert user_a.startswith("字幕内容：") and "Hello" in user_a
+
+
+class TestCachedTokenUsage:
+    """供应商缓存命中数记录测试"""
+
+    def test_openai_cached_tokens(self):
+        usage = openai_usage(
+            SimpleNamespace(
+                prompt_tokens=2000,
+                completion_tokens=100,
+                total_tokens=2100,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+            )
+        )
+        assert usage.cached_tokens == 1536 and usage.prompt_tokens == 2000
+
+    def test_deepseek_cache_hit_tokens(self):
+        usage = openai_usage(
+            SimpleNamespace(
+                prompt_tokens=2000,
+                completion_tokens=100,
+                total_tokens=2100,
+                prompt_cache_hit_tokens=1024,
+            )
+        )
+        assert usage.cached_tokens == 1024
+
+    def test_anthropic_cache_read_and_write(self):
+        usage = anthropic_usage(
+            SimpleNamespace(
+                input_tokens=50,
+                output_tokens=10,
+                cache_read_input_tokens=1200,
+                cache_creation_input_tokens=0,
+            )
+        )
+        assert usage.prompt_tokens == 1250
+        assert usage.cached_tokens == 1200
+        assert usage.total_tokens == 1260
+
+        assert _cached_system("rules")[0]["cache_control"] == {"type": "ephemeral"}
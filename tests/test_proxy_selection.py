@@ -0,0 +1,164 @@
+"""
+Tests for ProxyManager 加权选择与并发健康探测
+
+运行: python -m pytest tests/test_proxy_selection.py -v
+"""
+
+import threading
+import time
+from collections import Counter
+
+from core.proxy_manager import ProxyManager, ProxyStatus
+
+
+def _proxies(n):
+    return [f"http://127.0.0.1:{9000 + i}" for i in range(n)]
+
+
+def _manager(n, **kwargs):
+    kwargs.setdefault("enable_health_probe", False)
+    kwargs.setdefault("quiet", True)
+    return ProxyManager(_proxies(n), **kwargs)
+
+
+class _FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class _FakeHttpClient:
+    """记录并发度的假 HTTP 客户端"""
+
+    def __init__(self, delay=0.2, status_code=200):
+        self.delay = delay
+        self.status_code = status_code
+        self.active = 0
+        self.max_active = 0
+        self.closed = []
+        self._lock = threading.Lock()
+
+    def get(self, url, proxy=None, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return _FakeResponse(self.status_code)
+
+    def close_proxy(self, proxy):
+        self.closed.append(proxy)
+
+
+class TestProxyStatusScore:
+    """EWMA 得分测试"""
+
+    def test_latency_and_success_ewma(self):
+        status = ProxyStatus(proxy="p")
+        status.mark_success(latency_ms=100)
+        assert status.latency_ewma_ms == 100
+        status.mark_success(latency_ms=200)
+        assert 100 < status.latency_ewma_ms < 200
+
+        fast = status.score()
+        status.mark_failure("err", failure_threshold=100)
+        assert status.success_ewma < 1.0
+        assert status.score() > fast
+
+
+class TestWeightedSelection:
+    """power-of-two-choices 选择测试"""
+
+    def test_prefers_faster_proxy(self):
+        manager = _manager(10)
+        proxies = _proxies(10)
+        for proxy in proxies:
+            manager.mark_success(proxy, latency_ms=2000)
+        manager.mark_success(proxies[3], latency_ms=50)
+
+        counts = Counter(manager.get_next_proxy() for _ in range(5000))
+
+        # 均匀随机时约 500 次；两选一时更快的代理约被选中 2 倍
+        assert counts[proxies[3]] > 800
+        assert set(counts) <= set(proxies)
+
+    def test_exclude(self):
+        manager = _manager(3)
+        proxies = _proxies(3)
+        for _ in range(200):
+            assert manager.get_next_proxy(exclude={proxies[0]}) != proxies[0]
+        assert manager.get_next_proxy(exclude={proxies[0], proxies[1]}) == proxies[2]
+
+    def test_all_excluded_falls_back_to_excluded_healthy(self):
+        manager = _manager(2)
+        assert manager.get_next_proxy(exclude=set(_proxies(2))) in _proxies(2)
+
+
+class TestHealthySet:
+    """增量维护的健康集合测试"""
+
+    def test_unhealthy_removed_and_restored(self):
+        manager = _manager(4, failure_threshold=2)
+        bad = _proxies(4)[1]
+        manager.mark_failure(bad, "e")
+        manager.mark_failure(bad, "e")
+
+        assert manager.get_healthy_count() == 3
+        assert manager.get_unhealthy_count() == 1
+        assert all(manager.get_next_proxy() != bad for _ in range(200))
+
+        manager.mark_success(bad)
+        assert manager.get_healthy_count() == 4
+
+        manager.mark_failure(bad, "e")
+        manager.mark_failure(bad, "e")
+        manager.reset_all()
+        assert manager.get_healthy_count() == 4
+
+    def test_unhealthy_proxy_sessions_closed(self, monkeypatch):
+        client = _FakeHttpClient()
+        monkeypatch.setattr("core.http_client.get_http_client", lambda: client)
+        manager = _manager(2, failure_threshold=2)
+        bad = _proxies(2)[0]
+
+        manager.mark_failure(bad, "e")
+        assert client.closed == []
+        manager.mark_failure(bad, "e")
+        manager.mark_failure(bad, "e")
+        assert client.closed == [bad]
+
+    def test_all_unhealthy_uses_direct(self):
+        manager = _manager(2, failure_threshold=1)
+        for proxy in _proxies(2):
+            manager.mark_failure(proxy, "e")
+        assert manager.get_next_proxy(allow_direct=True) is None
+        assert manager.get_next_proxy(allow_direct=False) in _proxies(2)
+
+
+class TestConcurrentProbe:
+    """并发健康探测测试"""
+
+    def test_probes_fan_out(self):
+        manager = _manager(20, failure_threshold=1, retry_delay_minutes=0, probe_concurrency=10)
+        for proxy in _proxies(20):
+            manager.mark_failure(proxy, "e")
+        assert manager.get_healthy_count() == 0
+
+        client = _FakeHttpClient(delay=0.2)
+        started = time.perf_counter()
+        recovered = manager.probe_unhealthy(client)
+        elapsed = time.perf_counter() - started
+
+        assert recovered == 20
+        assert manager.get_healthy_count() == 20
+        assert client.max_active == 10
+        # 逐个探测需要 4 秒
+        assert elapsed < 2
+        assert manager.get_proxy_status(_proxies(20)[0]).latency_ewma_ms >= 200
+
+    def test_failed_probe_keeps_unhealthy(self):
+        manager = _manager(2, failure_threshold=1, retry_delay_minutes=0)
+        for proxy in _proxies(2):
+            manager.mark_failure(proxy, "e")
+        assert manager.probe_unhealthy(_FakeHttpClient(delay=0, status_code=503)) == 0
+        assert manager.get_healthy_count() == 0
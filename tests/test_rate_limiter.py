@@ -0,0 +1,176 @@
+"""
+Tests for core/rate_limiter.py
+
+运行: python -m pytest tests/test_rate_limiter.py -v
+"""
+
+import subprocess
+import threading
+import time
+
+import core.subprocess_utils as subprocess_utils
+from core.cancel_token import CancelToken
+from core.rate_limiter import (
+    MIN_RATE_FACTOR,
+    THROTTLE_RATE,
+    RateLimiter,
+    TokenBucket,
+    identity_from_command,
+    is_throttle_error,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """令牌桶测试"""
+
+    def test_burst_then_paced(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        # 预订制：排队的请求依次等待 0.5s、1.0s
+        assert bucket.reserve() == 0.5
+        assert bucket.reserve() == 1.0
+
+        clock.now += 10
+        assert bucket.reserve() == 0.0
+
+    def test_unlimited(self):
+        bucket = TokenBucket(rate=0, burst=1)
+        assert all(bucket.acquire() == 0 for _ in range(100))
+
+    def test_penalize_and_recover(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=5, clock=clock)
+
+        assert bucket.penalize() == 1.0
+        # 突发额度被清空，下一次请求按降低后的速率等待
+        assert bucket.reserve() == 1.0
+
+        for _ in range(10):
+            bucket.penalize()
+        assert bucket.factor == MIN_RATE_FACTOR
+
+        for _ in range(100):
+            bucket.reward()
+        assert bucket.factor == 1.0
+
+    def test_unpaced_until_throttled(self):
+        """默认不限速，被限流后才开始限速，完全恢复后回到不限速"""
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=0, burst=2, clock=clock)
+        assert all(bucket.reserve() == 0 for _ in range(10))
+
+        assert bucket.penalize() == THROTTLE_RATE / 2
+        assert bucket.adaptive
+        assert bucket.reserve() > 0
+
+        for _ in range(100):
+            bucket.reward()
+        assert not bucket.adaptive and bucket.rate == 0
+        assert all(bucket.reserve() == 0 for _ in range(10))
+
+    def test_concurrent_acquire_is_paced(self):
+        """测试多个 worker 同时请求时按速率依次放行"""
+        bucket = TokenBucket(rate=20.0, burst=1)
+        finished = []
+
+        def worker():
+            bucket.acquire()
+            finished.append(time.monotonic())
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 1 个突发 + 5 个间隔 50ms
+        assert time.monotonic() - started >= 0.24
+        assert len(finished) == 6
+
+    def test_cancel_interrupts_wait(self):
+        bucket = TokenBucket(rate=0.1, burst=1)
+        bucket.acquire()
+        token = CancelToken()
+        token.cancel("stop")
+
+        started = time.monotonic()
+        bucket.acquire(cancel_token=token)
+        assert time.monotonic() - started < 1
+        # 取消的预订被归还
+        assert bucket.reserve() > 0
+
+
+class TestRateLimiter:
+    """按出口身份划分的限速器测试"""
+
+    def test_identities_are_isolated(self):
+        limiter = RateLimiter(rate=1.0, burst=1)
+        assert limiter.bucket("http://p1") is limiter.bucket("http://p1")
+        assert limiter.bucket("http://p1") is not limiter.bucket("http://p2")
+        assert limiter.bucket("http://p1") is not limiter.bucket("http://p1", "/tmp/cookies.txt")
+        assert limiter.bucket(None) is limiter.bucket("")
+
+        limiter.acquire("http://p1")
+        assert limiter.acquire("http://p2") == 0
+
+    def test_report_throttled_only_slows_that_identity(self):
+        limiter = RateLimiter(rate=2.0, burst=2)
+        limiter.report("http://p1", throttled=True)
+        assert limiter.bucket("http://p1").current_rate == 1.0
+        assert limiter.bucket("http://p2").current_rate == 2.0
+
+    def test_configure_updates_existing_buckets(self):
+        limiter = RateLimiter(rate=1.0, burst=3)
+        bucket = limiter.bucket()
+        limiter.configure(rate=5.0, burst=10)
+        assert bucket.rate == 5.0
+        assert bucket.burst == 10
+        assert limiter.bucket("http://new").rate == 5.0
+
+
+def test_identity_from_command():
+    cmd = ["yt-dlp", "--proxy", "http://p1", "--cookies", "/tmp/c.txt", "URL"]
+    assert identity_from_command(cmd) == ("http://p1", "/tmp/c.txt")
+    assert identity_from_command(["yt-dlp", "URL"]) == (None, None)
+
+
+def test_is_throttle_error():
+    assert is_throttle_error("ERROR: HTTP Error 429: Too Many Requests")
+    assert is_throttle_error("ERROR: Sign in to confirm you're not a bot")
+    assert not is_throttle_error("ERROR: Video unavailable")
+    assert not is_throttle_error("ERROR: [youtube] x4293kd: Private video")
+    assert not is_throttle_error(None)
+
+
+def test_default_limiter_only_paces_throttled_identity():
+    limiter = RateLimiter()
+    assert all(limiter.acquire("http://p1") == 0 for _ in range(20))
+
+    limiter.report("http://p1", throttled=True)
+    assert limiter.bucket("http://p1").current_rate == THROTTLE_RATE / 2
+    assert limiter.bucket().current_rate == 0
+
+
+def test_run_ytdlp_command_reports_throttle(monkeypatch):
+    limiter = RateLimiter(rate=4.0, burst=2)
+    monkeypatch.setattr("core.rate_limiter.get_rate_limiter", lambda: limiter)
+
+    def fake_run_command(cmd, timeout=None, **kwargs):
+        return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="ERROR: HTTP Error 429")
+
+    monkeypatch.setattr(subprocess_utils, "run_command", fake_run_command)
+
+    subprocess_utils.run_ytdlp_command(["yt-dlp", "--proxy", "http://p1", "URL"])
+    assert limiter.bucket("http://p1").current_rate == 2.0
+    assert limiter.bucket().current_rate == 4.0
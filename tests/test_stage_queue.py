@@ -0,0 +1,317 @@
+"""
+Tests for core/staged_pipeline/cancellable_queue.py 和 StageQueue 的取消/停止行为
+
+运行: python -m pytest tests/test_stage_queue.py -v
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.cancel_token import CancelToken
+from core.models import VideoInfo
+from core.staged_pipeline.cancellable_queue import CancellableQueue, QueueClosed
+from core.staged_pipeline.data_types import StageData
+from core.staged_pipeline.queue import StageQueue
+
+
+def _data(i: int) -> StageData:
+    return StageData(video_info=VideoInfo(video_id=f"v{i}", url="", title=""))
+
+
+class TestCancellableQueue:
+    """CancellableQueue 单元测试"""
+
+    def test_fifo(self):
+        """测试先进先出"""
+        q = CancellableQueue()
+        for i in range(3):
+            q.put(i)
+        assert [q.get() for _ in range(3)] == [0, 1, 2]
+
+    def test_close_wakes_blocked_get(self):
+        """测试 close 立即唤醒阻塞的 get"""
+        q = CancellableQueue()
+        errors = []
+
+        def consumer():
+            try:
+                q.get()
+            except QueueClosed as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        time.sleep(0.05)
+        start = time.perf_counter()
+        q.close()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+        assert len(errors) == 1
+        assert time.perf_counter() - start < 0.5
+
+    def test_close_wakes_blocked_put_on_full_queue(self):
+        """测试队列满时 close 唤醒阻塞的 put"""
+        q = CancellableQueue(maxsize=1)
+        q.put("a")
+        errors = []
+
+        def producer():
+            try:
+                q.put("b")
+            except QueueClosed as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        time.sleep(0.05)
+        q.close()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+        assert len(errors) == 1
+
+    def test_drain_close(self):
+        """测试 drain 模式关闭后仍可取出剩余数据"""
+        q = CancellableQueue()
+        q.put(1)
+        q.put(2)
+        q.close(drain=True)
+        assert q.get() == 1
+        assert q.get() == 2
+        with pytest.raises(QueueClosed):
+            q.get()
+        with pytest.raises(QueueClosed):
+            q.put(3)
+
+    def test_cancel_token_closes_queue(self):
+        """测试取消令牌触发时队列关闭"""
+        token = CancelToken()
+        q = CancellableQueue(cancel_token=token)
+        q.put(1)
+        token.cancel("test")
+        assert q.closed
+        with pytest.raises(QueueClosed):
+            q.get()
+
+    def test_get_timeout(self):
+        """测试 get 超时"""
+        q = CancellableQueue()
+        with pytest.raises(TimeoutError):
+            q.get(timeout=0.01)
+
+
+class TestStageQueue:
+    """StageQueue 取消/停止行为测试"""
+
+    def test_items_flow_to_next_stage(self):
+        """测试数据正常流转到下一阶段"""
+        done = []
+        last = StageQueue(
+            stage_name="output",
+            executor=None,
+            processor=lambda d: d,
+            on_complete=done.append,
+        )
+        first = StageQueue(
+            stage_name="detect",
+            executor=None,
+            processor=lambda d: d,
+            next_stage_queue=last,
+        )
+        last.start(2)
+        first.start(2)
+        for i in range(20):
+            first.enqueue(_data(i))
+        assert first.wait_for_completion(timeout=5)
+        assert last.wait_for_completion(timeout=5)
+        first.stop()
+        last.stop()
+        assert len(done) == 20
+        assert first.get_stats()["processed"] == 20
+
+    def test_cancel_stops_idle_workers_immediately(self):
+        """测试取消时空闲 worker 立即退出（无轮询延迟）"""
+        token = CancelToken()
+        stage = StageQueue(
+            stage_name="detect",
+            executor=None,
+            processor=lambda d: d,
+            cancel_token=token,
+        )
+        stage.start(10)
+        time.sleep(0.05)
+        start = time.perf_counter()
+        token.cancel("test")
+        for worker in stage.workers:
+            worker.join(timeout=2)
+        assert time.perf_counter() - start < 0.5
+        assert not any(w.is_alive() for w in stage.workers)
+        stage.stop()
+
+    def test_stop_with_full_queue(self):
+        """测试队列已满时停止信号不会丢失"""
+        release = threading.Event()
+
+        def processor(data):
+            release.wait()
+            return data
+
+        stage = StageQueue(
+            stage_name="download",
+            executor=None,
+            processor=processor,
+            max_queue_size=2,
+        )
+        stage.start(2)
+        for i in range(4):
+            stage.enqueue(_data(i))
+        time.sleep(0.05)
+        release.set()
+        start = time.perf_counter()
+        stage.stop(timeout=5)
+        assert time.perf_counter() - start < 1.0
+        assert stage.workers == []
+
+    def test_enqueue_after_stop_is_dropped(self):
+        """测试停止后入队的数据被丢弃而不是阻塞"""
+        stage = StageQueue(stage_name="output", executor=None, processor=lambda d: d)
+        stage.start(1)
+        stage.stop()
+        assert stage.enqueue(_data(0)) is False
+        assert stage.get_stats()["total"] == 0
+
+
+class TestSharedWorkerPool:
+    """SharedWorkerPool 跨阶段调度测试"""
+
+    @staticmethod
+    def _tracking_processor(counter: dict, key: str, lock: threading.Lock, delay: float):
+        def process(data):
+            with lock:
+                counter[key] = counter.get(key, 0) + 1
+                counter[f"{key}_peak"] = max(counter.get(f"{key}_peak", 0), counter[key])
+                counter["ai"] = counter.get("ai", 0) + (1 if key in ("a", "b") else 0)
+                counter["ai_peak"] = max(counter.get("ai_peak", 0), counter["ai"])
+            time.sleep(delay)
+            with lock:
+                counter[key] -= 1
+                counter["ai"] -= 1 if key in ("a", "b") else 0
+            return data
+
+        return process
+
+    def test_pool_respects_stage_and_resource_limits(self):
+        """测试共享池遵守阶段上限和资源上限，且所有数据都处理完成"""
+        from core.staged_pipeline.worker_pool import SharedWorkerPool
+
+        counter, lock, done = {}, threading.Lock(), []
+        pool = SharedWorkerPool(
+            max_workers=8,
+            resource_limits={"ai": 3},
+            stage_resources={"a": "ai", "b": "ai", "c": "disk"},
+        )
+        stage_c = StageQueue(
+            stage_name="c",
+            executor=None,
+            processor=self._tracking_processor(counter, "c", lock, 0.005),
+            on_complete=done.append,
+            worker_pool=pool,
+        )
+        stage_b = StageQueue(
+            stage_name="b",
+            executor=None,
+            processor=self._tracking_processor(counter, "b", lock, 0.01),
+            next_stage_queue=stage_c,
+            worker_pool=pool,
+            max_queue_size=5,
+        )
+        stage_a = StageQueue(
+            stage_name="a",
+            executor=None,
+            processor=self._tracking_processor(counter, "a", lock, 0.01),
+            next_stage_queue=stage_b,
+            worker_pool=pool,
+        )
+        stage_a.start(2)
+        stage_b.start(2)
+        stage_c.start(8)
+        pool.start()
+
+        for i in range(30):
+            stage_a.enqueue(_data(i))
+        for stage in (stage_a, stage_b, stage_c):
+            assert stage.wait_for_completion(timeout=10)
+        for stage in (stage_c, stage_b, stage_a):
+            stage.stop()
+        pool.shutdown()
+
+        assert len(done) == 30
+        assert counter["a_peak"] <= 2
+        assert counter["b_peak"] <= 2
+        assert counter["ai_peak"] <= 3
+
+        utilization = pool.get_utilization()
+        assert set(utilization) == {"a", "b", "c"}
+        assert utilization["a"]["dispatched"] == 30
+        assert utilization["c"]["busy_seconds"] > 0
+        assert 0 < stage_a.get_utilization()["utilization"] <= 1
+
+    def test_pool_cancel_wakes_workers(self):
+        """测试取消令牌立即结束共享池中的空闲 worker"""
+        from core.staged_pipeline.worker_pool import SharedWorkerPool
+
+        token = CancelToken()
+        pool = SharedWorkerPool(max_workers=10, cancel_token=token)
+        stage = StageQueue(
+            stage_name="detect",
+            executor=None,
+            processor=lambda d: d,
+            cancel_token=token,
+            worker_pool=pool,
+        )
+        stage.start(10)
+        pool.start()
+        time.sleep(0.05)
+        start = time.perf_counter()
+        token.cancel("test")
+        pool.shutdown(timeout=2)
+        assert time.perf_counter() - start < 0.5
+        stage.stop()
+
+    def test_worker_budget_reaches_staged_pipeline(self, tmp_path, monkeypatch):
+        """测试配置的 worker 预算经 process_video_list 传到 StagedPipeline"""
+        import core.staged_pipeline as staged_pipeline
+        from types import SimpleNamespace
+
+        from config.manager import AppConfig
+        from core.language import LanguageConfig
+        from core.pipeline import process_video_list
+
+        created = []
+
+        class _FakeStagedPipeline:
+            def __init__(self, **kwargs):
+                created.append(kwargs)
+
+            def process_videos(self, videos):
+                return {"total": len(videos), "success": len(videos), "failed": 0}
+
+        monkeypatch.setattr(staged_pipeline, "StagedPipeline", _FakeStagedPipeline)
+        config = AppConfig.from_dict({"worker_budget": 12})
+        assert AppConfig.from_dict(config.to_dict()).worker_budget == 12
+
+        stats = process_video_list(
+            [_data(0).video_info],
+            LanguageConfig(),
+            None,
+            None,
+            SimpleNamespace(base_output_dir=tmp_path),
+            None,
+            None,
+            None,
+            worker_budget=config.worker_budget,
+        )
+
+        assert stats["success"] == 1
+        assert created and created[0]["worker_budget"] == 12
@@ -0,0 +1,87 @@
+"""
+Tests for CLI 启动延迟导入与语言文件按需加载
+
+运行: python -m pytest tests/test_startup_imports.py -v
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from core.i18n.json_provider import JsonI18nProvider
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _imported_modules(statement: str) -> set:
+    code = f"{statement}\nimport sys, json\nprint(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+def test_cli_main_defers_subcommands_and_providers():
+    """测试导入 CLI 入口不会导入子命令实现和 AI 供应商"""
+    modules = _imported_modules("from cli.main import create_parser; create_parser()")
+    for name in ("cli.channel", "cli.urls", "cli.ai_smoke_test", "core.ai_providers", "requests"):
+        assert name not in modules
+
+
+def test_ai_providers_clients_are_lazy():
+    """测试 core.ai_providers 只在访问客户端类时导入对应模块"""
+    modules = _imported_modules("import core.ai_providers")
+    assert "core.ai_providers.openai_compatible" not in modules
+    assert "core.ai_providers.local_model" not in modules
+
+    modules = _imported_modules("from core.ai_providers import OpenAICompatibleClient")
+    assert "core.ai_providers.openai_compatible" in modules
+    assert "core.ai_providers.gemini" not in modules
+
+
+def test_cli_help_runs():
+    proc = subprocess.run(
+        [sys.executable, "cli.py", "--help"], cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    assert proc.returncode == 0
+    assert "rerender" in proc.stdout
+
+
+class TestJsonI18nProviderLazyFallback:
+    """语言文件按需加载测试"""
+
+    def _write_locales(self, tmp_path):
+        (tmp_path / "en_US.json").write_text(
+            json.dumps({"a": "A", "b": "B", "one": "{n} item"}), encoding="utf-8"
+        )
+        (tmp_path / "zh_CN.json").write_text(json.dumps({"a": "甲"}), encoding="utf-8")
+
+    def test_fallback_loaded_on_first_miss(self, tmp_path):
+        self._write_locales(tmp_path)
+        provider = JsonI18nProvider(tmp_path, "zh-CN")
+        assert provider.get("a") == "甲"
+        assert provider._fallback is None
+
+        assert provider.get("b") == "B"
+        assert provider._fallback is not None
+        assert provider.get("missing") == "missing"
+        assert provider.get("missing", "default") == "default"
+        assert provider.nget("one", "many", 1) == "{n} item"
+
+    def test_english_does_not_load_twice(self, tmp_path):
+        self._write_locales(tmp_path)
+        provider = JsonI18nProvider(tmp_path, "en-US")
+        assert provider._fallback is provider.translations
+
+    def test_reload_switches_language(self, tmp_path):
+        self._write_locales(tmp_path)
+        provider = JsonI18nProvider(tmp_path, "en-US")
+        provider.reload("zh-CN")
+        assert provider.get_language() == "zh-CN"
+        assert provider.get("a") == "甲"
+        assert provider.get("b") == "B"
@@ -0,0 +1,125 @@
+"""
+Tests for core/output/formats/alignment.py 和双语合并
+
+运行: python -m pytest tests/test_subtitle_alignment.py -v
+"""
+
+import time
+
+import pytest
+
+from core.output.formats.alignment import align_entries, parse_timestamp_ms
+from core.output.formats.subtitle import merge_entries_to_txt, merge_srt_entries
+
+
+def _ts(ms: int) -> str:
+    hours, rest = divmod(ms, 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    seconds, millis = divmod(rest, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+
+
+def _entry(index: int, start_ms: int, end_ms: int, text: str) -> dict:
+    return {"index": index, "start": _ts(start_ms), "end": _ts(end_ms), "text": text}
+
+
+class TestParseTimestamp:
+    """时间戳解析测试"""
+
+    @pytest.mark.parametrize(
+        "timestamp, expected",
+        [
+            ("00:00:01,500", 1500),
+            ("01:02:03,004", 3_723_004),
+            ("00:00:01.5", 1500),
+            ("02:03.250", 123_250),
+            ("00:00:07", 7000),
+        ],
+    )
+    def test_formats(self, timestamp, expected):
+        assert parse_timestamp_ms(timestamp) == expected
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_timestamp_ms("not a time")
+
+
+class TestAlignEntries:
+    """时间轴对齐测试"""
+
+    def test_exact_timeline(self):
+        """测试时间轴完全一致时一一对应"""
+        source = [_entry(i + 1, i * 2000, i * 2000 + 2000, f"s{i}") for i in range(5)]
+        target = [_entry(i + 1, i * 2000, i * 2000 + 2000, f"t{i}") for i in range(5)]
+        aligned = align_entries(source, target)
+        assert [[e["text"] for e in m] for m in aligned] == [[f"t{i}"] for i in range(5)]
+
+    def test_shifted_timeline(self):
+        """测试目标时间轴整体偏移几百毫秒时仍能对齐"""
+        source = [_entry(i + 1, i * 2000, i * 2000 + 2000, f"s{i}") for i in range(10)]
+        target = [
+            _entry(i + 1, i * 2000 + 300, i * 2000 + 2250, f"t{i}") for i in range(10)
+        ]
+        aligned = align_entries(source, target)
+        assert [m[0]["text"] for m in aligned] == [f"t{i}" for i in range(10)]
+
+    def test_split_target_cues_attach_to_same_source(self):
+        """测试目标字幕切分更细时多条目标 cue 合并到同一条源 cue"""
+        source = [_entry(1, 0, 4000, "long"), _entry(2, 4000, 6000, "next")]
+        target = [
+            _entry(1, 0, 2000, "a"),
+            _entry(2, 2000, 4000, "b"),
+            _entry(3, 4000, 6000, "c"),
+        ]
+        aligned = align_entries(source, target)
+        assert [e["text"] for e in aligned[0]] == ["a", "b"]
+        assert [e["text"] for e in aligned[1]] == ["c"]
+
+    def test_gap_respects_tolerance(self):
+        """测试间隙超过容差时不匹配"""
+        source = [_entry(1, 0, 1000, "s")]
+        target = [_entry(1, 1200, 2000, "t")]
+        assert align_entries(source, target, tolerance_ms=500) == [[target[0]]]
+        assert align_entries(source, target, tolerance_ms=100) == [[]]
+
+    def test_zero_tolerance_requires_overlap(self):
+        """测试零容差时相邻（首尾相接）的 cue 不会被误匹配"""
+        source = [_entry(1, 0, 1000, "s0"), _entry(2, 1000, 2000, "s1")]
+        target = [_entry(1, 1000, 2000, "t1")]
+        aligned = align_entries(source, target, tolerance_ms=0)
+        assert aligned == [[], [target[0]]]
+
+    def test_unsorted_input(self):
+        """测试输入未按时间排序时仍能正确对齐"""
+        source = [_entry(2, 2000, 4000, "s1"), _entry(1, 0, 2000, "s0")]
+        target = [_entry(1, 100, 2000, "t0"), _entry(2, 2100, 4000, "t1")]
+        aligned = align_entries(source, target)
+        assert aligned[0][0]["text"] == "t1"
+        assert aligned[1][0]["text"] == "t0"
+
+    def test_long_subtitle_is_linear(self):
+        """测试超长字幕对齐耗时近似线性"""
+        n = 50_000
+        source = [_entry(i + 1, i * 1000, i * 1000 + 1000, "s") for i in range(n)]
+        target = [_entry(i + 1, i * 1000 + 120, i * 1000 + 1080, "t") for i in range(n)]
+        start = time.perf_counter()
+        aligned = align_entries(source, target)
+        assert time.perf_counter() - start < 5
+        assert all(len(m) == 1 for m in aligned)
+
+
+class TestMergeWithAlignment:
+    """双语合并使用区间对齐的测试"""
+
+    def test_merge_srt_matches_shifted_cues(self):
+        source = [_entry(1, 0, 2000, "Hello"), _entry(2, 2000, 4000, "World")]
+        target = [_entry(1, 80, 1950, "你好"), _entry(2, 2040, 3900, "世界")]
+        merged = merge_srt_entries(source, target)
+        assert "Hello\n你好" in merged
+        assert "World\n世界" in merged
+        assert "00:00:00,000 --> 00:00:02,000" in merged
+
+    def test_merge_txt_keeps_unmatched_source(self):
+        source = [_entry(1, 0, 2000, "Hello"), _entry(2, 10_000, 12_000, "Alone")]
+        target = [_entry(1, 50, 2000, "你好")]
+        assert merge_entries_to_txt(source, target) == "Hello\n你好\n\nAlone"
@@ -0,0 +1,99 @@
+"""
+Tests for core/subtitle/process_pool.py
+
+运行: python -m pytest tests/test_subtitle_process_pool.py -v
+"""
+
+import pytest
+
+from core.subtitle.merger import SubtitleCue
+from core.subtitle.process_pool import SubtitleProcessPool
+from core.subtitle_format import convert_vtt_to_srt
+from core.state.chunk_tracker import renumber_srt
+
+
+VTT = """WEBVTT
+
+00:00:01.000 --> 00:00:02.000
+Hello
+
+00:00:02.500 --> 00:00:04.000
+world.
+"""
+
+SRT_SOURCE = """1
+00:00:01,000 --> 00:00:02,000
+Hello
+
+2
+00:00:02,500 --> 00:00:04,000
+world.
+"""
+
+SRT_TARGET = """1
+00:00:01,000 --> 00:00:02,000
+你好
+
+2
+00:00:02,500 --> 00:00:04,000
+世界。
+"""
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    pool = SubtitleProcessPool(max_workers=2, min_batch_size=1)
+    yield pool
+    pool.shutdown()
+
+
+class TestSubtitleProcessPool:
+    """SubtitleProcessPool 单元测试"""
+
+    def test_inline_when_single_worker(self):
+        """测试 max_workers=1 时在当前进程执行"""
+        pool = SubtitleProcessPool(max_workers=1)
+        assert not pool.uses_processes
+        assert pool.convert_to_srt_batch([VTT]) == [convert_vtt_to_srt(VTT)]
+
+    def test_convert_batch_matches_inline(self, process_pool):
+        """测试进程池结果与直接调用一致且保持顺序"""
+        contents = [VTT.replace("Hello", f"Hello {i}") for i in range(20)]
+        results = process_pool.convert_to_srt_batch(contents)
+        assert results == [convert_vtt_to_srt(c) for c in contents]
+
+    def test_renumber_and_validate(self, process_pool):
+        """测试重编号与时间轴校验"""
+        shuffled = SRT_SOURCE.replace("1\n00:00:01", "7\n00:00:01")
+        assert process_pool.renumber_srt_batch([shuffled]) == [renumber_srt(shuffled)]
+        assert process_pool.validate_timeline_batch([SRT_SOURCE]) == [[]]
+
+    def test_split_batch(self, process_pool):
+        """测试批量拆分 chunk"""
+        groups = process_pool.split_srt_batch([SRT_SOURCE, SRT_SOURCE], 1, 8000)
+        assert [len(g) for g in groups] == [2, 2]
+
+    def test_bilingual_batch(self, process_pool):
+        """测试批量双语合并"""
+        srt, txt = (
+            process_pool.bilingual_batch([(SRT_SOURCE, SRT_TARGET)], "srt")[0],
+            process_pool.bilingual_batch([(SRT_SOURCE, SRT_TARGET)], "txt")[0],
+        )
+        assert "Hello\n你好" in srt
+        assert "00:00:01,000 --> 00:00:02,000" in srt
+        assert txt.startswith("Hello\n你好")
+
+    def test_merge_cues_and_chinese_detection(self, process_pool):
+        """测试 cue 合并与简繁检测"""
+        cues = [SubtitleCue(1, 0.0, 1.0, "Hello"), SubtitleCue(2, 1.1, 2.0, "world.")]
+        blocks = process_pool.merge_cues_batch([cues])[0]
+        assert len(blocks) == 1
+        variants = process_pool.detect_chinese_variant_batch(
+            ["这个国家的时间会过来说话" * 2, "這個國家的時間會過來說話" * 2]
+        )
+        assert variants == ["zh-CN", "zh-TW"]
+
+    def test_unknown_task(self, process_pool):
+        """测试未知任务名"""
+        with pytest.raises(ValueError):
+            process_pool.map("no_such_task", [("x",)])
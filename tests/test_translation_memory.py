@@ -0,0 +1,219 @@
+"""
+Tests for core/translation_memory.py 及逐条翻译任务对翻译记忆的复用
+
+运行: python -m pytest tests/test_translation_memory.py -v
+"""
+
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config.manager import AIConfig
+from core.ai_providers.google_translate import GoogleTranslateClient
+from core.state.chunk_tracker import format_srt_entry, parse_srt_entries
+from core.translation_memory import TranslationMemory, get_translation_memory, is_reusable_cue
+from core.translator.salvage import CueRepairTask, run_cue_repair
+
+
+def _srt(texts):
+    return "".join(
+        f"{i}\n00:00:{i:02d},000 --> 00:00:{i:02d},900\n{text}\n\n" for i, text in enumerate(texts, start=1)
+    )
+
+
+class _FakeModel:
+    """逐条加 T: 前缀的“翻译”，记录每次请求的条目文本"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def translate(self, content):
+        entries = parse_srt_entries(content)
+        with self._lock:
+            self.requests.append([entry["text"] for entry in entries])
+        time.sleep(self.delay)
+        return "".join(format_srt_entry({**entry, "text": f"T:{entry['text']}"}) for entry in entries)
+
+    @property
+    def cues(self):
+        return [text for request in self.requests for text in request]
+
+
+def _run(tasks, model, pool):
+    run_cue_repair(tasks, submit=pool.submit, translate=model.translate, on_done=lambda task: None)
+
+
+def test_reusable_cues():
+    assert is_reusable_cue("[Music]")
+    assert is_reusable_cue("(Applause)")
+    assert is_reusable_cue("Thanks for watching!")
+    assert is_reusable_cue("谢谢观看。")
+    assert not is_reusable_cue("and then we went to")
+    assert not is_reusable_cue("so that's why.")
+    assert not is_reusable_cue("   ")
+
+
+class TestTranslationMemory:
+    """翻译记忆测试"""
+
+    def test_exact_and_normalized_lookup(self):
+        memory = TranslationMemory()
+        memory.claim("en", "zh", "Thanks for watching!")
+        memory.resolve("en", "zh", "Thanks for watching!", "感谢观看！")
+        memory.claim("en", "zh", "THANKS  for watching!")
+        memory.resolve("en", "zh", "THANKS  for watching!", "感谢收看！")
+
+        assert memory.lookup("en", "zh", "Thanks for watching!") == "感谢观看！"
+        assert memory.lookup("en", "zh", "THANKS  for watching!") == "感谢收看！"
+        assert memory.lookup("en", "zh", "thanks for\nwatching!") == "感谢观看！"
+        assert memory.lookup("en", "ja", "Thanks for watching!") is None
+
+    def test_lru_bound(self):
+        memory = TranslationMemory(max_entries=2)
+        for text in ("A.", "B.", "C."):
+            memory.translate("en", "zh", text, lambda: f"T:{text}")
+
+        assert len(memory) == 2
+        assert memory.lookup("en", "zh", "A.") is None
+        assert memory.lookup("en", "zh", "C.") == "T:C."
+
+    def test_single_flight(self):
+        memory = TranslationMemory()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return "译文"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: memory.translate("en", "zh", "Hello.", slow), range(4)))
+
+        assert results == ["译文"] * 4
+        assert len(calls) == 1
+        assert memory.coalesced == 3
+
+    def test_failed_owner_releases_waiters(self):
+        memory = TranslationMemory()
+        assert memory.claim("en", "zh", "Hello.") == (None, None)
+        _, flight = memory.claim("en", "zh", "Hello.")
+
+        memory.resolve("en", "zh", "Hello.", None)
+        assert flight.result(timeout=1) is None
+        # 失败的结果不记忆，下一个调用方重新成为翻译方
+        assert memory.claim("en", "zh", "Hello.") == (None, None)
+
+
+class TestCueTasksWithMemory:
+    """逐条翻译任务复用翻译记忆"""
+
+    SHARED = ["[Music]", "Welcome back to the channel!"]
+
+    def _task(self, memory, texts, index=0):
+        return CueRepairTask(index, _srt(texts), memory=memory.bind("en", "zh"))
+
+    def test_second_video_requests_only_unique_cues(self):
+        memory = TranslationMemory()
+        model = _FakeModel()
+        first = self._task(memory, self.SHARED + ["today we look at", "a new topic."])
+        second = self._task(memory, self.SHARED + ["this time it is", "something else."])
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            _run([first], model, pool)
+            _run([second], model, pool)
+
+        assert first.complete and second.complete
+        assert model.requests[1] == ["this time it is", "something else."]
+        assert second.memory_hits == 2
+        # 命中的条目按原位置输出
+        rendered = parse_srt_entries(second.render())
+        assert [entry["text"] for entry in rendered] == [
+            "T:[Music]",
+            "T:Welcome back to the channel!",
+            "T:this time it is",
+            "T:something else.",
+        ]
+
+    def test_concurrent_videos_coalesce_shared_cues(self):
+        memory = TranslationMemory()
+        model = _FakeModel(delay=0.2)
+        videos = [
+            self._task(memory, [f"part {v} starts here"] + self.SHARED + [f"part {v} ends."])
+            for v in range(3)
+        ]
+
+        with ThreadPoolExecutor(max_workers=6) as pool, ThreadPoolExecutor(max_workers=3) as videos_pool:
+            list(videos_pool.map(lambda task: _run([task], model, pool), videos))
+
+        assert all(task.complete for task in videos)
+        for text in self.SHARED:
+            assert model.cues.count(text) == 1
+        for v, task in enumerate(videos):
+            assert parse_srt_entries(task.render())[-1]["text"] == f"T:part {v} ends."
+
+    def test_failed_owner_lets_waiting_video_translate(self):
+        memory = TranslationMemory()
+        bound = memory.bind("en", "zh")
+        assert bound.claim("[Music]") == (None, None)  # 另一个视频正在翻译
+
+        model = _FakeModel()
+        task = self._task(memory, ["[Music]", "Hello there."])
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            timer = threading.Timer(0.2, bound.resolve, args=("[Music]", None))
+            timer.start()
+            _run([task], model, pool)
+
+        assert task.complete
+        assert model.requests == [["Hello there."], ["[Music]"]]
+
+    def test_cancel_releases_owned_cues(self):
+        memory = TranslationMemory()
+        task = self._task(memory, ["[Music]"])
+
+        class _Token:
+            def is_cancelled(self):
+                return True
+
+            def get_reason(self):
+                return "stop"
+
+        from core.exceptions import TaskCancelledError
+
+        with ThreadPoolExecutor(max_workers=1) as pool, pytest.raises(TaskCancelledError):
+            run_cue_repair(
+                [task],
+                submit=pool.submit,
+                translate=_FakeModel(delay=0.1).translate,
+                on_done=lambda t: None,
+                cancel_token=_Token(),
+            )
+
+        assert memory.claim("en", "zh", "[Music]") == (None, None)
+
+
+def test_google_translate_does_not_remember_untranslated_text(monkeypatch):
+    """Google 翻译返回原文（翻译失败）时不写入翻译记忆"""
+    replies = iter(["Hello there.", "你好。"])
+
+    class _FakeGoogleTranslator:
+        def __init__(self, source, target):
+            pass
+
+        def translate(self, text):
+            return next(replies)
+
+    monkeypatch.setitem(
+        sys.modules, "deep_translator", types.SimpleNamespace(GoogleTranslator=_FakeGoogleTranslator)
+    )
+    client = GoogleTranslateClient(AIConfig(provider="google_translate", model="google_translate_free"))
+    block = ["1", "00:00:01,000 --> 00:00:02,000", "Hello there."]
+
+    assert client._translate_subtitle_block(block, "en", "zh-CN")[2] == "Hello there."
+    assert len(get_translation_memory(client)) == 0
+    assert client._translate_subtitle_block(block, "en", "zh-CN")[2] == "你好。"
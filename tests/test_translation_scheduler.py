@@ -0,0 +1,201 @@
+"""
+Tests for core/translator/scheduler.py 及目标语言并发翻译
+
+运行: python -m pytest tests/test_translation_scheduler.py -v
+"""
+
+import threading
+import time
+
+from core.language import LanguageConfig
+from core.llm_client import ClientRegistry, LLMResult
+from core.models import DetectionResult, VideoInfo
+from core.translator import SubtitleTranslator
+from core.translator.scheduler import TranslationScheduler, get_translation_scheduler
+
+
+class TestTranslationScheduler:
+    """调度器测试"""
+
+    def test_round_robin_between_videos(self):
+        """测试单 worker 时按视频轮询，长视频不会饿死其他视频"""
+        scheduler = TranslationScheduler(max_workers=1)
+        gate = threading.Event()
+        order = []
+
+        blocker = scheduler.submit("blocker", gate.wait)
+        futures = [scheduler.submit("long", order.append, f"long-{i}") for i in range(4)]
+        futures += [scheduler.submit("short", order.append, f"short-{i}") for i in range(2)]
+        gate.set()
+        blocker.result(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order[:4] == ["long-0", "short-0", "long-1", "short-1"]
+        assert order[4:] == ["long-2", "long-3"]
+
+    def test_concurrency_capped(self):
+        scheduler = TranslationScheduler(max_workers=3)
+        active = [0, 0]
+        lock = threading.Lock()
+
+        def unit():
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+        futures = [scheduler.submit(f"v{i % 2}", unit) for i in range(12)]
+        for future in futures:
+            future.result(timeout=5)
+        assert active[1] == 3
+
+    def test_burst_not_queued_behind_idle_worker(self):
+        """已有一个空闲 worker 时，突发提交的多个单元仍能并发执行"""
+        scheduler = TranslationScheduler(max_workers=5)
+        scheduler.submit("warmup", lambda: None).result(timeout=5)
+        time.sleep(0.05)  # 等 worker 进入空闲等待
+        active = [0, 0]
+        lock = threading.Lock()
+
+        def unit():
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+
+        futures = [scheduler.submit("burst", unit) for _ in range(10)]
+        for future in futures:
+            future.result(timeout=5)
+        assert active[1] > 1
+
+    def test_exception_and_cancel(self):
+        scheduler = TranslationScheduler(max_workers=1)
+        gate = threading.Event()
+        blocker = scheduler.submit("v", gate.wait)
+        failing = scheduler.submit("v", lambda: 1 / 0)
+        cancelled = scheduler.submit("v", lambda: "never")
+
+        assert cancelled.cancel()
+        gate.set()
+        blocker.result(timeout=5)
+        assert isinstance(failing.exception(timeout=5), ZeroDivisionError)
+        assert cancelled.cancelled()
+
+    def test_one_scheduler_per_client(self):
+        class Client:
+            max_concurrency = 7
+
+        client = Client()
+        assert get_translation_scheduler(client) is get_translation_scheduler(client)
+        assert get_translation_scheduler(client).max_workers == 7
+        assert get_translation_scheduler(Client()) is not get_translation_scheduler(client)
+
+    def test_client_registry_releases_collected_clients(self):
+        import gc
+
+        class Client:
+            pass
+
+        registry = ClientRegistry(lambda llm: object())
+        client = Client()
+        state = registry.get(client)
+        assert registry.get(client) is state
+        del client
+        gc.collect()
+        assert len(registry._states) == 0
+        # 不支持弱引用的客户端不缓存，不会拿到其他客户端的状态
+        unweakrefable = object()
+        assert registry.get(unweakrefable) is not registry.get(unweakrefable)
+
+
+class _SlowLLM:
+    max_concurrency = 4
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        source = prompt.split("字幕内容：\n", 1)[1].rsplit("\n\n请", 1)[0]
+        return LLMResult(text=source)
+
+
+def test_target_languages_translated_concurrently(tmp_path):
+    """测试多个目标语言并发翻译，总耗时接近单个语言"""
+    source = tmp_path / "original.en.srt"
+    source.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n\n", encoding="utf-8")
+    targets = ["zh-CN", "ja", "fr", "de"]
+    config = LanguageConfig(subtitle_target_languages=targets, translation_strategy="AI_ONLY")
+    llm = _SlowLLM(delay=0.3)
+
+    started = time.perf_counter()
+    result = SubtitleTranslator(llm, config).translate(
+        VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title"),
+        DetectionResult(
+            video_id="abc123", has_subtitles=True, manual_languages=["en"], auto_languages=[]
+        ),
+        config,
+        {"original": source, "official_translations": {}},
+        tmp_path,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert llm.calls == 4
+    assert all(result[lang] and result[lang].exists() for lang in targets)
+    # 串行需要 1.2 秒
+    assert elapsed < 0.9
+
+
+class _FlakyLLM(_SlowLLM):
+    """包含指定文本的请求返回空结果"""
+
+    def __init__(self, fail_marker=None):
+        super().__init__(delay=0)
+        self.fail_marker = fail_marker
+
+    def generate(self, prompt, **kwargs):
+        result = super().generate(prompt, **kwargs)
+        if self.fail_marker and self.fail_marker in prompt:
+            return LLMResult(text="")
+        return result
+
+
+def test_chunk_progress_persisted_and_resumed(tmp_path):
+    """测试已完成的 chunk 写入 ChunkTracker，重跑时只翻译失败的 chunk"""
+    source = tmp_path / "original.en.srt"
+    source.write_text(
+        "".join(
+            f"{i}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\nLine {i}\n\n"
+            for i in range(1, 201)
+        ),
+        encoding="utf-8",
+    )
+    config = LanguageConfig(subtitle_target_languages=["ja"], translation_strategy="AI_ONLY")
+    args = (
+        VideoInfo(video_id="abc123", url="https://youtu.be/abc123", title="Title"),
+        DetectionResult(
+            video_id="abc123", has_subtitles=True, manual_languages=["en"], auto_languages=[]
+        ),
+        config,
+        {"original": source, "official_translations": {}},
+        tmp_path,
+    )
+
+    flaky = _FlakyLLM(fail_marker="\nLine 180\n")
+    assert SubtitleTranslator(flaky, config).translate(*args)["ja"] is None
+    assert (tmp_path / ".chunk_progress.ja.json").exists()
+
+    good = _FlakyLLM()
+    result = SubtitleTranslator(good, config).translate(*args)
+    assert result["ja"].read_text(encoding="utf-8").count("-->") == 200
+    # 4 个 chunk 中只有失败的 1 个需要重新翻译
+    assert good.calls == 1
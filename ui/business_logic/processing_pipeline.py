@@ -7,6 +7,7 @@ from typing import List, Optional, Callable
 
 from core.logger import get_logger
 from core.pipeline import process_video_list
+from core.profiler import profiling
 from core.cancel_token import CancelToken
 from core.models import VideoInfo
 from core.exceptions import ErrorType
@@ -60,29 +61,32 @@ class ProcessingPipelineMixin:
             ),
         )
 
-        # 调用核心流水线
-        result = process_video_list(
-            videos=videos,
-            language_config=self.app_config.language,
-            translation_llm=self.translation_llm_client,
-            summary_llm=self.summary_llm_client,
-            output_writer=self.output_writer,
-            failure_logger=self.failure_logger,
-            incremental_manager=self.incremental_manager,
-            archive_path=archive_path,
-            force=force,
-            dry_run=False,  # 正常处理模式，不是 Dry Run
-            cancel_token=self.cancel_token,  # 传递取消令牌
-            concurrency=self.app_config.concurrency,
-            ai_concurrency=self.app_config.ai_concurrency,
-            proxy_manager=self.proxy_manager,
-            cookie_manager=self.cookie_manager,
-            on_stats=on_stats,
-            on_log=on_log,
-            on_error=self._handle_pipeline_error,
-            translation_llm_init_error_type=self.translation_llm_init_error_type,  # 传递初始化失败的错误类型
-            translation_llm_init_error=self.translation_llm_init_error,  # 传递初始化失败的错误信息
-        )
+        # 调用核心流水线（开启性能分析时结果写入日志目录）
+        with profiling(self.app_config.profile_enabled):
+            result = process_video_list(
+                videos=videos,
+                language_config=self.app_config.language,
+                translation_llm=self.translation_llm_client,
+                summary_llm=self.summary_llm_client,
+                output_writer=self.output_writer,
+                failure_logger=self.failure_logger,
+                incremental_manager=self.incremental_manager,
+                archive_path=archive_path,
+                force=force,
+                dry_run=False,  # 正常处理模式，不是 Dry Run
+                cancel_token=self.cancel_token,  # 传递取消令牌
+                concurrency=self.app_config.concurrency,
+                ai_concurrency=self.app_config.ai_concurrency,
+                proxy_manager=self.proxy_manager,
+                cookie_manager=self.cookie_manager,
+                on_stats=on_stats,
+                on_log=on_log,
+                on_error=self._handle_pipeline_error,
+                translation_llm_init_error_type=self.translation_llm_init_error_type,  # 传递初始化失败的错误类型
+                translation_llm_init_error=self.translation_llm_init_error,  # 传递初始化失败的错误信息
+                artifact_memory_mb=self.app_config.artifact_memory_mb,
+                worker_budget=self.app_config.worker_budget,
+            )
 
         # 更新最终统计信息（包含错误分类）
         stats["success"] = result.get("success", 0)
@@ -135,31 +139,34 @@ class ProcessingPipelineMixin:
             ),
         )
 
-        # 调用核心流水线
-        result = process_video_list(
-            videos=videos,
-            language_config=self.app_config.language,
-            translation_llm=self.translation_llm_client,
-            summary_llm=self.summary_llm_client,
-            output_writer=self.output_writer,
-            failure_logger=self.failure_logger,
-            incremental_manager=self.incremental_manager,
-            archive_path=archive_path,
-            force=force,
-            dry_run=False,  # 正常处理模式，不是 Dry Run
-            cancel_token=self.cancel_token,  # 传递取消令牌
-            concurrency=self.app_config.concurrency,
-            ai_concurrency=self.app_config.ai_concurrency,
-            proxy_manager=self.proxy_manager,
-            cookie_manager=self.cookie_manager,
-            on_stats=on_stats,
-            on_log=on_log,
-            on_error=self._handle_pipeline_error,
-            translation_llm_init_error_type=self.translation_llm_init_error_type,
-            translation_llm_init_error=self.translation_llm_init_error,
-            initial_url_count=initial_url_count,
-            fetch_failed_count=fetch_failed_count,
-        )
+        # 调用核心流水线（开启性能分析时结果写入日志目录）
+        with profiling(self.app_config.profile_enabled):
+            result = process_video_list(
+                videos=videos,
+                language_config=self.app_config.language,
+                translation_llm=self.translation_llm_client,
+                summary_llm=self.summary_llm_client,
+                output_writer=self.output_writer,
+                failure_logger=self.failure_logger,
+                incremental_manager=self.incremental_manager,
+                archive_path=archive_path,
+                force=force,
+                dry_run=False,  # 正常处理模式，不是 Dry Run
+                cancel_token=self.cancel_token,  # 传递取消令牌
+                concurrency=self.app_config.concurrency,
+                ai_concurrency=self.app_config.ai_concurrency,
+                proxy_manager=self.proxy_manager,
+                cookie_manager=self.cookie_manager,
+                on_stats=on_stats,
+                on_log=on_log,
+                on_error=self._handle_pipeline_error,
+                translation_llm_init_error_type=self.translation_llm_init_error_type,
+                translation_llm_init_error=self.translation_llm_init_error,
+                initial_url_count=initial_url_count,
+                fetch_failed_count=fetch_failed_count,
+                artifact_memory_mb=self.app_config.artifact_memory_mb,
+                worker_budget=self.app_config.worker_budget,
+            )
 
         # 更新最终统计信息（包含错误分类）
         stats["success"] = result.get("success", 0)
@@ -8,11 +8,12 @@ from pathlib import Path
 
 from core.logger import get_logger
 from core.fetcher import VideoFetcher
-from core.output import OutputWriter
+from core.output import create_output_writer
 from core.incremental import IncrementalManager
 from core.failure_logger import FailureLogger
 from core.proxy_manager import ProxyManager
 from core.cookie_manager import CookieManager
+from core.rate_limiter import get_rate_limiter
 from core.ai_providers import create_llm_client
 from core.llm_client import LLMException
 from core.cancel_token import CancelToken
@@ -47,6 +48,11 @@ class VideoProcessor(
 
     def _init_components(self):
         """初始化核心组件"""
+        # 按配置设置 YouTube 请求限速（每个出口身份一个令牌桶）
+        get_rate_limiter().configure(
+            rate=self.app_config.request_rate, burst=self.app_config.request_burst
+        )
+
         # 初始化代理管理器
         if self.app_config.proxies:
             self.proxy_manager = ProxyManager(self.app_config.proxies, quiet=self.quiet)
@@ -72,7 +78,11 @@ class VideoProcessor(
 
         # 初始化 OutputWriter
         output_dir = Path(self.app_config.output_dir)
-        self.output_writer = OutputWriter(output_dir)
+        self.output_writer = create_output_writer(
+            output_dir,
+            backend=self.app_config.output_backend,
+            commit_mode=self.app_config.output_commit_mode,
+        )
 
         # 初始化 IncrementalManager
         self.incremental_manager = IncrementalManager()
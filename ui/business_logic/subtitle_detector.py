@@ -78,7 +78,7 @@ class SubtitleDetectorMixin:
                 break
             
             try:
-                result = detector.detect(video)
+                result = detector.detect(video, language_config=self.app_config.language)
                 progress_prefix = f"[{i}/{len(videos)}]"
 
                 if result.has_subtitles:
@@ -13,7 +13,6 @@ from ui.themes import get_theme, apply_theme_to_window
 from ui.app_events import EventType
 from ui.pages.url_list_page import UrlListPage
 from core.logger import get_logger
-from ui.business_logic import VideoProcessor
 
 if TYPE_CHECKING:
     pass
@@ -51,9 +50,7 @@ class EventHandlersMixin:
                 if hasattr(self, 'video_processor') and hasattr(self.video_processor, 'cancel_token'):
                     old_cancel_token = self.video_processor.cancel_token
                 
-                self.video_processor = VideoProcessor(
-                    self.config_manager, self.app_config, event_bus=self.event_bus, quiet=True
-                )
+                self.video_processor = self._create_video_processor()
                 
                 # 恢复旧的 cancel_token（如果存在）
                 if old_cancel_token is not None:
@@ -263,6 +260,23 @@ class EventHandlersMixin:
             reinit_processor=False,
         )
 
+    def _on_save_profile(self, profile_enabled: bool):
+        """保存性能分析开关（对之后开始的任务生效）
+
+        Args:
+            profile_enabled: 是否分析任务性能
+        """
+
+        def update_config(cfg):
+            cfg.profile_enabled = profile_enabled
+
+        self._save_config(
+            update_fn=update_config,
+            success_msg="",  # 静默保存，不显示消息
+            error_msg_prefix="",
+            reinit_processor=False,
+        )
+
     def _on_language_changed(self, value: str):
         """语言切换回调"""
         # 直接比较显示文本，因为翻译文件中 language_zh 和 language_en 的值是固定的
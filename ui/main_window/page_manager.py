@@ -3,17 +3,14 @@
 负责页面切换逻辑
 """
 
+import importlib
+
 import customtkinter as ctk
 from typing import TYPE_CHECKING
 
 from core.i18n import t
 from ui.fonts import heading_font
 from ui.pages.url_list_page import UrlListPage
-from ui.pages.run_params_page import RunParamsPage
-from ui.pages.appearance_page import AppearancePage
-from ui.pages.system_page import SystemPage
-from ui.pages.network_settings import NetworkSettingsPage
-from ui.pages.translation_summary_page import TranslationSummaryPage
 from core.logger import get_logger
 
 if TYPE_CHECKING:
@@ -24,6 +21,21 @@ logger = get_logger()
 
 from ui.themes import apply_theme_to_window, _apply_custom_colors
 
+# 非默认页面在第一次导航时才导入（启动时只需要任务页面）
+_LAZY_PAGES = {
+    "run_params": ("ui.pages.run_params_page", "RunParamsPage"),
+    "appearance": ("ui.pages.appearance_page", "AppearancePage"),
+    "network_settings": ("ui.pages.network_settings", "NetworkSettingsPage"),
+    "translation_summary": ("ui.pages.translation_summary_page", "TranslationSummaryPage"),
+    "system": ("ui.pages.system_page", "SystemPage"),
+}
+
+
+def _page_class(page_name: str):
+    """获取页面类（首次调用时导入页面模块）"""
+    module_name, class_name = _LAZY_PAGES[page_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 class PageManagerMixin:
     """页面管理 Mixin
@@ -31,6 +43,14 @@ class PageManagerMixin:
     提供页面切换相关的方法
     """
 
+    def _preload_pages(self):
+        """预先导入其他页面模块（后台预热时调用，只导入不创建控件）"""
+        for page_name in _LAZY_PAGES:
+            try:
+                _page_class(page_name)
+            except Exception as e:
+                logger.debug(f"预加载页面 {page_name} 失败: {e}")
+
     def _switch_page(self, page_name: str):
         """切换页面"""
         # 在销毁页面之前，保存当前页面的输入内容
@@ -116,7 +136,7 @@ class PageManagerMixin:
             self.after(100, self._check_resumable_tasks)
 
         elif page_name == "run_params":
-            page = RunParamsPage(
+            page = _page_class("run_params")(
                 self.page_container,
                 concurrency=self.app_config.concurrency,
                 ai_concurrency=self.app_config.ai_concurrency,
@@ -135,13 +155,13 @@ class PageManagerMixin:
             self.state_manager.set("current_mode", t("run_params"))
 
         elif page_name == "appearance":
-            page = AppearancePage(self.page_container)
+            page = _page_class("appearance")(self.page_container)
             page.pack(fill="both", expand=True)
             self.current_page = page
             self.toolbar.update_title(t("appearance_lang"))
 
         elif page_name == "network_settings":
-            page = NetworkSettingsPage(
+            page = _page_class("network_settings")(
                 self.page_container,
                 cookie=self.app_config.cookie,
                 proxies=self.app_config.proxies,
@@ -161,7 +181,7 @@ class PageManagerMixin:
             self.toolbar.update_title(t("network_settings_group"))
 
         elif page_name == "translation_summary":
-            page = TranslationSummaryPage(
+            page = _page_class("translation_summary")(
                 self.page_container,
                 translation_ai_config=self.app_config.translation_ai.to_dict(),
                 summary_ai_config=self.app_config.summary_ai.to_dict(),
@@ -179,7 +199,14 @@ class PageManagerMixin:
             self.toolbar.update_title(t("translation_summary_group"))
 
         elif page_name == "system":
-            page = SystemPage(self.page_container, on_log=self._on_log)
+            page = _page_class("system")(
+                self.page_container,
+                on_log=self._on_log,
+                output_dir=self.app_config.output_dir,
+                language_config=self.app_config.language,
+                profile_enabled=self.app_config.profile_enabled,
+                on_save_profile=self._on_save_profile,
+            )
             page.pack(fill="both", expand=True)
             self.current_page = page
             self.toolbar.update_title(t("system_tools"))
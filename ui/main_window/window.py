@@ -4,6 +4,9 @@
 使用组件化架构，main_window 仅负责布局和事件接线
 """
 
+import threading
+import time
+
 import customtkinter as ctk
 from typing import Optional
 
@@ -15,7 +18,6 @@ from ui.state import get_state_manager
 from ui.components.toolbar import Toolbar
 from ui.components.sidebar import Sidebar
 from ui.components.log_panel import LogPanel
-from ui.business_logic import VideoProcessor
 from config.manager import ConfigManager
 
 # 导入 mixin 模块
@@ -34,7 +36,13 @@ class MainWindow(PageManagerMixin, TaskHandlersMixin, EventHandlersMixin, ctk.CT
     - 底部日志框：实时显示日志
     """
     
-    def __init__(self):
+    def __init__(self, launch_started: Optional[float] = None):
+        """
+        Args:
+            launch_started: 进程启动时的 time.perf_counter()，用于统计可交互耗时；
+                为 None 时从窗口创建开始计时
+        """
+        self._launch_started = launch_started or time.perf_counter()
         super().__init__()
         
         # 窗口基本设置（先设置默认标题，i18n 初始化后会更新）
@@ -68,10 +76,10 @@ class MainWindow(PageManagerMixin, TaskHandlersMixin, EventHandlersMixin, ctk.CT
         global_logger = get_logger()
         global_logger.add_callback(self._on_log_message)
         
-        # 初始化业务逻辑处理器
-        self.video_processor = VideoProcessor(
-            self.config_manager, self.app_config, event_bus=self.event_bus, quiet=True
-        )
+        # 业务逻辑处理器在后台线程中预热（代理/Cookie/yt-dlp 检查不阻塞 Tk 主线程）
+        self._video_processor = None
+        self._processor_ready = threading.Event()
+        self._start_background_warmup()
         
         # 当前页面
         self.current_page: Optional[ctk.CTkFrame] = None
@@ -99,6 +107,62 @@ class MainWindow(PageManagerMixin, TaskHandlersMixin, EventHandlersMixin, ctk.CT
         
         # 启动时检查更新
         self._check_for_updates()
+
+        # 主循环第一次空闲时界面已可交互
+        self.after_idle(self._report_time_to_interactive)
+
+    @property
+    def video_processor(self):
+        """业务逻辑处理器（后台预热完成前访问会等待预热结束）"""
+        if self._video_processor is None:
+            self._processor_ready.wait()
+            if self._video_processor is None:
+                # 预热失败：在当前线程重新创建，异常按原路径抛给调用方
+                self._video_processor = self._create_video_processor()
+        return self._video_processor
+
+    @video_processor.setter
+    def video_processor(self, processor):
+        self._video_processor = processor
+
+    def _create_video_processor(self):
+        from ui.business_logic import VideoProcessor
+
+        return VideoProcessor(
+            self.config_manager, self.app_config, event_bus=self.event_bus, quiet=True
+        )
+
+    def _start_background_warmup(self):
+        """后台预热：创建业务逻辑处理器，并预先导入其他页面模块"""
+
+        def warmup():
+            started = time.perf_counter()
+            try:
+                self._video_processor = self._create_video_processor()
+            except Exception as e:
+                self.logger.error_i18n("log.gui_warmup_failed", error=str(e))
+            finally:
+                self._processor_ready.set()
+            self.after(0, self._on_processor_ready)
+
+            self._preload_pages()
+            self.logger.info_i18n(
+                "log.gui_warmup_complete", seconds=f"{time.perf_counter() - started:.2f}"
+            )
+
+        threading.Thread(target=warmup, name="gui-warmup", daemon=True).start()
+
+    def _on_processor_ready(self):
+        """处理器预热完成（主线程）"""
+        if self._video_processor is not None and hasattr(self, "log_panel"):
+            self.log_panel.proxy_manager = self._video_processor.proxy_manager
+
+    def _report_time_to_interactive(self):
+        """记录从启动到界面可交互的耗时"""
+        self.logger.info_i18n(
+            "log.gui_time_to_interactive",
+            seconds=f"{time.perf_counter() - self._launch_started:.2f}",
+        )
     
     def _init_i18n(self):
         """初始化 i18n，从配置读取语言设置"""
@@ -160,7 +224,7 @@ class MainWindow(PageManagerMixin, TaskHandlersMixin, EventHandlersMixin, ctk.CT
         # 4. 底部日志框
         self.log_panel = LogPanel(self, height=450)
         self.log_panel._is_secondary = True  # 标记为次要区域
-        self.log_panel.proxy_manager = self.video_processor.proxy_manager  # 设置代理管理器引用
+        # 代理管理器引用在后台预热完成后设置（_on_processor_ready）
         self.log_panel.grid(row=2, column=0, columnspan=2, sticky="ew")
 
         # 5. 默认显示任务页面
@@ -3,18 +3,34 @@
 包含系统相关工具和设置
 """
 
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
 import customtkinter as ctk
 from core.i18n import t
-from ui.fonts import title_font, heading_font
+from core.language import LanguageConfig
+from ui.fonts import title_font, body_font
 
 
 class SystemPage(ctk.CTkFrame):
     """系统工具页面"""
 
-    def __init__(self, parent, on_log=None, **kwargs):
-        # 从 kwargs 中移除 on_log，因为 CTkFrame 不支持这个参数
-        # 如果将来需要使用，可以保存为实例变量
+    def __init__(
+        self,
+        parent,
+        on_log: Optional[Callable[..., None]] = None,
+        output_dir: str = "out",
+        language_config: Optional[LanguageConfig] = None,
+        profile_enabled: bool = False,
+        on_save_profile: Optional[Callable[[bool], None]] = None,
+        **kwargs,
+    ):
         self.on_log = on_log
+        self.output_dir = output_dir
+        self.language_config = language_config or LanguageConfig()
+        self.profile_enabled = profile_enabled
+        self.on_save_profile = on_save_profile
         super().__init__(parent, **kwargs)
         self.grid_columnconfigure(0, weight=1)
         self._build_ui()
@@ -27,11 +43,152 @@ class SystemPage(ctk.CTkFrame):
         )
         title.pack(pady=16)
 
-        # 占位文本
-        placeholder = ctk.CTkLabel(
-            self, text=t("page_not_implemented", page="system"), font=heading_font()
+        # 离线重新渲染
+        rerender_frame = ctk.CTkFrame(self)
+        rerender_frame.pack(fill="x", padx=32, pady=16)
+
+        rerender_title = ctk.CTkLabel(
+            rerender_frame, text=t("rerender_title"), font=body_font(weight="bold")
+        )
+        rerender_title.pack(anchor="w", padx=8, pady=(8, 0))
+
+        rerender_hint = ctk.CTkLabel(
+            rerender_frame,
+            text=t("rerender_hint"),
+            font=body_font(),
+            text_color=("gray50", "gray50"),
+        )
+        rerender_hint.pack(anchor="w", padx=8, pady=(0, 8))
+
+        options_frame = ctk.CTkFrame(rerender_frame, fg_color="transparent")
+        options_frame.pack(fill="x", padx=8, pady=8)
+
+        format_label = ctk.CTkLabel(
+            options_frame, text=t("rerender_format_label"), font=body_font()
+        )
+        format_label.pack(side="left", padx=(0, 8))
+
+        self.format_option = ctk.CTkOptionMenu(
+            options_frame, values=["srt", "txt", "both"], width=90, font=body_font()
+        )
+        self.format_option.set(self.language_config.subtitle_format)
+        self.format_option.pack(side="left", padx=8)
+
+        self.bilingual_checkbox = ctk.CTkCheckBox(
+            options_frame, text=t("rerender_bilingual_label"), font=body_font()
+        )
+        if self.language_config.bilingual_mode == "source+target":
+            self.bilingual_checkbox.select()
+        self.bilingual_checkbox.pack(side="left", padx=8)
+
+        self.force_checkbox = ctk.CTkCheckBox(
+            options_frame, text=t("rerender_force_label"), font=body_font()
+        )
+        self.force_checkbox.pack(side="left", padx=8)
+
+        button_frame = ctk.CTkFrame(rerender_frame, fg_color="transparent")
+        button_frame.pack(fill="x", padx=8, pady=8)
+
+        self.rerender_btn = ctk.CTkButton(
+            button_frame,
+            text=t("rerender_button"),
+            width=120,
+            font=body_font(),
+            command=self._on_rerender,
+        )
+        self.rerender_btn.pack(side="left")
+
+        self.rerender_status = ctk.CTkLabel(
+            button_frame,
+            text=t("rerender_output_dir", path=self.output_dir),
+            font=body_font(),
+            text_color=("gray50", "gray50"),
         )
-        placeholder.pack(expand=True)
+        self.rerender_status.pack(side="left", padx=16)
+
+        # 性能分析
+        profile_frame = ctk.CTkFrame(self)
+        profile_frame.pack(fill="x", padx=32, pady=16)
+
+        profile_title = ctk.CTkLabel(
+            profile_frame, text=t("profile_title"), font=body_font(weight="bold")
+        )
+        profile_title.pack(anchor="w", padx=8, pady=(8, 0))
+
+        profile_hint = ctk.CTkLabel(
+            profile_frame,
+            text=t("profile_hint"),
+            font=body_font(),
+            text_color=("gray50", "gray50"),
+        )
+        profile_hint.pack(anchor="w", padx=8, pady=(0, 8))
+
+        self.profile_checkbox = ctk.CTkCheckBox(
+            profile_frame,
+            text=t("profile_enable_label"),
+            font=body_font(),
+            command=self._on_profile_toggled,
+        )
+        if self.profile_enabled:
+            self.profile_checkbox.select()
+        self.profile_checkbox.pack(anchor="w", padx=8, pady=8)
+
+    def _on_profile_toggled(self):
+        """切换性能分析（对之后开始的任务生效）"""
+        if self.on_save_profile:
+            self.on_save_profile(bool(self.profile_checkbox.get()))
+
+    def _on_rerender(self):
+        """在后台线程中重新渲染输出目录"""
+        from core.output.rerender import OutputRerenderer
+
+        output_dir = Path(self.output_dir)
+        if not output_dir.exists():
+            if self.on_log:
+                self.on_log("ERROR", t("exception.file_not_found", path=str(output_dir)))
+            return
+
+        def on_progress(done: int, total: int):
+            self.after(
+                0,
+                lambda: self.rerender_status.configure(
+                    text=t("rerender_progress", done=done, total=total)
+                ),
+            )
+
+        rerenderer = OutputRerenderer(
+            output_dir,
+            subtitle_format=self.format_option.get(),
+            bilingual_mode="source+target" if self.bilingual_checkbox.get() else "none",
+            force=bool(self.force_checkbox.get()),
+            on_progress=on_progress,
+        )
+        self.rerender_btn.configure(state="disabled")
+
+        def rerender_in_thread():
+            try:
+                stats = rerenderer.run()
+                message = t(
+                    "rerender_done",
+                    rendered=stats.rendered,
+                    skipped=stats.skipped,
+                    failed=stats.failed,
+                    elapsed=f"{stats.elapsed:.1f}",
+                )
+                level = "WARN" if stats.failed else "INFO"
+            except Exception as e:
+                message = t("rerender_failed", error=str(e))
+                level = "ERROR"
+
+            def on_finish():
+                self.rerender_btn.configure(state="normal")
+                self.rerender_status.configure(text=message)
+                if self.on_log:
+                    self.on_log(level, message)
+
+            self.after(0, on_finish)
+
+        threading.Thread(target=rerender_in_thread, daemon=True).start()
 
     def refresh_language(self):
         """刷新语言相关文本"""